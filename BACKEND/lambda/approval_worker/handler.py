@@ -0,0 +1,281 @@
+"""
+approval_worker Lambda - Finalizes admin approve/reject decisions
+
+Triggered by DynamoDB Streams on the OnlineLibrary table (filtered to book
+items whose status is APPROVING or REJECTING).
+
+approve_book / reject_book only record the admin's intent with a
+conditional PENDING -> APPROVING/REJECTING write and return 202. This worker
+does the slow part:
+
+1. Re-read the book (consistent read); skip it unless it is still
+   APPROVING/REJECTING, so replayed records are no-ops
+2. Move the file:
+   - Approve: staging/ -> public/books/, cover thumbnail staging/covers/ ->
+     public/covers/, record PDF length/linearization (see shared.pdf_range); for
+     deduplicated content the shared object is moved on the first approval
+   - Reject: staging/ (or uploads/) -> quarantine/, cover thumbnail
+     deleted; deduplicated content
+     (see shared.dedup) is only released, and quarantined with the last
+     reference
+3. Finalize with a conditional APPROVING -> APPROVED / REJECTING -> REJECTED
+   write (stream_processor then updates the pending index, counters and
+   catalog snapshot from that change)
+
+Every step is idempotent (copy skipped when the destination exists, S3
+deletes and SET updates are repeatable, content releases are recorded per
+book), so a crash at any point is fixed by the stream retry. Failed records
+are reported through ReportBatchItemFailures and retried individually.
+
+Environment variables:
+- BOOKS_TABLE_NAME: DynamoDB table name
+- UPLOADS_BUCKET_NAME: S3 bucket name
+"""
+
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from botocore.exceptions import ClientError
+
+from shared.logger import get_logger, get_metrics, emit_metrics
+from shared.dynamodb import get_dynamodb_table, transition_book_status
+from shared.aws_clients import s3_client, transfer_config
+from shared.dedup import get_content_item, release_content_hash, update_content_location
+from shared.pdf_range import probe_pdf
+
+logger = get_logger(__name__)
+
+PUBLIC_COVERS_PREFIX = "public/covers/"
+
+FINAL_STATUS = {
+    "APPROVING": "APPROVED",
+    "REJECTING": "REJECTED",
+}
+
+
+def _get_env_or_error(name: str) -> str:
+    """Get environment variable or raise error if not set."""
+    value = os.getenv(name)
+    if not value:
+        raise ValueError(f"Missing required environment variable: {name}")
+    return value
+
+
+def _object_exists(bucket: str, key: str) -> bool:
+    try:
+        s3_client().head_object(Bucket=bucket, Key=key)
+        return True
+    except ClientError:
+        return False
+
+
+def _move_s3_object(bucket: str, source_keys: List[str], dest_key: str) -> None:
+    """
+    Move the first existing source to dest_key, tolerating earlier attempts.
+
+    Args:
+        bucket: S3 bucket name
+        source_keys: Candidate source keys, in order of preference
+        dest_key: Destination object key
+
+    Raises:
+        FileNotFoundError: If neither a source nor the destination exists
+    """
+    s3 = s3_client()
+    for source_key in source_keys:
+        if source_key == dest_key:
+            return
+        if not _object_exists(bucket, source_key):
+            continue
+        if not _object_exists(bucket, dest_key):
+            # Managed copy: multipart and parallel above the transfer threshold
+            s3.copy(
+                CopySource={"Bucket": bucket, "Key": source_key},
+                Bucket=bucket,
+                Key=dest_key,
+                Config=transfer_config(),
+            )
+        s3.delete_object(Bucket=bucket, Key=source_key)
+        logger.info(f"Moved S3 object from {source_key} to {dest_key}")
+        return
+
+    # A previous attempt already copied and deleted the source
+    if not _object_exists(bucket, dest_key):
+        raise FileNotFoundError(f"No source object for {dest_key}")
+
+
+def _public_key(key: str) -> str:
+    for prefix in ("staging/", "quarantine/"):
+        if key.startswith(prefix):
+            return "public/books/" + key[len(prefix):]
+    return key
+
+
+def _quarantine_key(key: str) -> str:
+    for prefix in ("staging/", "uploads/", "public/books/"):
+        if key.startswith(prefix):
+            return "quarantine/" + key[len(prefix):]
+    return key
+
+
+def _publish_cover(bucket: str, book: Dict[str, Any]) -> Optional[str]:
+    """Move the cover thumbnail to public/covers/ (best-effort); returns its new key."""
+    cover_path = book.get("coverPath")
+    if not cover_path or cover_path.startswith(PUBLIC_COVERS_PREFIX):
+        return cover_path
+    dest_key = PUBLIC_COVERS_PREFIX + cover_path.rsplit("/", 1)[-1]
+    try:
+        _move_s3_object(bucket, [cover_path], dest_key)
+    except FileNotFoundError:
+        logger.warning(f"Book {book['bookId']}: cover {cover_path} not found")
+        return None
+    return dest_key
+
+
+def _finalize_approve(table_name: str, bucket: str, book: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    book_id = book["bookId"]
+    file_path = book["file_path"]
+    content_hash = book.get("contentHash")
+
+    # Deduplicated content may still sit under the original book's staging/
+    # (or quarantine/) key: whichever referencing book is approved first
+    # publishes it for all of them
+    source_keys = [file_path]
+    content = get_content_item(table_name, content_hash) if content_hash else None
+    if content:
+        source_keys.insert(0, content["objectKey"])
+    dest_key = _public_key(source_keys[0])
+    with get_metrics().timer("S3MoveTime"):
+        _move_s3_object(bucket, source_keys, dest_key)
+    if content and content["objectKey"] != dest_key:
+        update_content_location(table_name, content_hash, dest_key)
+
+    # Length and linearization for range reading (best-effort; readers
+    # fall back to letting PDF.js probe the file)
+    range_fields: Dict[str, Any] = {}
+    if (book.get("mime_type") or "") == "application/pdf":
+        try:
+            range_fields = probe_pdf(bucket, dest_key)
+        except ClientError as e:
+            logger.warning(f"Book {book_id}: PDF probe failed: {e}")
+
+    return transition_book_status(
+        table_name,
+        book_id,
+        "APPROVING",
+        "APPROVED",
+        file_path=dest_key,
+        coverPath=_publish_cover(bucket, book),
+        approvedAt=datetime.now(timezone.utc).isoformat(),
+        approvalError=None,
+        **range_fields,
+    )
+
+
+def _finalize_reject(table_name: str, bucket: str, book: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    book_id = book["bookId"]
+    file_path = book.get("file_path") or book.get("s3Key")
+    content_hash = book.get("contentHash")
+    source_keys = [file_path, file_path.replace("staging/", "uploads/")]
+
+    remaining = 0
+    if content_hash:
+        # Deduplicated content: give back this book's reference; the object
+        # stays where it is for any other book (original or duplicate)
+        content = get_content_item(table_name, content_hash)
+        if content:
+            source_keys.insert(0, content["objectKey"])
+        remaining = release_content_hash(table_name, content_hash, book_id=book_id)
+
+    if remaining > 0:
+        dest_key = None
+    else:
+        dest_key = _quarantine_key(source_keys[0])
+        with get_metrics().timer("S3MoveTime"):
+            _move_s3_object(bucket, source_keys, dest_key)
+
+    # Covers are per book, never shared
+    if book.get("coverPath"):
+        s3_client().delete_object(Bucket=bucket, Key=book["coverPath"])
+
+    # contentHash stays so delete_book's release is a recorded no-op
+    return transition_book_status(
+        table_name,
+        book_id,
+        "REJECTING",
+        "REJECTED",
+        file_path=dest_key,
+        coverPath=None,
+        rejectedAt=datetime.now(timezone.utc).isoformat(),
+    )
+
+
+def process_book(table_name: str, bucket: str, book_id: str) -> Optional[str]:
+    """
+    Finalize one pending decision.
+
+    Returns:
+        The final status, or None if there was nothing to do
+    """
+    table = get_dynamodb_table(table_name)
+    book = table.get_item(
+        Key={"PK": f"BOOK#{book_id}", "SK": "METADATA"},
+        ConsistentRead=True,
+    ).get("Item")
+
+    status = (book or {}).get("status")
+    if status not in FINAL_STATUS:
+        logger.info(f"Book {book_id}: status {status}, nothing to finalize")
+        return None
+
+    if status == "APPROVING":
+        updated = _finalize_approve(table_name, bucket, book)
+    else:
+        updated = _finalize_reject(table_name, bucket, book)
+
+    if not updated:
+        # Another invocation finished first
+        return None
+    get_metrics().increment("BooksFinalized")
+    logger.info(f"Book {book_id}: {status} -> {updated.get('status')}")
+    return updated.get("status")
+
+
+def _book_id_from_record(record: Dict[str, Any]) -> Optional[str]:
+    keys = record.get("dynamodb", {}).get("Keys", {})
+    pk = keys.get("PK", {}).get("S", "")
+    sk = keys.get("SK", {}).get("S", "")
+    if not pk.startswith("BOOK#") or sk != "METADATA":
+        return None
+    return pk[len("BOOK#"):]
+
+
+@emit_metrics("approvalWorker")
+def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Lambda handler for DynamoDB stream batches.
+
+    Args:
+        event: DynamoDB stream event
+        context: Lambda context
+
+    Returns:
+        {"batchItemFailures": [...]} so only failed records are retried
+    """
+    table_name = _get_env_or_error("BOOKS_TABLE_NAME")
+    bucket_name = _get_env_or_error("UPLOADS_BUCKET_NAME")
+
+    failures = []
+    for record in event.get("Records", []):
+        book_id = _book_id_from_record(record)
+        if not book_id or record.get("eventName") == "REMOVE":
+            continue
+        try:
+            process_book(table_name, bucket_name, book_id)
+        except Exception as e:
+            logger.error(f"Book {book_id}: finalize failed: {e}", exc_info=True)
+            get_metrics().increment("FinalizeFailures")
+            failures.append({"itemIdentifier": record.get("dynamodb", {}).get("SequenceNumber")})
+
+    return {"batchItemFailures": failures}
@@ -2,12 +2,14 @@
 approve_book Lambda - Admin approve/reject books
 
 Triggered by POST /admin/books/{bookId}/approve or /admin/books/{bookId}/reject
-Moves file from staging/ to public/books/ (approve) or quarantine/ (reject)
-Updates DynamoDB status
+Records the decision with a conditional PENDING -> APPROVING/REJECTING write
+and returns 202 right away. The S3 move (staging/ -> public/books/ or
+quarantine/), PDF range-reading info and the final APPROVED/REJECTED status happen
+in approval_worker; the pending index and catalog snapshot are kept in sync
+by stream_processor. Both are fed by DynamoDB Streams.
 
 Environment variables:
 - BOOKS_TABLE_NAME: DynamoDB table name
-- UPLOADS_BUCKET_NAME: S3 bucket name
 """
 
 import json
@@ -15,13 +17,17 @@ import os
 from typing import Any, Dict
 from datetime import datetime, timezone
 
-from shared.logger import get_logger
-from shared.dynamodb import update_book_status
-from shared.aws_clients import s3_client
+from shared.logger import get_logger, get_metrics, emit_metrics
+from shared.dynamodb import get_book_metadata, transition_book_status
 from shared.error_handler import api_response, build_error_response, ErrorCode
 
 logger = get_logger(__name__)
 
+INTENT_STATUS = {
+    "approve": "APPROVING",
+    "reject": "REJECTING",
+}
+
 
 def _get_env_or_error(name: str) -> str:
     """Get environment variable or raise error if not set."""
@@ -31,52 +37,7 @@ def _get_env_or_error(name: str) -> str:
     return value
 
 
-def _move_s3_object(
-    bucket: str,
-    source_key: str,
-    dest_key: str,
-) -> None:
-    """
-    Move S3 object from source to destination.
-
-    Args:
-        bucket: S3 bucket name
-        source_key: Source object key
-        dest_key: Destination object key
-    """
-    s3 = s3_client()
-
-    # Copy object
-    s3.copy_object(
-        Bucket=bucket,
-        CopySource={"Bucket": bucket, "Key": source_key},
-        Key=dest_key,
-    )
-
-    # Delete original
-    s3.delete_object(Bucket=bucket, Key=source_key)
-
-    logger.info(f"Moved S3 object from {source_key} to {dest_key}")
-
-
-def _extract_book_id_from_key(s3_key: str) -> str:
-    """
-    Extract book ID from S3 key.
-
-    Expected format: staging/{book_id}/{file_name}
-
-    Args:
-        s3_key: S3 object key
-
-    Returns:
-        Book ID
-    """
-    parts = s3_key.split("/")
-    if len(parts) >= 2:
-        return parts[1]
-    return None
-
-
+@emit_metrics("approveBook")
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda handler for POST /admin/books/{bookId}/approve or /admin/books/{bookId}/reject
@@ -86,7 +47,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         context: Lambda context
 
     Returns:
-        Response with approval result
+        202 response with the queued decision
     """
     try:
         # Extract book ID from path
@@ -112,13 +73,12 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             return api_response(status_code=400, body=error_body)
 
         logger.info(f"Admin {action} book {book_id}")
+        get_metrics().add_dimension("action", action)
 
         # Get environment variables
         table_name = _get_env_or_error("BOOKS_TABLE_NAME")
-        bucket_name = _get_env_or_error("UPLOADS_BUCKET_NAME")
 
         # Get book metadata
-        from shared.dynamodb import get_book_metadata
         book = get_book_metadata(table_name, book_id)
         
         if not book:
@@ -136,50 +96,43 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             )
             return api_response(status_code=400, body=error_body)
 
-        # Get file path from metadata
-        file_path = book.get("file_path")
-        if not file_path:
+        if not book.get("file_path"):
             error_body = build_error_response(
                 error_code=ErrorCode.INTERNAL_ERROR,
                 message="Book has no file_path in metadata",
             )
             return api_response(status_code=500, body=error_body)
 
-        # Determine new status and destination
-        if action == "approve":
-            new_status = "APPROVED"
-            # Move from staging/ to public/books/
-            dest_key = file_path.replace("staging/", "public/books/")
-            approved_at = datetime.now(timezone.utc).isoformat()
-            rejected_at = None
-        else:  # reject
-            new_status = "REJECTED"
-            # Move from staging/ to quarantine/
-            dest_key = file_path.replace("staging/", "quarantine/")
-            approved_at = None
-            rejected_at = datetime.now(timezone.utc).isoformat()
-
-        # Move file in S3
-        _move_s3_object(bucket_name, file_path, dest_key)
-
-        # Update DynamoDB
-        update_book_status(
-            table_name=table_name,
-            book_id=book_id,
-            status=new_status,
-            file_path=dest_key,
-            approvedAt=approved_at,
-            rejectedAt=rejected_at,
-            approvedBy=event.get("requestContext", {}).get("authorizer", {}).get("claims", {}).get("sub", "unknown"),
-            # Remove from pending index
-            GSI5PK=None,
-            GSI5SK=None,
+        admin_id = event.get("requestContext", {}).get("authorizer", {}).get("claims", {}).get("sub", "unknown")
+        decided_at = datetime.now(timezone.utc).isoformat()
+        decision_fields = (
+            {"approvedBy": admin_id} if action == "approve" else {"rejectedBy": admin_id}
+        )
+
+        # Record the intent; the conditional write makes double clicks and
+        # concurrent admins safe. approval_worker does the rest.
+        new_status = INTENT_STATUS[action]
+        updated = transition_book_status(
+            table_name,
+            book_id,
+            "PENDING",
+            new_status,
+            decisionRequestedAt=decided_at,
+            approvalError=None,
+            **decision_fields,
         )
+        if not updated:
+            error_body = build_error_response(
+                error_code=ErrorCode.INVALID_REQUEST,
+                message="Book is no longer PENDING",
+            )
+            return api_response(status_code=409, body=error_body)
 
-        logger.info(f"Book {book_id}: {action}ed successfully")
+        get_metrics().increment("DecisionsQueued")
+        logger.info(f"Book {book_id}: {action} queued ({new_status})")
 
         return api_response(
-            status_code=200,
+            status_code=202,
             body={
                 "bookId": book_id,
                 "action": action,
@@ -0,0 +1,149 @@
+"""
+Lambda entrypoint for the `create_upload_urls` function.
+
+Batch variant of `create_upload_url` for multi-file submissions: one
+POST /books/upload-urls call validates every file, writes all draft items
+with BatchWriteItem and presigns one upload URL per file.
+
+Request body:
+    {"files": [{"fileName": ..., "fileSize": ..., "title": ..., "author": ...,
+                "description": ...}, ...]}
+
+Files are signed as PUT URLs or presigned POST forms depending on
+"uploadMode" in the body (or UPLOAD_URL_MODE), as in create_upload_url.
+
+The batch is all-or-nothing: if any file fails validation nothing is written
+and the error message names the offending index.
+
+Environment variables expected:
+- BOOKS_TABLE_NAME: DynamoDB table name (e.g. OnlineLibrary)
+- UPLOADS_BUCKET_NAME: S3 bucket name for uploads
+- UPLOAD_URL_TTL_SECONDS: (optional) TTL for presigned URL, default 900
+- MAX_FILE_SIZE_BYTES: (optional) Max file size, default 50MB
+- ALLOWED_EXTENSIONS: (optional) Comma-separated extensions, default .pdf,.epub
+- UPLOAD_URL_MODE: (optional) Default upload mode, "put" or "post", default put
+- MAX_BATCH_UPLOAD_FILES: (optional) Max files per request, default 25
+"""
+
+import os
+import uuid
+from typing import Any, Dict, List
+
+from shared.error_handler import (
+    lambda_handler_wrapper,
+    api_response,
+    ApiError,
+    ErrorCode,
+)
+from shared.auth import extract_and_validate_user
+from shared.logger import get_logger, get_metrics, emit_metrics
+from shared.dynamodb import put_draft_book_items
+
+from create_upload_url.handler import (
+    CreateUploadPayload,
+    _build_s3_key,
+    _create_upload_target,
+    _get_env_or_error,
+    _get_upload_mode,
+    _parse_body,
+    _validate_and_build_payload,
+)
+
+logger = get_logger(__name__)
+
+
+def _validate_files(data: Dict[str, Any]) -> List[CreateUploadPayload]:
+    """Validate every file entry, prefixing errors with the entry index."""
+    max_files = int(os.getenv("MAX_BATCH_UPLOAD_FILES", "25"))
+    files = data.get("files")
+    if not isinstance(files, list) or not files:
+        raise ApiError(ErrorCode.INVALID_REQUEST, "files must be a non-empty list")
+    if len(files) > max_files:
+        raise ApiError(ErrorCode.INVALID_REQUEST, f"At most {max_files} files per request")
+
+    payloads = []
+    for index, entry in enumerate(files):
+        if not isinstance(entry, dict):
+            raise ApiError(ErrorCode.INVALID_REQUEST, f"files[{index}] must be an object")
+        try:
+            payloads.append(_validate_and_build_payload(entry))
+        except ApiError as err:
+            raise ApiError(err.error_code, f"files[{index}]: {err.message}", err.status_code)
+    return payloads
+
+
+@emit_metrics("createUploadUrls")
+@lambda_handler_wrapper
+def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    AWS Lambda handler for POST /books/upload-urls.
+
+    Expects an API Gateway HTTP API event with Cognito JWT authorizer.
+    """
+    # 1) Auth
+    user_id, user_email = extract_and_validate_user(event)
+
+    # 2) Parse + validate all files before writing anything
+    data = _parse_body(event)
+    payloads = _validate_files(data)
+    mode = _get_upload_mode(data)
+
+    # 3) Env config
+    table_name = _get_env_or_error("BOOKS_TABLE_NAME")
+    bucket_name = _get_env_or_error("UPLOADS_BUCKET_NAME")
+    expires_in = int(os.getenv("UPLOAD_URL_TTL_SECONDS", "900"))
+
+    # 4) Draft items, written in one batch
+    drafts = []
+    for payload in payloads:
+        book_id = str(uuid.uuid4())
+        drafts.append({
+            "book_id": book_id,
+            "file_name": payload.file_name,
+            "file_size": payload.file_size,
+            "title": payload.title,
+            "author": payload.author,
+            "description": payload.description,
+            "user_id": user_id,
+            "user_email": user_email,
+            "s3_key": _build_s3_key(book_id, payload.file_name),
+        })
+
+    with get_metrics().timer("DraftWriteTime"):
+        put_draft_book_items(table_name, drafts)
+
+    # 5) Presign (local signing, no network round trip per file)
+    with get_metrics().timer("SignTime"):
+        uploads = [
+            {
+                "bookId": draft["book_id"],
+                "fileName": draft["file_name"],
+                **_create_upload_target(
+                    bucket_name=bucket_name,
+                    object_key=draft["s3_key"],
+                    expires_in=expires_in,
+                    payload=payload,
+                    mode=mode,
+                ),
+            }
+            for draft, payload in zip(drafts, payloads)
+        ]
+    get_metrics().put_metric("BatchSize", len(uploads))
+
+    logger.info(
+        f"Upload URLs created for {len(uploads)} books",
+        extra={
+            "requestId": context.request_id if hasattr(context, "request_id") else "unknown",
+            "userId": user_id,
+            "action": "CREATE_UPLOAD_URLS",
+            "status": "SUCCESS",
+        },
+    )
+
+    return api_response(
+        200,
+        {
+            "uploads": uploads,
+            "expiresIn": expires_in,
+        },
+    )
@@ -1,10 +1,15 @@
 """
 Lambda entrypoint for the `create_upload_url` function.
 
-This function generates a pre-signed S3 PUT URL so that
-the frontend can upload a file directly to S3, and it
-creates a draft Book Metadata item in DynamoDB with
-status=UPLOADING and a TTL of 72 hours.
+This function generates a pre-signed S3 PUT URL (or a
+presigned POST form) so that the frontend can upload a file
+directly to S3, and it creates a draft Book Metadata item in
+DynamoDB with status=UPLOADING and a TTL of 72 hours.
+
+In POST mode the policy pins the object key, the Content-Type
+for the extension and a content-length-range equal to the
+validated fileSize, so S3 rejects oversized or mistyped
+bodies before they reach validate_mime_type.
 
 Environment variables expected:
 - BOOKS_TABLE_NAME: DynamoDB table name (e.g. OnlineLibrary)
@@ -12,6 +17,8 @@ Environment variables expected:
 - UPLOAD_URL_TTL_SECONDS: (optional) TTL for presigned URL, default 900
 - MAX_FILE_SIZE_BYTES: (optional) Max file size, default 50MB
 - ALLOWED_EXTENSIONS: (optional) Comma-separated extensions, default .pdf,.epub
+- UPLOAD_URL_MODE: (optional) Default upload mode, "put" or "post", default put.
+  Clients can override per request with "uploadMode" in the body.
 """
 
 import base64
@@ -38,13 +45,21 @@ from shared.validators import (
     validate_file_size,
 )
 from shared.auth import extract_and_validate_user
-from shared.logger import get_logger
+from shared.logger import get_logger, get_metrics, emit_metrics
 from shared.dynamodb import put_draft_book_item
 from shared.aws_clients import s3_client
 
 logger = get_logger(__name__)
 
 
+UPLOAD_MODES = ("put", "post")
+
+CONTENT_TYPES = {
+    ".pdf": "application/pdf",
+    ".epub": "application/epub+zip",
+}
+
+
 @dataclass
 class CreateUploadPayload:
     file_name: str
@@ -112,6 +127,71 @@ def _create_presigned_put_url(bucket_name, object_key, expires_in):
         ExpiresIn=expires_in,
     )
 
+
+def _content_type_for(file_name: str) -> str:
+    return CONTENT_TYPES.get(os.path.splitext(file_name)[1].lower(), "application/octet-stream")
+
+
+def _create_presigned_post(bucket_name, object_key, expires_in, file_size, content_type):
+    """Presigned POST whose policy enforces the key, Content-Type and exact size."""
+    return s3_client().generate_presigned_post(
+        Bucket=bucket_name,
+        Key=object_key,
+        Fields={"Content-Type": content_type},
+        Conditions=[
+            {"Content-Type": content_type},
+            ["content-length-range", file_size, file_size],
+        ],
+        ExpiresIn=expires_in,
+    )
+
+
+def _get_upload_mode(data: Dict[str, Any]) -> str:
+    """Upload mode from the request body, falling back to UPLOAD_URL_MODE."""
+    mode = data.get("uploadMode") or os.getenv("UPLOAD_URL_MODE", "put")
+    mode = str(mode).lower()
+    if mode not in UPLOAD_MODES:
+        raise ApiError(
+            error_code=ErrorCode.INVALID_REQUEST,
+            message=f"uploadMode must be one of: {', '.join(UPLOAD_MODES)}",
+        )
+    return mode
+
+
+def _create_upload_target(
+    bucket_name: str,
+    object_key: str,
+    expires_in: int,
+    payload: CreateUploadPayload,
+    mode: str,
+) -> Dict[str, Any]:
+    """
+    Build the upload part of the response for the requested mode.
+
+    PUT:  {"uploadUrl", "uploadMethod": "PUT"}
+    POST: {"uploadUrl", "uploadMethod": "POST", "uploadFields"} - the client
+          sends uploadFields followed by the file as multipart/form-data
+    """
+    if mode == "post":
+        post = _create_presigned_post(
+            bucket_name=bucket_name,
+            object_key=object_key,
+            expires_in=expires_in,
+            file_size=payload.file_size,
+            content_type=_content_type_for(payload.file_name),
+        )
+        return {"uploadUrl": post["url"], "uploadMethod": "POST", "uploadFields": post["fields"]}
+
+    return {
+        "uploadUrl": _create_presigned_put_url(
+            bucket_name=bucket_name,
+            object_key=object_key,
+            expires_in=expires_in,
+        ),
+        "uploadMethod": "PUT",
+    }
+
+
 def _get_env_or_error(name: str) -> str:
     """Get environment variable or raise error if not set."""
     value = os.getenv(name)
@@ -123,6 +203,7 @@ def _get_env_or_error(name: str) -> str:
     return value
 
 
+@emit_metrics("createUploadUrl")
 @lambda_handler_wrapper
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -138,6 +219,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
     # 3) Validate payload
     payload = _validate_and_build_payload(data)
+    mode = _get_upload_mode(data)
     logger.info(
         f"Parsed upload payload: title={payload.title!r}, author={payload.author!r}, "
         f"description_len={len(payload.description or '')}, "
@@ -154,25 +236,29 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     book_id = str(uuid.uuid4())
     s3_key = _build_s3_key(book_id, payload.file_name)
 
-    put_draft_book_item(
-        table_name=table_name,
-        book_id=book_id,
-        file_name=payload.file_name,
-        file_size=payload.file_size,
-        title=payload.title,
-        author=payload.author,
-        description=payload.description,
-        user_id=user_id,
-        user_email=user_email,
-        s3_key=s3_key,
-    )
+    with get_metrics().timer("DraftWriteTime"):
+        put_draft_book_item(
+            table_name=table_name,
+            book_id=book_id,
+            file_name=payload.file_name,
+            file_size=payload.file_size,
+            title=payload.title,
+            author=payload.author,
+            description=payload.description,
+            user_id=user_id,
+            user_email=user_email,
+            s3_key=s3_key,
+        )
 
-    # 6) Generate presigned URL
-    upload_url = _create_presigned_put_url(
-        bucket_name=bucket_name,
-        object_key=s3_key,
-        expires_in=expires_in,
-    )
+    # 6) Generate presigned URL / POST form
+    with get_metrics().timer("SignTime"):
+        upload_target = _create_upload_target(
+            bucket_name=bucket_name,
+            object_key=s3_key,
+            expires_in=expires_in,
+            payload=payload,
+            mode=mode,
+        )
 
     # 7) Log action
     logger.info(
@@ -189,7 +275,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     return api_response(
         200,
         {
-            "uploadUrl": upload_url,
+            **upload_target,
             "bookId": book_id,
             "expiresIn": expires_in,
         },
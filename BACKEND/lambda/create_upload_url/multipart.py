@@ -0,0 +1,381 @@
+"""
+Lambda entrypoint for the `multipart_upload` function.
+
+Multipart variant of `create_upload_url` for large books. The client splits
+the file into parts, uploads them concurrently with presigned `upload_part`
+URLs and can resume by re-requesting URLs for the parts that failed.
+
+Routes (dispatched on rawPath / method):
+- POST   /books/multipart-upload                    initiate, returns first batch of part URLs
+- POST   /books/{bookId}/multipart-upload/parts     presign a batch of part URLs
+- POST   /books/{bookId}/multipart-upload/complete  complete the upload (aborted if the
+                                                   uploaded parts add up to more than fileSize)
+- DELETE /books/{bookId}/multipart-upload           abort the upload
+
+Environment variables expected:
+- BOOKS_TABLE_NAME: DynamoDB table name (e.g. OnlineLibrary)
+- UPLOADS_BUCKET_NAME: S3 bucket name for uploads
+- UPLOAD_URL_TTL_SECONDS: (optional) TTL for presigned part URLs, default 900
+- MAX_FILE_SIZE_BYTES: (optional) Max file size, default 50MB
+- MULTIPART_PART_SIZE_BYTES: (optional) Part size, default 8MB (S3 minimum 5MB)
+- ALLOWED_EXTENSIONS: (optional) Comma-separated extensions, default .pdf,.epub
+"""
+
+import math
+import os
+import uuid
+from typing import Any, Dict, List
+
+from botocore.exceptions import ClientError
+
+from shared.error_handler import (
+    lambda_handler_wrapper,
+    api_response,
+    ApiError,
+    ErrorCode,
+)
+from shared.auth import extract_and_validate_user
+from shared.logger import get_logger, get_metrics, emit_metrics
+from shared.dynamodb import (
+    get_book_item,
+    get_dynamodb_table,
+    put_draft_book_item,
+    update_book_status,
+)
+from shared.aws_clients import s3_client
+
+from create_upload_url.handler import (
+    _build_s3_key,
+    _get_env_or_error,
+    _parse_body,
+    _validate_and_build_payload,
+)
+
+logger = get_logger(__name__)
+
+# S3 multipart limits
+MIN_PART_SIZE_BYTES = 5 * 1024 * 1024
+MAX_PART_COUNT = 10000
+
+# Upper bound of part URLs signed per request
+MAX_PARTS_PER_REQUEST = 100
+
+
+def _get_part_size(file_size: int) -> int:
+    """Configured part size, grown if needed to stay within MAX_PART_COUNT parts."""
+    part_size = int(os.getenv("MULTIPART_PART_SIZE_BYTES", str(8 * 1024 * 1024)))
+    part_size = max(part_size, MIN_PART_SIZE_BYTES)
+    return max(part_size, math.ceil(file_size / MAX_PART_COUNT))
+
+
+def _get_part_count(file_size: int) -> int:
+    return max(1, math.ceil(file_size / _get_part_size(file_size)))
+
+
+def _presign_parts(
+    bucket_name: str,
+    object_key: str,
+    upload_id: str,
+    part_numbers: List[int],
+    expires_in: int,
+) -> List[Dict[str, Any]]:
+    s3 = s3_client()
+    return [
+        {
+            "partNumber": part_number,
+            "url": s3.generate_presigned_url(
+                ClientMethod="upload_part",
+                Params={
+                    "Bucket": bucket_name,
+                    "Key": object_key,
+                    "UploadId": upload_id,
+                    "PartNumber": part_number,
+                },
+                ExpiresIn=expires_in,
+            ),
+        }
+        for part_number in part_numbers
+    ]
+
+
+def _get_upload_for_user(table_name: str, book_id: str, user_id: str) -> Dict[str, Any]:
+    """Load the draft item and check it is an in-progress multipart upload owned by the caller."""
+    book = get_book_item(table_name, book_id)
+    if not book:
+        raise ApiError(ErrorCode.NOT_FOUND, f"Book {book_id} not found")
+    if book.get("uploaderId") != user_id:
+        raise ApiError(ErrorCode.FORBIDDEN, "Not allowed to modify this upload")
+    if book.get("status") != "UPLOADING" or not book.get("uploadId"):
+        raise ApiError(ErrorCode.INVALID_REQUEST, "Book has no multipart upload in progress")
+    return book
+
+
+def _validate_part_numbers(raw: Any, part_count: int) -> List[int]:
+    if not isinstance(raw, list) or not raw:
+        raise ApiError(ErrorCode.INVALID_REQUEST, "partNumbers must be a non-empty list")
+    if len(raw) > MAX_PARTS_PER_REQUEST:
+        raise ApiError(
+            ErrorCode.INVALID_REQUEST,
+            f"At most {MAX_PARTS_PER_REQUEST} parts can be signed per request",
+        )
+    part_numbers = []
+    for value in raw:
+        if isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= part_count:
+            raise ApiError(
+                ErrorCode.INVALID_REQUEST,
+                f"partNumbers must be integers between 1 and {part_count}",
+            )
+        part_numbers.append(value)
+    return sorted(set(part_numbers))
+
+
+def _validate_completed_parts(raw: Any, part_count: int) -> List[Dict[str, Any]]:
+    if not isinstance(raw, list) or not raw:
+        raise ApiError(ErrorCode.INVALID_REQUEST, "parts must be a non-empty list")
+    parts = {}
+    for part in raw:
+        if not isinstance(part, dict):
+            raise ApiError(ErrorCode.INVALID_REQUEST, "Each part must be an object")
+        part_number = part.get("partNumber")
+        etag = part.get("etag")
+        if isinstance(part_number, bool) or not isinstance(part_number, int) or not 1 <= part_number <= part_count:
+            raise ApiError(
+                ErrorCode.INVALID_REQUEST,
+                f"partNumber must be an integer between 1 and {part_count}",
+            )
+        if not isinstance(etag, str) or not etag:
+            raise ApiError(ErrorCode.INVALID_REQUEST, "Each part requires an etag")
+        parts[part_number] = etag
+    return [{"PartNumber": n, "ETag": parts[n]} for n in sorted(parts)]
+
+
+def _list_uploaded_parts(bucket_name: str, object_key: str, upload_id: str) -> List[Dict[str, Any]]:
+    """List parts already stored by S3 (number, ETag, size), following pagination."""
+    s3 = s3_client()
+    parts: List[Dict[str, Any]] = []
+    kwargs: Dict[str, Any] = {"Bucket": bucket_name, "Key": object_key, "UploadId": upload_id}
+    while True:
+        response = s3.list_parts(**kwargs)
+        parts.extend(
+            {"PartNumber": p["PartNumber"], "ETag": p["ETag"], "Size": p["Size"]}
+            for p in response.get("Parts", [])
+        )
+        if not response.get("IsTruncated"):
+            return parts
+        kwargs["PartNumberMarker"] = response["NextPartNumberMarker"]
+
+
+def _initiate(event: Dict[str, Any], user_id: str, user_email: str) -> Dict[str, Any]:
+    payload = _validate_and_build_payload(_parse_body(event))
+
+    table_name = _get_env_or_error("BOOKS_TABLE_NAME")
+    bucket_name = _get_env_or_error("UPLOADS_BUCKET_NAME")
+    expires_in = int(os.getenv("UPLOAD_URL_TTL_SECONDS", "900"))
+
+    book_id = str(uuid.uuid4())
+    s3_key = _build_s3_key(book_id, payload.file_name)
+
+    upload_id = s3_client().create_multipart_upload(Bucket=bucket_name, Key=s3_key)["UploadId"]
+
+    with get_metrics().timer("DraftWriteTime"):
+        put_draft_book_item(
+            table_name=table_name,
+            book_id=book_id,
+            file_name=payload.file_name,
+            file_size=payload.file_size,
+            title=payload.title,
+            author=payload.author,
+            description=payload.description,
+            user_id=user_id,
+            user_email=user_email,
+            s3_key=s3_key,
+            upload_id=upload_id,
+        )
+
+    part_size = _get_part_size(payload.file_size)
+    part_count = _get_part_count(payload.file_size)
+    first_batch = list(range(1, min(part_count, MAX_PARTS_PER_REQUEST) + 1))
+
+    with get_metrics().timer("SignTime"):
+        parts = _presign_parts(bucket_name, s3_key, upload_id, first_batch, expires_in)
+
+    logger.info(
+        f"Multipart upload initiated for book {book_id}",
+        extra={
+            "userId": user_id,
+            "action": "INITIATE_MULTIPART_UPLOAD",
+            "partCount": part_count,
+        },
+    )
+
+    return api_response(
+        200,
+        {
+            "bookId": book_id,
+            "uploadId": upload_id,
+            "partSize": part_size,
+            "partCount": part_count,
+            "parts": parts,
+            "expiresIn": expires_in,
+        },
+    )
+
+
+def _sign_parts(event: Dict[str, Any], book_id: str, user_id: str) -> Dict[str, Any]:
+    data = _parse_body(event)
+
+    table_name = _get_env_or_error("BOOKS_TABLE_NAME")
+    bucket_name = _get_env_or_error("UPLOADS_BUCKET_NAME")
+    expires_in = int(os.getenv("UPLOAD_URL_TTL_SECONDS", "900"))
+
+    book = _get_upload_for_user(table_name, book_id, user_id)
+    part_count = _get_part_count(int(book["fileSize"]))
+    part_numbers = _validate_part_numbers(data.get("partNumbers"), part_count)
+
+    with get_metrics().timer("SignTime"):
+        parts = _presign_parts(bucket_name, book["s3Key"], book["uploadId"], part_numbers, expires_in)
+
+    return api_response(
+        200,
+        {
+            "bookId": book_id,
+            "parts": parts,
+            "expiresIn": expires_in,
+        },
+    )
+
+
+def _complete(event: Dict[str, Any], book_id: str, user_id: str) -> Dict[str, Any]:
+    data = _parse_body(event)
+
+    table_name = _get_env_or_error("BOOKS_TABLE_NAME")
+    bucket_name = _get_env_or_error("UPLOADS_BUCKET_NAME")
+
+    book = _get_upload_for_user(table_name, book_id, user_id)
+    s3_key = book["s3Key"]
+    upload_id = book["uploadId"]
+    file_size = int(book["fileSize"])
+
+    # Part URLs cannot cap the body size, so the stored parts are measured
+    uploaded = {part["PartNumber"]: part for part in _list_uploaded_parts(bucket_name, s3_key, upload_id)}
+
+    # Clients normally send the ETags they collected; fall back to asking S3
+    if data.get("parts") is not None:
+        parts = _validate_completed_parts(data["parts"], _get_part_count(file_size))
+    else:
+        parts = [{"PartNumber": n, "ETag": part["ETag"]} for n, part in sorted(uploaded.items())]
+        if not parts:
+            raise ApiError(ErrorCode.INVALID_REQUEST, "No parts have been uploaded")
+
+    # fileSize was checked against MAX_FILE_SIZE_BYTES when the upload started
+    total_size = sum(uploaded[part["PartNumber"]]["Size"] for part in parts if part["PartNumber"] in uploaded)
+    if total_size > file_size:
+        _abort_upload(table_name, bucket_name, book)
+        logger.warning(
+            f"Multipart upload for book {book_id} aborted: {total_size} bytes uploaded, {file_size} declared",
+            extra={"userId": user_id, "action": "ABORT_MULTIPART_UPLOAD"},
+        )
+        raise ApiError(
+            ErrorCode.INVALID_REQUEST,
+            f"Uploaded parts total {total_size} bytes, more than the declared fileSize {file_size}",
+        )
+
+    try:
+        s3_client().complete_multipart_upload(
+            Bucket=bucket_name,
+            Key=s3_key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+    except ClientError as e:
+        code = e.response.get("Error", {}).get("Code")
+        if code in ("InvalidPart", "InvalidPartOrder", "EntityTooSmall", "NoSuchUpload"):
+            raise ApiError(ErrorCode.INVALID_REQUEST, f"Cannot complete upload: {code}")
+        raise
+
+    # validate_mime_type takes over from the S3 ObjectCreated event; only
+    # clear the upload id here so the status transition stays with it
+    get_dynamodb_table(table_name).update_item(
+        Key={"PK": f"BOOK#{book_id}", "SK": "METADATA"},
+        UpdateExpression="REMOVE uploadId",
+    )
+
+    logger.info(
+        f"Multipart upload completed for book {book_id}",
+        extra={
+            "userId": user_id,
+            "action": "COMPLETE_MULTIPART_UPLOAD",
+            "partCount": len(parts),
+        },
+    )
+
+    return api_response(200, {"bookId": book_id, "status": "UPLOADED"})
+
+
+def _abort_upload(table_name: str, bucket_name: str, book: Dict[str, Any]) -> None:
+    """Abort the S3 multipart upload (dropping its parts) and mark the draft ABORTED."""
+    try:
+        s3_client().abort_multipart_upload(
+            Bucket=bucket_name,
+            Key=book["s3Key"],
+            UploadId=book["uploadId"],
+        )
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") != "NoSuchUpload":
+            raise
+
+    update_book_status(
+        table_name=table_name,
+        book_id=book["bookId"],
+        status="ABORTED",
+        uploadId=None,
+    )
+
+
+def _abort(book_id: str, user_id: str) -> Dict[str, Any]:
+    table_name = _get_env_or_error("BOOKS_TABLE_NAME")
+    bucket_name = _get_env_or_error("UPLOADS_BUCKET_NAME")
+
+    book = _get_upload_for_user(table_name, book_id, user_id)
+    _abort_upload(table_name, bucket_name, book)
+
+    logger.info(
+        f"Multipart upload aborted for book {book_id}",
+        extra={"userId": user_id, "action": "ABORT_MULTIPART_UPLOAD"},
+    )
+
+    return api_response(200, {"bookId": book_id, "status": "ABORTED"})
+
+
+@emit_metrics("multipartUpload")
+@lambda_handler_wrapper
+def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    AWS Lambda handler for the multipart upload routes.
+
+    Expects an API Gateway HTTP API event with Cognito JWT authorizer.
+    """
+    user_id, user_email = extract_and_validate_user(event)
+
+    path = event.get("rawPath", "")
+    method = event.get("requestContext", {}).get("http", {}).get("method", "POST").upper()
+    book_id = (event.get("pathParameters") or {}).get("bookId")
+
+    if path.rstrip("/") == "/books/multipart-upload" and method == "POST":
+        get_metrics().add_dimension("action", "initiate")
+        return _initiate(event, user_id, user_email)
+
+    if not book_id:
+        raise ApiError(ErrorCode.INVALID_REQUEST, "Missing bookId in path")
+
+    if method == "DELETE":
+        get_metrics().add_dimension("action", "abort")
+        return _abort(book_id, user_id)
+    if path.endswith("/parts"):
+        get_metrics().add_dimension("action", "parts")
+        return _sign_parts(event, book_id, user_id)
+    if path.endswith("/complete"):
+        get_metrics().add_dimension("action", "complete")
+        return _complete(event, book_id, user_id)
+
+    raise ApiError(ErrorCode.NOT_FOUND, f"Unsupported route: {method} {path}")
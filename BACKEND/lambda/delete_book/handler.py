@@ -3,16 +3,26 @@ delete_book Lambda - User deletes/unpublishes their book.
 
 Endpoint: DELETE /books/{bookId}
 - User must be owner or in Admins group.
-- Removes metadata from DynamoDB and deletes associated S3 objects.
+- Removes metadata from DynamoDB and deletes associated S3 objects (file and
+  cover); the file stays while other (deduplicated) books still reference
+  the same content.
+- The pending index, status counters and catalog snapshot follow from the
+  metadata delete through stream_processor.
+
+Runs on shared.async_runtime: the S3 deletes are independent and
+best-effort, so they are issued together before the metadata delete. The
+metadata read, dedup release and metadata delete are blocking Table calls
+and run on the runtime's thread pool.
 """
 
-import json
+import asyncio
 import os
 from typing import Any, Dict, Set
 
 from shared.auth import extract_and_validate_user, extract_jwt_claims, is_admin
 from shared.dynamodb import get_book_metadata, get_dynamodb_table
-from shared.aws_clients import s3_client
+from shared.async_runtime import async_handler, aws_call, run_in_thread
+from shared.dedup import release_content_hash
 from shared.error_handler import (
     api_response,
     build_error_response,
@@ -48,7 +58,15 @@ def _collect_keys(book: Dict[str, Any]) -> Set[str]:
     return {k for k in keys if k}
 
 
-def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+async def _delete_object(bucket: str, key: str) -> None:
+    try:
+        await aws_call("s3", "delete_object", Bucket=bucket, Key=key)
+    except Exception:
+        pass
+
+
+@async_handler
+async def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     try:
         # Auth
         user_id, _ = extract_and_validate_user(event)
@@ -65,7 +83,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         bucket_name = _get_env_or_error("UPLOADS_BUCKET_NAME")
 
         # Fetch metadata
-        book = get_book_metadata(table_name, book_id)
+        book = await run_in_thread(get_book_metadata, table_name, book_id)
         if not book:
             err = build_error_response(ErrorCode.NOT_FOUND, f"Book {book_id} not found")
             return api_response(404, err)
@@ -76,17 +94,26 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             err = build_error_response(ErrorCode.FORBIDDEN, "Not allowed to delete this book")
             return api_response(403, err)
 
-        # Delete S3 objects (best-effort)
-        s3 = s3_client()
-        for key in _collect_keys(book):
-            try:
-                s3.delete_object(Bucket=bucket_name, Key=key)
-            except Exception:
-                pass
+        # Content shared with duplicate uploads stays until the last reference goes
+        shared_refs = 0
+        if book.get("contentHash"):
+            shared_refs = await run_in_thread(
+                release_content_hash, table_name, book["contentHash"], book_id=book_id
+            )
+
+        # Delete S3 objects (best-effort, all at once)
+        deletes = []
+        if shared_refs == 0:
+            deletes.extend(_delete_object(bucket_name, key) for key in _collect_keys(book))
+
+        # The cover thumbnail is per book even when the content is shared
+        if book.get("coverPath"):
+            deletes.append(_delete_object(bucket_name, book["coverPath"]))
+        await asyncio.gather(*deletes)
 
         # Delete metadata
         table = get_dynamodb_table(table_name)
-        table.delete_item(Key={"PK": f"BOOK#{book_id}", "SK": "METADATA"})
+        await run_in_thread(table.delete_item, Key={"PK": f"BOOK#{book_id}", "SK": "METADATA"})
 
         logger.info(f"Book {book_id} deleted by {user_id} (admin={admin})")
 
@@ -1,10 +1,11 @@
 import json
 import os
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
 from shared.auth import extract_and_validate_user
 from shared.dynamodb import query_by_gsi
+from shared.derived import get_status_counts
 from shared.error_handler import (
     lambda_handler_wrapper,
     api_response,
@@ -88,26 +89,40 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
     table_name = _get_env_or_error("BOOKS_TABLE_NAME")
 
-    # Query by uploader via GSI6
-    items = query_by_gsi(
-        table_name=table_name,
-        gsi_name="GSI6",
-        pk_value=f"UPLOADER#{user_id}",
-        sk_prefix="BOOK#",
-    )
-
-    # Only metadata items
-    metadata_items: List[Dict[str, Any]] = [
-        item for item in items if item.get("SK") == "METADATA"
-    ]
+    # Per-status totals for the page tabs, from the uploader's counters item;
+    # their sum is the pagination total
+    status_counts = get_status_counts(table_name, uploader_id=user_id)
+
+    if status_counts is not None:
+        # GSI6SK starts with the upload time: read only up to the requested page
+        items = query_by_gsi(
+            table_name=table_name,
+            gsi_name="GSI6",
+            pk_value=f"UPLOADER#{user_id}",
+            sk_prefix="BOOK#",
+            newest_first=True,
+            max_items=offset + limit,
+        )
+        metadata_items = [item for item in items if item.get("SK") == "METADATA"]
+        total = max(sum(status_counts.values()), len(metadata_items))
+    else:
+        # Counters not written yet: query everything and count
+        items = query_by_gsi(
+            table_name=table_name,
+            gsi_name="GSI6",
+            pk_value=f"UPLOADER#{user_id}",
+            sk_prefix="BOOK#",
+        )
+        metadata_items = [item for item in items if item.get("SK") == "METADATA"]
+        total = len(metadata_items)
 
-    # Sort by uploadedAt (or createdAt) desc
+    # Sort by uploadedAt (or createdAt) desc; also orders items still keyed
+    # "BOOK#<bookId>" from before GSI6SK carried the upload time
     metadata_items.sort(
         key=lambda item: _parse_timestamp(item.get("uploadedAt") or item.get("createdAt")),
         reverse=True,
     )
 
-    total = len(metadata_items)
     page = metadata_items[offset : offset + limit]
     books = [_format_book(item) for item in page]
 
@@ -132,5 +147,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 "total": total,
                 "hasMore": offset + limit < total,
             },
+            "statusCounts": status_counts,
         },
+        event=event,
     )
@@ -4,6 +4,11 @@ get_read_url Lambda - Generate CloudFront signed URL for reading books
 Triggered by GET /books/{bookId}/read-url
 Returns a signed CloudFront URL that expires in 1 hour.
 
+With ?mode=range, PDFs get the same signed URL plus the PDF.js options for
+reading it with HTTP Range requests (see shared.pdf_range): the object
+length and linearization recorded at approval, so the reader fetches only
+the byte ranges of the pages it shows. Other books fall back to mode=full.
+
 Flow:
 1. User authenticated via JWT
 2. Check if book exists and is APPROVED
@@ -27,9 +32,10 @@ from urllib.parse import urlencode, quote
 
 from botocore.signers import CloudFrontSigner
 
-from shared.logger import get_logger
+from shared.logger import get_logger, get_metrics, emit_metrics
 from shared.dynamodb import get_book_metadata
 from shared.error_handler import api_response, build_error_response, ErrorCode
+from shared.pdf_range import pdfjs_range_options
 
 logger = get_logger(__name__)
 
@@ -67,17 +73,9 @@ def _build_resource_url(
     return base_url
 
 
-def _generate_signed_url(
-    cloudfront_domain: str,
-    key_pair_id: str,
-    private_key: str,
-    file_path: str,
-    response_content_disposition: Optional[str] = None,
-    response_content_type: Optional[str] = None,
-    expiry_hours: int = 1,
-) -> str:
+def _build_signer(key_pair_id: str, private_key: str) -> CloudFrontSigner:
     """
-    Generate CloudFront signed URL using RSA-SHA1 via CloudFrontSigner.
+    Build a CloudFrontSigner using RSA-SHA1.
     """
     try:
         from cryptography.hazmat.primitives import hashes, serialization
@@ -99,7 +97,22 @@ def _generate_signed_url(
             hashes.SHA1(),
         )
 
-    signer = CloudFrontSigner(key_pair_id, rsa_signer)
+    return CloudFrontSigner(key_pair_id, rsa_signer)
+
+
+def _generate_signed_url(
+    cloudfront_domain: str,
+    key_pair_id: str,
+    private_key: str,
+    file_path: str,
+    response_content_disposition: Optional[str] = None,
+    response_content_type: Optional[str] = None,
+    expiry_hours: int = 1,
+) -> str:
+    """
+    Generate CloudFront signed URL using RSA-SHA1 via CloudFrontSigner.
+    """
+    signer = _build_signer(key_pair_id, private_key)
 
     resource_url = _build_resource_url(
         cloudfront_domain=cloudfront_domain,
@@ -116,16 +129,17 @@ def _generate_signed_url(
     )
 
 
-def _get_book_file_path(book_id: str, table_name: str) -> Optional[str]:
+def _get_readable_book(book_id: str, table_name: str) -> Optional[Dict[str, Any]]:
     """
-    Get book file path from DynamoDB.
+    Get the metadata of an approved book from DynamoDB (one read per request).
 
     Args:
         book_id: Book ID
         table_name: DynamoDB table name
 
     Returns:
-        File path (e.g., public/books/book-123/book.pdf) or None if not found
+        Book item with a file_path (e.g., public/books/book-123/book.pdf), or
+        None if not found or not approved
     """
     try:
         item = get_book_metadata(table_name, book_id)
@@ -143,12 +157,13 @@ def _get_book_file_path(book_id: str, table_name: str) -> Optional[str]:
             logger.warning(f"Book {book_id} has no file_path in metadata")
             return None
 
-        return file_path
+        return item
     except Exception as e:
         logger.error(f"Error getting book metadata: {str(e)}")
         return None
 
 
+@emit_metrics("getReadUrl")
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda handler for GET /books/{bookId}/read-url
@@ -189,15 +204,28 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             query_params.get("responseContentType")
             or query_params.get("response-content-type")
         )
+        mode = (query_params.get("mode") or "full").lower()
 
         # Check if book exists and is approved
-        file_path = _get_book_file_path(book_id, table_name)
-        if not file_path:
+        book = _get_readable_book(book_id, table_name)
+        if not book:
             error_body = build_error_response(
                 error_code=ErrorCode.NOT_FOUND,
                 message=f"Book {book_id} not found or not approved",
             )
             return api_response(status_code=404, body=error_body)
+        file_path = book["file_path"]
+        mime_type = book.get("mime_type") or book.get("mimeType")
+        if not mime_type and file_path.lower().endswith(".pdf"):
+            mime_type = "application/pdf"
+
+        private_key = None
+        if key_pair_id and private_key_b64:
+            try:
+                private_key = base64.b64decode(private_key_b64).decode()
+            except Exception:
+                logger.warning("CloudFront private key not base64-encoded, using raw value")
+                private_key = private_key_b64
 
         # Default to inline viewing to avoid forced downloads
         if not response_content_disposition:
@@ -206,39 +234,21 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
         # Default content-type from metadata (if available) or PDF
         if not response_content_type:
-            # Try from metadata first
-            try:
-                from shared.dynamodb import get_book_metadata
-
-                book = get_book_metadata(table_name, book_id)
-                response_content_type = (
-                    book.get("mime_type")
-                    or book.get("mimeType")
-                )
-            except Exception:
-                response_content_type = None
-
-        if not response_content_type and file_path.lower().endswith(".pdf"):
-            response_content_type = "application/pdf"
+            response_content_type = mime_type
 
         # Generate signed URL
-        if key_pair_id and private_key_b64:
+        if private_key:
             # Use CloudFront signed URL if credentials provided
-            try:
-                private_key = base64.b64decode(private_key_b64).decode()
-            except Exception:
-                logger.warning("CloudFront private key not base64-encoded, using raw value")
-                private_key = private_key_b64
-
-            signed_url = _generate_signed_url(
-                cloudfront_domain=cloudfront_domain,
-                key_pair_id=key_pair_id,
-                private_key=private_key,
-                file_path=file_path,
-                response_content_disposition=response_content_disposition,
-                response_content_type=response_content_type,
-                expiry_hours=1,
-            )
+            with get_metrics().timer("SignTime"):
+                signed_url = _generate_signed_url(
+                    cloudfront_domain=cloudfront_domain,
+                    key_pair_id=key_pair_id,
+                    private_key=private_key,
+                    file_path=file_path,
+                    response_content_disposition=response_content_disposition,
+                    response_content_type=response_content_type,
+                    expiry_hours=1,
+                )
         else:
             # Fallback: Return direct CloudFront URL (no signing)
             logger.warning("CloudFront credentials not provided, returning unsigned URL")
@@ -251,13 +261,28 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
         logger.info(f"Generated signed URL for book {book_id}")
 
+        body: Dict[str, Any] = {
+            "bookId": book_id,
+            "mode": "full",
+            "url": signed_url,
+            "expiresIn": 3600,  # 1 hour in seconds
+        }
+
+        # Range reading: same URL, plus what PDF.js needs to fetch only the
+        # byte ranges of the pages it renders
+        if mode == "range" and mime_type == "application/pdf":
+            content_length = book.get("contentLength")
+            body.update({
+                "mode": "range",
+                "length": int(content_length) if content_length else None,
+                "linearized": bool(book.get("linearized")),
+                "pageCount": int(book["pageCount"]) if book.get("pageCount") else None,
+                "pdfjs": pdfjs_range_options(content_length),
+            })
+
         return {
             "statusCode": 200,
-            "body": json.dumps({
-                "bookId": book_id,
-                "url": signed_url,
-                "expiresIn": 3600,  # 1 hour in seconds
-            }),
+            "body": json.dumps(body),
         }
 
     except ValueError as e:
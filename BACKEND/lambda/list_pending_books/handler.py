@@ -8,22 +8,51 @@ Query parameters:
 - limit: Max results (default: 20, max: 100)
 - offset: Pagination offset (default: 0)
 
+pagination.total comes from the status counters maintained by
+stream_processor, so only the first offset + limit index entries are read.
+
+The pending index (GSI5) is write-sharded (see shared.derived): every shard
+and the legacy unsharded partition are queried concurrently, newest first,
+and k-way merged by GSI5SK. The handler runs on shared.async_runtime: the
+index queries (sized for offset + limit), the counters read and the
+migration marker read are issued together, so a listing costs about one
+query round trip.
+
+Until scripts/migrate_pending_gsi5.py has written its migration marker,
+pending books without GSI5 keys may exist, and a parallel segmented scan
+(PENDING_SCAN_SEGMENTS) looks for them. Once the marker is seen it is cached
+for the container, and the scan is skipped. The legacy partition is also
+skipped while the marker's shard count matches.
+
+count_handler serves GET /admin/books/pending/count for the admin dashboard
+badge: one GetItem on the counters, no listing at all.
+
 Environment variables:
 - BOOKS_TABLE_NAME: DynamoDB table name
+- PENDING_GSI5_SHARDS: (optional) pending index shard count, must match
+  stream_processor (default: 8)
+- PENDING_SCAN_SEGMENTS: (optional) parallel segments of the legacy scan
+  (default: 4)
 """
 
-import json
+import asyncio
+import heapq
 import os
-from typing import Any, Dict, List, Tuple
-
-from boto3.dynamodb.conditions import Key, Attr
+from itertools import islice
+from typing import Any, Dict, List, Optional
 
-from shared.logger import get_logger
-from shared.dynamodb import get_dynamodb_table
+from shared.async_runtime import async_handler, aws_call, deserialize_item, run, run_in_thread
+from shared.logger import get_logger, get_metrics, emit_metrics
+from shared.derived import PENDING_SHARDS, get_pending_migration, get_status_counts, pending_partition_keys
 from shared.error_handler import api_response, build_error_response, ErrorCode
 
 logger = get_logger(__name__)
 
+PENDING_SCAN_SEGMENTS = max(1, int(os.getenv("PENDING_SCAN_SEGMENTS", "4")))
+
+# Warm-container migration markers by table; a written marker never goes away
+_migrations: Dict[str, Dict[str, Any]] = {}
+
 
 def _get_env_or_error(name: str) -> str:
     """Get environment variable or raise error if not set."""
@@ -33,7 +62,115 @@ def _get_env_or_error(name: str) -> str:
     return value
 
 
-def _list_pending_books(
+# Low-level (aws_call) expressions; values are in DynamoDB wire format
+_STATUS_NAMES = {"#status": "status"}
+_PENDING_VALUE = {"S": "PENDING"}
+_PENDING_FILTER = "attribute_exists(#status) AND #status = :status"
+_MISSING_GSI5_FILTER = "#status = :status AND (attribute_not_exists(GSI5PK) OR attribute_not_exists(GSI5SK))"
+
+
+async def _query_pending_partition(
+    table_name: str,
+    partition_key: str,
+    wanted: Optional[int],
+) -> List[Dict[str, Any]]:
+    """Newest-first pending items of one GSI5 partition (at most `wanted`)."""
+    query_kwargs: Dict[str, Any] = {
+        "TableName": table_name,
+        "IndexName": "GSI5",
+        "KeyConditionExpression": "GSI5PK = :pk",
+        # stream_processor removes the keys shortly after a decision
+        "FilterExpression": "#status = :status",
+        "ExpressionAttributeNames": _STATUS_NAMES,
+        "ExpressionAttributeValues": {":pk": {"S": partition_key}, ":status": _PENDING_VALUE},
+        "ScanIndexForward": False,
+    }
+    items: List[Dict[str, Any]] = []
+    while True:
+        if wanted is not None:
+            query_kwargs["Limit"] = wanted - len(items)
+        response = await aws_call("dynamodb", "query", **query_kwargs)
+        items.extend(map(deserialize_item, response.get("Items", [])))
+        if "LastEvaluatedKey" not in response or (wanted is not None and len(items) >= wanted):
+            return items
+        query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+async def _query_pending_index(table_name: str, wanted: Optional[int], legacy: bool) -> List[Dict[str, Any]]:
+    """
+    Scatter-gather over the pending index shards (and the legacy key).
+
+    Each partition returns at most `wanted` items newest first, so the newest
+    `wanted` overall are the head of their k-way merge.
+    """
+    # gather() re-raises the first failed query
+    pages = await asyncio.gather(
+        *(_query_pending_partition(table_name, key, wanted) for key in pending_partition_keys(legacy=legacy))
+    )
+    merged = heapq.merge(*pages, key=lambda item: item.get("GSI5SK") or "", reverse=True)
+    return list(islice(merged, wanted)) if wanted is not None else list(merged)
+
+
+async def _scan_segment(table_name: str, filter_expression: str, segment: int) -> List[Dict[str, Any]]:
+    scan_kwargs: Dict[str, Any] = {
+        "TableName": table_name,
+        "FilterExpression": filter_expression,
+        "ExpressionAttributeNames": _STATUS_NAMES,
+        "ExpressionAttributeValues": {":status": _PENDING_VALUE},
+        "Segment": segment,
+        "TotalSegments": PENDING_SCAN_SEGMENTS,
+    }
+    items: List[Dict[str, Any]] = []
+    while True:
+        response = await aws_call("dynamodb", "scan", **scan_kwargs)
+        items.extend(map(deserialize_item, response.get("Items", [])))
+        if "LastEvaluatedKey" not in response:
+            return items
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+async def _scan_pending(table_name: str, filter_expression: str) -> List[Dict[str, Any]]:
+    """Every PENDING item matching the filter (parallel segmented table scan)."""
+    get_metrics().increment("PendingScans")
+    segments = await asyncio.gather(
+        *(_scan_segment(table_name, filter_expression, segment) for segment in range(PENDING_SCAN_SEGMENTS))
+    )
+    return [item for items in segments for item in items]
+
+
+async def _query_pending_items(table_name: str, wanted: Optional[int], legacy: bool) -> List[Dict[str, Any]]:
+    """Indexed pending items (the newest `wanted`, or all of them)."""
+    # Try fast path via GSI5 if available; otherwise fallback to scan
+    try:
+        return await _query_pending_index(table_name, wanted, legacy)
+    except Exception:
+        return await _scan_pending(table_name, _PENDING_FILTER)
+
+
+async def _get_migration(table_name: str) -> Optional[Dict[str, Any]]:
+    """Pending index migration marker, cached once seen."""
+    if table_name not in _migrations:
+        migration = await run_in_thread(get_pending_migration, table_name)
+        if migration is None:
+            return None
+        _migrations[table_name] = migration
+    return _migrations[table_name]
+
+
+def _needs_legacy_key(migration: Optional[Dict[str, Any]]) -> bool:
+    """Books may still sit on the unsharded key until a migration at this shard count."""
+    return migration is None or int(migration.get("shards", 0)) != PENDING_SHARDS
+
+
+async def _scan_missing_gsi5(table_name: str) -> List[Dict[str, Any]]:
+    """Legacy pending items without GSI5 attributes (best-effort)."""
+    try:
+        return await _scan_pending(table_name, _MISSING_GSI5_FILTER)
+    except Exception:
+        return []
+
+
+async def _list_pending_books(
     table_name: str,
     limit: int = 20,
     offset: int = 0,
@@ -49,40 +186,25 @@ def _list_pending_books(
     Returns:
         Tuple of (books list, total count)
     """
-    table = get_dynamodb_table(table_name)
-
-    items: List[Dict[str, Any]] = []
-    missing_gsi_items: List[Dict[str, Any]] = []
-
-    # Try fast path via GSI5 if available; otherwise fallback to scan
-    try:
-        response = table.query(
-            IndexName="GSI5",
-            KeyConditionExpression=Key("GSI5PK").eq("STATUS#PENDING"),
-        )
-        items = response.get("Items", [])
-    except Exception:
-        # Fallback: full table scan
-        response = table.scan(
-            FilterExpression="attribute_exists(#status) AND #status = :status",
-            ExpressionAttributeNames={
-                "#status": "status",
-            },
-            ExpressionAttributeValues={
-                ":status": "PENDING",
-            },
-        )
-        items = response.get("Items", [])
-
-    # Also include legacy items missing GSI5 attributes
-    try:
-        resp_missing = table.scan(
-            FilterExpression=Attr("status").eq("PENDING")
-            & (Attr("GSI5PK").not_exists() | Attr("GSI5SK").not_exists()),
-        )
-        missing_gsi_items = resp_missing.get("Items", [])
-    except Exception:
-        missing_gsi_items = []
+    # Optimistically read only the newest offset + limit index entries,
+    # alongside the counters and the migration marker
+    cached = _migrations.get(table_name)
+    items, counts, migration = await asyncio.gather(
+        _query_pending_items(table_name, offset + limit, _needs_legacy_key(cached)),
+        run_in_thread(get_status_counts, table_name),
+        _get_migration(table_name),
+    )
+
+    follow_ups = {}
+    if counts is None:
+        # No counters yet: the total has to come from every index entry
+        follow_ups["items"] = _query_pending_items(table_name, None, _needs_legacy_key(migration))
+    if migration is None:
+        # Also include legacy items missing GSI5 attributes (not migrated yet)
+        follow_ups["missing"] = _scan_missing_gsi5(table_name)
+    results = dict(zip(follow_ups, await asyncio.gather(*follow_ups.values())))
+    items = results.get("items", items)
+    missing_gsi_items = results.get("missing", [])
 
     # Merge and deduplicate by PK/SK
     merged: Dict[tuple, Dict[str, Any]] = {}
@@ -97,8 +219,10 @@ def _list_pending_books(
 
     merged_items.sort(key=_ts, reverse=True)
 
-    # Apply pagination
+    # Apply pagination; the counter can only lag behind what we have seen
     total = len(merged_items)
+    if counts is not None:
+        total = max(counts.get("PENDING", 0), total)
     books = merged_items[offset : offset + limit]
 
     # Format response
@@ -116,13 +240,21 @@ def _list_pending_books(
             "uploadedBy": book.get("uploaderEmail"),
             "uploadedAt": uploaded_at,
             "mimeType": book.get("mime_type"),
+            "duplicateOf": book.get("duplicateOf"),
             "fileSize": file_size,
+            "pageCount": book.get("pageCount"),
+            "embeddedTitle": book.get("embeddedTitle"),
+            "embeddedAuthor": book.get("embeddedAuthor"),
+            "language": book.get("language"),
+            "coverPath": book.get("coverPath"),
         })
 
     return formatted_books, total
 
 
-def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+@emit_metrics("listPendingBooks")
+@async_handler
+async def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda handler for GET /admin/books/pending
 
@@ -159,17 +291,19 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         table_name = _get_env_or_error("BOOKS_TABLE_NAME")
 
         # List pending books
-        books, total = _list_pending_books(
-            table_name=table_name,
-            limit=limit,
-            offset=offset,
-        )
+        with get_metrics().timer("QueryTime"):
+            books, total = await _list_pending_books(
+                table_name=table_name,
+                limit=limit,
+                offset=offset,
+            )
+        get_metrics().put_metric("ResultCount", total)
 
         logger.info(f"Found {len(books)} pending books (total: {total})")
 
         return api_response(
             status_code=200,
-            body=json.loads(json.dumps({
+            body={
                 "books": books,
                 "pagination": {
                     "limit": limit,
@@ -177,7 +311,8 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     "total": total,
                     "hasMore": offset + limit < total,
                 },
-            }, default=lambda o: float(o))),
+            },
+            event=event,
         )
 
     except ValueError as e:
@@ -194,3 +329,48 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             message="Internal server error",
         )
         return api_response(status_code=500, body=error_body)
+
+
+@emit_metrics("countPendingBooks")
+def count_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Lambda handler for GET /admin/books/pending/count
+
+    Args:
+        event: API Gateway event
+        context: Lambda context
+
+    Returns:
+        Response with the pending count and the count of every status
+    """
+    try:
+        table_name = _get_env_or_error("BOOKS_TABLE_NAME")
+        counts = get_status_counts(table_name)
+        if counts is None:
+            # Counters not initialized yet (see scripts/rebuild_derived_state.py)
+            _, pending = run(_list_pending_books(table_name, limit=1))
+            counts = {"PENDING": pending}
+
+        return api_response(
+            status_code=200,
+            body={
+                "pending": max(counts.get("PENDING", 0), 0),
+                "counts": {status: max(count, 0) for status, count in counts.items()},
+            },
+            event=event,
+        )
+
+    except ValueError as e:
+        logger.error(f"Configuration error: {str(e)}")
+        error_body = build_error_response(
+            error_code=ErrorCode.INTERNAL_ERROR,
+            message="Server configuration error",
+        )
+        return api_response(status_code=500, body=error_body)
+    except Exception as e:
+        logger.error(f"Error counting pending books: {str(e)}", exc_info=True)
+        error_body = build_error_response(
+            error_code=ErrorCode.INTERNAL_ERROR,
+            message="Internal server error",
+        )
+        return api_response(status_code=500, body=error_body)
@@ -2,12 +2,12 @@
 Post Confirmation trigger - tạo UserProfile record khi user sign up
 """
 import json
-import boto3
 import os
 from datetime import datetime
 
-dynamodb = boto3.resource("dynamodb")
-user_profile_table = dynamodb.Table(os.environ.get("USER_PROFILE_TABLE", "UserProfile"))
+from shared.aws_clients import dynamodb_resource
+
+user_profile_table = dynamodb_resource().Table(os.environ.get("USER_PROFILE_TABLE", "UserProfile"))
 
 
 def handler(event, context):
@@ -4,22 +4,58 @@ search_books Lambda - Search and list books
 Triggered by GET /books/search
 Returns list of approved books with optional filtering.
 
+suggest_handler serves GET /books/suggest?prefix=&limit= (search-box
+suggestions of titles and authors, see shared.suggest) with a short public
+Cache-Control.
+
 Query parameters:
 - q: Search query (title, author)
+- title: Title prefix, served by a GSI1 query (accents and case ignored)
+- author: Author prefix, served by a GSI2 query (combined with title, the
+  title index is queried and the author prefix filters the result)
+- sort: approvedAt (newest first) | title | author; with any of the facet
+  filters below, the request is answered from the catalog facet index
+  (shared.catalog_facets) and the response adds catalog-wide facet counts
+- language: Language facet ("vi", "en", ...)
+- size: Size bucket (small < 1 MB, medium < 10 MB, large < 50 MB, huge)
+- approvedFrom / approvedTo: approvedAt range (ISO dates, inclusive)
 - limit: Max results (default: 20, max: 100)
 - offset: Pagination offset (default: 0)
 
+pagination.total is null for title/author prefix searches that have more
+results: the index query stops after offset + limit + 1 matches, so only
+hasMore is known.
+
 Environment variables:
 - BOOKS_TABLE_NAME: DynamoDB table name
+- CATALOG_BUCKET_NAME: Bucket holding the approved catalog snapshot (optional).
+  When set, searches run against the in-memory snapshot and only fall back to
+  a DynamoDB scan if no snapshot has been published yet.
+- SEARCH_INDEX_ENABLED: (optional) "true" to answer q= from the warm-container
+  inverted index (shared.search_index: BM25F-ranked over title, author and
+  description, prefix and typo tolerant) instead of a substring filter over
+  the snapshot
 """
 
-import json
 import os
 from typing import Any, Dict, List, Optional
-from decimal import Decimal
 
-from shared.logger import get_logger
+from boto3.dynamodb.conditions import Attr, Key
+
+from shared.logger import get_logger, get_metrics, emit_metrics
+from shared.catalog import load_catalog, scan_approved_books, search_text
+from shared.catalog_facets import SIZE_BUCKETS, SORT_FIELDS, CatalogFacets, get_catalog_facets
+from shared.derived import AUTHOR_GSI2_PREFIX, TITLE_GSI1_PREFIX, get_status_counts
 from shared.dynamodb import get_dynamodb_table
+from shared.search_index import get_search_index
+from shared.suggest import (
+    DEFAULT_SUGGESTIONS,
+    MAX_SUGGESTIONS,
+    SUGGEST_CACHE_CONTROL,
+    SuggestIndex,
+    get_suggest_index,
+)
+from shared.text import normalize
 from shared.error_handler import api_response, build_error_response, ErrorCode
 
 logger = get_logger(__name__)
@@ -33,6 +69,17 @@ def _get_env_or_error(name: str) -> str:
     return value
 
 
+def _load_catalog_books() -> Optional[List[Dict[str, Any]]]:
+    """Approved books from the catalog snapshot, or None if there is none."""
+    catalog_bucket = os.getenv("CATALOG_BUCKET_NAME")
+    if catalog_bucket:
+        books = load_catalog(catalog_bucket)
+        if books is not None:
+            return books
+        logger.warning("Catalog snapshot unavailable, falling back to table scan")
+    return None
+
+
 def _search_books(
     table_name: str,
     query: Optional[str] = None,
@@ -51,54 +98,148 @@ def _search_books(
     Returns:
         Tuple of (books list, total count)
     """
-    table = get_dynamodb_table(table_name)
+    catalog_bucket = os.getenv("CATALOG_BUCKET_NAME")
+    if query and catalog_bucket and os.getenv("SEARCH_INDEX_ENABLED", "false").lower() == "true":
+        index = get_search_index(catalog_bucket)
+        if index is not None:
+            books, total = index.search(query, limit=limit, offset=offset)
+            return [_format_book(book) for book in books], total
 
-    # Query all approved books
-    # Note: In production, use GSI for better performance
-    response = table.scan(
-        FilterExpression="attribute_exists(#status) AND #status = :status",
-        ExpressionAttributeNames={
-            "#status": "status",
-        },
-        ExpressionAttributeValues={
-            ":status": "APPROVED",
-        },
-    )
-
-    books = response.get("Items", [])
-
-    # Filter by search query if provided
+    books = _load_catalog_books()
+    if books is None:
+        counts = None if query else get_status_counts(table_name)
+        if counts is not None:
+            # Unfiltered listing: the APPROVED counter is the total, so the
+            # scan stops at the end of the requested page
+            books = scan_approved_books(table_name, max_items=offset + limit)
+            return [_format_book(book) for book in books[offset:]], counts.get("APPROVED", 0)
+        books = scan_approved_books(table_name)
+
+    # Filter by search query if provided ("sach" matches "Sách")
     if query:
-        query_lower = query.lower()
+        needle = normalize(query)
         books = [
             book for book in books
-            if query_lower in book.get("title", "").lower()
-            or query_lower in book.get("author", "").lower()
+            if needle in (book.get("searchText") or search_text(book))
         ]
 
-    # Apply pagination
+    # Apply pagination (snapshot entries are in memory, counting reads nothing)
     total = len(books)
     books = books[offset : offset + limit]
 
-    # Format response
-    formatted_books = []
-    for book in books:
-        uploaded_at = book.get("uploadedAt") or book.get("createdAt")
-        formatted_books.append({
-            "bookId": book.get("bookId"),
-            "title": book.get("title"),
-            "author": book.get("author"),
-            "description": book.get("description"),
-            "status": book.get("status"),
-            "uploadedAt": uploaded_at,
-            "fileSize": book.get("fileSize") or book.get("file_size"),
-            "uploaderEmail": book.get("uploaderEmail"),
-            "approvedAt": book.get("approvedAt"),
-        })
-
-    return formatted_books, total
+    return [_format_book(book) for book in books], total
+
+
+def _search_by_prefix(
+    table_name: str,
+    title: Optional[str] = None,
+    author: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    Title/author prefix search on GSI1/GSI2 (see shared.derived).
+
+    Paging stops once offset + limit + 1 matches are collected, so a short
+    prefix ("a") reads a few pages of the index instead of all of it.
+
+    Args:
+        table_name: DynamoDB table name
+        title: Title prefix
+        author: Author prefix
+        limit: Max results
+        offset: Pagination offset
+
+    Returns:
+        Tuple of (books list, total count), ordered by normalized title/author;
+        the total is None when more matches exist beyond the page
+    """
+    title_key = normalize(title)
+    author_key = normalize(author)
+    if title_key:
+        index, pk_name, sk_name, pk_value, prefix = "GSI1", "GSI1PK", "GSI1SK", TITLE_GSI1_PREFIX, title_key
+    elif author_key:
+        index, pk_name, sk_name, pk_value, prefix = "GSI2", "GSI2PK", "GSI2SK", AUTHOR_GSI2_PREFIX, author_key
+    else:
+        return [], 0
+
+    wanted = offset + limit + 1
+    table = get_dynamodb_table(table_name)
+    query_kwargs = {
+        "IndexName": index,
+        "KeyConditionExpression": Key(pk_name).eq(f"{pk_value}{prefix[0]}")
+        & Key(sk_name).begins_with(prefix),
+        # stream_processor removes the keys shortly after a book leaves APPROVED
+        "FilterExpression": Attr("status").eq("APPROVED"),
+        "Limit": wanted,
+    }
+    books: List[Dict[str, Any]] = []
+    while len(books) < wanted:
+        response = table.query(**query_kwargs)
+        items = response.get("Items", [])
+        if title_key and author_key:
+            items = [book for book in items if normalize(book.get("author")).startswith(author_key)]
+        books.extend(items)
+        if "LastEvaluatedKey" not in response:
+            break
+        query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    total = len(books) if len(books) < wanted else None
+    return [_format_book(book) for book in books[offset : offset + limit]], total
+
+
+def _browse_catalog(
+    table_name: str,
+    sort: str,
+    filters: Dict[str, Optional[str]],
+    query: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> tuple[List[Dict[str, Any]], int, Dict[str, Any]]:
+    """
+    Filtered and sorted browsing from the catalog facet index.
 
+    Args:
+        table_name: DynamoDB table name (scanned when no snapshot exists)
+        sort: One of SORT_FIELDS
+        filters: CatalogFacets.browse() filter arguments
+        query: Optional substring of title/author
+        limit: Max results
+        offset: Pagination offset
 
+    Returns:
+        Tuple of (books list, total count, catalog-wide facet counts)
+    """
+    catalog_bucket = os.getenv("CATALOG_BUCKET_NAME")
+    facets = get_catalog_facets(catalog_bucket) if catalog_bucket else None
+    if facets is None:
+        logger.warning("Catalog snapshot unavailable, building facets from a table scan")
+        books = scan_approved_books(table_name)
+        books.sort(key=lambda b: b.get("approvedAt") or "", reverse=True)
+        facets = CatalogFacets(books)
+
+    books, total = facets.browse(sort=sort, query=query, limit=limit, offset=offset, **filters)
+    return [_format_book(book) for book in books], total, facets.facet_counts()
+
+
+def _format_book(book: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a catalog entry or DynamoDB item to the response shape."""
+    return {
+        "bookId": book.get("bookId"),
+        "title": book.get("title"),
+        "author": book.get("author"),
+        "description": book.get("description"),
+        "status": book.get("status", "APPROVED"),
+        "uploadedAt": book.get("uploadedAt") or book.get("createdAt"),
+        "fileSize": book.get("fileSize") or book.get("file_size"),
+        "approvedAt": book.get("approvedAt"),
+        "pageCount": book.get("pageCount"),
+        "language": book.get("language"),
+        "coverPath": book.get("coverPath"),
+    }
+
+
+@emit_metrics("searchBooks")
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda handler for GET /books/search
@@ -114,7 +255,29 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         # Get query parameters
         query_params = event.get("queryStringParameters") or {}
         search_query = query_params.get("q", "").strip()
-        
+        title = (query_params.get("title") or "").strip()
+        author = (query_params.get("author") or "").strip()
+        sort = (query_params.get("sort") or "").strip()
+        facet_filters = {
+            "language": (query_params.get("language") or "").strip() or None,
+            "size": (query_params.get("size") or "").strip() or None,
+            "approved_from": (query_params.get("approvedFrom") or "").strip() or None,
+            "approved_to": (query_params.get("approvedTo") or "").strip() or None,
+        }
+        browsing = bool(sort) or any(facet_filters.values())
+        if sort and sort not in SORT_FIELDS:
+            error_body = build_error_response(
+                error_code=ErrorCode.INVALID_REQUEST,
+                message=f"sort must be one of: {', '.join(SORT_FIELDS)}",
+            )
+            return api_response(status_code=400, body=error_body)
+        if facet_filters["size"] and facet_filters["size"] not in dict(SIZE_BUCKETS):
+            error_body = build_error_response(
+                error_code=ErrorCode.INVALID_REQUEST,
+                message=f"size must be one of: {', '.join(name for name, _ in SIZE_BUCKETS)}",
+            )
+            return api_response(status_code=400, body=error_body)
+
         try:
             limit = int(query_params.get("limit", 20))
             offset = int(query_params.get("offset", 0))
@@ -131,32 +294,118 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         if offset < 0:
             offset = 0
 
-        logger.info(f"Searching books: query={search_query}, limit={limit}, offset={offset}")
+        logger.info(
+            f"Searching books: query={search_query}, title={title}, author={author}, "
+            f"sort={sort}, filters={facet_filters}, limit={limit}, offset={offset}"
+        )
 
         # Get environment variables
         table_name = _get_env_or_error("BOOKS_TABLE_NAME")
 
         # Search books
-        books, total = _search_books(
-            table_name=table_name,
-            query=search_query if search_query else None,
-            limit=limit,
-            offset=offset,
-        )
+        facet_counts = None
+        with get_metrics().timer("QueryTime"):
+            if browsing:
+                books, total, facet_counts = _browse_catalog(
+                    table_name=table_name,
+                    sort=sort or "approvedAt",
+                    filters=dict(facet_filters, title=title or None, author=author or None),
+                    query=search_query or None,
+                    limit=limit,
+                    offset=offset,
+                )
+            elif title or author:
+                books, total = _search_by_prefix(
+                    table_name=table_name,
+                    title=title,
+                    author=author,
+                    limit=limit,
+                    offset=offset,
+                )
+            else:
+                books, total = _search_books(
+                    table_name=table_name,
+                    query=search_query if search_query else None,
+                    limit=limit,
+                    offset=offset,
+                )
+        get_metrics().put_metric("ResultCount", len(books) if total is None else total)
 
         logger.info(f"Found {len(books)} books (total: {total})")
 
+        body = {
+            "books": books,
+            "pagination": {
+                "limit": limit,
+                "offset": offset,
+                "total": total,
+                "hasMore": total is None or offset + limit < total,
+            },
+        }
+        if facet_counts is not None:
+            body["facets"] = facet_counts
+        return api_response(status_code=200, body=body, event=event)
+
+    except ValueError as e:
+        logger.error(f"Configuration error: {str(e)}")
+        error_body = build_error_response(
+            error_code=ErrorCode.INTERNAL_ERROR,
+            message="Server configuration error",
+        )
+        return api_response(status_code=500, body=error_body)
+    except Exception as e:
+        logger.error(f"Error searching books: {str(e)}", exc_info=True)
+        error_body = build_error_response(
+            error_code=ErrorCode.INTERNAL_ERROR,
+            message="Internal server error",
+        )
+        return api_response(status_code=500, body=error_body)
+
+
+@emit_metrics("suggestBooks")
+def suggest_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Lambda handler for GET /books/suggest
+
+    Args:
+        event: API Gateway event
+        context: Lambda context
+
+    Returns:
+        Response with up to `limit` title/author suggestions for `prefix`
+    """
+    try:
+        query_params = event.get("queryStringParameters") or {}
+        prefix = (query_params.get("prefix") or "").strip()
+        try:
+            limit = int(query_params.get("limit", DEFAULT_SUGGESTIONS))
+        except ValueError:
+            error_body = build_error_response(
+                error_code=ErrorCode.INVALID_REQUEST,
+                message="limit must be an integer",
+            )
+            return api_response(status_code=400, body=error_body)
+        if limit < 1 or limit > MAX_SUGGESTIONS:
+            limit = DEFAULT_SUGGESTIONS
+
+        table_name = _get_env_or_error("BOOKS_TABLE_NAME")
+
+        suggestions: List[Dict[str, Any]] = []
+        if prefix:
+            with get_metrics().timer("QueryTime"):
+                catalog_bucket = os.getenv("CATALOG_BUCKET_NAME")
+                index = get_suggest_index(catalog_bucket) if catalog_bucket else None
+                if index is None:
+                    logger.warning("Catalog snapshot unavailable, building suggestions from a table scan")
+                    index = SuggestIndex(scan_approved_books(table_name))
+                suggestions = index.suggest(prefix, limit=limit)
+        get_metrics().put_metric("ResultCount", len(suggestions))
+
         return api_response(
             status_code=200,
-            body=json.loads(json.dumps({  # convert Decimals to float/int
-                "books": books,
-                "pagination": {
-                    "limit": limit,
-                    "offset": offset,
-                    "total": total,
-                    "hasMore": offset + limit < total,
-                },
-            }, default=lambda o: float(o) if isinstance(o, Decimal) else o)),
+            body={"prefix": prefix, "suggestions": suggestions},
+            headers={"Cache-Control": SUGGEST_CACHE_CONTROL},
+            event=event,
         )
 
     except ValueError as e:
@@ -167,7 +416,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         )
         return api_response(status_code=500, body=error_body)
     except Exception as e:
-        logger.error(f"Error searching books: {str(e)}", exc_info=True)
+        logger.error(f"Error suggesting books: {str(e)}", exc_info=True)
         error_body = build_error_response(
             error_code=ErrorCode.INTERNAL_ERROR,
             message="Internal server error",
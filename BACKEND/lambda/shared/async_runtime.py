@@ -0,0 +1,113 @@
+"""
+Asyncio runtime for handlers that fan out blocking AWS calls.
+
+Handlers such as delete_book (one delete per candidate S3 key) and
+list_pending_books (every pending index shard plus the legacy scan) make
+independent AWS calls; one after another, each pays a full round trip.
+async_handler runs an ``async def`` handler on an event loop created once per
+container and reused across warm invocations. Its default executor is a
+thread pool sized to the boto3 connection pool, so blocking calls awaited
+together (asyncio.gather) run concurrently:
+
+- aws_call(service, operation, **params): one low-level API call on the
+  shared boto3 client (shared.aws_clients)
+- run_in_thread(func, ...): any blocking helper (Table resource calls,
+  paginators) on that same pool
+- run(coro): a coroutine from sync code (e.g. a sync handler reusing an
+  async helper)
+
+Nothing may block the loop itself: every AWS call in an async handler goes
+through aws_call or run_in_thread.
+
+DynamoDB results of aws_call are in wire format; deserialize_item() returns
+the Python values a Table resource would.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Optional, TypeVar
+
+from boto3.dynamodb.types import TypeDeserializer
+
+from .aws_clients import get_client, get_region, max_pool_connections
+
+T = TypeVar("T")
+
+# Reused across warm invocations
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_deserializer = TypeDeserializer()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """The container's event loop (its default executor is the AWS thread pool)."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        _loop.set_default_executor(
+            ThreadPoolExecutor(max_workers=max_pool_connections(), thread_name_prefix="aws")
+        )
+    return _loop
+
+
+def run(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion on the reused loop (not from async code)."""
+    return get_loop().run_until_complete(coro)
+
+
+def async_handler(handler_func: Callable[[Dict[str, Any], Any], Awaitable[Dict[str, Any]]]):
+    """
+    Decorator that runs an ``async def`` Lambda handler on the reused loop.
+
+    The result is a plain sync handler, so emit_metrics and
+    lambda_handler_wrapper stack on top of it as usual.
+
+    Usage:
+        @emit_metrics("deleteBook")
+        @async_handler
+        async def handler(event, context):
+            await asyncio.gather(aws_call("s3", "delete_object", ...), ...)
+    """
+    @functools.wraps(handler_func)
+    def wrapper(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+        return run(handler_func(event, context))
+
+    return wrapper
+
+
+async def run_in_thread(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Await a blocking call on the loop's thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+async def aws_call(service_name: str, operation: str, region: Optional[str] = None, **params: Any) -> Dict[str, Any]:
+    """
+    One low-level AWS API call, on the loop's thread pool.
+
+    Args:
+        service_name: AWS service (e.g. "s3", "dynamodb")
+        operation: Client method name (e.g. "delete_object", "query")
+        region: Optional AWS region (uses env vars if not provided)
+        params: API parameters, as for the boto3 client
+
+    Returns:
+        The API response
+    """
+    region = region or get_region()
+    return await run_in_thread(getattr(get_client(service_name, region), operation), **params)
+
+
+def deserialize_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """DynamoDB wire-format item -> Python values (numbers as Decimal)."""
+    return {name: _deserializer.deserialize(value) for name, value in item.items()}
+
+
+__all__ = [
+    "get_loop",
+    "run",
+    "async_handler",
+    "run_in_thread",
+    "aws_call",
+    "deserialize_item",
+]
@@ -0,0 +1,335 @@
+"""
+Approved catalog snapshot.
+
+The approved catalog only changes when an admin approves or deletes a book, so
+instead of scanning DynamoDB on every search the catalog is materialized to S3:
+
+- public/catalog/catalog-v{version}.json: immutable snapshot, cached for a year
+- public/catalog/latest.json: small pointer to the current version, short TTL
+
+stream_processor rebuilds once per stream batch, so rebuilds can overlap. The
+pointer only moves forward: it is written conditionally on the ETag that was
+read, and a rebuild that finds a newer version published drops its own.
+
+Each rebuild deletes the snapshots older than the previous version (kept for
+readers still holding the old pointer); the storage stack expires the
+noncurrent object versions those deletes leave behind.
+
+Both objects live under public/ so they are served by the CloudFront
+distribution (CdnStack). search_books keeps the decoded snapshot in module
+scope and only re-reads the pointer every CATALOG_REFRESH_SECONDS.
+
+Snapshot layout (rows instead of objects keeps the file roughly half the size):
+
+    {"version": "...", "generatedAt": "...", "count": 2,
+     "fields": ["bookId", "title", ...],
+     "rows": [["id-1", "Title", ...], ...]}
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from botocore.exceptions import ClientError
+
+from .aws_clients import s3_client
+from .dynamodb import get_dynamodb_table
+from .error_handler import encode_json
+from .logger import get_logger
+from .text import normalize
+
+logger = get_logger(__name__)
+
+CATALOG_PREFIX = "public/catalog/"
+SNAPSHOT_PREFIX = f"{CATALOG_PREFIX}catalog-v"
+LATEST_KEY = f"{CATALOG_PREFIX}latest.json"
+CATALOG_REFRESH_SECONDS = int(os.getenv("CATALOG_REFRESH_SECONDS", "60"))
+# Current and previous snapshot survive a rebuild
+RETAINED_SNAPSHOTS = 2
+# Conditional latest.json writes lost to concurrent rebuilds before giving up
+POINTER_WRITE_ATTEMPTS = 5
+
+SNAPSHOT_CACHE_CONTROL = "public, max-age=31536000, immutable"
+LATEST_CACHE_CONTROL = "public, max-age=30, must-revalidate"
+
+# Public CloudFront object: no uploader emails or other personal data
+CATALOG_FIELDS = [
+    "bookId",
+    "title",
+    "author",
+    "description",
+    "uploadedAt",
+    "fileSize",
+    "approvedAt",
+    "pageCount",
+    "language",
+    "coverPath",
+    # normalize(title) | normalize(author), so queries skip per-request folding
+    "searchText",
+]
+
+# Warm-container cache, keyed by bucket name
+_cache: Dict[str, Dict[str, Any]] = {}
+
+
+def snapshot_key(version: str) -> str:
+    """S3 key of an immutable snapshot version."""
+    return f"{SNAPSHOT_PREFIX}{version}.json"
+
+
+def scan_approved_books(table_name: str, max_items: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Scan every APPROVED book metadata item, following pagination.
+
+    Args:
+        table_name: DynamoDB table name
+        max_items: Stop once this many books were found
+
+    Returns:
+        List of raw DynamoDB items
+    """
+    table = get_dynamodb_table(table_name)
+    scan_kwargs: Dict[str, Any] = {
+        "FilterExpression": "#status = :status AND SK = :sk",
+        "ExpressionAttributeNames": {"#status": "status"},
+        "ExpressionAttributeValues": {":status": "APPROVED", ":sk": "METADATA"},
+        # A snapshot built right after an approval must include that book
+        "ConsistentRead": True,
+    }
+
+    items: List[Dict[str, Any]] = []
+    while True:
+        response = table.scan(**scan_kwargs)
+        items.extend(response.get("Items", []))
+        last_key = response.get("LastEvaluatedKey")
+        if max_items is not None and len(items) >= max_items:
+            return items[:max_items]
+        if not last_key:
+            return items
+        scan_kwargs["ExclusiveStartKey"] = last_key
+
+
+def search_text(book: Dict[str, Any]) -> str:
+    """Normalized "title | author" that substring queries match (searchText)."""
+    return f"{normalize(book.get('title'))} | {normalize(book.get('author'))}"
+
+
+def _to_row(book: Dict[str, Any]) -> List[Any]:
+    """Project a DynamoDB item onto CATALOG_FIELDS."""
+    values = dict(book)
+    values["uploadedAt"] = book.get("uploadedAt") or book.get("createdAt")
+    values["fileSize"] = book.get("fileSize") or book.get("file_size")
+    values["searchText"] = search_text(book)
+    return [values.get(field) for field in CATALOG_FIELDS]
+
+
+def build_catalog_snapshot(table_name: str, bucket: str) -> Optional[Dict[str, Any]]:
+    """
+    Rebuild the catalog snapshot from DynamoDB and publish it to S3.
+
+    The versioned snapshot is written before the pointer, so readers never see
+    a pointer to an object that does not exist yet. The version is taken
+    before the scan, so a higher version always holds data at least as new;
+    concurrent rebuilds only move the pointer forward (see _publish_pointer).
+
+    Args:
+        table_name: DynamoDB table name
+        bucket: S3 bucket name
+
+    Returns:
+        The pointer document written to latest.json, or None if a newer
+        snapshot was already published
+    """
+    now = datetime.now(timezone.utc)
+    version = now.strftime("%Y%m%dT%H%M%S%fZ")
+    key = snapshot_key(version)
+
+    books = scan_approved_books(table_name)
+    books.sort(key=lambda b: b.get("approvedAt") or "", reverse=True)
+
+    snapshot = {
+        "version": version,
+        "generatedAt": now.isoformat(),
+        "count": len(books),
+        "fields": CATALOG_FIELDS,
+        "rows": [_to_row(book) for book in books],
+    }
+
+    s3 = s3_client()
+    s3.put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=encode_json(snapshot).encode("utf-8"),
+        ContentType="application/json",
+        CacheControl=SNAPSHOT_CACHE_CONTROL,
+    )
+
+    pointer = {
+        "version": version,
+        "key": key,
+        "count": len(books),
+        "generatedAt": snapshot["generatedAt"],
+    }
+    if not _publish_pointer(bucket, pointer):
+        logger.info(f"Catalog snapshot {key} superseded by a newer version, not published")
+        s3.delete_object(Bucket=bucket, Key=key)
+        return None
+
+    logger.info(f"Published catalog snapshot {key} ({len(books)} books)")
+    prune_catalog_snapshots(bucket)
+    return pointer
+
+
+def _publish_pointer(bucket: str, pointer: Dict[str, Any]) -> bool:
+    """
+    Point latest.json at `pointer` unless an equal or newer version is there.
+
+    The write is conditional on the ETag that was read (or on the pointer not
+    existing yet), so a rebuild publishing in between makes it fail and the
+    version check run again.
+
+    Returns:
+        False if a newer snapshot is already published
+    """
+    s3 = s3_client()
+    conflict: Optional[ClientError] = None
+    for _ in range(POINTER_WRITE_ATTEMPTS):
+        try:
+            current = s3.get_object(Bucket=bucket, Key=LATEST_KEY)
+            condition = {"IfMatch": current["ETag"]}
+            published = json.loads(current["Body"].read()).get("version") or ""
+        except ClientError as e:
+            if e.response["Error"]["Code"] not in ("NoSuchKey", "404"):
+                raise
+            condition, published = {"IfNoneMatch": "*"}, ""
+        if published >= pointer["version"]:
+            return False
+
+        try:
+            s3.put_object(
+                Bucket=bucket,
+                Key=LATEST_KEY,
+                Body=encode_json(pointer).encode("utf-8"),
+                ContentType="application/json",
+                CacheControl=LATEST_CACHE_CONTROL,
+                **condition,
+            )
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] not in ("PreconditionFailed", "ConditionalRequestConflict"):
+                raise
+            conflict = e
+    raise conflict
+
+
+def prune_catalog_snapshots(bucket: str, keep: int = RETAINED_SNAPSHOTS) -> List[str]:
+    """
+    Delete all but the newest `keep` snapshot versions (best-effort).
+
+    Versions are UTC timestamps, so key order is publication order.
+
+    Args:
+        bucket: S3 bucket name
+        keep: Number of newest snapshots to keep
+
+    Returns:
+        The deleted keys
+    """
+    s3 = s3_client()
+    try:
+        keys: List[str] = []
+        for page in s3.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=SNAPSHOT_PREFIX):
+            keys.extend(obj["Key"] for obj in page.get("Contents", []))
+        keys.sort()
+        stale = keys[:-keep] if keep > 0 else keys
+        # DeleteObjects takes at most 1000 keys per call
+        for start in range(0, len(stale), 1000):
+            s3.delete_objects(
+                Bucket=bucket,
+                Delete={"Objects": [{"Key": key} for key in stale[start:start + 1000]], "Quiet": True},
+            )
+    except ClientError as e:
+        logger.warning(f"Catalog snapshot cleanup failed: {e}")
+        return []
+    if stale:
+        logger.info(f"Deleted {len(stale)} old catalog snapshots")
+    return stale
+
+
+def _decode_snapshot(snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
+    fields = snapshot.get("fields") or CATALOG_FIELDS
+    return [dict(zip(fields, row)) for row in snapshot.get("rows", [])]
+
+
+def _read_json(bucket: str, key: str) -> Dict[str, Any]:
+    response = s3_client().get_object(Bucket=bucket, Key=key)
+    return json.loads(response["Body"].read())
+
+
+def load_catalog(bucket: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Return the approved catalog from the warm-container cache.
+
+    The pointer is re-read at most every CATALOG_REFRESH_SECONDS; the snapshot
+    body is only downloaded when its version changes. If S3 is unavailable the
+    last loaded snapshot keeps being served.
+
+    Args:
+        bucket: S3 bucket name
+
+    Returns:
+        List of catalog entries, or None if no snapshot could be loaded
+    """
+    cached = _cache.get(bucket)
+    now = time.monotonic()
+    if cached and now - cached["checkedAt"] < CATALOG_REFRESH_SECONDS:
+        return cached["books"]
+
+    try:
+        pointer = _read_json(bucket, LATEST_KEY)
+        version = pointer.get("version")
+        if cached and cached["version"] == version:
+            cached["checkedAt"] = now
+            return cached["books"]
+
+        snapshot = _read_json(bucket, pointer.get("key") or snapshot_key(version))
+    except (ClientError, ValueError) as e:
+        if cached:
+            logger.warning(f"Catalog refresh failed, serving version {cached['version']}: {e}")
+            cached["checkedAt"] = now
+            return cached["books"]
+        logger.warning(f"Catalog snapshot unavailable: {e}")
+        return None
+
+    books = _decode_snapshot(snapshot)
+    _cache[bucket] = {"version": version, "books": books, "checkedAt": now}
+    logger.info(f"Loaded catalog snapshot version {version} ({len(books)} books)")
+    return books
+
+
+def catalog_version(bucket: str) -> Optional[str]:
+    """Version of the snapshot last returned by load_catalog() for a bucket."""
+    return (_cache.get(bucket) or {}).get("version")
+
+
+def clear_catalog_cache() -> None:
+    """Drop the warm-container cache (used by tests)."""
+    _cache.clear()
+
+
+__all__ = [
+    "CATALOG_PREFIX",
+    "SNAPSHOT_PREFIX",
+    "LATEST_KEY",
+    "CATALOG_FIELDS",
+    "snapshot_key",
+    "search_text",
+    "scan_approved_books",
+    "build_catalog_snapshot",
+    "prune_catalog_snapshots",
+    "load_catalog",
+    "catalog_version",
+    "clear_catalog_cache",
+]
@@ -0,0 +1,263 @@
+"""
+Facet filters, sort orders and facet counts over the approved catalog.
+
+Browsing ("newest approved", "by author", "Vietnamese books under 10 MB")
+must not filter and sort the whole catalog per request. Per snapshot version
+a warm container builds, once, keyed structures over the catalog entries:
+
+- Sort orders: row permutations by approvedAt (newest first), normalized
+  title and normalized author, each with its inverse (row -> position)
+- Sorted keys: the title/author/approvedAt values in those orders, so a
+  title or author prefix and an approvedAt range are a bisect, i.e. a
+  contiguous slice of the order
+- Posting lists: rows per language (primary subtag, "vi-VN" -> "vi"), per
+  size bucket (SIZE_BUCKETS) and per normalized author
+- Facet counts: per-value totals of those posting lists, computed with the
+  postings so requests read them instead of counting
+
+A request intersects the smallest filter with the others (set operations in
+C) and picks its page from the requested order with a top-k heap on the
+precomputed positions; with no filter the page is a slice of the order.
+"""
+
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+from .catalog import catalog_version, load_catalog, search_text
+from .logger import get_logger, get_metrics
+from .text import normalize, tokenize
+
+logger = get_logger(__name__)
+
+SORT_FIELDS = ("approvedAt", "title", "author")
+FACET_FIELDS = ("language", "size", "author")
+# Upper bound (bytes, exclusive) of each size bucket; the last one is open
+SIZE_BUCKETS = (
+    ("small", 1024 * 1024),
+    ("medium", 10 * 1024 * 1024),
+    ("large", 50 * 1024 * 1024),
+    ("huge", None),
+)
+# Values listed per facet in facet_counts(), most frequent first
+TOP_FACET_VALUES = 20
+
+# Warm-container facet indexes, keyed by catalog bucket
+_facets: Dict[str, "CatalogFacets"] = {}
+
+
+def size_bucket(file_size: Any) -> Optional[str]:
+    """SIZE_BUCKETS name for a file size in bytes (None if unknown)."""
+    try:
+        size = int(file_size)
+    except (TypeError, ValueError):
+        return None
+    for name, upper in SIZE_BUCKETS:
+        if upper is None or size < upper:
+            return name
+    return None
+
+
+def language_key(language: Any) -> Optional[str]:
+    """Primary language subtag, folded ("vi-VN" -> "vi")."""
+    words = tokenize(language)
+    return words[0] if words else None
+
+
+class CatalogFacets:
+    """Sort orders, posting lists and facet counts for one catalog version."""
+
+    def __init__(self, books: List[Dict[str, Any]], version: Optional[str] = None) -> None:
+        self.version = version
+        self._books = books
+        count = len(books)
+        rows = range(count)
+
+        approved = [book.get("approvedAt") or "" for book in books]
+        titles = [normalize(book.get("title")) for book in books]
+        authors = [normalize(book.get("author")) for book in books]
+
+        # Ties keep snapshot order, which is newest approval first
+        by_approved = sorted(rows, key=lambda row: (approved[row], -row), reverse=True)
+        self._orders: Dict[str, array] = {
+            "approvedAt": array("I", by_approved),
+            "title": array("I", sorted(rows, key=lambda row: (titles[row], row))),
+            "author": array("I", sorted(rows, key=lambda row: (authors[row], row))),
+        }
+        self._positions: Dict[str, array] = {}
+        for field, order in self._orders.items():
+            positions = array("I", [0]) * count
+            for position, row in enumerate(order):
+                positions[row] = position
+            self._positions[field] = positions
+
+        # Ascending keys aligned with the orders (approvedAt is stored oldest
+        # first and mapped back, since bisect needs ascending keys)
+        self._sorted_keys: Dict[str, List[str]] = {
+            "approvedAt": [approved[row] for row in reversed(by_approved)],
+            "title": [titles[row] for row in self._orders["title"]],
+            "author": [authors[row] for row in self._orders["author"]],
+        }
+
+        postings: Dict[str, Dict[str, List[int]]] = {field: {} for field in FACET_FIELDS}
+        author_names: Dict[str, str] = {}
+        for row, book in enumerate(books):
+            values = {
+                "language": language_key(book.get("language")),
+                "size": size_bucket(book.get("fileSize")),
+                "author": authors[row] or None,
+            }
+            for field, value in values.items():
+                if value is not None:
+                    postings[field].setdefault(value, []).append(row)
+            if authors[row]:
+                author_names.setdefault(authors[row], book.get("author"))
+        self._postings = {
+            field: {value: array("I", rows_) for value, rows_ in values.items()}
+            for field, values in postings.items()
+        }
+
+        self._counts: Dict[str, List[Dict[str, Any]]] = {}
+        for field, values in self._postings.items():
+            top = heapq.nlargest(TOP_FACET_VALUES, values.items(), key=lambda item: (len(item[1]), item[0]))
+            self._counts[field] = [
+                {"value": value, "label": author_names.get(value, value) if field == "author" else value,
+                 "count": len(rows_)}
+                for value, rows_ in top
+            ]
+
+    def __len__(self) -> int:
+        return len(self._books)
+
+    def facet_counts(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Catalog-wide counts per facet value (TOP_FACET_VALUES per facet)."""
+        return self._counts
+
+    def _range(self, field: str, low: str, high: Optional[str] = None) -> Tuple[int, int]:
+        """[start, end) of the ascending keys between low and high (inclusive)."""
+        keys = self._sorted_keys[field]
+        start = bisect_left(keys, low)
+        end = bisect_right(keys, high + "\uffff") if high is not None else len(keys)
+        return start, end
+
+    def _prefix_rows(self, field: str, prefix: str) -> array:
+        start, end = self._range(field, prefix, prefix)
+        return self._orders[field][start:end]
+
+    def _approved_rows(self, approved_from: Optional[str], approved_to: Optional[str]) -> array:
+        start, end = self._range("approvedAt", approved_from or "", approved_to)
+        order = self._orders["approvedAt"]
+        count = len(order)
+        # Ascending [start, end) is the newest-first slice [count - end, count - start)
+        return order[count - end:count - start]
+
+    def browse(
+        self,
+        sort: str = "approvedAt",
+        language: Optional[str] = None,
+        size: Optional[str] = None,
+        author: Optional[str] = None,
+        title: Optional[str] = None,
+        approved_from: Optional[str] = None,
+        approved_to: Optional[str] = None,
+        query: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Catalog entries matching every given filter, in the requested order.
+
+        Args:
+            sort: One of SORT_FIELDS (approvedAt is newest first, others A-Z)
+            language: Language facet value (any form, "vi-VN" -> "vi")
+            size: SIZE_BUCKETS name
+            author: Author prefix (accents and case ignored)
+            title: Title prefix (accents and case ignored)
+            approved_from: Earliest approvedAt (ISO date or timestamp)
+            approved_to: Latest approvedAt, inclusive (ISO date or timestamp)
+            query: Normalized substring of title/author, checked only on the
+                rows left by the other filters
+            limit: Max results
+            offset: Pagination offset
+
+        Returns:
+            Tuple of (page of catalog entries, total matches)
+        """
+        if sort not in self._orders:
+            raise ValueError(f"Unsupported sort: {sort}")
+
+        filters: List[Any] = []
+        if language:
+            filters.append(self._postings["language"].get(language_key(language) or "", array("I")))
+        if size:
+            filters.append(self._postings["size"].get(size, array("I")))
+        if author:
+            filters.append(self._prefix_rows("author", normalize(author)))
+        if title:
+            filters.append(self._prefix_rows("title", normalize(title)))
+        if approved_from or approved_to:
+            filters.append(self._approved_rows(approved_from, approved_to))
+
+        order = self._orders[sort]
+        page = offset + limit
+        if not filters and not query:
+            return [self._books[row] for row in order[offset:page]], len(order)
+
+        filters.sort(key=len)
+        matched = set(filters[0] if filters else order)
+        for rows in filters[1:]:
+            if not matched:
+                break
+            matched.intersection_update(rows)
+        needle = normalize(query)
+        if needle:
+            books = self._books
+            matched = {
+                row for row in matched
+                if needle in (books[row].get("searchText") or search_text(books[row]))
+            }
+
+        top = heapq.nsmallest(page, matched, key=self._positions[sort].__getitem__)
+        return [self._books[row] for row in top[offset:]], len(matched)
+
+
+def get_catalog_facets(bucket: str) -> Optional[CatalogFacets]:
+    """
+    Warm-container facet index for the bucket's catalog, rebuilt by version.
+
+    Returns:
+        The facet index, or None if no catalog snapshot could be loaded
+    """
+    books = load_catalog(bucket)
+    if books is None:
+        return None
+    version = catalog_version(bucket)
+
+    facets = _facets.get(bucket)
+    if facets is not None and facets.version == version:
+        get_metrics().increment("CatalogFacetsHits")
+        return facets
+
+    get_metrics().increment("CatalogFacetsMisses")
+    facets = CatalogFacets(books, version)
+    _facets[bucket] = facets
+    logger.info(f"Catalog facets built for version {version} ({len(facets)} books)")
+    return facets
+
+
+def clear_catalog_facets() -> None:
+    """Drop the warm-container facet indexes (used by tests)."""
+    _facets.clear()
+
+
+__all__ = [
+    "SORT_FIELDS",
+    "FACET_FIELDS",
+    "SIZE_BUCKETS",
+    "size_bucket",
+    "language_key",
+    "CatalogFacets",
+    "get_catalog_facets",
+    "clear_catalog_facets",
+]
@@ -0,0 +1,227 @@
+"""
+Content-hash deduplication of uploaded books.
+
+validate_mime_type hashes every valid upload (SHA-256) and records the first
+book with that content in a content item:
+
+    PK = "HASH#<hex digest>", SK = "CONTENT"
+    canonicalBookId  book that owns the stored object
+    objectKey        current S3 key of the object (staging/, public/books/, quarantine/)
+    refCount         number of books pointing at the object
+    claimedBy        books that took a reference (each counted once)
+    releasedBy       books that gave their reference back
+
+Later uploads with the same digest are not stored again: the book item gets
+duplicateOf/contentHash, its file_path points at objectKey and the uploaded
+copy is deleted. Every referencing book is equal from then on, whether the
+canonical book is still pending, rejected or deleted:
+
+- Approving any of them moves the object to public/books/ (if it is not
+  there yet) and updates objectKey
+- Rejecting or deleting one releases its reference; the object is only
+  quarantined (reject) or deleted (delete) with the last reference
+"""
+
+import base64
+import hashlib
+from typing import Any, Dict, Optional
+
+from botocore.exceptions import ClientError
+
+from .aws_clients import s3_client
+from .dynamodb import get_dynamodb_table
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+CONTENT_SK = "CONTENT"
+# put/update races with a release deleting the item are retried this often
+CLAIM_ATTEMPTS = 3
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def _content_key(digest: str) -> Dict[str, str]:
+    return {"PK": f"HASH#{digest}", "SK": CONTENT_SK}
+
+
+def compute_content_sha256(bucket: str, key: str) -> str:
+    """
+    SHA-256 hex digest of an S3 object.
+
+    Uses the object's stored full-object SHA-256 checksum when the uploader
+    supplied one, otherwise streams the body in HASH_CHUNK_BYTES chunks so
+    memory stays flat regardless of file size.
+
+    Args:
+        bucket: S3 bucket name
+        key: S3 object key
+
+    Returns:
+        Lowercase hex digest
+    """
+    s3 = s3_client()
+
+    try:
+        head = s3.head_object(Bucket=bucket, Key=key, ChecksumMode="ENABLED")
+        checksum = head.get("ChecksumSHA256")
+        # Multipart checksums are composite ("<b64>-<parts>"), not a file hash
+        if checksum and head.get("ChecksumType", "FULL_OBJECT") == "FULL_OBJECT" and "-" not in checksum:
+            return base64.b64decode(checksum).hex()
+    except ClientError as e:
+        logger.warning(f"head_object failed for {key}, hashing body: {e}")
+
+    digest = hashlib.sha256()
+    body = s3.get_object(Bucket=bucket, Key=key)["Body"]
+    for chunk in body.iter_chunks(chunk_size=HASH_CHUNK_BYTES):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_content_item(table_name: str, digest: str) -> Optional[Dict[str, Any]]:
+    """Get the content item for a digest, or None."""
+    table = get_dynamodb_table(table_name)
+    return table.get_item(Key=_content_key(digest)).get("Item")
+
+
+def claim_content_hash(
+    table_name: str,
+    digest: str,
+    book_id: str,
+    object_key: str,
+) -> Optional[Dict[str, Any]]:
+    """
+    Register book_id as the owner of digest, or add a reference to the owner.
+
+    Args:
+        table_name: DynamoDB table name
+        digest: SHA-256 hex digest of the upload
+        book_id: Book that was just validated
+        object_key: Where the object will live if book_id becomes canonical
+
+    Returns:
+        None if book_id owns the content (first upload, or a retried event
+        for the owner), otherwise the existing content item; its refCount
+        is incremented once per book (claimedBy), so retried events for a
+        duplicate do not count twice
+    """
+    table = get_dynamodb_table(table_name)
+    for _ in range(CLAIM_ATTEMPTS):
+        try:
+            table.put_item(
+                Item={
+                    **_content_key(digest),
+                    "canonicalBookId": book_id,
+                    "objectKey": object_key,
+                    "refCount": 1,
+                    "claimedBy": {book_id},
+                },
+                ConditionExpression="attribute_not_exists(PK)",
+            )
+            return None
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise
+
+        try:
+            response = table.update_item(
+                Key=_content_key(digest),
+                UpdateExpression="ADD refCount :one, claimedBy :books",
+                ConditionExpression=(
+                    "attribute_exists(PK) AND canonicalBookId <> :book AND NOT contains(claimedBy, :book)"
+                ),
+                ExpressionAttributeValues={":one": 1, ":books": {book_id}, ":book": book_id},
+                ReturnValues="ALL_NEW",
+            )
+            return response["Attributes"]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise
+
+        # Retried event (this book already holds a reference), or the item
+        # was released to zero and deleted in between (claim it afresh)
+        existing = get_content_item(table_name, digest)
+        if existing:
+            return None if existing.get("canonicalBookId") == book_id else existing
+
+    raise RuntimeError(f"Could not claim content {digest} for book {book_id}")
+
+
+def update_content_location(table_name: str, digest: str, object_key: str) -> None:
+    """Record that the shared object moved (approval of any referencing book)."""
+    table = get_dynamodb_table(table_name)
+    table.update_item(
+        Key=_content_key(digest),
+        UpdateExpression="SET objectKey = :key",
+        ConditionExpression="attribute_exists(PK)",
+        ExpressionAttributeValues={":key": object_key},
+    )
+
+
+def release_content_hash(table_name: str, digest: str, book_id: Optional[str] = None) -> int:
+    """
+    Drop one reference to digest, deleting the content item at zero.
+
+    Args:
+        table_name: DynamoDB table name
+        digest: SHA-256 hex digest
+        book_id: Releasing book; when given only a book in claimedBy can
+            release, once (recorded in releasedBy), so retried calls and
+            deletes after a reject are no-ops
+
+    Returns:
+        Remaining reference count; 0 means the caller may delete the object
+    """
+    table = get_dynamodb_table(table_name)
+    update_expr = "ADD refCount :minus_one"
+    condition = "attribute_exists(PK) AND refCount > :zero"
+    values: Dict[str, Any] = {":minus_one": -1, ":zero": 0}
+    if book_id:
+        update_expr += ", releasedBy :books"
+        # Items written before claimedBy existed accept any book
+        condition += (
+            " AND (attribute_not_exists(claimedBy) OR contains(claimedBy, :book))"
+            " AND NOT contains(releasedBy, :book)"
+        )
+        values[":books"] = {book_id}
+        values[":book"] = book_id
+
+    try:
+        response = table.update_item(
+            Key=_content_key(digest),
+            UpdateExpression=update_expr,
+            ConditionExpression=condition,
+            ExpressionAttributeValues=values,
+            ReturnValues="UPDATED_NEW",
+        )
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+            raise
+        # Already released by this book (retry), nothing left to release, or
+        # the item was re-created for other books after this one let go; while
+        # any item exists the content stays
+        existing = get_content_item(table_name, digest) if book_id else None
+        return int(existing.get("refCount", 0)) if existing else 0
+
+    remaining = int(response.get("Attributes", {}).get("refCount", 0))
+    if remaining <= 0:
+        try:
+            table.delete_item(
+                Key=_content_key(digest),
+                ConditionExpression="refCount <= :zero",
+                ExpressionAttributeValues={":zero": 0},
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise
+            # A new duplicate claimed the content in between; keep the object
+            return 1
+    return remaining
+
+
+__all__ = [
+    "compute_content_sha256",
+    "get_content_item",
+    "claim_content_hash",
+    "update_content_location",
+    "release_content_hash",
+]
@@ -0,0 +1,262 @@
+"""
+Derived state of book metadata items, maintained by stream_processor.
+
+Handlers only write the source attributes (status, title, author, ...).
+Everything that can be computed from them lives here, so it is derived in
+one place and cannot drift:
+
+- GSI5PK/GSI5SK: pending index ("STATUS#PENDING#<n>" + upload time), present
+  only while status is PENDING. Writes are spread over PENDING_SHARDS
+  partitions by a hash of the book id, so a mass upload does not funnel into
+  one index partition; readers query every shard plus the legacy unsharded
+  "STATUS#PENDING" key and merge by GSI5SK. After changing
+  PENDING_GSI5_SHARDS run scripts/migrate_pending_gsi5.py to move books to
+  their new shard. When a migration pass completes, the script writes a marker
+  item (PENDING_MIGRATION_KEY, with the shard count): readers then stop
+  scanning for pending books without index keys, and stop querying the
+  legacy key while the shard count matches
+- GSI1PK/GSI1SK and GSI2PK/GSI2SK: title and author indexes, present only
+  while status is APPROVED. The partition is the first character of the
+  normalized value ("TITLE#d"), the sort key the full normalized value plus
+  the book id ("de men phieu luu ky#<bookId>"), so a prefix search is one
+  Query with begins_with on a single partition
+- GSI6SK: uploader index sort key ("BOOK#<uploadedAt>#<bookId>"), so
+  "my uploads" pages are read newest first instead of sorted in memory.
+  Follows uploadedAt, which is reset when the upload is processed
+- Status counters: PK "STATS#STATUS" / SK "COUNTS" for the whole library and
+  PK "STATS#UPLOADER#<uploaderId>" / SK "COUNTS" per uploader, each holding
+  one numeric attribute per status, so list totals are a single GetItem
+
+stream_processor applies derive_index_attributes() to every changed book
+and adjusts the counters from the stream's old/new images.
+"""
+
+import os
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .dynamodb import get_dynamodb_table, uploader_sort_key
+from .text import normalize
+
+BOOK_PK_PREFIX = "BOOK#"
+METADATA_SK = "METADATA"
+# Legacy unsharded pending partition, still read until migrated
+PENDING_GSI5PK = "STATUS#PENDING"
+PENDING_SHARDS = max(1, int(os.getenv("PENDING_GSI5_SHARDS", "8")))
+TITLE_GSI1_PREFIX = "TITLE#"
+AUTHOR_GSI2_PREFIX = "AUTHOR#"
+STATS_KEY = {"PK": "STATS#STATUS", "SK": "COUNTS"}
+PENDING_MIGRATION_KEY = {"PK": "MIGRATION#PENDING_GSI5", "SK": "STATUS"}
+STATS_SK = "COUNTS"
+UPLOADER_STATS_PREFIX = "STATS#UPLOADER#"
+
+# Attributes whose change on an APPROVED book changes the public catalog
+CATALOG_SOURCE_FIELDS = (
+    "status",
+    "title",
+    "author",
+    "description",
+    "fileSize",
+    "pageCount",
+    "language",
+    "coverPath",
+)
+
+
+def _book_id(book: Dict[str, Any]) -> str:
+    return book.get("bookId") or str(book.get("PK", ""))[len(BOOK_PK_PREFIX):]
+
+
+def pending_shard_key(book_id: str, shards: int = PENDING_SHARDS) -> str:
+    """GSI5PK of a pending book: a stable shard of the pending partition."""
+    return f"{PENDING_GSI5PK}#{zlib.crc32(book_id.encode('utf-8')) % shards}"
+
+
+def pending_partition_keys(shards: int = PENDING_SHARDS, legacy: bool = True) -> List[str]:
+    """Every GSI5PK a pending book may carry: each shard, then the legacy key."""
+    keys = [f"{PENDING_GSI5PK}#{shard}" for shard in range(shards)]
+    return keys + [PENDING_GSI5PK] if legacy else keys
+
+
+def get_pending_migration(table_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Marker written by scripts/migrate_pending_gsi5.py after a complete pass.
+
+    Returns:
+        The marker item ("shards", "completedAt"), or None if no pass has
+        completed yet (pending books without GSI5 keys may exist)
+    """
+    return get_dynamodb_table(table_name).get_item(Key=PENDING_MIGRATION_KEY).get("Item")
+
+
+def search_key_attributes(book: Dict[str, Any]) -> Dict[str, Any]:
+    """Desired GSI1 (title) / GSI2 (author) keys; only approved books are indexed."""
+    approved = book.get("status") == "APPROVED"
+    book_id = _book_id(book)
+    attributes: Dict[str, Any] = {}
+    for field, prefix, pk_name, sk_name in (
+        ("title", TITLE_GSI1_PREFIX, "GSI1PK", "GSI1SK"),
+        ("author", AUTHOR_GSI2_PREFIX, "GSI2PK", "GSI2SK"),
+    ):
+        normalized = normalize(book.get(field)) if approved else ""
+        attributes[pk_name] = f"{prefix}{normalized[0]}" if normalized else None
+        attributes[sk_name] = f"{normalized}#{book_id}" if normalized else None
+    return attributes
+
+
+def derive_index_attributes(book: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compute the derived attributes a book item should carry.
+
+    Args:
+        book: Book metadata item
+
+    Returns:
+        Attribute name -> desired value (None means the attribute must be absent)
+    """
+    pending = book.get("status") == "PENDING"
+    uploaded_at = book.get("uploadedAt") or book.get("createdAt")
+    return {
+        "GSI5PK": pending_shard_key(_book_id(book)) if pending else None,
+        "GSI5SK": uploaded_at if pending else None,
+        # Only items in the uploader index (GSI6PK is set with the draft)
+        "GSI6SK": uploader_sort_key(_book_id(book), uploaded_at) if book.get("GSI6PK") else None,
+        # No longer maintained (no query read it); removed when a book changes
+        "searchTokens": None,
+        **search_key_attributes(book),
+    }
+
+
+def derived_changes(book: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Derived attributes that differ from what the item currently holds.
+
+    An empty result means the item is already consistent, which is what keeps
+    the processor from reacting to its own writes forever.
+    """
+    changes = {}
+    for name, desired in derive_index_attributes(book).items():
+        current = book.get(name)
+        if isinstance(current, (set, frozenset)) or isinstance(desired, set):
+            same = set(current or ()) == set(desired or ())
+        else:
+            same = current == desired
+        if not same:
+            changes[name] = desired
+    return changes
+
+
+def status_counter_deltas(
+    old: Optional[Dict[str, Any]],
+    new: Optional[Dict[str, Any]],
+) -> Dict[str, int]:
+    """Per-status counter changes for one item transition."""
+    old_status = (old or {}).get("status")
+    new_status = (new or {}).get("status")
+    deltas: Dict[str, int] = {}
+    if old_status == new_status:
+        return deltas
+    if old_status:
+        deltas[old_status] = deltas.get(old_status, 0) - 1
+    if new_status:
+        deltas[new_status] = deltas.get(new_status, 0) + 1
+    return deltas
+
+
+def uploader_stats_key(uploader_id: str) -> Dict[str, str]:
+    """Key of the per-uploader counters item."""
+    return {"PK": f"{UPLOADER_STATS_PREFIX}{uploader_id}", "SK": STATS_SK}
+
+
+def counter_deltas(
+    old: Optional[Dict[str, Any]],
+    new: Optional[Dict[str, Any]],
+) -> Dict[Tuple[str, str], int]:
+    """
+    Counter changes for one item transition, for every counters item it touches.
+
+    Returns:
+        (counters item PK, status) -> delta
+    """
+    deltas: Dict[Tuple[str, str], int] = {}
+    for status, delta in status_counter_deltas(old, new).items():
+        deltas[(STATS_KEY["PK"], status)] = delta
+
+    # Uploader is immutable, but drafts from before GSI6 may lack it
+    old_uploader = (old or {}).get("uploaderId")
+    new_uploader = (new or {}).get("uploaderId")
+    old_status = (old or {}).get("status")
+    new_status = (new or {}).get("status")
+    if old_uploader == new_uploader and old_status == new_status:
+        return deltas
+    if old_uploader and old_status:
+        key = (f"{UPLOADER_STATS_PREFIX}{old_uploader}", old_status)
+        deltas[key] = deltas.get(key, 0) - 1
+    if new_uploader and new_status:
+        key = (f"{UPLOADER_STATS_PREFIX}{new_uploader}", new_status)
+        deltas[key] = deltas.get(key, 0) + 1
+    return {key: delta for key, delta in deltas.items() if delta}
+
+
+def affects_catalog(old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> bool:
+    """Whether a transition changes the approved catalog snapshot."""
+    was_approved = (old or {}).get("status") == "APPROVED"
+    is_approved = (new or {}).get("status") == "APPROVED"
+    if not was_approved and not is_approved:
+        return False
+    if was_approved != is_approved:
+        return True
+    return any((old or {}).get(f) != (new or {}).get(f) for f in CATALOG_SOURCE_FIELDS)
+
+
+def merge_deltas(target: Dict[str, int], deltas: Iterable) -> Dict[str, int]:
+    """Add (key, delta) pairs into target, dropping zero totals."""
+    for key, delta in deltas:
+        target[key] = target.get(key, 0) + delta
+        if target[key] == 0:
+            del target[key]
+    return target
+
+
+def get_status_counts(table_name: str, uploader_id: Optional[str] = None) -> Optional[Dict[str, int]]:
+    """
+    Current number of books per status (O(1) read of a counters item).
+
+    Args:
+        table_name: DynamoDB table name
+        uploader_id: Count only this uploader's books
+
+    Returns:
+        Status -> count (statuses never seen are absent), or None if the
+        counters were never written (stream processor not deployed yet)
+    """
+    table = get_dynamodb_table(table_name)
+    key = uploader_stats_key(uploader_id) if uploader_id else STATS_KEY
+    item = table.get_item(Key=key).get("Item")
+    if item is None:
+        return None
+    return {
+        name: int(value)
+        for name, value in item.items()
+        if name not in ("PK", "SK", "updatedAt")
+    }
+
+
+__all__ = [
+    "STATS_KEY",
+    "PENDING_MIGRATION_KEY",
+    "PENDING_GSI5PK",
+    "PENDING_SHARDS",
+    "pending_shard_key",
+    "pending_partition_keys",
+    "get_pending_migration",
+    "search_key_attributes",
+    "derive_index_attributes",
+    "derived_changes",
+    "status_counter_deltas",
+    "uploader_stats_key",
+    "counter_deltas",
+    "affects_catalog",
+    "merge_deltas",
+    "get_status_counts",
+]
@@ -6,15 +6,20 @@ Provides common DynamoDB operations and client initialization.
 
 import os
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-import boto3
+from botocore.exceptions import ClientError
+
+from .aws_clients import dynamodb_resource, get_client
 
 
 def get_dynamodb_table(table_name: str):
     """
     Get a DynamoDB table resource with proper region configuration.
 
+    The table is bound to the calling thread's shared resource (see
+    shared.aws_clients), so worker threads may call this freely.
+
     Args:
         table_name: DynamoDB table name
 
@@ -25,9 +30,7 @@ def get_dynamodb_table(table_name: str):
         table = get_dynamodb_table("OnlineLibrary")
         item = table.get_item(Key={"PK": "BOOK#123", "SK": "METADATA"})
     """
-    region = _get_aws_region()
-    dynamodb = boto3.resource("dynamodb", region_name=region)
-    return dynamodb.Table(table_name)
+    return dynamodb_resource(_get_aws_region()).Table(table_name)
 
 
 def get_dynamodb_client(region: Optional[str] = None):
@@ -44,9 +47,7 @@ def get_dynamodb_client(region: Optional[str] = None):
         client = get_dynamodb_client()
         response = client.query(TableName="OnlineLibrary", ...)
     """
-    if not region:
-        region = _get_aws_region()
-    return boto3.client("dynamodb", region_name=region)
+    return get_client("dynamodb", region or _get_aws_region())
 
 
 def _get_aws_region() -> str:
@@ -75,6 +76,7 @@ def put_draft_book_item(
     user_id: str,
     user_email: Optional[str],
     s3_key: str,
+    upload_id: Optional[str] = None,
 ) -> None:
     """
     Create a draft Book Metadata item in DynamoDB with status=UPLOADING.
@@ -90,6 +92,7 @@ def put_draft_book_item(
         user_id: Uploader user ID
         user_email: Optional uploader email
         s3_key: S3 object key for the file
+        upload_id: Optional S3 multipart upload ID (multipart uploads only)
 
     Example:
         put_draft_book_item(
@@ -106,7 +109,60 @@ def put_draft_book_item(
         )
     """
     table = get_dynamodb_table(table_name)
+    table.put_item(
+        Item=_build_draft_book_item(
+            book_id=book_id,
+            file_name=file_name,
+            file_size=file_size,
+            title=title,
+            author=author,
+            description=description,
+            user_id=user_id,
+            user_email=user_email,
+            s3_key=s3_key,
+            upload_id=upload_id,
+        )
+    )
+
 
+def put_draft_book_items(table_name: str, drafts: List[Dict[str, Any]]) -> None:
+    """
+    Create several draft Book Metadata items with batched BatchWriteItem calls.
+
+    The batch writer sends up to 25 items per request and resubmits
+    UnprocessedItems, so callers do not need to chunk or retry.
+
+    Args:
+        table_name: DynamoDB table name
+        drafts: List of keyword-argument dicts accepted by put_draft_book_item
+            (book_id, file_name, file_size, title, author, description,
+            user_id, user_email, s3_key and optional upload_id)
+
+    Example:
+        put_draft_book_items("OnlineLibrary", [
+            {"book_id": "book-1", "file_name": "a.pdf", "file_size": 1024, ...},
+            {"book_id": "book-2", "file_name": "b.epub", "file_size": 2048, ...},
+        ])
+    """
+    table = get_dynamodb_table(table_name)
+    with table.batch_writer() as batch:
+        for draft in drafts:
+            batch.put_item(Item=_build_draft_book_item(**draft))
+
+
+def _build_draft_book_item(
+    book_id: str,
+    file_name: str,
+    file_size: int,
+    title: str,
+    author: str,
+    description: Optional[str],
+    user_id: str,
+    user_email: Optional[str],
+    s3_key: str,
+    upload_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Build the draft item written by put_draft_book_item(s)."""
     now = datetime.now(timezone.utc)
     ttl_seconds = int((now + timedelta(hours=72)).timestamp())
     now_iso = now.isoformat()
@@ -123,17 +179,25 @@ def put_draft_book_item(
         "status": "UPLOADING",
         "fileSize": file_size,
         "s3Key": s3_key,
+        "uploadId": upload_id,
         "createdAt": now_iso,
         "uploadedAt": now_iso,
         "ttl": ttl_seconds,
         "GSI6PK": f"UPLOADER#{user_id}",
-        "GSI6SK": f"BOOK#{book_id}",
+        "GSI6SK": uploader_sort_key(book_id, now_iso),
     }
 
     # Remove optional fields that might be None
-    item = {k: v for k, v in item.items() if v is not None}
+    return {k: v for k, v in item.items() if v is not None}
 
-    table.put_item(Item=item)
+
+def uploader_sort_key(book_id: str, uploaded_at: Optional[str]) -> str:
+    """
+    GSI6SK of a book: upload time before the id, so a GSI6 query returns an
+    uploader's books in upload order. Items without a timestamp keep the
+    plain "BOOK#<bookId>" form.
+    """
+    return f"BOOK#{uploaded_at}#{book_id}" if uploaded_at else f"BOOK#{book_id}"
 
 
 def get_book_item(table_name: str, book_id: str) -> Optional[Dict[str, Any]]:
@@ -192,14 +256,34 @@ def update_book_status(
         )
     """
     table = get_dynamodb_table(table_name)
+    update_expr, expr_attr_names, expr_attr_values = _build_status_update(status, additional_fields)
+
+    response = table.update_item(
+        Key={
+            "PK": f"BOOK#{book_id}",
+            "SK": "METADATA",
+        },
+        UpdateExpression=update_expr,
+        ExpressionAttributeNames=expr_attr_names,
+        ExpressionAttributeValues=expr_attr_values,
+        ReturnValues="ALL_NEW",
+    )
+
+    return response.get("Attributes", {})
 
+
+def _build_status_update(
+    status: str,
+    fields: Dict[str, Any],
+) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+    """Build SET/REMOVE expression parts for a status update (None removes)."""
     set_parts = ["#status = :status"]
     remove_parts = []
     expr_attr_names = {"#status": "status"}
     expr_attr_values = {":status": status}
 
     # Add additional fields; skip None or remove them
-    for key, value in additional_fields.items():
+    for key, value in fields.items():
         expr_attr_names[f"#{key}"] = key
         if value is None:
             remove_parts.append(f"#{key}")
@@ -210,17 +294,57 @@ def update_book_status(
     update_expr = "SET " + ", ".join(set_parts)
     if remove_parts:
         update_expr += " REMOVE " + ", ".join(remove_parts)
+    return update_expr, expr_attr_names, expr_attr_values
 
-    response = table.update_item(
-        Key={
-            "PK": f"BOOK#{book_id}",
-            "SK": "METADATA",
-        },
-        UpdateExpression=update_expr,
-        ExpressionAttributeNames=expr_attr_names,
-        ExpressionAttributeValues=expr_attr_values,
-        ReturnValues="ALL_NEW",
-    )
+
+def transition_book_status(
+    table_name: str,
+    book_id: str,
+    from_status: str,
+    to_status: str,
+    **additional_fields,
+) -> Optional[Dict[str, Any]]:
+    """
+    Move a book from one status to another only if it is still in from_status.
+
+    The conditional write makes state changes safe against double clicks,
+    concurrent admins and retried workers: exactly one caller wins.
+
+    Args:
+        table_name: DynamoDB table name
+        book_id: Book ID to update
+        from_status: Status the item must currently have
+        to_status: New status
+        **additional_fields: Fields to set (None removes the attribute)
+
+    Returns:
+        Updated item, or None if the book does not exist or is no longer
+        in from_status
+
+    Example:
+        if not transition_book_status("OnlineLibrary", "book-123", "PENDING", "APPROVING"):
+            raise ApiError(ErrorCode.INVALID_REQUEST, "Book is not pending")
+    """
+    table = get_dynamodb_table(table_name)
+    update_expr, expr_attr_names, expr_attr_values = _build_status_update(to_status, additional_fields)
+    expr_attr_values[":from_status"] = from_status
+
+    try:
+        response = table.update_item(
+            Key={
+                "PK": f"BOOK#{book_id}",
+                "SK": "METADATA",
+            },
+            UpdateExpression=update_expr,
+            ConditionExpression="#status = :from_status",
+            ExpressionAttributeNames=expr_attr_names,
+            ExpressionAttributeValues=expr_attr_values,
+            ReturnValues="ALL_NEW",
+        )
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+            return None
+        raise
 
     return response.get("Attributes", {})
 
@@ -230,6 +354,8 @@ def query_by_gsi(
     gsi_name: str,
     pk_value: str,
     sk_prefix: Optional[str] = None,
+    newest_first: bool = False,
+    max_items: Optional[int] = None,
 ) -> list:
     """
     Query items by GSI.
@@ -239,6 +365,8 @@ def query_by_gsi(
         gsi_name: Global Secondary Index name
         pk_value: Partition key value
         sk_prefix: Optional sort key prefix for begins_with query
+        newest_first: Return items in descending sort key order
+        max_items: Stop once this many items were read
 
     Returns:
         List of items matching the query
@@ -282,13 +410,23 @@ def query_by_gsi(
         key_condition += f" AND begins_with({sk_name}, :sk)"
         expr_attr_values[":sk"] = sk_prefix
 
-    response = table.query(
-        IndexName=gsi_name,
-        KeyConditionExpression=key_condition,
-        ExpressionAttributeValues=expr_attr_values,
-    )
+    query_kwargs: Dict[str, Any] = {
+        "IndexName": gsi_name,
+        "KeyConditionExpression": key_condition,
+        "ExpressionAttributeValues": expr_attr_values,
+        "ScanIndexForward": not newest_first,
+    }
 
-    return response.get("Items", [])
+    items: list = []
+    while True:
+        if max_items is not None:
+            query_kwargs["Limit"] = max_items - len(items)
+        response = table.query(**query_kwargs)
+        items.extend(response.get("Items", []))
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key or (max_items is not None and len(items) >= max_items):
+            return items
+        query_kwargs["ExclusiveStartKey"] = last_key
 
 
 def get_book_metadata(table_name: str, book_id: str) -> Optional[Dict[str, Any]]:
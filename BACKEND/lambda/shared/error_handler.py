@@ -6,10 +6,15 @@ across all Lambda functions.
 """
 
 from dataclasses import dataclass
+from decimal import Decimal
 from enum import Enum
 from typing import Any, Dict, Optional
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
+import base64
+import gzip
+import hashlib
 import json
+import os
 
 
 class ErrorCode(str, Enum):
@@ -74,18 +79,105 @@ def build_error_response(
     }
 
 
+# Bodies smaller than this are sent uncompressed even if the client accepts gzip
+GZIP_MIN_BYTES = int(os.getenv("RESPONSE_GZIP_MIN_BYTES", "1024"))
+
+
+def _json_default(value: Any) -> Any:
+    """
+    Encode types json.dumps does not handle natively.
+
+    Decimal values coming back from DynamoDB become int when integral and
+    float otherwise, so fileSize stays 1024 instead of 1024.0.
+    """
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_json(body: Any) -> str:
+    """Serialize a response body in a single pass (Decimal/set/datetime aware)."""
+    return json.dumps(body, default=_json_default, separators=(",", ":"), ensure_ascii=False)
+
+
+def get_request_header(event: Optional[Dict[str, Any]], name: str) -> Optional[str]:
+    """Case-insensitive request header lookup (HTTP API lowercases header names)."""
+    if not event:
+        return None
+    headers = event.get("headers") or {}
+    value = headers.get(name.lower())
+    if value is not None:
+        return value
+    name_lower = name.lower()
+    for key, header_value in headers.items():
+        if key.lower() == name_lower:
+            return header_value
+    return None
+
+
+def _accepts_gzip(event: Optional[Dict[str, Any]]) -> bool:
+    """Check whether the request's Accept-Encoding allows gzip."""
+    accept_encoding = get_request_header(event, "Accept-Encoding")
+    if not accept_encoding:
+        return False
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def compute_etag(payload: bytes) -> str:
+    """Strong ETag over the serialized (uncompressed) response body."""
+    return '"' + hashlib.sha256(payload).hexdigest()[:32] + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag.
+
+    Uses weak comparison as required for If-None-Match, and treats the
+    gzip variant ("...-gz") as the same representation.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.strip('"')
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        candidate = candidate.strip('"')
+        if candidate.endswith("-gz"):
+            candidate = candidate[:-3]
+        if candidate == opaque:
+            return True
+    return False
+
+
 def api_response(
     status_code: int,
     body: Dict[str, Any],
     headers: Optional[Dict[str, str]] = None,
+    event: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
     Build a standardized API Gateway HTTP API response.
 
     Args:
         status_code: HTTP status code
-        body: Response body as dictionary
+        body: Response body as dictionary (may contain Decimal, set, datetime)
         headers: Optional custom headers
+        event: Optional request event; when given, 200 responses carry a
+            strong ETag and return 304 if If-None-Match matches, and bodies
+            of at least GZIP_MIN_BYTES are gzipped if Accept-Encoding allows it
 
     Returns:
         API Gateway HTTP API response format
@@ -97,10 +189,42 @@ def api_response(
     if headers:
         default_headers.update(headers)
 
+    serialized = encode_json(body)
+
+    if event is not None:
+        default_headers["Vary"] = "Accept-Encoding"
+        encoded = serialized.encode("utf-8")
+        etag = None
+
+        if status_code == 200:
+            etag = compute_etag(encoded)
+            default_headers.setdefault("Cache-Control", "private, no-cache")
+            default_headers["ETag"] = etag
+            if _etag_matches(get_request_header(event, "If-None-Match"), etag):
+                not_modified_headers = {
+                    k: v for k, v in default_headers.items() if k != "Content-Type"
+                }
+                return {
+                    "statusCode": 304,
+                    "headers": not_modified_headers,
+                    "body": "",
+                }
+
+        if len(encoded) >= GZIP_MIN_BYTES and _accepts_gzip(event):
+            default_headers["Content-Encoding"] = "gzip"
+            if etag:
+                default_headers["ETag"] = etag[:-1] + '-gz"'
+            return {
+                "statusCode": status_code,
+                "headers": default_headers,
+                "body": base64.b64encode(gzip.compress(encoded, compresslevel=5)).decode("ascii"),
+                "isBase64Encoded": True,
+            }
+
     return {
         "statusCode": status_code,
         "headers": default_headers,
-        "body": json.dumps(body),
+        "body": serialized,
     }
 
 
@@ -1,48 +1,125 @@
 """
 Shared structured logging utility for Lambda functions.
 
-Provides JSON-formatted logging with consistent fields for CloudWatch.
+Provides JSON-formatted logging with consistent fields for CloudWatch, and
+CloudWatch Embedded Metric Format (EMF) metrics buffered per invocation.
 """
 
+import functools
 import json
 import logging
-from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+import os
+import random
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+# Attributes every LogRecord carries; anything else was passed via `extra=`
+_RESERVED_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", (), None)).keys()
+) | {"message", "asctime", "taskName"}
+
+# True until the first record is formatted (or the first emit_metrics
+# invocation ends), so every handler logs one coldStart line per environment
+_cold_start = True
+
+# Fraction of INFO (and DEBUG) records to keep; WARNING and above are always kept
+LOG_INFO_SAMPLE_RATE = float(os.getenv("LOG_INFO_SAMPLE_RATE", "1.0"))
+
+
+def mark_warm() -> None:
+    """Mark the execution environment as warm (no longer a cold start)."""
+    global _cold_start
+    _cold_start = False
 
 
 class JsonFormatter(logging.Formatter):
-    """Custom formatter that outputs logs as JSON."""
+    """
+    Custom formatter that outputs logs as JSON.
+
+    Static fields (function name/version) are serialized once per formatter,
+    the timestamp comes from the record itself, and every non-standard record
+    attribute passed via `extra=` is included.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        static_fields: Dict[str, Any] = {}
+        function_name = os.getenv("AWS_LAMBDA_FUNCTION_NAME")
+        if function_name:
+            static_fields["function"] = function_name
+        function_version = os.getenv("AWS_LAMBDA_FUNCTION_VERSION")
+        if function_version:
+            static_fields["functionVersion"] = function_version
+        # Pre-serialized fragment without braces, spliced into every line
+        self._static_fragment = json.dumps(static_fields)[1:-1]
+        self._cached_second = -1
+        self._cached_prefix = ""
+
+    def _format_timestamp(self, created: float) -> str:
+        """Format record.created as ISO8601 UTC, caching the per-second prefix."""
+        second = int(created)
+        if second != self._cached_second:
+            self._cached_second = second
+            self._cached_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        return f"{self._cached_prefix}.{int((created - second) * 1_000_000):06d}+00:00"
 
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON."""
         log_data: Dict[str, Any] = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": self._format_timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
+            "coldStart": _cold_start,
         }
+        if _cold_start:
+            mark_warm()
 
         # Add exception info if present
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
 
-        # Add extra fields if present
-        if hasattr(record, "requestId"):
-            log_data["requestId"] = record.requestId
-        if hasattr(record, "userId"):
-            log_data["userId"] = record.userId
-        if hasattr(record, "action"):
-            log_data["action"] = record.action
-        if hasattr(record, "status"):
-            log_data["status"] = record.status
+        # Add every field passed via extra= (requestId, userId, count, ...)
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_RECORD_ATTRS and key not in log_data:
+                log_data[key] = value
+
+        body = json.dumps(log_data, default=str)
+        if not self._static_fragment:
+            return body
+        return "{" + self._static_fragment + ", " + body[1:]
+
+
+class InfoSamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of INFO/DEBUG records to cut log volume under load.
+
+    WARNING and above, and audit records written with `log_action`, are
+    always kept.
+    """
+
+    def __init__(self, sample_rate: float = 1.0) -> None:
+        super().__init__()
+        self.sample_rate = sample_rate
 
-        return json.dumps(log_data)
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.sample_rate >= 1.0 or record.levelno >= logging.WARNING:
+            return True
+        if getattr(record, "action", None):
+            return True
+        return random.random() < self.sample_rate
 
 
 def get_logger(name: str) -> logging.Logger:
     """
     Get a configured logger with JSON formatting.
 
+    The JSON handler is attached once per logger; repeated calls return the
+    already configured logger.
+
     Args:
         name: Logger name (typically __name__)
 
@@ -52,12 +129,15 @@ def get_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
 
-    # Remove existing handlers to avoid duplicates
-    logger.handlers.clear()
+    if any(getattr(h, "_shared_json_handler", False) for h in logger.handlers):
+        return logger
 
     # Add handler with JSON formatter
     handler = logging.StreamHandler()
+    handler._shared_json_handler = True
     handler.setFormatter(JsonFormatter())
+    if LOG_INFO_SAMPLE_RATE < 1.0:
+        handler.addFilter(InfoSamplingFilter(LOG_INFO_SAMPLE_RATE))
     logger.addHandler(handler)
 
     return logger
@@ -102,3 +182,153 @@ def log_action(
         setattr(log_record, key, value)
 
     logger.handle(log_record)
+
+
+# === CloudWatch Embedded Metric Format (EMF) ===
+
+METRICS_NAMESPACE = os.getenv("METRICS_NAMESPACE", "OnlineLibrary")
+
+# EMF accepts at most 100 values per metric per document
+_MAX_VALUES_PER_METRIC = 100
+
+
+class MetricsLogger:
+    """
+    Buffer metrics for one invocation and flush them as a single EMF document.
+
+    CloudWatch extracts the metrics from the log line asynchronously, so
+    handlers can publish business latency without PutMetricData calls.
+    """
+
+    def __init__(self, namespace: Optional[str] = None) -> None:
+        self.namespace = namespace or METRICS_NAMESPACE
+        self.reset()
+
+    def reset(self, **dimensions: str) -> None:
+        """Drop buffered metrics and start a new invocation scope."""
+        self._dimensions: Dict[str, str] = {k: str(v) for k, v in dimensions.items()}
+        self._metrics: Dict[str, Dict[str, Any]] = {}
+        self._properties: Dict[str, Any] = {}
+
+    def add_dimension(self, name: str, value: str) -> None:
+        """Add a dimension (e.g. action) to every metric in this scope."""
+        self._dimensions[name] = str(value)
+
+    def set_property(self, name: str, value: Any) -> None:
+        """Attach a searchable, non-metric field to the EMF document."""
+        self._properties[name] = value
+
+    def put_metric(self, name: str, value: float, unit: str = "Count") -> None:
+        """
+        Record a metric value.
+
+        Args:
+            name: Metric name (e.g. "SignTime")
+            value: Metric value
+            unit: CloudWatch unit (Count, Milliseconds, Bytes, ...)
+        """
+        entry = self._metrics.setdefault(name, {"unit": unit, "values": []})
+        entry["values"].append(value)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        """Increment a counter metric."""
+        self.put_metric(name, value, unit="Count")
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Time the wrapped block and record it in milliseconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.put_metric(name, round((time.perf_counter() - start) * 1000, 3), unit="Milliseconds")
+
+    def serialize(self) -> Optional[Dict[str, Any]]:
+        """Build the EMF document, or None if nothing was recorded."""
+        if not self._metrics:
+            return None
+
+        dimension_sets: List[List[str]] = [
+            [name for name in ("handler", "status") if name in self._dimensions]
+        ]
+        all_dimensions = list(self._dimensions.keys())
+        if sorted(all_dimensions) != sorted(dimension_sets[0]):
+            dimension_sets.append(all_dimensions)
+
+        document: Dict[str, Any] = {
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [
+                    {
+                        "Namespace": self.namespace,
+                        "Dimensions": dimension_sets,
+                        "Metrics": [
+                            {"Name": name, "Unit": entry["unit"]}
+                            for name, entry in self._metrics.items()
+                        ],
+                    }
+                ],
+            },
+        }
+        document.update(self._properties)
+        document.update(self._dimensions)
+        for name, entry in self._metrics.items():
+            values = entry["values"][:_MAX_VALUES_PER_METRIC]
+            document[name] = values[0] if len(values) == 1 else values
+
+        return document
+
+    def flush(self) -> None:
+        """Write buffered metrics to stdout as one EMF document and reset."""
+        document = self.serialize()
+        if document is not None:
+            sys.stdout.write(json.dumps(document, default=str) + "\n")
+            sys.stdout.flush()
+        self.reset(**self._dimensions)
+
+
+_metrics = MetricsLogger()
+
+
+def get_metrics() -> MetricsLogger:
+    """Get the metrics buffer for the current invocation."""
+    return _metrics
+
+
+def emit_metrics(handler_name: str):
+    """
+    Decorator that scopes metrics to one invocation and flushes them at the end.
+
+    Adds `handler` and `status` (SUCCESS/ERROR) dimensions and an `Invocations`
+    counter so every flushed document carries at least one metric.
+
+    Usage:
+        @emit_metrics("searchBooks")
+        def handler(event, context):
+            with get_metrics().timer("QueryTime"):
+                ...
+    """
+    def decorator(handler_func):
+        @functools.wraps(handler_func)
+        def wrapper(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+            metrics = get_metrics()
+            metrics.reset(handler=handler_name)
+            request_id = getattr(context, "aws_request_id", None) or getattr(context, "request_id", None)
+            if request_id:
+                metrics.set_property("requestId", request_id)
+
+            status = "ERROR"
+            try:
+                response = handler_func(event, context)
+                status_code = response.get("statusCode", 200) if isinstance(response, dict) else 200
+                status = "SUCCESS" if status_code < 400 else "ERROR"
+                return response
+            finally:
+                metrics.add_dimension("status", status)
+                metrics.increment("Invocations")
+                metrics.flush()
+                mark_warm()
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,77 @@
+"""
+Range reading of approved PDFs.
+
+Readers do not download a whole book before showing page 1: PDF.js loads
+the approved PDF from its signed CloudFront URL with HTTP Range requests
+(disableRange=false), fetching the trailer and xref first and then only the
+byte ranges of the pages being displayed (disableAutoFetch=true). S3 and
+CloudFront serve ranges of the original object, so nothing is copied.
+
+approval_worker records the object length and whether the PDF is
+linearized (page 1 renders from the first range alone) on the book item;
+get_read_url returns them with the PDF.js options for ?mode=range.
+
+Environment variables (all optional):
+- PDF_RANGE_CHUNK_BYTES: PDF.js rangeChunkSize, default 64KB
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+from .aws_clients import s3_client
+
+PDF_RANGE_CHUNK_BYTES = int(os.getenv("PDF_RANGE_CHUNK_BYTES", str(64 * 1024)))
+LINEARIZED_PROBE_BYTES = 1024
+
+
+def probe_pdf(bucket: str, key: str) -> Dict[str, Any]:
+    """
+    Length and linearization of a stored PDF (one HEAD, one 1KB range GET).
+
+    Args:
+        bucket: S3 bucket name
+        key: Key of the approved PDF (public/books/...)
+
+    Returns:
+        {"contentLength": int, "linearized": bool}
+    """
+    s3 = s3_client()
+    size = s3.head_object(Bucket=bucket, Key=key)["ContentLength"]
+    head = b""
+    if size:
+        head = s3.get_object(
+            Bucket=bucket,
+            Key=key,
+            Range=f"bytes=0-{min(size, LINEARIZED_PROBE_BYTES) - 1}",
+        )["Body"].read()
+    return {"contentLength": size, "linearized": b"/Linearized" in head}
+
+
+def pdfjs_range_options(content_length: Optional[int] = None) -> Dict[str, Any]:
+    """
+    PDF.js getDocument() options for range reading.
+
+    Args:
+        content_length: Object length recorded at approval; lets PDF.js skip
+            the initial request it otherwise makes to learn the length
+
+    Returns:
+        Options to merge into getDocument({url, ...})
+    """
+    options: Dict[str, Any] = {
+        "disableRange": False,
+        # Streaming would download the whole file in the background
+        "disableStream": True,
+        "disableAutoFetch": True,
+        "rangeChunkSize": PDF_RANGE_CHUNK_BYTES,
+    }
+    if content_length:
+        options["length"] = int(content_length)
+    return options
+
+
+__all__ = [
+    "PDF_RANGE_CHUNK_BYTES",
+    "probe_pdf",
+    "pdfjs_range_options",
+]
@@ -0,0 +1,497 @@
+"""
+In-memory ranked search index over the approved catalog, kept in module scope.
+
+search_books used to filter the whole decoded catalog with a substring test
+on every request. With SEARCH_INDEX_ENABLED a warm container instead keeps
+an inverted index built from the catalog snapshot (shared.catalog):
+
+- Book ids are interned into dense ints (doc ids)
+- Terms are the normalized words (shared.text) of title, author and
+  description. Each posting stores the doc id and its BM25F term weight
+  (per-field length-normalized tf, title x3, author x1.5, saturated with
+  k1), precomputed at build time in parallel array('I') / array('f')
+- Postings are compact: a frozen base where all postings live in one pair of
+  arrays with per-term offsets, plus small per-term delta arrays
+
+A query word matches the exact word. The last query word (still being typed)
+and words that are not in the index also match the PREFIX_EXPANSIONS most
+frequent vocabulary words they are a prefix of (bisect on the sorted
+vocabulary); failing that, words within edit distance 1 (2 for long words)
+found through a symmetric-delete dictionary built on first use. Only the
+FUZZY_MAX_WORDS words in the most books are in the dictionary (a document
+frequency floor that only rises for large vocabularies), and a variant of
+a single word maps to the word itself rather than a list, which bounds it
+to tens of MB.
+Every query word must match (AND); the score is the sum over query words of
+idf x term weight x match penalty (document frequencies exclude tombstoned
+books), and the page is picked with a top-k heap
+(ties: newest approval first), so large result sets are never fully sorted.
+Score maps of recently queried words stay cached until the next refresh.
+
+When the snapshot version changes, refresh() diffs the new rows against the
+indexed ones: removed or edited books are tombstoned, new or edited books are
+appended as new doc ids into the deltas, and snapshot positions are
+rewritten. Once tombstones or deltas grow past COMPACT_RATIO of the index it
+is rebuilt.
+
+scripts/bench_search_index.py measures memory per 10k books and latency.
+"""
+
+import heapq
+import math
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter, OrderedDict
+from itertools import compress, repeat
+from operator import add, ge, mul
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .catalog import catalog_version, load_catalog
+from .logger import get_logger, get_metrics
+from .text import tokenize
+
+logger = get_logger(__name__)
+
+# Rebuild when tombstones or delta postings exceed this share of the index
+COMPACT_RATIO = 0.25
+
+FIELD_BOOSTS = {"title": 3.0, "author": 1.5, "description": 1.0}
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+PREFIX_EXPANSIONS = 32
+PREFIX_WEIGHT = 0.8
+FUZZY_MIN_LENGTH = 4
+FUZZY_LONG_LENGTH = 8
+FUZZY_WEIGHT = 0.5  # per edit
+# Typo targets are capped to the most frequent words: every word costs up to
+# ~40 delete variants in the symmetric-delete dictionary, and in a large
+# catalog most of the vocabulary occurs in one book (names, foreign words)
+FUZZY_MAX_WORDS = 10_000
+MAX_QUERY_WORDS = 8
+# Score maps of recent query words kept between requests, bounded by entries
+WORD_CACHE_ENTRIES = 400_000
+# Bisect a word's postings for the remaining candidates when it has this many
+# times more postings than candidates x expansions
+PROBE_RATIO = 8
+
+# Warm-container indexes, keyed by catalog bucket
+_indexes: Dict[str, "SearchIndex"] = {}
+
+
+def _max_edits(word: str) -> int:
+    if len(word) < FUZZY_MIN_LENGTH:
+        return 0
+    return 2 if len(word) >= FUZZY_LONG_LENGTH else 1
+
+
+def _deletes(word: str, edits: int) -> Set[str]:
+    """Every string obtained by deleting up to `edits` characters."""
+    variants = {word}
+    frontier = {word}
+    for _ in range(edits):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        variants |= frontier
+    return variants
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance, or limit + 1 once it exceeds limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SearchIndex:
+    """BM25F-ranked AND search with prefix and typo tolerance over catalog entries."""
+
+    def __init__(self, books: List[Dict[str, Any]], version: Optional[str] = None) -> None:
+        self.version = version
+        self._build(books)
+
+    # ----- construction -----
+
+    @staticmethod
+    def _fields(book: Dict[str, Any]) -> Dict[str, List[str]]:
+        return {field: tokenize(book.get(field)) for field in FIELD_BOOSTS}
+
+    def _doc_terms(self, fields: Dict[str, List[str]]) -> Dict[str, float]:
+        """Saturated BM25F weight of every word of a book's tokenized fields."""
+        weighted: Dict[str, float] = {}
+        for field, words in fields.items():
+            if not words:
+                continue
+            norm = FIELD_BOOSTS[field] / (1 - BM25_B + BM25_B * len(words) / self._avg_length[field])
+            for word, count in Counter(words).items():
+                weighted[word] = weighted.get(word, 0.0) + count * norm
+        return {word: tf * (BM25_K1 + 1) / (tf + BM25_K1) for word, tf in weighted.items()}
+
+    def _build(self, books: List[Dict[str, Any]]) -> None:
+        self._books: List[Optional[Dict[str, Any]]] = list(books)
+        self._doc_of: Dict[str, int] = {}
+        self._deleted: Set[int] = set()
+        self._delta: Dict[str, Tuple[array, array]] = {}
+        self._delta_size = 0
+        # Tombstoned postings per word, subtracted from document frequencies
+        self._dead: Counter = Counter()
+        self._fuzzy: Optional[Dict[str, Any]] = None
+        self._fuzzy_words: Set[str] = set()
+        self._word_cache: "OrderedDict[str, Tuple[float, Dict[int, float]]]" = OrderedDict()
+        self._word_cache_size = 0
+
+        tokenized = [self._fields(book) for book in self._books]
+        count = max(len(tokenized), 1)
+        self._avg_length = {
+            field: max(sum(len(fields[field]) for fields in tokenized) / count, 1.0)
+            for field in FIELD_BOOSTS
+        }
+
+        postings: Dict[str, Tuple[List[int], List[float]]] = {}
+        for doc_id, (book, fields) in enumerate(zip(self._books, tokenized)):
+            self._doc_of[book.get("bookId")] = doc_id
+            for word, weight in self._doc_terms(fields).items():
+                entry = postings.get(word)
+                if entry is None:
+                    entry = postings[word] = ([], [])
+                entry[0].append(doc_id)
+                entry[1].append(weight)
+
+        # Frozen base: word -> slot, slot -> [start, end) in the postings arrays
+        self._vocab: List[str] = sorted(postings)
+        self._slot: Dict[str, int] = {}
+        self._starts = array("I")
+        self._ends = array("I")
+        self._docs = array("I")
+        self._weights = array("f")
+        for slot, word in enumerate(self._vocab):
+            docs, weights = postings[word]
+            self._slot[word] = slot
+            self._starts.append(len(self._docs))
+            self._docs.extend(docs)
+            self._weights.extend(weights)
+            self._ends.append(len(self._docs))
+
+        # Position in the snapshot as "higher is newer", so it can break score ties directly
+        self._recency = array("I", range(len(self._books), 0, -1))
+
+    def refresh(self, books: List[Dict[str, Any]], version: Optional[str] = None) -> Dict[str, int]:
+        """
+        Bring the index up to date with a newer snapshot.
+
+        Returns:
+            Counts of added/removed books and whether the index was compacted
+        """
+        incoming = {book.get("bookId"): book for book in books}
+        removed = 0
+        for book_id, doc_id in list(self._doc_of.items()):
+            if incoming.get(book_id) != self._books[doc_id]:
+                self._deleted.add(doc_id)
+                self._dead.update({word for words in self._fields(self._books[doc_id]).values() for word in words})
+                self._books[doc_id] = None
+                del self._doc_of[book_id]
+                removed += 1
+
+        added = 0
+        grown: Set[str] = set()
+        for book_id, book in incoming.items():
+            if book_id in self._doc_of:
+                continue
+            doc_id = len(self._books)
+            self._books.append(book)
+            self._doc_of[book_id] = doc_id
+            for word, weight in self._doc_terms(self._fields(book)).items():
+                if word not in self._slot and word not in self._delta:
+                    insort(self._vocab, word)
+                docs, weights = self._delta.setdefault(word, (array("I"), array("f")))
+                docs.append(doc_id)
+                weights.append(weight)
+                self._delta_size += 1
+                grown.add(word)
+            added += 1
+
+        if self._fuzzy is not None:
+            # New words become typo targets while the cap allows
+            for word in sorted(grown - self._fuzzy_words):
+                if len(self._fuzzy_words) >= FUZZY_MAX_WORDS:
+                    break
+                if len(word) >= FUZZY_MIN_LENGTH - 1:
+                    self._add_fuzzy(word)
+
+        self.version = version
+        compacted = (
+            len(self._deleted) > COMPACT_RATIO * len(self._books)
+            or self._delta_size > COMPACT_RATIO * max(len(self._docs), 1)
+        )
+        if compacted:
+            self._build(books)
+        else:
+            recency = array("I", [0]) * len(self._books)
+            for position, book in enumerate(books):
+                recency[self._doc_of[book.get("bookId")]] = len(books) - position
+            self._recency = recency
+            self._word_cache.clear()
+            self._word_cache_size = 0
+        return {"added": added, "removed": removed, "compacted": int(compacted)}
+
+    # ----- term lookup -----
+
+    def __len__(self) -> int:
+        return len(self._doc_of)
+
+    def _postings(self, word: str) -> Tuple[Iterable[int], Iterable[float]]:
+        slot = self._slot.get(word)
+        if slot is not None:
+            start, end = self._starts[slot], self._ends[slot]
+            docs, weights = self._docs[start:end], self._weights[start:end]
+        else:
+            docs, weights = array("I"), array("f")
+        delta = self._delta.get(word)
+        if delta:
+            docs, weights = docs + delta[0], weights + delta[1]
+        return docs, weights
+
+    def _document_frequency(self, word: str) -> int:
+        """Live books containing word (postings minus tombstoned ones)."""
+        return self._term_size(word) - self._dead.get(word, 0)
+
+    def _idf(self, word: str) -> float:
+        total = len(self._doc_of)
+        document_frequency = self._document_frequency(word)
+        return math.log(1 + (total - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def _add_fuzzy(self, word: str) -> None:
+        self._fuzzy_words.add(word)
+        for variant in _deletes(word, _max_edits(word)):
+            words = self._fuzzy.get(variant)
+            if words is None:
+                self._fuzzy[variant] = word
+            elif isinstance(words, str):
+                self._fuzzy[variant] = (words, word)
+            else:
+                self._fuzzy[variant] = words + (word,)
+
+    def _fuzzy_matches(self, word: str) -> List[Tuple[str, int]]:
+        """Vocabulary words within the allowed edit distance of word."""
+        limit = _max_edits(word)
+        if not limit:
+            return []
+        if self._fuzzy is None:
+            # Built on the first misspelled query of this container
+            self._fuzzy = {}
+            eligible = [vocab_word for vocab_word in self._vocab if len(vocab_word) >= FUZZY_MIN_LENGTH - 1]
+            if len(eligible) > FUZZY_MAX_WORDS:
+                eligible = heapq.nlargest(FUZZY_MAX_WORDS, eligible, key=self._document_frequency)
+            for vocab_word in eligible:
+                self._add_fuzzy(vocab_word)
+        candidates: Set[str] = set()
+        for variant in _deletes(word, limit):
+            words = self._fuzzy.get(variant)
+            if isinstance(words, str):
+                candidates.add(words)
+            elif words:
+                candidates.update(words)
+        matches = []
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, limit)
+            if distance <= limit:
+                matches.append((candidate, distance))
+        return matches
+
+    def _term_size(self, word: str) -> int:
+        slot = self._slot.get(word)
+        size = self._ends[slot] - self._starts[slot] if slot is not None else 0
+        delta = self._delta.get(word)
+        return size + (len(delta[0]) if delta else 0)
+
+    def _expand(self, word: str, prefix: bool) -> List[Tuple[str, float]]:
+        """Index words a query word matches, with their match weight."""
+        if self._term_size(word) and not prefix:
+            return [(word, 1.0)]
+        end = bisect_left(self._vocab, word + "\x7f")
+        completions = self._vocab[bisect_left(self._vocab, word):end]
+        if completions:
+            # The most frequent completions of a partially typed word
+            completions = heapq.nlargest(PREFIX_EXPANSIONS, completions, key=self._term_size)
+            return [(term, 1.0 if term == word else PREFIX_WEIGHT) for term in completions]
+        return [(match, FUZZY_WEIGHT ** distance) for match, distance in self._fuzzy_matches(word)]
+
+    def _word_scores(self, key: Tuple[str, bool], expansions: List[Tuple[str, float]]) -> Tuple[float, Dict[int, float]]:
+        """(factor, doc -> partial score) for one query word; score = factor x value."""
+        cached = self._word_cache.get(key)
+        if cached is not None:
+            self._word_cache.move_to_end(key)
+            return cached
+        result = self._score_map(expansions)
+        self._word_cache[key] = result
+        self._word_cache_size += len(result[1])
+        while self._word_cache_size > WORD_CACHE_ENTRIES and len(self._word_cache) > 1:
+            _, (_, evicted) = self._word_cache.popitem(last=False)
+            self._word_cache_size -= len(evicted)
+        return result
+
+    def _score_map(self, expansions: List[Tuple[str, float]]) -> Tuple[float, Dict[int, float]]:
+        if len(expansions) == 1:
+            term, weight = expansions[0]
+            docs, weights = self._postings(term)
+            # Single term: build the map in C and apply idf x weight when totalling
+            return weight * self._idf(term), dict(zip(docs, weights))
+
+        # A doc matching several completions scores by the rarest one: maps
+        # are merged in C in ascending idf order, so later updates win
+        scores: Dict[int, float] = {}
+        scaled = []
+        for term, weight in expansions:
+            docs, weights = self._postings(term)
+            scaled.append((weight * self._idf(term), docs, weights))
+        for factor, docs, weights in sorted(scaled, key=lambda entry: entry[0]):
+            scores.update(zip(docs, map(mul, weights, repeat(factor))))
+        return 1.0, scores
+
+    def _probe(self, expansions: List[Tuple[str, float]], candidates: Set[int]) -> Dict[int, float]:
+        """Scaled partial scores of the candidates only, by bisecting the sorted base postings."""
+        scores: Dict[int, float] = {}
+        docs, weights = self._docs, self._weights
+        for term, weight in expansions:
+            factor = weight * self._idf(term)
+            slot = self._slot.get(term)
+            if slot is not None:
+                start, end = self._starts[slot], self._ends[slot]
+                for doc_id in candidates:
+                    position = bisect_left(docs, doc_id, start, end)
+                    if position < end and docs[position] == doc_id:
+                        value = weights[position] * factor
+                        if value > scores.get(doc_id, 0.0):
+                            scores[doc_id] = value
+            delta = self._delta.get(term)
+            if delta:
+                for doc_id, value in zip(*delta):
+                    value *= factor
+                    if doc_id in candidates and value > scores.get(doc_id, 0.0):
+                        scores[doc_id] = value
+        return scores
+
+    # ----- queries -----
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Books matching every query word, best BM25F score first.
+
+        Returns:
+            Tuple of (page of catalog entries, total matches)
+        """
+        words = list(dict.fromkeys(tokenize(query)))[-MAX_QUERY_WORDS:]
+        recency = self._recency
+        if not words:
+            doc_ids = sorted(self._doc_of.values(), key=recency.__getitem__, reverse=True)
+            return [self._books[doc_id] for doc_id in doc_ids[offset:offset + limit]], len(doc_ids)
+
+        # Only the last word is still being typed; earlier ones complete as
+        # prefixes only when they are not a word of the index themselves.
+        # Words are then processed rarest first.
+        plans = []
+        for position, word in enumerate(words):
+            key = (word, position == len(words) - 1)
+            expansions = self._expand(*key)
+            if not expansions:
+                return [], 0
+            plans.append((sum(self._term_size(term) for term, _ in expansions), key, expansions))
+        plans.sort(key=lambda plan: plan[0])
+
+        _, key, expansions = plans[0]
+        partials = [self._word_scores(key, expansions)]
+        candidates = set(partials[0][1])
+        candidates.difference_update(self._deleted)
+        for size, key, expansions in plans[1:]:
+            if not candidates:
+                break
+            if key not in self._word_cache and size > PROBE_RATIO * len(candidates) * len(expansions):
+                # A common word after a rare one: look up the few candidates
+                # instead of building its full score map
+                partial = (1.0, self._probe(expansions, candidates))
+            else:
+                partial = self._word_scores(key, expansions)
+            candidates.intersection_update(partial[1].keys())
+            partials.append(partial)
+
+        # Totals are built with map() so the per-candidate work stays in C.
+        # A float-only heap finds the k-th best score first, so (score,
+        # recency, doc) keys are only built for docs that can make the page;
+        # ties go to the newest approval.
+        doc_ids = list(candidates)
+        factor, scores = partials[0]
+        totals = map(mul, map(scores.__getitem__, doc_ids), repeat(factor))
+        for factor, scores in partials[1:]:
+            totals = map(add, totals, map(mul, map(scores.__getitem__, doc_ids), repeat(factor)))
+        totals = list(totals)
+        page = offset + limit
+        if page <= 0:
+            return [], len(doc_ids)
+        if len(doc_ids) > page:
+            threshold = heapq.nlargest(page, totals)[-1]
+            selected = list(compress(range(len(doc_ids)), map(ge, totals, repeat(threshold))))
+            totals = list(map(totals.__getitem__, selected))
+            doc_ids = list(map(doc_ids.__getitem__, selected))
+            total = len(candidates)
+        else:
+            total = len(doc_ids)
+        keyed = zip(totals, map(recency.__getitem__, doc_ids), doc_ids)
+        top = heapq.nlargest(page, keyed)
+        return [self._books[doc_id] for _, _, doc_id in top[offset:]], total
+
+
+def get_search_index(bucket: str) -> Optional[SearchIndex]:
+    """
+    Warm-container index for the bucket's catalog, refreshed by version.
+
+    Logs and counts a hit when the cached index already matches the current
+    catalog version, a miss when it had to be built or refreshed.
+
+    Returns:
+        The index, or None if no catalog snapshot could be loaded
+    """
+    books = load_catalog(bucket)
+    if books is None:
+        return None
+    version = catalog_version(bucket)
+
+    index = _indexes.get(bucket)
+    if index is not None and index.version == version:
+        get_metrics().increment("SearchIndexHits")
+        logger.debug(f"Search index hit (version {version})")
+        return index
+
+    get_metrics().increment("SearchIndexMisses")
+    if index is None:
+        index = SearchIndex(books, version)
+        _indexes[bucket] = index
+        logger.info(f"Search index miss: built version {version} ({len(index)} books)")
+    else:
+        previous = index.version
+        changes = index.refresh(books, version)
+        logger.info(f"Search index miss: refreshed {previous} -> {version} {changes}")
+    return index
+
+
+def clear_search_indexes() -> None:
+    """Drop the warm-container indexes (used by tests)."""
+    _indexes.clear()
+
+
+__all__ = [
+    "SearchIndex",
+    "edit_distance",
+    "get_search_index",
+    "clear_search_indexes",
+]
@@ -0,0 +1,169 @@
+"""
+Search-box suggestions from a sorted prefix array over the approved catalog.
+
+Typing in the search box must not run a full search per keystroke. A warm
+container builds, once per catalog snapshot version, a sorted array of
+suggestion keys and answers a prefix with two bisects:
+
+- Entries: every approved title (newest first) and every distinct author
+  (with its number of approved books)
+- Keys: the normalized text of each entry (shared.text), plus the text from
+  each later word on ("phieu luu ky" for "Dế Mèn Phiêu Lưu Ký", up to
+  MAX_WORD_KEYS words), so a prefix also matches the start of an inner word
+- Keys are not stored as strings: the array holds (entry, offset) pairs
+  sorted by normalized[entry][offset:], and bisect slices on probe
+
+A lookup is O(log n + limit): full-text matches are listed before inner-word
+matches, each in key order. Responses are cacheable for a short time
+(SUGGEST_CACHE_CONTROL); scripts/bench_suggest.py measures latency.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
+
+from .catalog import catalog_version, load_catalog
+from .logger import get_logger, get_metrics
+from .text import normalize
+
+logger = get_logger(__name__)
+
+DEFAULT_SUGGESTIONS = 8
+MAX_SUGGESTIONS = 20
+# Inner-word keys per entry (long titles only match their first words)
+MAX_WORD_KEYS = 6
+# Suggestions change with the catalog only, so browsers and CDNs may reuse them
+SUGGEST_CACHE_CONTROL = "public, max-age=30, stale-while-revalidate=60"
+
+# Warm-container suggestion indexes, keyed by catalog bucket
+_indexes: Dict[str, "SuggestIndex"] = {}
+
+
+class _SortedKeys:
+    """(entry, offset) pairs sorted by texts[entry][offset:]."""
+
+    def __init__(self, texts: List[str], entries: array, offsets: array) -> None:
+        # Stable sort: equal keys stay in entry order (newest title first)
+        order = sorted(range(len(entries)), key=lambda i: texts[entries[i]][offsets[i]:])
+        self._texts = texts
+        self.entries = array("I", map(entries.__getitem__, order))
+        self.offsets = array("H", map(offsets.__getitem__, order))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def key(self, position: int) -> str:
+        return self._texts[self.entries[position]][self.offsets[position]:]
+
+    def first(self, prefix: str) -> int:
+        return bisect_left(range(len(self.entries)), prefix, key=self.key)
+
+
+class SuggestIndex:
+    """Title and author suggestions for one catalog version."""
+
+    def __init__(self, books: List[Dict[str, Any]], version: Optional[str] = None) -> None:
+        self.version = version
+        self._books = books
+        # Per entry: catalog row, whether it is an author, approved book count
+        self._rows = array("I")
+        self._is_author = array("B")
+        self._counts = array("I")
+        texts: List[str] = []
+
+        authors: Dict[str, int] = {}
+        for row, book in enumerate(books):
+            title = normalize(book.get("title"))
+            if title:
+                self._add(row, False, texts, title)
+            author = normalize(book.get("author"))
+            if not author:
+                continue
+            if author in authors:
+                self._counts[authors[author]] += 1
+            else:
+                authors[author] = len(texts)
+                self._add(row, True, texts, author)
+
+        word_entries = array("I")
+        word_offsets = array("H")
+        for entry, text in enumerate(texts):
+            offset = text.find(" ")
+            count = 0
+            while offset != -1 and count < MAX_WORD_KEYS and offset < 0xFFFF:
+                word_entries.append(entry)
+                word_offsets.append(offset + 1)
+                offset = text.find(" ", offset + 1)
+                count += 1
+        self._phrases = _SortedKeys(texts, array("I", range(len(texts))), array("H", [0]) * len(texts))
+        self._words = _SortedKeys(texts, word_entries, word_offsets)
+
+    def _add(self, row: int, is_author: bool, texts: List[str], text: str) -> None:
+        self._rows.append(row)
+        self._is_author.append(is_author)
+        self._counts.append(1)
+        texts.append(text)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _suggestion(self, entry: int) -> Dict[str, Any]:
+        book = self._books[self._rows[entry]]
+        if self._is_author[entry]:
+            return {"text": book.get("author"), "type": "author", "count": self._counts[entry]}
+        return {"text": book.get("title"), "type": "title", "bookId": book.get("bookId")}
+
+    def suggest(self, prefix: str, limit: int = DEFAULT_SUGGESTIONS) -> List[Dict[str, Any]]:
+        """Entries whose text, or one of its words, starts with the prefix."""
+        needle = normalize(prefix)
+        if not needle or limit < 1:
+            return []
+
+        found: List[int] = []
+        for keys in (self._phrases, self._words):
+            position = keys.first(needle)
+            while position < len(keys) and len(found) < limit and keys.key(position).startswith(needle):
+                entry = keys.entries[position]
+                position += 1
+                if entry not in found:
+                    found.append(entry)
+        return [self._suggestion(entry) for entry in found]
+
+
+def get_suggest_index(bucket: str) -> Optional[SuggestIndex]:
+    """
+    Warm-container suggestion index for the bucket's catalog, rebuilt by version.
+
+    Returns:
+        The index, or None if no catalog snapshot could be loaded
+    """
+    books = load_catalog(bucket)
+    if books is None:
+        return None
+    version = catalog_version(bucket)
+
+    index = _indexes.get(bucket)
+    if index is not None and index.version == version:
+        get_metrics().increment("SuggestIndexHits")
+        return index
+
+    get_metrics().increment("SuggestIndexMisses")
+    index = SuggestIndex(books, version)
+    _indexes[bucket] = index
+    logger.info(f"Suggest index built for version {version} ({len(index)} entries)")
+    return index
+
+
+def clear_suggest_indexes() -> None:
+    """Drop the warm-container indexes (used by tests)."""
+    _indexes.clear()
+
+
+__all__ = [
+    "DEFAULT_SUGGESTIONS",
+    "MAX_SUGGESTIONS",
+    "SUGGEST_CACHE_CONTROL",
+    "SuggestIndex",
+    "get_suggest_index",
+    "clear_suggest_indexes",
+]
@@ -0,0 +1,81 @@
+"""
+Text normalization for search keys and queries.
+
+Most of the catalog is Vietnamese, so user input and stored titles rarely
+agree on diacritics or case ("sach" vs "Sách", "Đắc Nhân Tâm" vs
+"dac nhan tam"). Everything that is indexed and every query goes through
+the same functions, so they compare equal:
+
+- fold(): casefold, NFKD decomposition, combining marks stripped, đ -> d
+- normalize(): fold() plus every non-alphanumeric run collapsed to one space
+- tokenize(): the words of normalize()
+- edge_ngrams(): word prefixes ("sach" -> "sa", "sac", "sach"), for
+  prefix lookups by exact token
+
+Pure stdlib (unicodedata, re); scripts/bench_tokenizer.py measures throughput.
+"""
+
+import re
+import unicodedata
+from typing import Iterable, List, Optional, Set
+
+EDGE_NGRAM_MIN = 2
+EDGE_NGRAM_MAX = 15
+
+_WORD_RE = re.compile(r"[0-9a-z]+")
+# Combining mark blocks; one regex pass beats unicodedata.combining() per character
+_COMBINING_RE = re.compile("[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]+")
+
+# đ, ð, ø, ł are base letters in Unicode, NFKD does not split them. Applied
+# after casefold(), so the lowercase forms cover Đ, Ð, Ø, Ł (and ß -> ss)
+_SPECIAL_FOLDS = str.maketrans({"đ": "d", "ð": "d", "ø": "o", "ł": "l"})
+
+
+def fold(text: Optional[str]) -> str:
+    """Lowercase text without diacritics ("Đắc Nhân" -> "dac nhan")."""
+    if not text:
+        return ""
+    text = str(text).casefold().translate(_SPECIAL_FOLDS)
+    if text.isascii():
+        return text
+    return _COMBINING_RE.sub("", unicodedata.normalize("NFKD", text))
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Folded alphanumeric words, in order (duplicates kept)."""
+    return _WORD_RE.findall(fold(text))
+
+
+def normalize(text: Optional[str]) -> str:
+    """Folded words joined by single spaces ("  Sách,  hay! " -> "sach hay")."""
+    return " ".join(tokenize(text))
+
+
+def edge_ngrams(
+    tokens: Iterable[str],
+    min_gram: int = EDGE_NGRAM_MIN,
+    max_gram: int = EDGE_NGRAM_MAX,
+) -> Set[str]:
+    """
+    Prefixes of every token, from min_gram up to max_gram characters.
+
+    Tokens shorter than min_gram are kept whole so "a" or "1" stay searchable.
+    """
+    grams: Set[str] = set()
+    for token in tokens:
+        if len(token) <= min_gram:
+            grams.add(token)
+            continue
+        for size in range(min_gram, min(len(token), max_gram) + 1):
+            grams.add(token[:size])
+    return grams
+
+
+__all__ = [
+    "EDGE_NGRAM_MIN",
+    "EDGE_NGRAM_MAX",
+    "fold",
+    "tokenize",
+    "normalize",
+    "edge_ngrams",
+]
@@ -0,0 +1,298 @@
+"""
+stream_processor Lambda - Keeps derived book state in sync with the table
+
+Triggered by DynamoDB Streams on the OnlineLibrary table (filtered to
+BOOK#*/METADATA items, NEW_AND_OLD_IMAGES).
+
+API handlers and approval_worker only write source attributes; everything
+derived from them is maintained here (see shared.derived):
+
+1. Status counters (STATS#STATUS/COUNTS and STATS#UPLOADER#<id>/COUNTS):
+   one transaction per batch that puts an idempotency marker per stream
+   record (STREAM#<eventID>, expires after a day) and ADDs the aggregated
+   deltas to each counters item, so replayed batches do not double count
+2. Pending index keys (GSI5PK/GSI5SK) and title/author index keys
+   (GSI1/GSI2): the affected books are re-read with one consistent
+   BatchGetItem and only the attributes that differ are written, conditioned
+   on the status that was read. A book that is already consistent gets no
+   write, which is what stops the processor from looping on the records its
+   own writes produce
+3. Catalog snapshot: rebuilt once per batch when an approved book changed
+   (shared.catalog; overlapping rebuilds only ever publish a newer version)
+
+Failures are reported through ReportBatchItemFailures starting at the first
+record, so the whole batch is retried; every step above is idempotent.
+
+Environment variables:
+- BOOKS_TABLE_NAME: DynamoDB table name
+- UPLOADS_BUCKET_NAME: S3 bucket name (catalog snapshot)
+"""
+
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import ClientError
+
+from shared.logger import get_logger, get_metrics, emit_metrics
+from shared.dynamodb import get_dynamodb_table
+from shared.catalog import build_catalog_snapshot
+from shared.derived import (
+    BOOK_PK_PREFIX,
+    METADATA_SK,
+    STATS_SK,
+    affects_catalog,
+    counter_deltas,
+    derived_changes,
+    merge_deltas,
+)
+
+logger = get_logger(__name__)
+
+_deserializer = TypeDeserializer()
+
+# TransactWriteItems allows 100 actions: a marker per record plus at most
+# one counters update per record (its uploader) and the global one
+MARKERS_PER_TRANSACTION = 49
+BATCH_GET_KEYS = 100
+MARKER_TTL_SECONDS = 24 * 60 * 60
+
+
+def _get_env_or_error(name: str) -> str:
+    """Get environment variable or raise error if not set."""
+    value = os.getenv(name)
+    if not value:
+        raise ValueError(f"Missing required environment variable: {name}")
+    return value
+
+
+def _image(record: Dict[str, Any], name: str) -> Optional[Dict[str, Any]]:
+    image = record.get("dynamodb", {}).get(name)
+    if not image:
+        return None
+    return {key: _deserializer.deserialize(value) for key, value in image.items()}
+
+
+def _book_id_from_record(record: Dict[str, Any]) -> Optional[str]:
+    keys = record.get("dynamodb", {}).get("Keys", {})
+    pk = keys.get("PK", {}).get("S", "")
+    sk = keys.get("SK", {}).get("S", "")
+    if not pk.startswith(BOOK_PK_PREFIX) or sk != METADATA_SK:
+        return None
+    return pk[len(BOOK_PK_PREFIX):]
+
+
+def _counter_updates(table_name: str, deltas: Dict[Tuple[str, str], int]) -> List[Dict[str, Any]]:
+    """One ADD update per counters item touched by the deltas."""
+    by_item: Dict[str, Dict[str, int]] = {}
+    for (pk, status), delta in deltas.items():
+        by_item.setdefault(pk, {})[status] = delta
+
+    now = datetime.now(timezone.utc).isoformat()
+    updates = []
+    for pk, statuses in sorted(by_item.items()):
+        names = {"#updatedAt": "updatedAt"}
+        values: Dict[str, Any] = {":now": now}
+        parts = []
+        for index, (status, delta) in enumerate(sorted(statuses.items())):
+            names[f"#s{index}"] = status
+            values[f":d{index}"] = delta
+            parts.append(f"#s{index} :d{index}")
+        updates.append({
+            "Update": {
+                "TableName": table_name,
+                "Key": {"PK": pk, "SK": STATS_SK},
+                "UpdateExpression": f"SET #updatedAt = :now ADD {', '.join(parts)}",
+                "ExpressionAttributeNames": names,
+                "ExpressionAttributeValues": values,
+            }
+        })
+    return updates
+
+
+def _marker_put(table_name: str, event_id: str) -> Dict[str, Any]:
+    return {
+        "Put": {
+            "TableName": table_name,
+            "Item": {
+                "PK": f"STREAM#{event_id}",
+                "SK": "APPLIED",
+                "ttl": int(time.time()) + MARKER_TTL_SECONDS,
+            },
+            "ConditionExpression": "attribute_not_exists(PK)",
+        }
+    }
+
+
+def _marker_exists(error: ClientError) -> bool:
+    """True if a single-record transaction was cancelled only because its marker (item 0) exists."""
+    if error.response["Error"]["Code"] != "TransactionCanceledException":
+        return False
+    reasons = error.response.get("CancellationReasons") or []
+    return bool(reasons) and reasons[0].get("Code") == "ConditionalCheckFailed"
+
+
+def _apply_counter_deltas(table_name: str, changes: List[Tuple[str, Dict[Tuple[str, str], int]]]) -> int:
+    """
+    Apply (eventID, deltas) pairs exactly once.
+
+    Returns:
+        Number of records applied (replays are skipped)
+    """
+    client = get_dynamodb_table(table_name).meta.client
+    applied = 0
+    for start in range(0, len(changes), MARKERS_PER_TRANSACTION):
+        chunk = changes[start:start + MARKERS_PER_TRANSACTION]
+        total = merge_deltas({}, ((k, d) for _, deltas in chunk for k, d in deltas.items()))
+        items = [_marker_put(table_name, event_id) for event_id, _ in chunk]
+        items.extend(_counter_updates(table_name, total))
+        try:
+            client.transact_write_items(TransactItems=items)
+            applied += len(chunk)
+            continue
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "TransactionCanceledException":
+                raise
+
+        # Part of the chunk was applied by an earlier attempt: go record by record
+        for event_id, deltas in chunk:
+            items = [_marker_put(table_name, event_id)] + _counter_updates(table_name, deltas)
+            try:
+                client.transact_write_items(TransactItems=items)
+                applied += 1
+            except ClientError as e:
+                if not _marker_exists(e):
+                    raise
+                get_metrics().increment("ReplayedRecords")
+    return applied
+
+
+def _read_books(table_name: str, book_ids: List[str]) -> List[Dict[str, Any]]:
+    """Consistent BatchGetItem of the current metadata items."""
+    client = get_dynamodb_table(table_name).meta.client
+    books: List[Dict[str, Any]] = []
+    for start in range(0, len(book_ids), BATCH_GET_KEYS):
+        request = {
+            table_name: {
+                "Keys": [
+                    {"PK": f"{BOOK_PK_PREFIX}{book_id}", "SK": METADATA_SK}
+                    for book_id in book_ids[start:start + BATCH_GET_KEYS]
+                ],
+                "ConsistentRead": True,
+            }
+        }
+        while request:
+            response = client.batch_get_item(RequestItems=request)
+            books.extend(response.get("Responses", {}).get(table_name, []))
+            request = response.get("UnprocessedKeys") or None
+    return books
+
+
+def _write_derived(table_name: str, book: Dict[str, Any], changes: Dict[str, Any]) -> bool:
+    """Write the derived attribute diff unless the book changed meanwhile."""
+    table = get_dynamodb_table(table_name)
+    names = {"#status": "status"}
+    values: Dict[str, Any] = {":status": book.get("status")}
+    set_parts, remove_parts = [], []
+    for index, (name, value) in enumerate(sorted(changes.items())):
+        names[f"#a{index}"] = name
+        if value is None:
+            remove_parts.append(f"#a{index}")
+        else:
+            values[f":v{index}"] = value
+            set_parts.append(f"#a{index} = :v{index}")
+
+    update_expr = ""
+    if set_parts:
+        update_expr += "SET " + ", ".join(set_parts)
+    if remove_parts:
+        update_expr += " REMOVE " + ", ".join(remove_parts)
+
+    try:
+        table.update_item(
+            Key={"PK": book["PK"], "SK": book["SK"]},
+            UpdateExpression=update_expr.strip(),
+            ConditionExpression="#status = :status",
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+        )
+        return True
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            # A newer record for this book will bring it in sync
+            return False
+        raise
+
+
+def process_records(table_name: str, bucket: str, records: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Apply one stream batch.
+
+    Returns:
+        Counts of what was done (for logging and tests)
+    """
+    counter_changes: List[Tuple[str, Dict[Tuple[str, str], int]]] = []
+    touched: List[str] = []
+    catalog_changed = False
+
+    for record in records:
+        book_id = _book_id_from_record(record)
+        if not book_id:
+            continue
+        old = _image(record, "OldImage")
+        new = _image(record, "NewImage")
+
+        deltas = counter_deltas(old, new)
+        if deltas:
+            counter_changes.append((record.get("eventID") or record["dynamodb"]["SequenceNumber"], deltas))
+        if record.get("eventName") != "REMOVE" and book_id not in touched:
+            touched.append(book_id)
+        catalog_changed = catalog_changed or affects_catalog(old, new)
+
+    applied = _apply_counter_deltas(table_name, counter_changes) if counter_changes else 0
+
+    written = 0
+    for book in _read_books(table_name, touched) if touched else []:
+        changes = derived_changes(book)
+        if changes and _write_derived(table_name, book, changes):
+            written += 1
+
+    if catalog_changed:
+        # A failed rebuild fails the batch: the retry rebuilds it
+        build_catalog_snapshot(table_name, bucket)
+
+    return {"countersApplied": applied, "derivedWritten": written, "catalogRefreshed": int(catalog_changed)}
+
+
+@emit_metrics("streamProcessor")
+def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Lambda handler for DynamoDB stream batches.
+
+    Args:
+        event: DynamoDB stream event
+        context: Lambda context
+
+    Returns:
+        {"batchItemFailures": [...]} so a failed batch is retried
+    """
+    table_name = _get_env_or_error("BOOKS_TABLE_NAME")
+    bucket_name = _get_env_or_error("UPLOADS_BUCKET_NAME")
+    records = event.get("Records", [])
+    if not records:
+        return {"batchItemFailures": []}
+
+    try:
+        with get_metrics().timer("BatchTime"):
+            result = process_records(table_name, bucket_name, records)
+    except Exception as e:
+        logger.error(f"Stream batch failed: {e}", exc_info=True)
+        get_metrics().increment("BatchFailures")
+        return {"batchItemFailures": [{"itemIdentifier": records[0]["dynamodb"]["SequenceNumber"]}]}
+
+    get_metrics().put_metric("CountersApplied", result["countersApplied"])
+    get_metrics().put_metric("DerivedWritten", result["derivedWritten"])
+    logger.info(f"Processed {len(records)} records: {result}")
+    return {"batchItemFailures": []}
@@ -7,18 +7,26 @@ Validates MIME type and automatically approves/rejects files.
 Flow:
 1. S3 upload complete → S3 event
 2. Lambda receives S3 event
-3. Check MIME type from file content
+3. Check MIME type from file content, then the PDF/EPUB container
+   structure with bounded ranged reads (see structure.py)
 4. Update DynamoDB status:
    - APPROVED if valid (PDF/EPUB)
    - REJECTED if invalid
 5. Move file:
    - Valid: uploads/{bookId}/ → public/books/{bookId}/
    - Invalid: uploads/{bookId}/ → quarantine/{bookId}/
+   - Valid duplicate (same SHA-256 as an earlier upload): the upload is
+     deleted and the book points at the existing object (see shared.dedup)
+6. Store embedded metadata (page count, title, author, language) read in the
+   same pass and, when the book has a cover image, a WebP thumbnail at
+   staging/covers/{bookId}.webp (see metadata.py); approval_worker
+   publishes it to public/covers/ on approve and deletes it on reject
 
 Environment variables:
 - BOOKS_TABLE_NAME: DynamoDB table name
 - UPLOADS_BUCKET_NAME: S3 bucket name
 - ALLOWED_MIME_TYPES: Comma-separated MIME types (e.g., application/pdf,application/epub+zip)
+- COVER_THUMBNAIL_WIDTH: (optional) Cover thumbnail width in px, default 300
 """
 
 import json
@@ -27,12 +35,25 @@ import mimetypes
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
-from shared.logger import get_logger
+from shared.logger import get_logger, get_metrics, emit_metrics
 from shared.dynamodb import update_book_status
-from shared.aws_clients import s3_client
+from shared.aws_clients import s3_client, transfer_config
+from shared.dedup import claim_content_hash, compute_content_sha256
+
+from validate_mime_type.metadata import BookMetadata, extract_metadata, render_cover_thumbnail
+from validate_mime_type.structure import StructureError, validate_structure
 
 logger = get_logger(__name__)
 
+# Magic bytes live at the start of the file; multipart uploads can be large,
+# so only this much of the object is downloaded for sniffing
+SNIFF_BYTES = 4096
+
+# Not public until the book is approved (approval_worker moves it to public/covers/)
+COVERS_PREFIX = "staging/covers/"
+# Kept by the copy to public/covers/, where CloudFront serves it
+COVER_CACHE_CONTROL = "public, max-age=86400"
+
 
 def _get_env_or_error(name: str) -> str:
     """Get environment variable or raise error if not set."""
@@ -48,13 +69,14 @@ def _get_allowed_mime_types() -> set[str]:
     return {mime.strip() for mime in mime_types_str.split(",") if mime.strip()}
 
 
-def _get_s3_object(bucket: str, key: str) -> bytes:
+def _get_s3_object(bucket: str, key: str, max_bytes: Optional[int] = None) -> bytes:
     """
     Get S3 object content.
 
     Args:
         bucket: S3 bucket name
         key: S3 object key
+        max_bytes: Only read the first max_bytes bytes (ranged GET)
 
     Returns:
         Object content as bytes
@@ -62,7 +84,10 @@ def _get_s3_object(bucket: str, key: str) -> bytes:
     Raises:
         Exception: If S3 operation fails
     """
-    response = s3_client().get_object(Bucket=bucket, Key=key)
+    params = {"Bucket": bucket, "Key": key}
+    if max_bytes:
+        params["Range"] = f"bytes=0-{max_bytes - 1}"
+    response = s3_client().get_object(**params)
     return response["Body"].read()
 
 
@@ -115,11 +140,12 @@ def _move_s3_object(
     """
     s3 = s3_client()
 
-    # Copy object
-    s3.copy_object(
-        Bucket=bucket,
+    # Copy object (multipart and parallel above the transfer threshold)
+    s3.copy(
         CopySource={"Bucket": bucket, "Key": source_key},
+        Bucket=bucket,
         Key=dest_key,
+        Config=transfer_config(),
     )
 
     # Delete original
@@ -128,6 +154,31 @@ def _move_s3_object(
     logger.info(f"Moved S3 object from {source_key} to {dest_key}")
 
 
+def _store_cover(bucket: str, book_id: str, image: Optional[bytes]) -> Optional[str]:
+    """
+    Render and upload a cover thumbnail.
+
+    Returns:
+        S3 key of the thumbnail, or None if there is no usable cover
+    """
+    if not image:
+        return None
+    with get_metrics().timer("CoverRenderTime"):
+        thumbnail = render_cover_thumbnail(image)
+    if not thumbnail:
+        return None
+
+    cover_key = f"{COVERS_PREFIX}{book_id}.webp"
+    s3_client().put_object(
+        Bucket=bucket,
+        Key=cover_key,
+        Body=thumbnail,
+        ContentType="image/webp",
+        CacheControl=COVER_CACHE_CONTROL,
+    )
+    return cover_key
+
+
 def _extract_book_id_from_key(s3_key: str) -> Optional[str]:
     """
     Extract book ID from S3 key.
@@ -146,6 +197,7 @@ def _extract_book_id_from_key(s3_key: str) -> Optional[str]:
     return None
 
 
+@emit_metrics("validateMimeType")
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda handler for S3 event.
@@ -177,7 +229,8 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         allowed_mime_types = _get_allowed_mime_types()
 
         # Get file content from S3
-        file_content = _get_s3_object(bucket, key)
+        with get_metrics().timer("S3ReadTime"):
+            file_content = _get_s3_object(bucket, key, max_bytes=SNIFF_BYTES)
 
         # Extract file name from S3 key
         file_name = key.split('/')[-1]
@@ -185,7 +238,25 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         # Check MIME type
         mime_type, is_valid = _check_mime_type(file_content, file_name, allowed_mime_types)
 
+        rejected_reason = None if is_valid else "Invalid MIME type"
+
+        # Structural check: catches truncated/corrupt files and zip bombs.
+        # Embedded metadata is read on the same reader right after.
+        metadata = BookMetadata()
+        if is_valid:
+            try:
+                with get_metrics().timer("StructureCheckTime"):
+                    structure = validate_structure(bucket, key, mime_type)
+            except StructureError as e:
+                logger.warning(f"Book {book_id}: structure check failed: {e}")
+                is_valid = False
+                rejected_reason = f"Corrupt or unsafe file: {e}"
+            else:
+                with get_metrics().timer("MetadataExtractTime"):
+                    metadata = extract_metadata(structure)
+
         logger.info(f"Book {book_id}: MIME type = {mime_type}, Valid = {is_valid}")
+        get_metrics().increment("FilesAccepted" if is_valid else "FilesRejected")
         processed_at = datetime.now(timezone.utc).isoformat()
 
         # Determine status and destination
@@ -198,8 +269,32 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             status = "REJECTED"
             dest_key = key.replace("uploads/", "quarantine/")
 
-        # Move file in S3
-        _move_s3_object(bucket, key, dest_key)
+        # Deduplicate valid uploads by content hash
+        content_hash = None
+        duplicate = None
+        if is_valid:
+            with get_metrics().timer("HashTime"):
+                content_hash = compute_content_sha256(bucket, key)
+            duplicate = claim_content_hash(table_name, content_hash, book_id, dest_key)
+
+        if duplicate:
+            # Same bytes already stored: reuse that object, drop this copy
+            dest_key = duplicate["objectKey"]
+            s3_client().delete_object(Bucket=bucket, Key=key)
+            get_metrics().increment("DuplicatesDetected")
+            logger.info(f"Book {book_id}: duplicate of {duplicate['canonicalBookId']}")
+        else:
+            # Move file in S3
+            with get_metrics().timer("S3MoveTime"):
+                _move_s3_object(bucket, key, dest_key)
+
+        # Cover thumbnail (best-effort, never blocks validation)
+        cover_path = None
+        if is_valid:
+            try:
+                cover_path = _store_cover(bucket, book_id, metadata.cover_image)
+            except Exception as e:
+                logger.warning(f"Book {book_id}: cover upload failed: {e}")
 
         # Update DynamoDB
         update_book_status(
@@ -209,10 +304,12 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             mime_type=mime_type,
             file_path=dest_key,
             uploadedAt=processed_at,
-            rejectedReason=None if is_valid else "Invalid MIME type",
+            rejectedReason=rejected_reason,
             rejectedAt=None if is_valid else processed_at,
-            GSI5PK="STATUS#PENDING" if is_valid else None,
-            GSI5SK=processed_at if is_valid else None,
+            contentHash=content_hash,
+            duplicateOf=duplicate["canonicalBookId"] if duplicate else None,
+            coverPath=cover_path,
+            **metadata.to_item_fields(),
         )
 
         logger.info(f"Book {book_id}: Status updated to {status}")
@@ -223,6 +320,9 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 "bookId": book_id,
                 "status": status,
                 "mimeType": mime_type,
+                "duplicateOf": duplicate["canonicalBookId"] if duplicate else None,
+                "pageCount": metadata.page_count,
+                "coverPath": cover_path,
             }),
         }
 
@@ -0,0 +1,320 @@
+"""
+Embedded metadata extraction for uploaded books.
+
+Runs after structure.py on the same RangeReader (same byte/time budget), so
+only a few more small ranged reads are needed:
+
+- PDF: page count from the catalog's /Pages tree, /Lang from the catalog and
+  /Title, /Author from the Info dictionary. Objects are located through the
+  classic xref table; for xref streams the head/tail windows are searched.
+- EPUB: dc:title, dc:creator and dc:language from the OPF package document,
+  plus the cover image referenced by the manifest.
+
+Extraction is best-effort: failures are logged and never reject a book.
+Cover thumbnails need Pillow (optional dependency, e.g. via a Lambda layer);
+without it, or for PDFs (which need a rasterizer), no cover is produced.
+
+Environment variables (all optional):
+- COVER_THUMBNAIL_WIDTH: thumbnail width in px, default 300
+"""
+
+import html
+import io
+import os
+import posixpath
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import unquote
+
+from shared.logger import get_logger
+
+from validate_mime_type.structure import (
+    RangeReader,
+    StructureError,
+    StructureInfo,
+    read_zip_entry,
+)
+
+logger = get_logger(__name__)
+
+COVER_THUMBNAIL_WIDTH = int(os.getenv("COVER_THUMBNAIL_WIDTH", "300"))
+MAX_TEXT_LENGTH = 500
+PDF_OBJECT_BYTES = 8 * 1024
+PDF_SCAN_BYTES = 64 * 1024
+PDF_MAX_XREF_SUBSECTIONS = 64
+OPF_MAX_BYTES = 1024 * 1024
+COVER_MAX_BYTES = 5 * 1024 * 1024
+COVER_MAX_PIXELS = 40_000_000
+
+
+@dataclass
+class BookMetadata:
+    page_count: Optional[int] = None
+    title: Optional[str] = None
+    author: Optional[str] = None
+    language: Optional[str] = None
+    cover_image: Optional[bytes] = None
+
+    def to_item_fields(self) -> Dict[str, Any]:
+        """Attributes for update_book_status (None removes the attribute)."""
+        return {
+            "pageCount": self.page_count,
+            "embeddedTitle": self.title,
+            "embeddedAuthor": self.author,
+            "language": self.language,
+        }
+
+
+def _clean_text(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    value = " ".join(value.replace("\x00", "").split())
+    return value[:MAX_TEXT_LENGTH] or None
+
+
+# ---------------------------------------------------------------------------
+# PDF
+# ---------------------------------------------------------------------------
+
+_PDF_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+_PDF_STRING = rb"(\((?:\\.|[^\\()])*\)|<[0-9A-Fa-f\s]*>)"
+_XREF_SUBSECTION_RE = re.compile(rb"\s*(\d+)\s+(\d+)[ \t]*\r?\n")
+
+
+def _decode_pdf_string(raw: bytes) -> Optional[str]:
+    """Decode a PDF literal "(...)" or hex "<...>" string."""
+    if raw.startswith(b"<"):
+        digits = re.sub(rb"\s", b"", raw[1:-1])
+        if len(digits) % 2:
+            digits += b"0"
+        data = bytes.fromhex(digits.decode("ascii"))
+    else:
+        out = bytearray()
+        body = raw[1:-1]
+        i = 0
+        while i < len(body):
+            ch = body[i:i + 1]
+            if ch != b"\\":
+                out += ch
+                i += 1
+                continue
+            nxt = body[i + 1:i + 2]
+            octal = re.match(rb"[0-7]{1,3}", body[i + 1:i + 4])
+            if octal:
+                out.append(int(octal.group(0), 8) & 0xFF)
+                i += 1 + len(octal.group(0))
+            else:
+                out += _PDF_ESCAPES.get(nxt, nxt if nxt not in (b"\n", b"\r") else b"")
+                i += 2
+        data = bytes(out)
+
+    if data.startswith(b"\xfe\xff"):
+        return data[2:].decode("utf-16-be", errors="replace")
+    if data.startswith(b"\xef\xbb\xbf"):
+        return data[3:].decode("utf-8", errors="replace")
+    # PDFDocEncoding is close enough to Latin-1 for titles
+    return data.decode("latin-1")
+
+
+def _pdf_string_value(obj: bytes, key: bytes) -> Optional[str]:
+    match = re.search(rb"/" + key + rb"\s*" + _PDF_STRING, obj)
+    return _clean_text(_decode_pdf_string(match.group(1))) if match else None
+
+
+def _pdf_ref(obj: bytes, key: bytes) -> Optional[int]:
+    match = re.search(rb"/" + key + rb"\s+(\d+)\s+\d+\s+R", obj)
+    return int(match.group(1)) if match else None
+
+
+class _PdfObjects:
+    """Locate and read indirect objects with as few ranged reads as possible."""
+
+    def __init__(self, reader: RangeReader, info: StructureInfo):
+        self.reader = reader
+        self.info = info
+        self._offsets: Dict[int, int] = {}
+        self._windows: Optional[bytes] = None
+
+    def _lookup_table(self, number: int) -> Optional[int]:
+        pos = self.info.details["xrefOffset"]
+        head = self.reader.read(pos, 64)
+        pos += head.index(b"xref") + 4
+        for _ in range(PDF_MAX_XREF_SUBSECTIONS):
+            match = _XREF_SUBSECTION_RE.match(self.reader.read(pos, 64))
+            if not match:
+                return None
+            start, count = int(match.group(1)), int(match.group(2))
+            entries = pos + match.end()
+            if start <= number < start + count:
+                entry = self.reader.read(entries + (number - start) * 20, 20).split()
+                if len(entry) >= 3 and entry[2] == b"n":
+                    return int(entry[0])
+                return None
+            pos = entries + count * 20
+        return None
+
+    def _scan_windows(self, number: int) -> Optional[bytes]:
+        if self._windows is None:
+            size = self.reader.size
+            head = self.reader.read(0, min(size, PDF_SCAN_BYTES))
+            tail = b"" if size <= PDF_SCAN_BYTES else self.reader.tail(PDF_SCAN_BYTES)
+            self._windows = head + b"\n" + tail
+        match = re.search(rb"(?<!\d)%d\s+0\s+obj\b" % number, self._windows)
+        if not match:
+            return None
+        end = self._windows.find(b"endobj", match.end())
+        return self._windows[match.end():end if end != -1 else None]
+
+    def get(self, number: Optional[int]) -> Optional[bytes]:
+        if number is None:
+            return None
+        if self.info.details.get("xref") == "table":
+            if number not in self._offsets:
+                offset = self._lookup_table(number)
+                if offset is None:
+                    return None
+                self._offsets[number] = offset
+            data = self.reader.read(self._offsets[number], PDF_OBJECT_BYTES)
+            end = data.find(b"endobj")
+            return data[:end if end != -1 else None]
+        return self._scan_windows(number)
+
+
+def extract_pdf_metadata(info: StructureInfo) -> BookMetadata:
+    trailer = info.details.get("trailer", b"")
+    objects = _PdfObjects(info.reader, info)
+    metadata = BookMetadata()
+
+    catalog = objects.get(_pdf_ref(trailer, b"Root"))
+    if catalog:
+        metadata.language = _pdf_string_value(catalog, b"Lang")
+        pages = objects.get(_pdf_ref(catalog, b"Pages"))
+        count = re.search(rb"/Count\s+(\d+)(?!\s+\d+\s+R)", pages or b"")
+        if count:
+            metadata.page_count = int(count.group(1))
+
+    info_dict = objects.get(_pdf_ref(trailer, b"Info"))
+    if info_dict:
+        metadata.title = _pdf_string_value(info_dict, b"Title")
+        metadata.author = _pdf_string_value(info_dict, b"Author")
+
+    return metadata
+
+
+# ---------------------------------------------------------------------------
+# EPUB
+# ---------------------------------------------------------------------------
+
+_ATTR_RE = re.compile(r"([\w:-]+)\s*=\s*(?:\"([^\"]*)\"|'([^']*)')")
+
+
+def _attrs(tag: str) -> Dict[str, str]:
+    return {m.group(1): m.group(2) if m.group(2) is not None else m.group(3) for m in _ATTR_RE.finditer(tag)}
+
+
+def _dc_value(opf: str, name: str) -> Optional[str]:
+    match = re.search(
+        rf"<(?:[\w-]+:)?{name}\b[^>]*>(.*?)</(?:[\w-]+:)?{name}\s*>", opf, re.S | re.I
+    )
+    if not match:
+        return None
+    return _clean_text(html.unescape(re.sub(r"<[^>]+>", "", match.group(1))))
+
+
+def _cover_href(opf: str) -> Optional[str]:
+    items = [_attrs(tag) for tag in re.findall(r"<(?:[\w-]+:)?item\b[^>]*>", opf)]
+    # EPUB 3: manifest property
+    for item in items:
+        if "cover-image" in item.get("properties", "").split():
+            return item.get("href")
+    # EPUB 2: <meta name="cover" content="item-id"/>
+    for tag in re.findall(r"<(?:[\w-]+:)?meta\b[^>]*>", opf):
+        meta = _attrs(tag)
+        if meta.get("name") == "cover" and meta.get("content"):
+            for item in items:
+                if item.get("id") == meta["content"]:
+                    return item.get("href")
+    return None
+
+
+def extract_epub_metadata(info: StructureInfo) -> BookMetadata:
+    entries = info.details["entries"]
+    rootfile = info.details["rootfile"]
+    opf = read_zip_entry(info.reader, entries[rootfile], OPF_MAX_BYTES).decode("utf-8", errors="replace")
+
+    metadata = BookMetadata(
+        title=_dc_value(opf, "title"),
+        author=_dc_value(opf, "creator"),
+        language=_dc_value(opf, "language"),
+    )
+
+    href = _cover_href(opf)
+    if href:
+        path = posixpath.normpath(posixpath.join(posixpath.dirname(rootfile), unquote(href)))
+        entry = entries.get(path)
+        if entry and entry.uncompressed_size <= COVER_MAX_BYTES:
+            metadata.cover_image = read_zip_entry(info.reader, entry, COVER_MAX_BYTES)
+
+    return metadata
+
+
+EXTRACTORS = {
+    "pdf": extract_pdf_metadata,
+    "epub": extract_epub_metadata,
+}
+
+
+def extract_metadata(info: StructureInfo) -> BookMetadata:
+    """
+    Extract embedded metadata using the reader from the structure check.
+
+    Args:
+        info: Result of validate_structure
+
+    Returns:
+        BookMetadata (empty if nothing could be extracted)
+    """
+    extractor = EXTRACTORS.get(info.kind)
+    if not extractor or info.reader is None:
+        return BookMetadata()
+    try:
+        return extractor(info)
+    except (StructureError, ValueError, KeyError, IndexError) as e:
+        logger.warning(f"Metadata extraction failed: {e}")
+        return BookMetadata()
+
+
+def render_cover_thumbnail(image_bytes: bytes, width: int = None) -> Optional[bytes]:
+    """
+    Render a WebP thumbnail of a cover image.
+
+    Returns:
+        WebP bytes, or None if Pillow is unavailable or the image is unusable
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        logger.info("Pillow not available, skipping cover thumbnail")
+        return None
+
+    width = width or COVER_THUMBNAIL_WIDTH
+    Image.MAX_IMAGE_PIXELS = COVER_MAX_PIXELS
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            image.thumbnail((width, width * 2))
+            output = io.BytesIO()
+            image.convert("RGB").save(output, format="WEBP", quality=80)
+            return output.getvalue()
+    except Exception as e:
+        logger.warning(f"Cover thumbnail rendering failed: {e}")
+        return None
+
+
+__all__ = [
+    "BookMetadata",
+    "extract_metadata",
+    "extract_pdf_metadata",
+    "extract_epub_metadata",
+    "render_cover_thumbnail",
+]
@@ -0,0 +1,332 @@
+"""
+Structural validation of uploaded PDF/EPUB files.
+
+Magic bytes only say what a file claims to be. This module checks that the
+container is intact, reading only the parts that matter with ranged GETs:
+
+- PDF: the tail must hold %%EOF and a startxref offset that points at an xref
+  table (followed by a trailer with /Root) or an xref stream with /Root.
+- EPUB: the ZIP end-of-central-directory record and central directory must
+  parse, the first entry must be a stored `mimetype` containing
+  "application/epub+zip", and META-INF/container.xml must name a rootfile
+  that exists in the archive.
+
+Every read goes through RangeReader, which enforces a total byte budget and
+a wall-clock deadline, and ZIP limits (entry count, declared uncompressed
+size, compression ratio) reject zip-bomb style archives from the central
+directory alone, without inflating them.
+
+Environment variables (all optional):
+- STRUCTURE_MAX_READ_BYTES: total bytes read per file, default 8MB
+- STRUCTURE_TIMEOUT_SECONDS: wall-clock budget per file, default 10
+- EPUB_MAX_ENTRIES: default 10000
+- EPUB_MAX_UNCOMPRESSED_BYTES: declared total, default 1GB
+- EPUB_MAX_COMPRESSION_RATIO: per entry, default 200
+"""
+
+import os
+import re
+import struct
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from shared.aws_clients import s3_client
+
+MAX_READ_BYTES = int(os.getenv("STRUCTURE_MAX_READ_BYTES", str(8 * 1024 * 1024)))
+TIMEOUT_SECONDS = float(os.getenv("STRUCTURE_TIMEOUT_SECONDS", "10"))
+EPUB_MAX_ENTRIES = int(os.getenv("EPUB_MAX_ENTRIES", "10000"))
+EPUB_MAX_UNCOMPRESSED_BYTES = int(os.getenv("EPUB_MAX_UNCOMPRESSED_BYTES", str(1024 * 1024 * 1024)))
+EPUB_MAX_COMPRESSION_RATIO = int(os.getenv("EPUB_MAX_COMPRESSION_RATIO", "200"))
+
+PDF_TAIL_BYTES = 64 * 1024
+PDF_EOF_WINDOW = 1024
+
+ZIP_EOCD = struct.Struct("<4s4H2LH")
+ZIP_CDIR = struct.Struct("<4s6H3L5H2L")
+ZIP_LOCAL = struct.Struct("<4s5H3L2H")
+ZIP_MAX_COMMENT = 0xFFFF
+EPUB_MIMETYPE = b"application/epub+zip"
+CONTAINER_PATH = "META-INF/container.xml"
+CONTAINER_MAX_BYTES = 256 * 1024
+
+
+class StructureError(Exception):
+    """File is truncated, corrupt, or exceeds a safety limit."""
+
+
+class RangeReader:
+    """Ranged reads of one S3 object under a byte and time budget."""
+
+    def __init__(self, bucket: str, key: str, size: int, max_bytes: int = None, timeout: float = None):
+        self.bucket = bucket
+        self.key = key
+        self.size = size
+        self.max_bytes = MAX_READ_BYTES if max_bytes is None else max_bytes
+        self.deadline = time.monotonic() + (TIMEOUT_SECONDS if timeout is None else timeout)
+        self.bytes_read = 0
+
+    def check_deadline(self) -> None:
+        if time.monotonic() > self.deadline:
+            raise StructureError("validation time limit exceeded")
+
+    def read(self, offset: int, length: int) -> bytes:
+        """Read up to length bytes at offset (clamped to the object)."""
+        self.check_deadline()
+        if offset < 0 or offset >= self.size:
+            raise StructureError(f"offset {offset} outside file")
+        length = min(length, self.size - offset)
+        if self.bytes_read + length > self.max_bytes:
+            raise StructureError("validation read budget exceeded")
+        self.bytes_read += length
+        response = s3_client().get_object(
+            Bucket=self.bucket,
+            Key=self.key,
+            Range=f"bytes={offset}-{offset + length - 1}",
+        )
+        return response["Body"].read()
+
+    def tail(self, length: int) -> bytes:
+        length = min(length, self.size)
+        return self.read(self.size - length, length)
+
+
+@dataclass
+class ZipEntry:
+    name: str
+    method: int
+    compressed_size: int
+    uncompressed_size: int
+    local_header_offset: int
+
+
+@dataclass
+class StructureInfo:
+    """What the validator learned; later stages reuse it instead of re-reading."""
+    kind: str
+    details: Dict[str, Any] = field(default_factory=dict)
+    reader: Optional["RangeReader"] = None
+
+
+# ---------------------------------------------------------------------------
+# PDF
+# ---------------------------------------------------------------------------
+
+_STARTXREF_RE = re.compile(rb"startxref\s+(\d+)\s+%%EOF", re.S)
+_OBJ_HEADER_RE = re.compile(rb"^\s*\d+\s+\d+\s+obj\b")
+
+
+def validate_pdf(reader: RangeReader) -> StructureInfo:
+    """Check %%EOF, startxref and the xref table/stream it points at."""
+    tail_len = min(reader.size, PDF_TAIL_BYTES)
+    tail_start = reader.size - tail_len
+    tail = reader.tail(tail_len)
+
+    if b"%%EOF" not in tail[-PDF_EOF_WINDOW:]:
+        raise StructureError("PDF has no %%EOF marker (truncated?)")
+
+    matches = list(_STARTXREF_RE.finditer(tail))
+    if not matches:
+        raise StructureError("PDF has no startxref")
+    xref_offset = int(matches[-1].group(1))
+    if xref_offset >= reader.size:
+        raise StructureError("PDF startxref points outside the file")
+
+    if xref_offset >= tail_start:
+        head = tail[xref_offset - tail_start:]
+    else:
+        head = reader.read(xref_offset, 4096)
+
+    if head.lstrip().startswith(b"xref"):
+        # Classic table: the trailer sits between the table and startxref
+        trailer_end = matches[-1].start()
+        trailer_pos = tail.rfind(b"trailer", 0, trailer_end)
+        if trailer_pos == -1:
+            raise StructureError("PDF trailer not found")
+        trailer = tail[trailer_pos:trailer_end]
+        if b"/Root" not in trailer:
+            raise StructureError("PDF trailer has no /Root")
+        return StructureInfo("pdf", {"xref": "table", "xrefOffset": xref_offset, "trailer": trailer})
+
+    if _OBJ_HEADER_RE.match(head):
+        # Cross-reference stream (PDF 1.5+): the stream dict replaces the trailer
+        dict_end = head.find(b"stream")
+        stream_dict = head[:dict_end if dict_end != -1 else len(head)]
+        if b"/XRef" not in stream_dict or b"/Root" not in stream_dict:
+            raise StructureError("PDF xref stream is missing /Type /XRef or /Root")
+        return StructureInfo("pdf", {"xref": "stream", "xrefOffset": xref_offset, "trailer": stream_dict})
+
+    raise StructureError("PDF startxref does not point at a cross-reference section")
+
+
+# ---------------------------------------------------------------------------
+# EPUB (ZIP)
+# ---------------------------------------------------------------------------
+
+def _read_central_directory(reader: RangeReader) -> List[ZipEntry]:
+    tail = reader.tail(ZIP_EOCD.size + ZIP_MAX_COMMENT)
+    tail_start = reader.size - len(tail)
+    pos = tail.rfind(b"PK\x05\x06")
+    if pos == -1 or pos + ZIP_EOCD.size > len(tail):
+        raise StructureError("ZIP end of central directory not found (truncated?)")
+
+    (_, disk, cd_disk, _, total_entries, cd_size, cd_offset, _) = ZIP_EOCD.unpack_from(tail, pos)
+    if disk != 0 or cd_disk != 0:
+        raise StructureError("multi-disk ZIP archives are not supported")
+    if total_entries == 0xFFFF or cd_offset == 0xFFFFFFFF:
+        raise StructureError("ZIP64 archives are not supported")
+    if total_entries > EPUB_MAX_ENTRIES:
+        raise StructureError(f"ZIP has too many entries ({total_entries})")
+    if cd_offset + cd_size > tail_start + pos:
+        raise StructureError("ZIP central directory overlaps its end record")
+
+    if total_entries == 0:
+        return []
+    if cd_offset >= tail_start:
+        directory = tail[cd_offset - tail_start:cd_offset - tail_start + cd_size]
+    else:
+        directory = reader.read(cd_offset, cd_size)
+
+    entries: List[ZipEntry] = []
+    declared_total = 0
+    offset = 0
+    for _ in range(total_entries):
+        if offset + ZIP_CDIR.size > len(directory):
+            raise StructureError("ZIP central directory is truncated")
+        (sig, _, _, flags, method, _, _, _, comp_size, uncomp_size,
+         name_len, extra_len, comment_len, _, _, _, local_offset) = ZIP_CDIR.unpack_from(directory, offset)
+        if sig != b"PK\x01\x02":
+            raise StructureError("ZIP central directory entry has a bad signature")
+        name_start = offset + ZIP_CDIR.size
+        name = directory[name_start:name_start + name_len].decode("utf-8", errors="replace")
+        offset = name_start + name_len + extra_len + comment_len
+
+        if flags & 0x1:
+            raise StructureError(f"ZIP entry {name!r} is encrypted")
+        if method not in (0, 8):
+            raise StructureError(f"ZIP entry {name!r} uses unsupported compression {method}")
+        if local_offset >= cd_offset:
+            raise StructureError(f"ZIP entry {name!r} has an invalid offset")
+        if uncomp_size > 1024 * 1024 and uncomp_size > max(comp_size, 1) * EPUB_MAX_COMPRESSION_RATIO:
+            raise StructureError(f"ZIP entry {name!r} compression ratio is too high")
+        declared_total += uncomp_size
+        if declared_total > EPUB_MAX_UNCOMPRESSED_BYTES:
+            raise StructureError("ZIP uncompressed size exceeds the limit")
+
+        entries.append(ZipEntry(name, method, comp_size, uncomp_size, local_offset))
+        reader.check_deadline()
+
+    return entries
+
+
+def read_zip_entry(reader: RangeReader, entry: ZipEntry, max_bytes: int) -> bytes:
+    """Read and inflate one (small) entry, refusing anything above max_bytes."""
+    if entry.uncompressed_size > max_bytes or entry.compressed_size > max_bytes:
+        raise StructureError(f"ZIP entry {entry.name!r} is too large to inspect")
+
+    header = reader.read(entry.local_header_offset, ZIP_LOCAL.size)
+    if len(header) < ZIP_LOCAL.size:
+        raise StructureError(f"ZIP local header for {entry.name!r} is truncated")
+    sig, _, _, _, _, _, _, _, _, name_len, extra_len = ZIP_LOCAL.unpack(header)
+    if sig != b"PK\x03\x04":
+        raise StructureError(f"ZIP local header for {entry.name!r} has a bad signature")
+
+    data_offset = entry.local_header_offset + ZIP_LOCAL.size + name_len + extra_len
+    raw = reader.read(data_offset, entry.compressed_size) if entry.compressed_size else b""
+    if entry.method == 0:
+        return raw
+
+    inflater = zlib.decompressobj(-15)
+    try:
+        data = inflater.decompress(raw, max_bytes + 1)
+    except zlib.error as e:
+        raise StructureError(f"ZIP entry {entry.name!r} is corrupt: {e}")
+    if len(data) > max_bytes:
+        raise StructureError(f"ZIP entry {entry.name!r} inflates beyond the limit")
+    return data
+
+
+_ROOTFILE_RE = re.compile(rb"<(?:\w+:)?rootfile\b[^>]*\bfull-path\s*=\s*[\"']([^\"']+)[\"']")
+
+
+def validate_epub(reader: RangeReader) -> StructureInfo:
+    """Check the central directory, the mimetype entry and container.xml."""
+    entries = _read_central_directory(reader)
+    if not entries:
+        raise StructureError("EPUB archive is empty")
+
+    first = entries[0]
+    if first.name != "mimetype" or first.local_header_offset != 0:
+        raise StructureError("EPUB mimetype must be the first entry")
+    if first.method != 0:
+        raise StructureError("EPUB mimetype entry must be stored uncompressed")
+    if read_zip_entry(reader, first, 64).strip() != EPUB_MIMETYPE:
+        raise StructureError("EPUB mimetype entry has the wrong content")
+
+    by_name = {entry.name: entry for entry in entries}
+    container = by_name.get(CONTAINER_PATH)
+    if not container:
+        raise StructureError(f"EPUB is missing {CONTAINER_PATH}")
+    # Regex instead of an XML parser: no entity expansion on untrusted input
+    match = _ROOTFILE_RE.search(read_zip_entry(reader, container, CONTAINER_MAX_BYTES))
+    if not match:
+        raise StructureError("EPUB container.xml has no rootfile")
+    rootfile = match.group(1).decode("utf-8", errors="replace")
+    if rootfile not in by_name:
+        raise StructureError(f"EPUB rootfile {rootfile!r} is missing")
+
+    return StructureInfo("epub", {"rootfile": rootfile, "entries": by_name})
+
+
+VALIDATORS = {
+    "application/pdf": validate_pdf,
+    "application/epub+zip": validate_epub,
+}
+
+
+def validate_structure(
+    bucket: str,
+    key: str,
+    mime_type: str,
+    size: Optional[int] = None,
+) -> StructureInfo:
+    """
+    Validate the container structure of an uploaded book.
+
+    Args:
+        bucket: S3 bucket name
+        key: S3 object key
+        mime_type: MIME type from the magic-byte sniff
+        size: Object size if already known (saves a HEAD request)
+
+    Returns:
+        StructureInfo for the file
+
+    Raises:
+        StructureError: If the file is corrupt or exceeds a limit
+    """
+    validator = VALIDATORS.get(mime_type)
+    if not validator:
+        return StructureInfo(mime_type)
+    if size is None:
+        size = s3_client().head_object(Bucket=bucket, Key=key)["ContentLength"]
+    if size == 0:
+        raise StructureError("file is empty")
+    reader = RangeReader(bucket, key, size)
+    info = validator(reader)
+    # Metadata extraction continues on the same reader (and byte budget)
+    info.reader = reader
+    return info
+
+
+__all__ = [
+    "StructureError",
+    "StructureInfo",
+    "RangeReader",
+    "ZipEntry",
+    "read_zip_entry",
+    "validate_pdf",
+    "validate_epub",
+    "validate_structure",
+]
@@ -15,6 +15,8 @@ from aws_cdk import (
 )
 from constructs import Construct
 
+from lib.stack.database_stack import PENDING_GSI5_SHARDS
+
 
 class ApiStack(Stack):
     """Stack for API Gateway and Lambda functions"""
@@ -49,7 +51,8 @@ class ApiStack(Stack):
                     apigw.CorsHttpMethod.DELETE,
                 ],
                 allow_origins=["*"],
-                allow_headers=["Content-Type", "Authorization"],
+                allow_headers=["Content-Type", "Authorization", "If-None-Match"],
+                expose_headers=["ETag"],
                 max_age=Duration.hours(1),
             ),
         )
@@ -85,6 +88,8 @@ class ApiStack(Stack):
                 "UPLOAD_URL_TTL_SECONDS": "900",
                 "MAX_FILE_SIZE_BYTES": str(50 * 1024 * 1024),
                 "ALLOWED_EXTENSIONS": ".pdf,.epub",
+                # Clients opt into "post" per request; it enforces size/type at S3
+                "UPLOAD_URL_MODE": "put",
             },
         )
         lambdas["createUploadUrl"] = create_upload_url_fn
@@ -95,6 +100,65 @@ class ApiStack(Stack):
         if uploads_bucket:
             uploads_bucket.grant_put(create_upload_url_fn)
 
+        # createUploadUrls Lambda (batch of up to 25 files)
+        create_upload_urls_fn = _lambda.Function(
+            self,
+            "CreateUploadUrlsFn",
+            runtime=_lambda.Runtime.PYTHON_3_12,
+            handler="create_upload_url.batch.handler",
+            code=_lambda.Code.from_asset(
+                "./lambda",
+                exclude=["**/__pycache__", "*.pyc", ".pytest_cache", "tests"],
+            ),
+            timeout=Duration.seconds(30),
+            memory_size=256,
+            environment={
+                "BOOKS_TABLE_NAME": books_table.table_name if books_table else "OnlineLibrary",
+                "UPLOADS_BUCKET_NAME": uploads_bucket.bucket_name if uploads_bucket else "uploads",
+                "UPLOAD_URL_TTL_SECONDS": "900",
+                "MAX_FILE_SIZE_BYTES": str(50 * 1024 * 1024),
+                "ALLOWED_EXTENSIONS": ".pdf,.epub",
+                # Clients opt into "post" per request; it enforces size/type at S3
+                "UPLOAD_URL_MODE": "put",
+                "MAX_BATCH_UPLOAD_FILES": "25",
+            },
+        )
+        lambdas["createUploadUrls"] = create_upload_urls_fn
+
+        if books_table:
+            books_table.grant_write_data(create_upload_urls_fn)
+        if uploads_bucket:
+            uploads_bucket.grant_put(create_upload_urls_fn)
+
+        # multipartUpload Lambda (initiate / sign parts / complete / abort)
+        multipart_upload_fn = _lambda.Function(
+            self,
+            "MultipartUploadFn",
+            runtime=_lambda.Runtime.PYTHON_3_12,
+            handler="create_upload_url.multipart.handler",
+            code=_lambda.Code.from_asset(
+                "./lambda",
+                exclude=["**/__pycache__", "*.pyc", ".pytest_cache", "tests"],
+            ),
+            timeout=Duration.seconds(30),
+            memory_size=256,
+            environment={
+                "BOOKS_TABLE_NAME": books_table.table_name if books_table else "OnlineLibrary",
+                "UPLOADS_BUCKET_NAME": uploads_bucket.bucket_name if uploads_bucket else "uploads",
+                "UPLOAD_URL_TTL_SECONDS": "3600",
+                "MAX_FILE_SIZE_BYTES": str(1024 * 1024 * 1024),
+                "MULTIPART_PART_SIZE_BYTES": str(8 * 1024 * 1024),
+                "ALLOWED_EXTENSIONS": ".pdf,.epub",
+            },
+        )
+        lambdas["multipartUpload"] = multipart_upload_fn
+
+        if books_table:
+            books_table.grant_read_write_data(multipart_upload_fn)
+        if uploads_bucket:
+            # PutObject covers presigned UploadPart; List*/Abort* cover list_parts and abort
+            uploads_bucket.grant_read_write(multipart_upload_fn, "uploads/*")
+
         # === Create Secrets for CloudFront ===
         # Get CloudFront credentials from context (cdk deploy -c cloudfront_key_pair_id=... -c cloudfront_private_key=...)
         cloudfront_key_pair_id = self.node.try_get_context("cloudfront_key_pair_id")
@@ -194,16 +258,46 @@ class ApiStack(Stack):
                 exclude=["**/__pycache__", "*.pyc", ".pytest_cache", "tests"],
             ),
             timeout=Duration.seconds(30),
-            memory_size=256,
+            # Warm search index: building it over 20k books peaks ~100 MB above
+            # the decoded catalog (scripts/bench_search_index.py)
+            memory_size=512,
             environment={
                 "BOOKS_TABLE_NAME": books_table.table_name if books_table else "OnlineLibrary",
+                "CATALOG_BUCKET_NAME": uploads_bucket.bucket_name if uploads_bucket else "uploads",
+                "CATALOG_REFRESH_SECONDS": "60",
+                "SEARCH_INDEX_ENABLED": "true",
             },
         )
         lambdas["searchBooks"] = search_books_fn
 
+        # suggestBooks Lambda (search-box suggestions from the catalog snapshot)
+        suggest_books_fn = _lambda.Function(
+            self,
+            "SuggestBooksFn",
+            runtime=_lambda.Runtime.PYTHON_3_12,
+            handler="search_books.handler.suggest_handler",
+            code=_lambda.Code.from_asset(
+                "./lambda",
+                exclude=["**/__pycache__", "*.pyc", ".pytest_cache", "tests"],
+            ),
+            timeout=Duration.seconds(10),
+            memory_size=256,
+            environment={
+                "BOOKS_TABLE_NAME": books_table.table_name if books_table else "OnlineLibrary",
+                "CATALOG_BUCKET_NAME": uploads_bucket.bucket_name if uploads_bucket else "uploads",
+                "CATALOG_REFRESH_SECONDS": "60",
+            },
+        )
+        lambdas["suggestBooks"] = suggest_books_fn
+
         # Grant permissions
         if books_table:
             books_table.grant_read_data(search_books_fn)
+            books_table.grant_read_data(suggest_books_fn)
+        if uploads_bucket:
+            # Approved catalog snapshot (written by streamProcessor)
+            uploads_bucket.grant_read(search_books_fn, "public/catalog/*")
+            uploads_bucket.grant_read(suggest_books_fn, "public/catalog/*")
 
         # admin_preview Lambda
         admin_preview_env = {
@@ -316,13 +410,34 @@ class ApiStack(Stack):
             memory_size=256,
             environment={
                 "BOOKS_TABLE_NAME": books_table.table_name if books_table else "OnlineLibrary",
+                "PENDING_GSI5_SHARDS": PENDING_GSI5_SHARDS,
             },
         )
         lambdas["listPendingBooks"] = list_pending_books_fn
 
+        # countPendingBooks Lambda (dashboard badge, reads the status counters)
+        count_pending_books_fn = _lambda.Function(
+            self,
+            "CountPendingBooksFn",
+            runtime=_lambda.Runtime.PYTHON_3_12,
+            handler="list_pending_books.handler.count_handler",
+            code=_lambda.Code.from_asset(
+                "./lambda",
+                exclude=["**/__pycache__", "*.pyc", ".pytest_cache", "tests"],
+            ),
+            timeout=Duration.seconds(10),
+            memory_size=128,
+            environment={
+                "BOOKS_TABLE_NAME": books_table.table_name if books_table else "OnlineLibrary",
+                "PENDING_GSI5_SHARDS": PENDING_GSI5_SHARDS,
+            },
+        )
+        lambdas["countPendingBooks"] = count_pending_books_fn
+
         # Grant permissions
         if books_table:
             books_table.grant_read_data(list_pending_books_fn)
+            books_table.grant_read_data(count_pending_books_fn)
 
         # approveBook Lambda
         approve_book_fn = _lambda.Function(
@@ -334,11 +449,11 @@ class ApiStack(Stack):
                 "./lambda",
                 exclude=["**/__pycache__", "*.pyc", ".pytest_cache", "tests"],
             ),
-            timeout=Duration.seconds(30),
+            # Only records the decision; approval_worker (ProcessingStack) moves files
+            timeout=Duration.seconds(10),
             memory_size=256,
             environment={
                 "BOOKS_TABLE_NAME": books_table.table_name if books_table else "OnlineLibrary",
-                "UPLOADS_BUCKET_NAME": uploads_bucket.bucket_name if uploads_bucket else "uploads",
             },
         )
         lambdas["approveBook"] = approve_book_fn
@@ -346,8 +461,6 @@ class ApiStack(Stack):
         # Grant permissions
         if books_table:
             books_table.grant_read_write_data(approve_book_fn)
-        if uploads_bucket:
-            uploads_bucket.grant_read_write(approve_book_fn)
 
         # rejectBook Lambda
         reject_book_fn = _lambda.Function(
@@ -359,19 +472,16 @@ class ApiStack(Stack):
                 "./lambda",
                 exclude=["**/__pycache__", "*.pyc", ".pytest_cache", "tests"],
             ),
-            timeout=Duration.seconds(30),
+            timeout=Duration.seconds(10),
             memory_size=256,
             environment={
                 "BOOKS_TABLE_NAME": books_table.table_name if books_table else "OnlineLibrary",
-                "UPLOADS_BUCKET_NAME": uploads_bucket.bucket_name if uploads_bucket else "uploads",
             },
         )
         lambdas["rejectBook"] = reject_book_fn
 
         if books_table:
             books_table.grant_read_write_data(reject_book_fn)
-        if uploads_bucket:
-            uploads_bucket.grant_read_write(reject_book_fn)
 
         # updateUserProfile Lambda
         user_profile_table_name = (
@@ -425,11 +535,18 @@ class ApiStack(Stack):
         # Routes
         routes = [
             ("/books/upload-url", apigw.HttpMethod.POST, create_upload_url_fn),
+            ("/books/upload-urls", apigw.HttpMethod.POST, create_upload_urls_fn),
+            ("/books/multipart-upload", apigw.HttpMethod.POST, multipart_upload_fn),
+            ("/books/{bookId}/multipart-upload/parts", apigw.HttpMethod.POST, multipart_upload_fn),
+            ("/books/{bookId}/multipart-upload/complete", apigw.HttpMethod.POST, multipart_upload_fn),
+            ("/books/{bookId}/multipart-upload", apigw.HttpMethod.DELETE, multipart_upload_fn),
             ("/books/{bookId}/read-url", apigw.HttpMethod.GET, get_read_url_fn),
             ("/books/search", apigw.HttpMethod.GET, search_books_fn),
+            ("/books/suggest", apigw.HttpMethod.GET, suggest_books_fn),
             ("/books/my-uploads", apigw.HttpMethod.GET, get_my_uploads_fn),
             ("/books/{bookId}", apigw.HttpMethod.DELETE, delete_book_fn),
             ("/admin/books/pending", apigw.HttpMethod.GET, list_pending_books_fn),
+            ("/admin/books/pending/count", apigw.HttpMethod.GET, count_pending_books_fn),
             ("/admin/books/{bookId}/approve", apigw.HttpMethod.POST, approve_book_fn),
             ("/admin/books/{bookId}/reject", apigw.HttpMethod.POST, reject_book_fn),
             ("/admin/books/{bookId}/preview-url", apigw.HttpMethod.GET, admin_preview_fn),
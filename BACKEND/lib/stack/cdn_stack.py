@@ -7,6 +7,11 @@ from aws_cdk import (
 )
 from constructs import Construct
 
+# AWS managed "CachingOptimized" cache policy (respects origin Cache-Control, gzip/brotli)
+CACHING_OPTIMIZED_POLICY_ID = "658327ea-f89d-4fab-a63d-7e88639e58f6"
+CATALOG_PATH_PATTERN = "public/catalog/*"
+COVERS_PATH_PATTERN = "public/covers/*"
+
 
 class CdnStack(Stack):
     """Stack for CloudFront distribution"""
@@ -50,14 +55,46 @@ class CdnStack(Stack):
                         )
                     )
                 ],
+                # Books: PDF.js reads them with Range requests (S3 serves the
+                # ranges). Cross-origin Range reads need the CORS preflight and
+                # Origin header to reach the bucket's CORS rule.
                 default_cache_behavior=cloudfront.CfnDistribution.DefaultCacheBehaviorProperty(
                     target_origin_id="S3Origin",
                     viewer_protocol_policy="redirect-to-https",
+                    allowed_methods=["GET", "HEAD", "OPTIONS"],
+                    cached_methods=["GET", "HEAD", "OPTIONS"],
                     forwarded_values=cloudfront.CfnDistribution.ForwardedValuesProperty(
                         query_string=True,
+                        headers=[
+                            "Origin",
+                            "Access-Control-Request-Headers",
+                            "Access-Control-Request-Method",
+                        ],
                         cookies=cloudfront.CfnDistribution.CookiesProperty(forward="none"),
                     ),
-                )
+                ),
+                cache_behaviors=[
+                    # Approved catalog snapshot: versioned files are immutable and
+                    # latest.json carries a short max-age, so honour origin headers
+                    cloudfront.CfnDistribution.CacheBehaviorProperty(
+                        path_pattern=CATALOG_PATH_PATTERN,
+                        target_origin_id="S3Origin",
+                        viewer_protocol_policy="redirect-to-https",
+                        cache_policy_id=CACHING_OPTIMIZED_POLICY_ID,
+                        compress=True,
+                        allowed_methods=["GET", "HEAD"],
+                        cached_methods=["GET", "HEAD"],
+                    ),
+                    # Cover thumbnails of approved books, published by approvalWorker (WebP, max-age 1 day)
+                    cloudfront.CfnDistribution.CacheBehaviorProperty(
+                        path_pattern=COVERS_PATH_PATTERN,
+                        target_origin_id="S3Origin",
+                        viewer_protocol_policy="redirect-to-https",
+                        cache_policy_id=CACHING_OPTIMIZED_POLICY_ID,
+                        allowed_methods=["GET", "HEAD"],
+                        cached_methods=["GET", "HEAD"],
+                    ),
+                ],
             )
         )
 
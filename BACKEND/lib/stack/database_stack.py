@@ -6,6 +6,11 @@ from aws_cdk import (
 )
 from constructs import Construct
 
+# Pending index write shards (GSI5PK "STATUS#PENDING#<n>"); every Lambda that
+# writes or reads GSI5 gets it as PENDING_GSI5_SHARDS. Changing it needs
+# scripts/migrate_pending_gsi5.py --shards <n> after the deploy.
+PENDING_GSI5_SHARDS = "8"
+
 
 class DatabaseStack(Stack):
     """Stack for DynamoDB table and indexes"""
@@ -28,12 +33,15 @@ class DatabaseStack(Stack):
             ),
             billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,  # On-Demand
             removal_policy=RemovalPolicy.DESTROY,  # For dev ,
-            time_to_live_attribute="ttl"   
+            time_to_live_attribute="ttl",
+            # Feeds approval_worker (APPROVING/REJECTING -> final status)
+            stream=dynamodb.StreamViewType.NEW_AND_OLD_IMAGES,
         )
 
         # TODO: Add GSI1, GSI2, GSI3, GSI5, GSI6
 
         # === GSI1 – title search: GSI1PK, GSI1SK ===
+        # Keys written by stream_processor for APPROVED books (see shared/derived.py)
         table.add_global_secondary_index(
             index_name="GSI1",
             partition_key=dynamodb.Attribute(
@@ -76,6 +84,7 @@ class DatabaseStack(Stack):
         )
 
         # === GSI5 – status query (pending list): GSI5PK, GSI5SK ===
+        # GSI5PK is write-sharded (PENDING_GSI5_SHARDS) to avoid a hot partition
         table.add_global_secondary_index(
             index_name="GSI5",
             partition_key=dynamodb.Attribute(
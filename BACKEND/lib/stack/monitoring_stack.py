@@ -12,6 +12,7 @@ Metrics to monitor:
 - DynamoDB: Read/Write capacity, Errors
 - S3: Upload count, Size, Errors
 - API Gateway: Requests, Errors, Latency
+- Business latency (EMF, emitted by shared.logger): sign, S3 move, query time
 """
 
 from aws_cdk import (
@@ -25,6 +26,16 @@ from aws_cdk import (
 )
 from constructs import Construct
 
+# Must match shared.logger.METRICS_NAMESPACE used by the Lambda functions
+METRICS_NAMESPACE = "OnlineLibrary"
+
+# (widget title, metric name, handlers emitting it)
+BUSINESS_LATENCY_METRICS = [
+    ("Presign Latency", "SignTime", ["createUploadUrl", "getReadUrl"]),
+    ("S3 Move Latency", "S3MoveTime", ["approveBook", "rejectBook", "validateMimeType"]),
+    ("Query Latency", "QueryTime", ["searchBooks", "listPendingBooks"]),
+]
+
 
 class MonitoringStack(Stack):
     """Stack for monitoring and observability"""
@@ -72,6 +83,8 @@ class MonitoringStack(Stack):
         if storage_stack and hasattr(storage_stack, "bucket"):
             self._add_s3_widgets(dashboard, storage_stack.bucket)
 
+        self._add_business_widgets(dashboard)
+
         CfnOutput(
             self,
             "DashboardUrl",
@@ -247,3 +260,52 @@ class MonitoringStack(Stack):
                 height=6,
             )
         )
+
+    def _add_business_widgets(self, dashboard):
+        """Add business metrics published via CloudWatch Embedded Metric Format"""
+        for title, metric_name, handlers in BUSINESS_LATENCY_METRICS:
+            p50 = []
+            p99 = []
+            for handler_name in handlers:
+                for statistic, series in (("p50", p50), ("p99", p99)):
+                    series.append(
+                        cloudwatch.Metric(
+                            namespace=METRICS_NAMESPACE,
+                            metric_name=metric_name,
+                            dimensions_map={"handler": handler_name, "status": "SUCCESS"},
+                            statistic=statistic,
+                            label=f"{handler_name} {statistic}",
+                            period=Duration.minutes(5),
+                        )
+                    )
+
+            dashboard.add_widgets(
+                cloudwatch.GraphWidget(
+                    title=f"Business - {title} (ms)",
+                    left=p50,
+                    right=p99,
+                    width=12,
+                    height=6,
+                )
+            )
+
+        # Upload validation outcomes
+        outcomes = [
+            cloudwatch.Metric(
+                namespace=METRICS_NAMESPACE,
+                metric_name=metric_name,
+                dimensions_map={"handler": "validateMimeType", "status": "SUCCESS"},
+                statistic="Sum",
+                period=Duration.minutes(5),
+            )
+            for metric_name in ("FilesAccepted", "FilesRejected")
+        ]
+
+        dashboard.add_widgets(
+            cloudwatch.GraphWidget(
+                title="Business - Upload Validation Outcomes",
+                left=outcomes,
+                width=12,
+                height=6,
+            )
+        )
@@ -3,7 +3,8 @@ ProcessingStack - File processing Lambda functions
 
 Separate stack for file processing to avoid cyclic dependencies:
 - StorageStack: S3 bucket
-- ProcessingStack: validate_mime_type Lambda
+- ProcessingStack: validate_mime_type Lambda, approval_worker and
+  stream_processor Lambdas (DynamoDB stream)
 - EventStack: S3 event notification (references both)
 
 This allows clean separation of concerns and proper dependency management.
@@ -12,14 +13,18 @@ This allows clean separation of concerns and proper dependency management.
 from aws_cdk import (
     Stack,
     aws_lambda as _lambda,
+    aws_lambda_event_sources as lambda_event_sources,
     aws_iam as iam,
     aws_s3 as s3,
+    aws_sqs as sqs,
     Fn,
     Duration,
     CfnOutput,
 )
 from constructs import Construct
 
+from lib.stack.database_stack import PENDING_GSI5_SHARDS
+
 
 class ProcessingStack(Stack):
     """Stack for file processing Lambda functions"""
@@ -39,6 +44,15 @@ class ProcessingStack(Stack):
         # Import bucket name if provided
         bucket_name = Fn.import_value(f"{storage_stack_name}-Bucket-Name") if storage_stack_name else None
 
+        # Optional Pillow layer for cover thumbnails (cdk deploy -c pillow_layer_arn=...);
+        # without it validation still runs, only covers are skipped
+        pillow_layer_arn = self.node.try_get_context("pillow_layer_arn")
+        layers = (
+            [_lambda.LayerVersion.from_layer_version_arn(self, "PillowLayer", pillow_layer_arn)]
+            if pillow_layer_arn
+            else None
+        )
+
         # === validate_mime_type Lambda ===
         validate_mime_type_fn = _lambda.Function(
             self,
@@ -49,17 +63,20 @@ class ProcessingStack(Stack):
                 "./lambda",
                 exclude=["**/__pycache__", "*.pyc", ".pytest_cache", "tests"],
             ),
-            timeout=Duration.seconds(60),
+            # Streaming SHA-256 of large uploads for dedup
+            timeout=Duration.seconds(120),
             memory_size=512,
+            layers=layers,
             environment={
                 "BOOKS_TABLE_NAME": books_table.table_name if books_table else "OnlineLibrary",
                 "ALLOWED_MIME_TYPES": "application/pdf,application/epub+zip",
+                "COVER_THUMBNAIL_WIDTH": "300",
             },
         )
 
-        # Grant DynamoDB permissions
+        # Grant DynamoDB permissions (read for the HASH# dedup lookup)
         if books_table:
-            books_table.grant_write_data(validate_mime_type_fn)
+            books_table.grant_read_write_data(validate_mime_type_fn)
 
         # S3 permissions
         if bucket_name:
@@ -72,8 +89,118 @@ class ProcessingStack(Stack):
                 )
             )
 
+        # === approval_worker Lambda ===
+        # approve_book/reject_book only write APPROVING/REJECTING and return 202;
+        # this worker moves the file and finalizes the status from the table stream
+        approval_worker_fn = _lambda.Function(
+            self,
+            "ApprovalWorkerFn",
+            runtime=_lambda.Runtime.PYTHON_3_12,
+            handler="approval_worker.handler.handler",
+            code=_lambda.Code.from_asset(
+                "./lambda",
+                exclude=["**/__pycache__", "*.pyc", ".pytest_cache", "tests"],
+            ),
+            # Large copies, no API Gateway 30s limit here
+            timeout=Duration.minutes(5),
+            memory_size=512,
+            environment={
+                "BOOKS_TABLE_NAME": books_table.table_name if books_table else "OnlineLibrary",
+                "UPLOADS_BUCKET_NAME": bucket_name if bucket_name else "uploads",
+            },
+        )
+
+        if books_table:
+            books_table.grant_read_write_data(approval_worker_fn)
+            approval_worker_dlq = sqs.Queue(
+                self,
+                "ApprovalWorkerDlq",
+                retention_period=Duration.days(14),
+            )
+            approval_worker_fn.add_event_source(
+                lambda_event_sources.DynamoEventSource(
+                    books_table,
+                    starting_position=_lambda.StartingPosition.LATEST,
+                    batch_size=10,
+                    bisect_batch_on_error=True,
+                    retry_attempts=5,
+                    report_batch_item_failures=True,
+                    on_failure=lambda_event_sources.SqsDlq(approval_worker_dlq),
+                    filters=[
+                        _lambda.FilterCriteria.filter({
+                            "eventName": _lambda.FilterRule.is_equal("MODIFY"),
+                            "dynamodb": {
+                                "NewImage": {
+                                    "status": {"S": _lambda.FilterRule.or_("APPROVING", "REJECTING")},
+                                },
+                            },
+                        }),
+                    ],
+                )
+            )
+
+        if bucket_name:
+            bucket.grant_read_write(approval_worker_fn)
+
+        # === stream_processor Lambda ===
+        # Maintains derived state (pending and title/author index keys, status
+        # counters, catalog snapshot) from every book metadata change
+        stream_processor_fn = _lambda.Function(
+            self,
+            "StreamProcessorFn",
+            runtime=_lambda.Runtime.PYTHON_3_12,
+            handler="stream_processor.handler.handler",
+            code=_lambda.Code.from_asset(
+                "./lambda",
+                exclude=["**/__pycache__", "*.pyc", ".pytest_cache", "tests"],
+            ),
+            timeout=Duration.seconds(60),
+            memory_size=256,
+            environment={
+                "BOOKS_TABLE_NAME": books_table.table_name if books_table else "OnlineLibrary",
+                "UPLOADS_BUCKET_NAME": bucket_name if bucket_name else "uploads",
+                "PENDING_GSI5_SHARDS": PENDING_GSI5_SHARDS,
+            },
+        )
+
+        if books_table:
+            books_table.grant_read_write_data(stream_processor_fn)
+            stream_processor_dlq = sqs.Queue(
+                self,
+                "StreamProcessorDlq",
+                retention_period=Duration.days(14),
+            )
+            stream_processor_fn.add_event_source(
+                lambda_event_sources.DynamoEventSource(
+                    books_table,
+                    starting_position=_lambda.StartingPosition.TRIM_HORIZON,
+                    # Large batches so counters and the catalog refresh are amortized
+                    batch_size=100,
+                    max_batching_window=Duration.seconds(5),
+                    bisect_batch_on_error=True,
+                    retry_attempts=10,
+                    report_batch_item_failures=True,
+                    on_failure=lambda_event_sources.SqsDlq(stream_processor_dlq),
+                    filters=[
+                        _lambda.FilterCriteria.filter({
+                            "dynamodb": {
+                                "Keys": {
+                                    "PK": {"S": _lambda.FilterRule.begins_with("BOOK#")},
+                                    "SK": {"S": _lambda.FilterRule.is_equal("METADATA")},
+                                },
+                            },
+                        }),
+                    ],
+                )
+            )
+
+        if bucket_name:
+            bucket.grant_read_write(stream_processor_fn)
+
         # Store Lambda for other stacks to reference
         self.validate_mime_type_fn = validate_mime_type_fn
+        self.approval_worker_fn = approval_worker_fn
+        self.stream_processor_fn = stream_processor_fn
 
         # === Outputs ===
         CfnOutput(
@@ -7,8 +7,12 @@ Components:
 - S3 Bucket chính với folder structure:
   * uploads/: Pending files (chờ validate)
   * public/books/: Approved files (serve qua CloudFront)
+  * public/catalog/: Snapshot catalog sách đã duyệt (search_books đọc, serve qua CloudFront)
+  * staging/covers/: Ảnh bìa thu nhỏ {bookId}.webp của sách chờ duyệt (validateMimeType ghi, không public)
+  * public/covers/: Ảnh bìa của sách đã duyệt (approvalWorker chuyển sang, serve qua CloudFront)
   * quarantine/: Rejected/takedown files
-- Lifecycle Rule: Auto-delete files trong uploads/ sau 72h
+- Lifecycle Rule: Auto-delete files trong uploads/ sau 72h, abort multipart upload dở dang sau 1 ngày,
+  xoá hẳn version cũ của snapshot catalog đã bị thay thế sau 1 ngày
 - Event Notification: Upload → trigger Lambda validateMimeType
 - Security: Block all public access, versioning enabled
 
@@ -62,12 +66,32 @@ class StorageStack(Stack):
             expiration=Duration.hours(72),
         )
 
-        # === CORS: Allow browser uploads from frontend ===
+        # === LIFECYCLE: Abort multipart uploads the client never completed ===
+        # Uploaded parts are billed until the upload is completed or aborted
+        bucket.add_lifecycle_rule(
+            id="AbortIncompleteMultipartUploads",
+            prefix="uploads/",
+            abort_incomplete_multipart_upload_after=Duration.days(1),
+        )
+
+        # === LIFECYCLE: Expire replaced catalog snapshots ===
+        # build_catalog_snapshot deletes all but the current and previous
+        # catalog-v*.json; versioning keeps the deleted objects as noncurrent
+        # versions, which are removed here. Age-based expiration of current
+        # versions would delete the live snapshot of an unchanged catalog.
+        bucket.add_lifecycle_rule(
+            id="CatalogSnapshotCleanup",
+            prefix="public/catalog/",
+            noncurrent_version_expiration=Duration.days(1),
+            expired_object_delete_marker=True,
+        )
+
+        # === CORS: Allow browser uploads and PDF.js range reads from frontend ===
         bucket.add_cors_rule(
             allowed_methods=[s3.HttpMethods.GET, s3.HttpMethods.PUT, s3.HttpMethods.POST],
             allowed_origins=cors_origins,
             allowed_headers=["*"],
-            exposed_headers=["ETag", "x-amz-version-id"],
+            exposed_headers=["ETag", "x-amz-version-id", "Accept-Ranges", "Content-Range", "Content-Length"],
             max_age=3600,  # 1 hour in seconds
         )
 
@@ -0,0 +1,66 @@
+"""
+Add GSI1 (title) / GSI2 (author) keys to books approved before they existed.
+
+Usage:
+  python backfill_search_keys.py --table OnlineLibrary --region ap-southeast-1 [--dry-run]
+
+stream_processor writes these keys whenever a book becomes APPROVED; this
+fills them in for the approved books already in the table, using the same
+rules (shared.derived.search_key_attributes). Safe to re-run: books whose
+keys are already correct are skipped.
+"""
+
+import argparse
+import os
+import sys
+
+from boto3.dynamodb.conditions import Attr
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "lambda"))
+
+from shared.aws_clients import dynamodb_resource  # noqa: E402
+from shared.derived import search_key_attributes  # noqa: E402
+
+
+def backfill(table_name: str, region: str, dry_run: bool = False) -> None:
+    table = dynamodb_resource(region).Table(table_name)
+
+    updated = 0
+    scan_kwargs = {
+        "FilterExpression": Attr("PK").begins_with("BOOK#")
+        & Attr("SK").eq("METADATA")
+        & Attr("status").eq("APPROVED"),
+    }
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get("Items", []):
+            keys = {k: v for k, v in search_key_attributes(item).items() if v is not None}
+            if not keys or all(item.get(k) == v for k, v in keys.items()):
+                continue
+            updated += 1
+            print(f"- {item['PK']}: {keys.get('GSI1SK')} / {keys.get('GSI2SK')}")
+            if dry_run:
+                continue
+            names = {f"#k{i}": name for i, name in enumerate(keys)}
+            values = {f":v{i}": value for i, value in enumerate(keys.values())}
+            table.update_item(
+                Key={"PK": item["PK"], "SK": item["SK"]},
+                UpdateExpression="SET " + ", ".join(f"#k{i} = :v{i}" for i in range(len(keys))),
+                ConditionExpression=Attr("status").eq("APPROVED"),
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+            )
+        if "LastEvaluatedKey" not in response:
+            break
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    print(f"{updated} approved books {'would be' if dry_run else 'were'} updated.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill title/author search keys for approved books")
+    parser.add_argument("--table", required=True, help="DynamoDB table name")
+    parser.add_argument("--region", default="ap-southeast-1", help="AWS region")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would change")
+    args = parser.parse_args()
+    backfill(args.table, args.region, args.dry_run)
@@ -0,0 +1,172 @@
+"""
+Measure DynamoDB client throughput under concurrency, per client config.
+
+Usage:
+  python bench_aws_clients.py [--threads 1 8 32 64] [--requests 2000] [--latency-ms 20]
+                              [--throttle-rate 0.0] [--endpoint-url URL --table NAME]
+
+Compares botocore's default Config (10 pooled connections, legacy retries,
+no timeouts beyond 60s, no keepalive) with shared.aws_clients.client_config() (AWS_* env vars). For
+each thread count one shared client issues GetItem calls from a thread pool
+and the script reports requests per second, p50/p99 latency, failed calls,
+the TCP connections the server saw and the connections the client discarded:
+botocore's pool does not block, so a pool smaller than the thread count
+keeps opening connections (a TCP + TLS handshake each against AWS) and
+throwing them away.
+
+Without --endpoint-url a local stub stands in for DynamoDB, answering every
+call after --latency-ms and with a ThrottlingException for a --throttle-rate
+share of calls. With --endpoint-url/--table the calls go to that endpoint
+(e.g. DynamoDB Local) and read a missing key, so connection counts are not
+available.
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from botocore.config import Config
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "lambda"))
+
+from shared import aws_clients  # noqa: E402
+
+
+class DiscardCounter(logging.Handler):
+    """Counts urllib3's "Connection pool is full, discarding connection" records."""
+
+    def __init__(self) -> None:
+        super().__init__(logging.WARNING)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if "discarding" in record.getMessage():
+            self.count += 1
+
+
+class StubDynamoDB(BaseHTTPRequestHandler):
+    """Keep-alive HTTP handler answering every call like an empty GetItem."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; Nagle would delay the body ~40 ms
+    disable_nagle_algorithm = True
+    latency = 0.02
+    throttle_rate = 0.0
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self) -> None:
+        super().setup()
+        with StubDynamoDB.lock:
+            StubDynamoDB.connections += 1
+
+    def do_POST(self) -> None:  # noqa: N802 (http.server naming)
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.latency)
+        if random.random() < self.throttle_rate:
+            status = 400
+            body = {"__type": "com.amazonaws.dynamodb.v20120810#ThrottlingException", "message": "Rate exceeded"}
+        else:
+            status = 200
+            body = {}
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/x-amz-json-1.0")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def start_stub(latency_ms: float, throttle_rate: float) -> ThreadingHTTPServer:
+    StubDynamoDB.latency = latency_ms / 1000
+    StubDynamoDB.throttle_rate = throttle_rate
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubDynamoDB)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(config: Config, endpoint_url: str, table: str, threads: int, requests: int, discards: DiscardCounter) -> dict:
+    client = aws_clients._session.client(
+        "dynamodb", region_name=aws_clients.get_region(), endpoint_url=endpoint_url, config=config
+    )
+    latencies = []
+    failures = 0
+
+    def call(_: int) -> None:
+        nonlocal failures
+        start = time.perf_counter()
+        try:
+            client.get_item(TableName=table, Key={"PK": {"S": "BENCH#missing"}, "SK": {"S": "METADATA"}})
+        except Exception:
+            failures += 1
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    connections = StubDynamoDB.connections
+    discards.count = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(call, range(requests)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50": statistics.median(latencies),
+        "p99": latencies[int(len(latencies) * 0.99)],
+        "failures": failures,
+        "connections": StubDynamoDB.connections - connections,
+        "discarded": discards.count,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark AWS client configs under concurrency")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8, 32, 64], help="Concurrent callers")
+    parser.add_argument("--requests", type=int, default=2000, help="GetItem calls per run")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Stub response latency")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of stub calls throttled")
+    parser.add_argument("--endpoint-url", help="Real endpoint (e.g. DynamoDB Local) instead of the stub")
+    parser.add_argument("--table", default="OnlineLibrary", help="Table read with --endpoint-url")
+    args = parser.parse_args()
+
+    # urllib3 warns on every discarded connection: count instead of printing
+    discards = DiscardCounter()
+    pool_logger = logging.getLogger("urllib3.connectionpool")
+    pool_logger.addHandler(discards)
+    pool_logger.propagate = False
+    endpoint_url = args.endpoint_url
+    if endpoint_url is None:
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+        server = start_stub(args.latency_ms, args.throttle_rate)
+        endpoint_url = f"http://127.0.0.1:{server.server_port}"
+
+    configs = {
+        "botocore default": Config(),
+        "aws_clients": aws_clients.client_config(),
+    }
+    for threads in args.threads:
+        for name, config in configs.items():
+            result = run(config, endpoint_url, args.table, threads, args.requests, discards)
+            connections = f"{result['connections']:5d}" if args.endpoint_url is None else "    -"
+            print(
+                f"{threads:>3} threads, {name:<16}: {result['rps']:7.0f} req/s, "
+                f"p50 {result['p50']:6.1f} ms p99 {result['p99']:6.1f} ms, "
+                f"{result['failures']:4d} failed, {connections} connections, "
+                f"{result['discarded']:5d} discarded"
+            )
+
+
+if __name__ == "__main__":
+    main()
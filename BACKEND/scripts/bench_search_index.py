@@ -0,0 +1,178 @@
+"""
+Measure memory and latency of shared.search_index.
+
+Usage:
+  python bench_search_index.py [--books 10000 100000] [--queries 2000] [--seed 42]
+                               [--vocabulary zipf|syllables|open]
+
+The default "zipf" corpus draws title, author and description words from
+~2,000 generated Vietnamese syllables with Zipfian frequencies, like a real
+catalog. "syllables" reuses bench_tokenizer's 62 common syllables: every
+word is then in a large share of the books, a worst case for ranking.
+"open" draws from ~300,000 generated 3-12 letter words (names, foreign
+words): most of the vocabulary occurs in a single book, the worst case for
+the typo dictionary.
+
+For each catalog size: index build time (measured under tracemalloc, so
+inflated), traced memory of the index (catalog entries themselves excluded)
+reported per 10k books, ranked query latency percentiles for 1-2 word prefix queries and for the same
+queries with one typo (the first typo query also builds the symmetric-delete
+dictionary, reported separately with its traced size and entry count), the
+time of an incremental refresh that changes 1% of the books, and the peak
+RSS of the process so far (catalog entries included).
+"""
+
+import argparse
+import os
+import random
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from itertools import accumulate
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "lambda"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_tokenizer import SYLLABLES, build_corpus  # noqa: E402
+from shared.search_index import SearchIndex  # noqa: E402
+from shared.text import tokenize  # noqa: E402
+
+ONSETS = "b c ch d đ g gh gi h k kh l m n ng nh p ph qu r s t th tr v x".split() + [""]
+RHYMES = (
+    "a ac ai am an ang anh ao ap at au ay ăc ăm ăn ăng ăt âm ân âng âu ây e em en eo "
+    "ê êm ên êt êu i ich im in inh it iêu iên o oa oai oan oang oc oi om on ong ô ôi "
+    "ôm ôn ông ơ ơi ơm ơn u uc ui um un ung uôi uông ư ưa ưc ưng ươi ương ươc"
+).split()
+
+
+def build_vocabulary(seed: int) -> list:
+    """Generated syllables, shuffled so frequency rank is independent of spelling."""
+    words = sorted({onset + rhyme for onset in ONSETS for rhyme in RHYMES})
+    random.Random(seed).shuffle(words)
+    return words
+
+
+def build_open_vocabulary(seed: int, size: int = 300_000) -> list:
+    """Generated letter words, shuffled like build_vocabulary()."""
+    rng = random.Random(seed)
+    letters = "abcdeghiklmnopqrstuvxy"
+    words = sorted({"".join(rng.choice(letters) for _ in range(rng.randint(3, 12))) for _ in range(size)})
+    rng.shuffle(words)
+    return words
+
+
+def build_books(count: int, seed: int, vocabulary: str = "zipf") -> list:
+    rng = random.Random(seed)
+    if vocabulary == "syllables":
+        titles = build_corpus(count, seed)
+
+        def words(size: int) -> str:
+            return " ".join(rng.choice(SYLLABLES) for _ in range(size))
+    else:
+        vocab = build_open_vocabulary(seed) if vocabulary == "open" else build_vocabulary(seed)
+        cum_weights = list(accumulate(1 / rank for rank in range(1, len(vocab) + 1)))
+
+        def words(size: int) -> str:
+            return " ".join(rng.choices(vocab, cum_weights=cum_weights, k=size))
+
+        titles = [words(rng.randint(2, 9)).title() for _ in range(count)]
+    return [
+        {
+            "bookId": f"book-{i:07d}",
+            "title": title,
+            "author": words(3).title(),
+            "description": words(rng.randint(10, 40)),
+        }
+        for i, title in enumerate(titles)
+    ]
+
+
+def add_typo(query: str, rng: random.Random) -> str:
+    """Swap two letters of the longest word (one transposition)."""
+    words = query.split()
+    longest = max(range(len(words)), key=lambda i: len(words[i]))
+    word = words[longest]
+    if len(word) >= 4:
+        i = rng.randrange(len(word) - 1)
+        words[longest] = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return " ".join(words)
+
+
+def _percentiles(index: SearchIndex, queries: list) -> tuple:
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, limit=20)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.95)]
+
+
+def build_queries(books: list, count: int, seed: int) -> list:
+    rng = random.Random(seed + 1)
+    queries = []
+    for _ in range(count):
+        words = tokenize(rng.choice(books)["title"])
+        picked = rng.sample(words, min(len(words), rng.randint(1, 2)))
+        queries.append(" ".join(word[: rng.randint(2, len(word))] if len(word) > 2 else word for word in picked))
+    return queries
+
+
+def bench(size: int, query_count: int, seed: int, vocabulary: str) -> None:
+    books = build_books(size, seed, vocabulary)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    index = SearchIndex(books, "v1")
+    build_ms = (time.perf_counter() - start) * 1000
+    index_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    queries = build_queries(books, query_count, seed)
+    p50, p95 = _percentiles(index, queries)
+
+    rng = random.Random(seed + 3)
+    typo_queries = [add_typo(query, rng) for query in queries]
+    tracemalloc.start()
+    start = time.perf_counter()
+    index.search("qqqqq", limit=20)
+    fuzzy_build_ms = (time.perf_counter() - start) * 1000
+    fuzzy_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    typo_p50, typo_p95 = _percentiles(index, typo_queries)
+
+    changed = list(books)
+    rng = random.Random(seed + 2)
+    for position in rng.sample(range(size), max(1, size // 100)):
+        changed[position] = dict(changed[position], title=changed[position]["title"] + " tái bản")
+    start = time.perf_counter()
+    index.refresh(changed, "v2")
+    refresh_ms = (time.perf_counter() - start) * 1000
+
+    print(
+        f"{size:>7} books: build {build_ms:7.0f} ms, "
+        f"{index_bytes / 1e6:6.1f} MB ({index_bytes / 1e6 / (size / 10_000):5.1f} MB per 10k), "
+        f"query p50 {p50:7.0f} us p95 {p95:7.0f} us, "
+        f"typo p50 {typo_p50:7.0f} us p95 {typo_p95:7.0f} us "
+        f"(dictionary {fuzzy_build_ms:5.0f} ms, {fuzzy_bytes / 1e6:5.1f} MB, {len(index._fuzzy)} entries), "
+        f"1% refresh {refresh_ms:6.0f} ms, "
+        f"peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:5.0f} MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the in-memory search index")
+    parser.add_argument("--books", type=int, nargs="+", default=[10_000, 100_000], help="Catalog sizes")
+    parser.add_argument("--queries", type=int, default=2000, help="Queries per size")
+    parser.add_argument("--seed", type=int, default=42, help="Corpus seed")
+    parser.add_argument("--vocabulary", choices=["zipf", "syllables", "open"], default="zipf", help="Corpus word distribution")
+    args = parser.parse_args()
+
+    for size in args.books:
+        bench(size, args.queries, args.seed, args.vocabulary)
+
+
+if __name__ == "__main__":
+    main()
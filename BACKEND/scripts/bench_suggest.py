@@ -0,0 +1,79 @@
+"""
+Measure build cost, memory and lookup latency of shared.suggest.
+
+Usage:
+  python bench_suggest.py [--books 10000 100000] [--lookups 10000] [--seed 42]
+
+Uses the Zipfian catalog of bench_search_index. Lookups are what a search
+box sends while typing: 1-8 leading characters of a title, of an inner
+title word or of an author. Reports build time, traced memory of the index
+(catalog entries excluded) and p50/p99/max lookup latency.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "lambda"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_search_index import build_books  # noqa: E402
+from shared.suggest import SuggestIndex  # noqa: E402
+from shared.text import normalize  # noqa: E402
+
+
+def build_prefixes(books: list, count: int, seed: int) -> list:
+    rng = random.Random(seed + 1)
+    prefixes = []
+    for _ in range(count):
+        book = rng.choice(books)
+        text = normalize(book["author"] if rng.random() < 0.3 else book["title"])
+        words = text.split()
+        start = text.find(rng.choice(words)) if rng.random() < 0.3 else 0
+        prefixes.append(text[start:start + rng.randint(1, 8)])
+    return prefixes
+
+
+def bench(size: int, lookup_count: int, seed: int) -> None:
+    books = build_books(size, seed)
+
+    start = time.perf_counter()
+    SuggestIndex(books, "v1")
+    build_ms = (time.perf_counter() - start) * 1000
+
+    tracemalloc.start()
+    index = SuggestIndex(books, "v1")
+    index_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = []
+    for prefix in build_prefixes(books, lookup_count, seed):
+        start = time.perf_counter()
+        index.suggest(prefix)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    latencies.sort()
+
+    print(
+        f"{size:>7} books: build {build_ms:6.0f} ms, {index_bytes / 1e6:5.1f} MB, "
+        f"lookup p50 {statistics.median(latencies):5.0f} us "
+        f"p99 {latencies[int(len(latencies) * 0.99)]:5.0f} us max {latencies[-1]:6.0f} us"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the suggestion index")
+    parser.add_argument("--books", type=int, nargs="+", default=[10_000, 100_000], help="Catalog sizes")
+    parser.add_argument("--lookups", type=int, default=10_000, help="Lookups per size")
+    parser.add_argument("--seed", type=int, default=42, help="Corpus seed")
+    args = parser.parse_args()
+
+    for size in args.books:
+        bench(size, args.lookups, args.seed)
+
+
+if __name__ == "__main__":
+    main()
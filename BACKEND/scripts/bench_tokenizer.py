@@ -0,0 +1,81 @@
+"""
+Benchmark shared.text over a synthetic Vietnamese title corpus.
+
+Usage:
+  python bench_tokenizer.py [--titles 100000] [--repeat 3] [--seed 42]
+
+Builds a deterministic corpus of titles from common Vietnamese syllables
+(with and without diacritics, mixed case and punctuation) and reports the
+best-of-N throughput of each stage used at approval and query time:
+normalize(), tokenize() and tokenize() + edge_ngrams().
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "lambda"))
+
+from shared.text import edge_ngrams, normalize, tokenize  # noqa: E402
+
+SYLLABLES = (
+    "sách người việt nam đường xưa mây trắng đắc nhân tâm truyện kiều dế mèn "
+    "phiêu lưu ký nhà giả kim số đỏ tắt đèn chí phèo lão hạc vợ chồng a phủ "
+    "những ngày thơ ấu hoàng tử bé cho tôi xin một vé đi tuổi thơ mắt biếc "
+    "tôi thấy hoa vàng trên cỏ xanh lập trình python cơ bản nâng cao học máy"
+).split()
+PUNCTUATION = ["", "", "", ",", ":", " -", "!", "?"]
+
+
+def build_corpus(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    titles = []
+    for _ in range(count):
+        words = []
+        for _ in range(rng.randint(2, 9)):
+            word = rng.choice(SYLLABLES)
+            if rng.random() < 0.3:
+                word = word.capitalize()
+            words.append(word + rng.choice(PUNCTUATION))
+        titles.append(" ".join(words))
+    return titles
+
+
+def _best(func, corpus, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for title in corpus:
+            func(title)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark search text normalization")
+    parser.add_argument("--titles", type=int, default=100_000, help="Corpus size")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage (best is reported)")
+    parser.add_argument("--seed", type=int, default=42, help="Corpus seed")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.titles, args.seed)
+    megabytes = sum(len(title.encode("utf-8")) for title in corpus) / 1e6
+    print(f"Corpus: {len(corpus)} titles, {megabytes:.1f} MB UTF-8")
+
+    stages = [
+        ("normalize", normalize),
+        ("tokenize", tokenize),
+        ("tokenize+edge_ngrams", lambda title: edge_ngrams(tokenize(title))),
+    ]
+    for name, func in stages:
+        seconds = _best(func, corpus, args.repeat)
+        print(
+            f"{name:>22}: {seconds * 1000:8.1f} ms  "
+            f"{len(corpus) / seconds:>10,.0f} titles/s  {megabytes / seconds:6.1f} MB/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
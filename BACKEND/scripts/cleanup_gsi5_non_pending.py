@@ -6,17 +6,26 @@ Usage:
 
 This scans for items where status != PENDING and GSI5PK exists, then removes
 GSI5PK and GSI5SK so the item is no longer returned in the pending index.
+Any GSI5PK counts, so books on a pending shard ("STATUS#PENDING#<n>") and on
+the legacy "STATUS#PENDING" partition are both cleaned.
+
+GSI5 keys are now maintained by the stream_processor Lambda; prefer
+rebuild_derived_state.py, which fixes all derived attributes and counters.
 """
 
 import argparse
+import os
+import sys
 
-import boto3
 from boto3.dynamodb.conditions import Attr
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "lambda"))
+
+from shared.aws_clients import dynamodb_resource  # noqa: E402
+
 
 def cleanup(table_name: str, region: str) -> None:
-    dynamodb = boto3.resource("dynamodb", region_name=region)
-    table = dynamodb.Table(table_name)
+    table = dynamodb_resource(region).Table(table_name)
 
     response = table.scan(
         FilterExpression=Attr("status").ne("PENDING") & Attr("GSI5PK").exists()
@@ -1,60 +1,86 @@
 """
-Add GSI5 keys for pending books that are missing them.
+Put pending books on their GSI5 pending-index shard.
 
 Usage:
-  python migrate_pending_gsi5.py --table OnlineLibrary --region ap-southeast-1
+  python migrate_pending_gsi5.py --table OnlineLibrary --region ap-southeast-1 [--shards 8] [--dry-run]
 
 This script scans for items with status=PENDING and sets:
-  GSI5PK = "STATUS#PENDING"
+  GSI5PK = "STATUS#PENDING#<n>" (shard of the book id, see shared.derived)
   GSI5SK = uploadedAt or createdAt (fallback to current timestamp)
+
+Books without keys, on the legacy unsharded "STATUS#PENDING" partition or on
+another shard (after changing PENDING_GSI5_SHARDS) are moved; --shards must
+match the PENDING_GSI5_SHARDS of the deployed Lambdas.
+
+After a complete pass (not --dry-run) the script writes the migration marker
+(shared.derived.PENDING_MIGRATION_KEY, with the shard count).
+list_pending_books then skips its scan for books without index keys, and
+skips the legacy partition while the shard count matches.
 """
 
 import argparse
+import os
+import sys
 from datetime import datetime, timezone
 
-import boto3
 from boto3.dynamodb.conditions import Attr
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "lambda"))
 
-def migrate(table_name: str, region: str) -> None:
-    dynamodb = boto3.resource("dynamodb", region_name=region)
-    table = dynamodb.Table(table_name)
+from shared.aws_clients import dynamodb_resource  # noqa: E402
+from shared.derived import PENDING_MIGRATION_KEY, PENDING_SHARDS, pending_shard_key  # noqa: E402
 
-    pending = table.scan(
-        FilterExpression=Attr("status").eq("PENDING")
-    ).get("Items", [])
 
-    updated = 0
-    for item in pending:
-        pk = item["PK"]
-        sk = item["SK"]
+def migrate(table_name: str, region: str, shards: int = PENDING_SHARDS, dry_run: bool = False) -> None:
+    table = dynamodb_resource(region).Table(table_name)
 
-        if item.get("GSI5PK") and item.get("GSI5SK"):
-            continue
-
-        gsi5sk = (
-            item.get("uploadedAt")
-            or item.get("createdAt")
-            or datetime.now(timezone.utc).isoformat()
-        )
+    scan_kwargs = {"FilterExpression": Attr("status").eq("PENDING")}
+    scanned = 0
+    updated = 0
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get("Items", []):
+            scanned += 1
+            book_id = item.get("bookId") or item["PK"].replace("BOOK#", "")
+            gsi5pk = pending_shard_key(book_id, shards)
+            if item.get("GSI5PK") == gsi5pk and item.get("GSI5SK"):
+                continue
 
-        table.update_item(
-            Key={"PK": pk, "SK": sk},
-            UpdateExpression="SET GSI5PK = :gpk, GSI5SK = :gsk",
-            ExpressionAttributeValues={
-                ":gpk": "STATUS#PENDING",
-                ":gsk": gsi5sk,
-            },
-        )
-        updated += 1
+            gsi5sk = (
+                item.get("GSI5SK")
+                or item.get("uploadedAt")
+                or item.get("createdAt")
+                or datetime.now(timezone.utc).isoformat()
+            )
+            print(f"- {book_id}: {item.get('GSI5PK')} -> {gsi5pk}")
+            if not dry_run:
+                table.update_item(
+                    Key={"PK": item["PK"], "SK": item["SK"]},
+                    UpdateExpression="SET GSI5PK = :gpk, GSI5SK = :gsk",
+                    ExpressionAttributeValues={
+                        ":gpk": gsi5pk,
+                        ":gsk": gsi5sk,
+                    },
+                )
+            updated += 1
+        if "LastEvaluatedKey" not in response:
+            break
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
 
-    print(f"Total pending items: {len(pending)}; Updated: {updated}")
+    action = "Would update" if dry_run else "Updated"
+    print(f"Total pending items: {scanned}; {action}: {updated} ({shards} shards)")
+    if not dry_run:
+        completed_at = datetime.now(timezone.utc).isoformat()
+        table.put_item(Item={**PENDING_MIGRATION_KEY, "shards": shards, "completedAt": completed_at})
+        print(f"Migration marker written ({completed_at})")
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Add GSI5 keys to pending books")
+    parser = argparse.ArgumentParser(description="Add or reshard GSI5 keys of pending books")
     parser.add_argument("--table", required=True, help="DynamoDB table name")
     parser.add_argument("--region", default="ap-southeast-1", help="AWS region")
+    parser.add_argument("--shards", type=int, default=PENDING_SHARDS, help="Pending index shard count")
+    parser.add_argument("--dry-run", action="store_true", help="Only report the books that would move")
     args = parser.parse_args()
 
-    migrate(args.table, args.region)
+    migrate(args.table, args.region, max(1, args.shards), args.dry_run)
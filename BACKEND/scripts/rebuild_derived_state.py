@@ -0,0 +1,109 @@
+"""
+Recompute derived book state from scratch.
+
+Usage:
+  python rebuild_derived_state.py --table OnlineLibrary --region ap-southeast-1 [--dry-run]
+
+stream_processor keeps the GSI1/GSI2/GSI5 keys, GSI6SK and the status counters
+in sync from the table stream. Run this once when enabling the stream on an
+existing table, after the processor's DLQ received records, or to move books
+uploaded before GSI6SK carried the upload time into date order: it scans all
+BOOK#*/METADATA items, writes the derived attributes that differ (same rules
+as shared.derived) and overwrites the STATS#STATUS and STATS#UPLOADER#<id>
+counters items with fresh counts.
+
+Pending books are put on their GSI5 shard for the PENDING_GSI5_SHARDS of the
+environment running the script (default 8), which must match the deployed
+Lambdas. Like migrate_pending_gsi5.py, a full run writes the pending index
+migration marker.
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+from boto3.dynamodb.conditions import Attr
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "lambda"))
+
+from shared.aws_clients import dynamodb_resource  # noqa: E402
+from shared.derived import (  # noqa: E402
+    PENDING_MIGRATION_KEY,
+    PENDING_SHARDS,
+    STATS_KEY,
+    derived_changes,
+    uploader_stats_key,
+)
+
+
+def _update_expression(changes):
+    names, values, set_parts, remove_parts = {}, {}, [], []
+    for index, (name, value) in enumerate(sorted(changes.items())):
+        names[f"#a{index}"] = name
+        if value is None:
+            remove_parts.append(f"#a{index}")
+        else:
+            values[f":v{index}"] = value
+            set_parts.append(f"#a{index} = :v{index}")
+    expr = ""
+    if set_parts:
+        expr += "SET " + ", ".join(set_parts)
+    if remove_parts:
+        expr += " REMOVE " + ", ".join(remove_parts)
+    return expr.strip(), names, values
+
+
+def rebuild(table_name: str, region: str, dry_run: bool = False) -> None:
+    table = dynamodb_resource(region).Table(table_name)
+
+    counts = Counter()
+    uploader_counts = defaultdict(Counter)
+    fixed = 0
+    scan_kwargs = {"FilterExpression": Attr("PK").begins_with("BOOK#") & Attr("SK").eq("METADATA")}
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get("Items", []):
+            if item.get("status"):
+                counts[item["status"]] += 1
+                if item.get("uploaderId"):
+                    uploader_counts[item["uploaderId"]][item["status"]] += 1
+            changes = derived_changes(item)
+            if not changes:
+                continue
+            fixed += 1
+            print(f"- {item['PK']}: {sorted(changes)}")
+            if dry_run:
+                continue
+            expr, names, values = _update_expression(changes)
+            kwargs = {"ExpressionAttributeValues": values} if values else {}
+            table.update_item(
+                Key={"PK": item["PK"], "SK": item["SK"]},
+                UpdateExpression=expr,
+                ExpressionAttributeNames=names,
+                **kwargs,
+            )
+        if "LastEvaluatedKey" not in response:
+            break
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    print(f"{fixed} books with stale derived attributes; counts: {dict(counts)}")
+    if not dry_run:
+        now = datetime.now(timezone.utc).isoformat()
+        with table.batch_writer() as batch:
+            batch.put_item(Item={**STATS_KEY, **counts, "updatedAt": now})
+            for uploader_id, statuses in uploader_counts.items():
+                batch.put_item(Item={**uploader_stats_key(uploader_id), **statuses, "updatedAt": now})
+            # Every pending book now carries its GSI5 keys
+            batch.put_item(Item={**PENDING_MIGRATION_KEY, "shards": PENDING_SHARDS, "completedAt": now})
+    print("Rebuild complete." if not dry_run else "Dry run, nothing written.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute derived book attributes and status counters")
+    parser.add_argument("--table", required=True, help="DynamoDB table name")
+    parser.add_argument("--region", default="ap-southeast-1", help="AWS region")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would change")
+    args = parser.parse_args()
+    rebuild(args.table, args.region, args.dry_run)
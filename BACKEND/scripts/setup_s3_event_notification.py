@@ -11,14 +11,19 @@ Usage:
 """
 
 import json
-import boto3
 import argparse
+import os
+import sys
 from typing import Optional
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "lambda"))
+
+from shared.aws_clients import get_client  # noqa: E402
+
 
 def get_lambda_arn(lambda_name: str, region: str) -> str:
     """Get Lambda function ARN by name"""
-    lambda_client = boto3.client("lambda", region_name=region)
+    lambda_client = get_client("lambda", region)
     try:
         response = lambda_client.get_function(FunctionName=lambda_name)
         return response["Configuration"]["FunctionArn"]
@@ -28,7 +33,7 @@ def get_lambda_arn(lambda_name: str, region: str) -> str:
 
 def get_s3_bucket_name(stack_name: str, region: str) -> str:
     """Get S3 bucket name from CloudFormation stack"""
-    cf_client = boto3.client("cloudformation", region_name=region)
+    cf_client = get_client("cloudformation", region)
     try:
         response = cf_client.describe_stacks(StackName=stack_name)
         stack = response["Stacks"][0]
@@ -50,8 +55,8 @@ def get_s3_bucket_name(stack_name: str, region: str) -> str:
 
 def grant_lambda_s3_permission(lambda_name: str, bucket_name: str, region: str) -> None:
     """Grant S3 permissions to Lambda"""
-    lambda_client = boto3.client("lambda", region_name=region)
-    iam_client = boto3.client("iam", region_name=region)
+    lambda_client = get_client("lambda", region)
+    iam_client = get_client("iam", region)
     
     # Remove existing permission first
     try:
@@ -98,7 +103,7 @@ def grant_lambda_s3_permission(lambda_name: str, bucket_name: str, region: str)
         }
         
         # Use IAM client without region
-        iam_client_global = boto3.client("iam")
+        iam_client_global = get_client("iam")
         iam_client_global.put_role_policy(
             RoleName=role_name,
             PolicyName="S3Access",
@@ -116,7 +121,7 @@ def setup_s3_event_notification(
     prefix: str = "uploads/",
 ) -> None:
     """Setup S3 event notification"""
-    s3_client = boto3.client("s3", region_name=region)
+    s3_client = get_client("s3", region)
     
     notification_config = {
         "LambdaFunctionConfigurations": [
@@ -191,7 +196,7 @@ def main():
         
         # Get Lambda function name from ProcessingStack outputs
         print(f"🔍 Getting Lambda function from {processing_stack_name}...")
-        cf_client = boto3.client("cloudformation", region_name=args.region)
+        cf_client = get_client("cloudformation", args.region)
         response = cf_client.describe_stacks(StackName=processing_stack_name)
         stack = response["Stacks"][0]
         
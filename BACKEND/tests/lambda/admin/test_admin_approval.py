@@ -8,6 +8,7 @@ import pytest
 # Add lambda directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from approval_worker.handler import handler as worker_handler
 from approve_book.handler import handler as approve_handler
 from list_pending_books.handler import handler as list_handler
 
@@ -60,7 +61,7 @@ def test_list_pending_books(admin_context, books_table):
     assert body["pagination"]["total"] == 3
 
 
-def test_approve_book(admin_context, books_table, monkeypatch):
+def test_approve_book(admin_context, books_table, monkeypatch, build_stream_event):
     """Test approving a book."""
     from unittest.mock import MagicMock
     
@@ -83,7 +84,7 @@ def test_approve_book(admin_context, books_table, monkeypatch):
     
     # Mock S3 operations
     mock_s3 = MagicMock()
-    monkeypatch.setattr("approve_book.handler.s3_client", lambda: mock_s3)
+    monkeypatch.setattr("approval_worker.handler.s3_client", lambda: mock_s3)
     
     # Approve book
     event = {
@@ -102,18 +103,30 @@ def test_approve_book(admin_context, books_table, monkeypatch):
     
     response = approve_handler(event, context={})
     
-    assert response["statusCode"] == 200
+    assert response["statusCode"] == 202
     body = json.loads(response["body"])
     assert body["action"] == "approve"
-    assert body["status"] == "APPROVED"
-    
+    assert body["status"] == "APPROVING"
+
+    item = table.get_item(Key={"PK": f"BOOK#{book_id}", "SK": "METADATA"}).get("Item")
+    assert item["status"] == "APPROVING"
+    assert item["approvedBy"] == "admin-user-123"
+
+    # Stream worker moves the file and finalizes
+    result = worker_handler(build_stream_event(book_id), context={})
+    assert result == {"batchItemFailures": []}
+
     # Verify DynamoDB updated
     item = table.get_item(Key={"PK": f"BOOK#{book_id}", "SK": "METADATA"}).get("Item")
     assert item["status"] == "APPROVED"
     assert "public/books" in item["file_path"]
 
+    # A second approve loses the conditional write
+    response = approve_handler(event, context={})
+    assert response["statusCode"] == 400
+
 
-def test_reject_book(admin_context, books_table, monkeypatch):
+def test_reject_book(admin_context, books_table, monkeypatch, build_stream_event):
     """Test rejecting a book."""
     from unittest.mock import MagicMock
     
@@ -136,7 +149,7 @@ def test_reject_book(admin_context, books_table, monkeypatch):
     
     # Mock S3 operations
     mock_s3 = MagicMock()
-    monkeypatch.setattr("approve_book.handler.s3_client", lambda: mock_s3)
+    monkeypatch.setattr("approval_worker.handler.s3_client", lambda: mock_s3)
     
     # Reject book
     event = {
@@ -155,11 +168,13 @@ def test_reject_book(admin_context, books_table, monkeypatch):
     
     response = approve_handler(event, context={})
     
-    assert response["statusCode"] == 200
+    assert response["statusCode"] == 202
     body = json.loads(response["body"])
     assert body["action"] == "reject"
-    assert body["status"] == "REJECTED"
-    
+    assert body["status"] == "REJECTING"
+
+    worker_handler(build_stream_event(book_id), context={})
+
     # Verify DynamoDB updated
     item = table.get_item(Key={"PK": f"BOOK#{book_id}", "SK": "METADATA"}).get("Item")
     assert item["status"] == "REJECTED"
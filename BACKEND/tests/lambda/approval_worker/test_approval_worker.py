@@ -0,0 +1,193 @@
+import sys
+from pathlib import Path
+
+import boto3
+
+# Add lambda directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import approval_worker.handler as worker
+from approval_worker.handler import handler
+
+
+def _put_book(table, book_id, status, file_path, **extra):
+    table.put_item(Item={
+        "PK": f"BOOK#{book_id}",
+        "SK": "METADATA",
+        "bookId": book_id,
+        "title": "Test Book",
+        "status": status,
+        "file_path": file_path,
+        **extra,
+    })
+
+
+def test_rejecting_duplicate_releases_reference_once(upload_test_context, books_table, build_stream_event, monkeypatch):
+    table = boto3.resource("dynamodb", region_name=upload_test_context["region"]).Table(
+        upload_test_context["table_name"]
+    )
+    table.put_item(Item={
+        "PK": "HASH#abc",
+        "SK": "CONTENT",
+        "canonicalBookId": "original",
+        "objectKey": "staging/original/book.pdf",
+        "refCount": 2,
+    })
+    _put_book(
+        table,
+        "dup",
+        "REJECTING",
+        "staging/original/book.pdf",
+        contentHash="abc",
+        duplicateOf="original",
+    )
+
+    # First attempt crashes after releasing the reference, before finalizing
+    real_transition = worker.transition_book_status
+    calls = []
+
+    def flaky_transition(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            raise RuntimeError("throttled")
+        return real_transition(*args, **kwargs)
+
+    monkeypatch.setattr(worker, "transition_book_status", flaky_transition)
+
+    assert handler(build_stream_event("dup"), context={})["batchItemFailures"]
+    assert handler(build_stream_event("dup"), context={}) == {"batchItemFailures": []}
+
+    content = table.get_item(Key={"PK": "HASH#abc", "SK": "CONTENT"})["Item"]
+    assert content["refCount"] == 1
+    item = table.get_item(Key={"PK": "BOOK#dup", "SK": "METADATA"})["Item"]
+    assert item["status"] == "REJECTED"
+    assert "file_path" not in item
+
+
+def test_duplicate_can_be_approved_after_original_is_rejected(upload_test_context, books_table, build_stream_event):
+    table = boto3.resource("dynamodb", region_name=upload_test_context["region"]).Table(
+        upload_test_context["table_name"]
+    )
+    s3 = boto3.client("s3", region_name=upload_test_context["region"])
+    bucket_name = upload_test_context["bucket_name"]
+    shared_key = "staging/original/book.epub"
+    s3.put_object(Bucket=bucket_name, Key=shared_key, Body=b"shared bytes")
+    table.put_item(Item={
+        "PK": "HASH#abc",
+        "SK": "CONTENT",
+        "canonicalBookId": "original",
+        "objectKey": shared_key,
+        "refCount": 2,
+        "claimedBy": {"original", "dup"},
+    })
+    _put_book(table, "original", "REJECTING", shared_key, contentHash="abc")
+    _put_book(table, "dup", "APPROVING", shared_key, contentHash="abc", duplicateOf="original")
+
+    assert handler(build_stream_event("original"), context={}) == {"batchItemFailures": []}
+
+    # The duplicate still references the content: nothing is quarantined
+    s3.head_object(Bucket=bucket_name, Key=shared_key)
+    original = table.get_item(Key={"PK": "BOOK#original", "SK": "METADATA"})["Item"]
+    assert original["status"] == "REJECTED"
+    assert "file_path" not in original
+
+    assert handler(build_stream_event("dup"), context={}) == {"batchItemFailures": []}
+
+    public_key = "public/books/original/book.epub"
+    s3.head_object(Bucket=bucket_name, Key=public_key)
+    assert "Contents" not in s3.list_objects_v2(Bucket=bucket_name, Prefix="staging/original/")
+    dup = table.get_item(Key={"PK": "BOOK#dup", "SK": "METADATA"})["Item"]
+    assert dup["status"] == "APPROVED"
+    assert dup["file_path"] == public_key
+    content = table.get_item(Key={"PK": "HASH#abc", "SK": "CONTENT"})["Item"]
+    assert content["objectKey"] == public_key
+    assert content["refCount"] == 1
+
+
+def test_rejecting_last_reference_quarantines_shared_object(upload_test_context, books_table, build_stream_event):
+    table = boto3.resource("dynamodb", region_name=upload_test_context["region"]).Table(
+        upload_test_context["table_name"]
+    )
+    s3 = boto3.client("s3", region_name=upload_test_context["region"])
+    bucket_name = upload_test_context["bucket_name"]
+    shared_key = "staging/original/book.epub"
+    s3.put_object(Bucket=bucket_name, Key=shared_key, Body=b"shared bytes")
+    # The original was deleted while pending; the duplicate holds the last reference
+    table.put_item(Item={
+        "PK": "HASH#abc",
+        "SK": "CONTENT",
+        "canonicalBookId": "original",
+        "objectKey": shared_key,
+        "refCount": 1,
+        "claimedBy": {"original", "dup"},
+        "releasedBy": {"original"},
+    })
+    _put_book(table, "dup", "REJECTING", shared_key, contentHash="abc", duplicateOf="original")
+
+    assert handler(build_stream_event("dup"), context={}) == {"batchItemFailures": []}
+
+    s3.head_object(Bucket=bucket_name, Key="quarantine/original/book.epub")
+    assert "Item" not in table.get_item(Key={"PK": "HASH#abc", "SK": "CONTENT"})
+    dup = table.get_item(Key={"PK": "BOOK#dup", "SK": "METADATA"})["Item"]
+    assert dup["status"] == "REJECTED"
+    assert dup["file_path"] == "quarantine/original/book.epub"
+
+
+def test_cover_is_published_on_approve_and_deleted_on_reject(upload_test_context, books_table, build_stream_event):
+    table = boto3.resource("dynamodb", region_name=upload_test_context["region"]).Table(
+        upload_test_context["table_name"]
+    )
+    s3 = boto3.client("s3", region_name=upload_test_context["region"])
+    bucket_name = upload_test_context["bucket_name"]
+    for book_id, status in (("kept", "APPROVING"), ("dropped", "REJECTING")):
+        s3.put_object(Bucket=bucket_name, Key=f"staging/{book_id}/book.epub", Body=b"epub")
+        s3.put_object(
+            Bucket=bucket_name,
+            Key=f"staging/covers/{book_id}.webp",
+            Body=b"webp",
+            CacheControl="public, max-age=86400",
+        )
+        _put_book(table, book_id, status, f"staging/{book_id}/book.epub", coverPath=f"staging/covers/{book_id}.webp")
+
+    assert handler(build_stream_event("kept", "dropped"), context={}) == {"batchItemFailures": []}
+
+    kept = table.get_item(Key={"PK": "BOOK#kept", "SK": "METADATA"})["Item"]
+    assert kept["coverPath"] == "public/covers/kept.webp"
+    head = s3.head_object(Bucket=bucket_name, Key="public/covers/kept.webp")
+    assert head["CacheControl"] == "public, max-age=86400"
+    dropped = table.get_item(Key={"PK": "BOOK#dropped", "SK": "METADATA"})["Item"]
+    assert "coverPath" not in dropped
+    assert "Contents" not in s3.list_objects_v2(Bucket=bucket_name, Prefix="staging/covers/")
+    assert "Contents" not in s3.list_objects_v2(Bucket=bucket_name, Prefix="public/covers/dropped")
+
+
+def test_missing_object_is_reported_as_batch_failure(upload_test_context, books_table, build_stream_event):
+    table = boto3.resource("dynamodb", region_name=upload_test_context["region"]).Table(
+        upload_test_context["table_name"]
+    )
+    _put_book(table, "missing", "APPROVING", "staging/missing/book.pdf")
+    _put_book(table, "done", "APPROVED", "public/books/done/book.pdf")
+
+    result = handler(build_stream_event("done", "missing"), context={})
+
+    assert result == {"batchItemFailures": [{"itemIdentifier": "2"}]}
+    item = table.get_item(Key={"PK": "BOOK#missing", "SK": "METADATA"})["Item"]
+    assert item["status"] == "APPROVING"
+
+
+def test_approved_pdf_records_range_reading_fields(upload_test_context, books_table, build_stream_event):
+    table = boto3.resource("dynamodb", region_name=upload_test_context["region"]).Table(
+        upload_test_context["table_name"]
+    )
+    s3 = boto3.client("s3", region_name=upload_test_context["region"])
+    bucket_name = upload_test_context["bucket_name"]
+    body = b"%PDF-1.7\n1 0 obj <</Linearized 1 /L 4096>> endobj\n" + b"0" * 4000
+    s3.put_object(Bucket=bucket_name, Key="staging/pdf/book.pdf", Body=body)
+    _put_book(table, "pdf", "APPROVING", "staging/pdf/book.pdf", mime_type="application/pdf")
+
+    assert handler(build_stream_event("pdf"), context={}) == {"batchItemFailures": []}
+
+    item = table.get_item(Key={"PK": "BOOK#pdf", "SK": "METADATA"})["Item"]
+    assert item["file_path"] == "public/books/pdf/book.pdf"
+    assert item["contentLength"] == len(body)
+    assert item["linearized"] is True
@@ -448,3 +448,134 @@ def get_book_item_for_test(table_name: str, book_id: str) -> Dict[str, Any]:
     return get_book_item(table_name, book_id)
 
 
+@pytest.fixture
+def build_pdf_bytes():
+    """Factory fixture for minimal, structurally valid PDF files."""
+    def _build(marker: bytes = b"test pdf content", info: bytes = b"") -> bytes:
+        """
+        Build a one-page PDF with a classic xref table and trailer.
+
+        Args:
+            marker: Comment bytes to make otherwise identical files differ
+            info: Optional raw Info dictionary body, e.g. b"/Title (My Book)"
+        """
+        objects = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >>",
+        ]
+        if info:
+            objects.append(b"<< " + info + b" >>")
+
+        out = b"%PDF-1.4\n%" + marker + b"\n"
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(len(out))
+            out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+
+        xref_offset = len(out)
+        out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+        for offset in offsets:
+            out += b"%010d 00000 n \n" % offset
+        trailer = b"/Size %d /Root 1 0 R" % (len(objects) + 1)
+        if info:
+            trailer += b" /Info %d 0 R" % len(objects)
+        out += b"trailer\n<< " + trailer + b" >>\nstartxref\n%d\n%%%%EOF\n" % xref_offset
+        return out
+
+    return _build
+
+
+@pytest.fixture
+def build_epub_bytes():
+    """Factory fixture for minimal EPUB (ZIP) files."""
+    def _build(
+        opf: str = None,
+        files: Dict[str, bytes] = None,
+        mimetype_first: bool = True,
+    ) -> bytes:
+        """
+        Build an EPUB with mimetype, container.xml and an OPF package.
+
+        Args:
+            opf: Package document XML (a minimal one is used if omitted)
+            files: Extra archive members
+            mimetype_first: Set False to produce an invalid archive layout
+        """
+        import io
+        import zipfile
+
+        container = (
+            '<?xml version="1.0"?>'
+            '<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">'
+            '<rootfiles><rootfile full-path="OEBPS/content.opf" '
+            'media-type="application/oebps-package+xml"/></rootfiles></container>'
+        )
+        if opf is None:
+            opf = (
+                '<?xml version="1.0"?>'
+                '<package xmlns="http://www.idpf.org/2007/opf" version="3.0">'
+                '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">'
+                '<dc:title>Test EPUB</dc:title></metadata>'
+                '<manifest/><spine/></package>'
+            )
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            mimetype = ("mimetype", b"application/epub+zip")
+            if mimetype_first:
+                archive.writestr(zipfile.ZipInfo(mimetype[0]), mimetype[1], zipfile.ZIP_STORED)
+            archive.writestr("META-INF/container.xml", container, zipfile.ZIP_DEFLATED)
+            archive.writestr("OEBPS/content.opf", opf, zipfile.ZIP_DEFLATED)
+            for name, data in (files or {}).items():
+                archive.writestr(name, data, zipfile.ZIP_DEFLATED)
+            if not mimetype_first:
+                archive.writestr(zipfile.ZipInfo(mimetype[0]), mimetype[1], zipfile.ZIP_STORED)
+        return buffer.getvalue()
+
+    return _build
+
+
+@pytest.fixture
+def build_stream_event():
+    """
+    Factory fixture for DynamoDB stream events on book metadata items.
+
+    Images are optional: build(*ids) gives key-only records,
+    build(images=[(old, new), ...]) gives records with Old/NewImage.
+    """
+    import hashlib
+    import json
+
+    from boto3.dynamodb.types import TypeSerializer
+
+    serializer = TypeSerializer()
+
+    def _serialize(image):
+        return {key: serializer.serialize(value) for key, value in image.items()}
+
+    def _build(*book_ids: str, event_name: str = "MODIFY", images=None) -> Dict[str, Any]:
+        pairs = list(images) if images is not None else [(None, None)] * len(book_ids)
+        ids = list(book_ids) or [(new or old)["PK"].split("#", 1)[1] for old, new in pairs]
+        records = []
+        for index, (book_id, (old, new)) in enumerate(zip(ids, pairs)):
+            change = {
+                "Keys": {
+                    "PK": {"S": f"BOOK#{book_id}"},
+                    "SK": {"S": "METADATA"},
+                },
+                "SequenceNumber": str(index + 1),
+            }
+            if old is not None:
+                change["OldImage"] = _serialize(old)
+            if new is not None:
+                change["NewImage"] = _serialize(new)
+            name = event_name
+            if images is not None:
+                name = "INSERT" if old is None else "REMOVE" if new is None else "MODIFY"
+            # Same change -> same eventID, so rebuilding an event simulates a replay
+            digest = hashlib.sha1(json.dumps(change, sort_keys=True, default=str).encode()).hexdigest()
+            records.append({"eventID": digest, "eventName": name, "dynamodb": change})
+        return {"Records": records}
+
+    return _build
@@ -50,5 +50,52 @@ def test_create_upload_url_happy_path(upload_test_context, build_api_gateway_eve
     assert item["status"] == "UPLOADING"
     assert item["uploaderId"] == "user-123"
     assert item["GSI6PK"] == "UPLOADER#user-123"
-    assert item["GSI6SK"] == f"BOOK#{body['bookId']}"
+    assert item["GSI6SK"] == f"BOOK#{item['uploadedAt']}#{body['bookId']}"
     assert item["s3Key"].startswith(f"uploads/{body['bookId']}/")
+
+
+def test_create_upload_url_post_mode_enforces_size_and_type(upload_test_context, build_api_gateway_event):
+    import base64
+
+    event = build_api_gateway_event(
+        method="POST",
+        path="/books/upload-url",
+        body={
+            "fileName": "novel.epub",
+            "fileSize": 2048,
+            "title": "Novel",
+            "author": "Jane Doe",
+            "uploadMode": "post",
+        },
+    )
+
+    response = handler(event, context={})
+
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert body["uploadMethod"] == "POST"
+    fields = body["uploadFields"]
+    assert fields["key"] == f"uploads/{body['bookId']}/novel.epub"
+    assert fields["Content-Type"] == "application/epub+zip"
+
+    policy = json.loads(base64.b64decode(fields["policy"]))
+    assert ["content-length-range", 2048, 2048] in policy["conditions"]
+    assert {"Content-Type": "application/epub+zip"} in policy["conditions"]
+
+
+def test_create_upload_url_rejects_unknown_upload_mode(upload_test_context, build_api_gateway_event):
+    event = build_api_gateway_event(
+        method="POST",
+        path="/books/upload-url",
+        body={
+            "fileName": "book.pdf",
+            "fileSize": 1024,
+            "title": "Book",
+            "author": "Jane Doe",
+            "uploadMode": "ftp",
+        },
+    )
+
+    response = handler(event, context={})
+
+    assert response["statusCode"] == 400
@@ -0,0 +1,72 @@
+import json
+import sys
+from pathlib import Path
+
+import boto3
+import pytest
+
+# Add lambda directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from create_upload_url.batch import handler
+
+
+def _file(name, size=1024):
+    return {"fileName": name, "fileSize": size, "title": f"Title {name}", "author": "Jane Doe"}
+
+
+def test_create_upload_urls_writes_all_drafts(upload_test_context, build_api_gateway_event):
+    files = [_file(f"book-{i}.pdf") for i in range(3)] + [_file("novel.epub")]
+    event = build_api_gateway_event(
+        method="POST",
+        path="/books/upload-urls",
+        body={"files": files},
+    )
+
+    response = handler(event, context={})
+
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert body["expiresIn"] == 900
+    assert [u["fileName"] for u in body["uploads"]] == [f["fileName"] for f in files]
+
+    table = boto3.resource("dynamodb", region_name=upload_test_context["region"]).Table(
+        upload_test_context["table_name"]
+    )
+    for upload in body["uploads"]:
+        assert upload["uploadUrl"]
+        item = table.get_item(Key={"PK": f"BOOK#{upload['bookId']}", "SK": "METADATA"})["Item"]
+        assert item["status"] == "UPLOADING"
+        assert item["GSI6PK"] == "UPLOADER#user-123"
+        assert item["s3Key"] == f"uploads/{upload['bookId']}/{upload['fileName']}"
+
+
+def test_create_upload_urls_rejects_whole_batch_on_invalid_file(upload_test_context, build_api_gateway_event):
+    event = build_api_gateway_event(
+        method="POST",
+        path="/books/upload-urls",
+        body={"files": [_file("ok.pdf"), _file("bad.exe")]},
+    )
+
+    response = handler(event, context={})
+
+    assert response["statusCode"] == 415
+    assert "files[1]" in json.loads(response["body"])["error"]
+
+    table = boto3.resource("dynamodb", region_name=upload_test_context["region"]).Table(
+        upload_test_context["table_name"]
+    )
+    assert table.scan()["Count"] == 0
+
+
+def test_create_upload_urls_enforces_batch_limit(upload_test_context, build_api_gateway_event, monkeypatch):
+    monkeypatch.setenv("MAX_BATCH_UPLOAD_FILES", "2")
+    event = build_api_gateway_event(
+        method="POST",
+        path="/books/upload-urls",
+        body={"files": [_file(f"b{i}.pdf") for i in range(3)]},
+    )
+
+    response = handler(event, context={})
+
+    assert response["statusCode"] == 400
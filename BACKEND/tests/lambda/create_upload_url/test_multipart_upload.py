@@ -0,0 +1,160 @@
+import json
+import sys
+from pathlib import Path
+
+import boto3
+import pytest
+
+# Add lambda directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from create_upload_url.multipart import handler
+
+
+MB = 1024 * 1024
+
+
+def _initiate(build_api_gateway_event, file_size=20 * MB, user_id="user-123"):
+    event = build_api_gateway_event(
+        method="POST",
+        path="/books/multipart-upload",
+        body={
+            "fileName": "big-book.pdf",
+            "fileSize": file_size,
+            "title": "Large Book",
+            "author": "Jane Doe",
+        },
+        user_id=user_id,
+    )
+    return handler(event, context={})
+
+
+def _book_event(build_api_gateway_event, book_id, suffix="", method="POST", body=None, user_id="user-123"):
+    event = build_api_gateway_event(
+        method=method,
+        path=f"/books/{book_id}/multipart-upload{suffix}",
+        body=body,
+        user_id=user_id,
+    )
+    event["pathParameters"] = {"bookId": book_id}
+    return event
+
+
+def test_initiate_multipart_upload(upload_test_context, build_api_gateway_event):
+    response = _initiate(build_api_gateway_event)
+
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert body["partSize"] == 8 * MB
+    assert body["partCount"] == 3
+    assert [p["partNumber"] for p in body["parts"]] == [1, 2, 3]
+    assert "uploadId=" in body["parts"][0]["url"]
+
+    table = boto3.resource("dynamodb", region_name=upload_test_context["region"]).Table(
+        upload_test_context["table_name"]
+    )
+    item = table.get_item(Key={"PK": f"BOOK#{body['bookId']}", "SK": "METADATA"})["Item"]
+    assert item["status"] == "UPLOADING"
+    assert item["uploadId"] == body["uploadId"]
+
+
+def test_sign_parts_rejects_out_of_range_part(upload_test_context, build_api_gateway_event):
+    body = json.loads(_initiate(build_api_gateway_event)["body"])
+
+    ok = handler(
+        _book_event(build_api_gateway_event, body["bookId"], "/parts", body={"partNumbers": [3, 1]}),
+        context={},
+    )
+    assert ok["statusCode"] == 200
+    assert [p["partNumber"] for p in json.loads(ok["body"])["parts"]] == [1, 3]
+
+    bad = handler(
+        _book_event(build_api_gateway_event, body["bookId"], "/parts", body={"partNumbers": [4]}),
+        context={},
+    )
+    assert bad["statusCode"] == 400
+
+
+def test_complete_multipart_upload_lists_parts(upload_test_context, build_api_gateway_event):
+    body = json.loads(_initiate(build_api_gateway_event, file_size=3 * MB)["body"])
+    assert body["partCount"] == 1
+
+    table = boto3.resource("dynamodb", region_name=upload_test_context["region"]).Table(
+        upload_test_context["table_name"]
+    )
+    item = table.get_item(Key={"PK": f"BOOK#{body['bookId']}", "SK": "METADATA"})["Item"]
+
+    s3 = boto3.client("s3", region_name=upload_test_context["region"])
+    s3.upload_part(
+        Bucket=upload_test_context["bucket_name"],
+        Key=item["s3Key"],
+        UploadId=body["uploadId"],
+        PartNumber=1,
+        Body=b"%PDF-1.4" + b"0" * (3 * MB - 8),
+    )
+
+    response = handler(_book_event(build_api_gateway_event, body["bookId"], "/complete"), context={})
+
+    assert response["statusCode"] == 200
+    head = s3.head_object(Bucket=upload_test_context["bucket_name"], Key=item["s3Key"])
+    assert head["ContentLength"] == 3 * MB
+    item = table.get_item(Key={"PK": f"BOOK#{body['bookId']}", "SK": "METADATA"})["Item"]
+    assert "uploadId" not in item
+
+
+def test_complete_rejects_parts_larger_than_declared_size(upload_test_context, build_api_gateway_event):
+    body = json.loads(_initiate(build_api_gateway_event, file_size=3 * MB)["body"])
+
+    table = boto3.resource("dynamodb", region_name=upload_test_context["region"]).Table(
+        upload_test_context["table_name"]
+    )
+    item = table.get_item(Key={"PK": f"BOOK#{body['bookId']}", "SK": "METADATA"})["Item"]
+
+    s3 = boto3.client("s3", region_name=upload_test_context["region"])
+    part = s3.upload_part(
+        Bucket=upload_test_context["bucket_name"],
+        Key=item["s3Key"],
+        UploadId=body["uploadId"],
+        PartNumber=1,
+        Body=b"%PDF-1.4" + b"0" * (4 * MB),
+    )
+
+    response = handler(
+        _book_event(
+            build_api_gateway_event,
+            body["bookId"],
+            "/complete",
+            body={"parts": [{"partNumber": 1, "etag": part["ETag"]}]},
+        ),
+        context={},
+    )
+
+    assert response["statusCode"] == 400
+    assert "fileSize" in json.loads(response["body"])["error"]
+    listed = s3.list_objects_v2(Bucket=upload_test_context["bucket_name"], Prefix=item["s3Key"])
+    assert listed.get("KeyCount", 0) == 0
+    uploads = s3.list_multipart_uploads(Bucket=upload_test_context["bucket_name"])
+    assert body["uploadId"] not in [u["UploadId"] for u in uploads.get("Uploads", [])]
+    item = table.get_item(Key={"PK": f"BOOK#{body['bookId']}", "SK": "METADATA"})["Item"]
+    assert item["status"] == "ABORTED"
+
+
+def test_abort_multipart_upload_by_other_user_is_forbidden(upload_test_context, build_api_gateway_event):
+    body = json.loads(_initiate(build_api_gateway_event)["body"])
+
+    forbidden = handler(
+        _book_event(build_api_gateway_event, body["bookId"], method="DELETE", user_id="someone-else"),
+        context={},
+    )
+    assert forbidden["statusCode"] == 403
+
+    response = handler(_book_event(build_api_gateway_event, body["bookId"], method="DELETE"), context={})
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["status"] == "ABORTED"
+
+    table = boto3.resource("dynamodb", region_name=upload_test_context["region"]).Table(
+        upload_test_context["table_name"]
+    )
+    item = table.get_item(Key={"PK": f"BOOK#{body['bookId']}", "SK": "METADATA"})["Item"]
+    assert item["status"] == "ABORTED"
+    assert "uploadId" not in item
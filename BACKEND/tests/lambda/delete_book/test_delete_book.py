@@ -96,3 +96,50 @@ def test_delete_book_forbidden(upload_test_context, books_table):
 
     resp = handler(event, context={})
     assert resp["statusCode"] == 403
+
+
+def test_delete_book_keeps_content_shared_with_duplicate(upload_test_context, s3_bucket, books_table):
+    region = upload_test_context["region"]
+    bucket_name = upload_test_context["bucket_name"]
+    table = boto3.resource("dynamodb", region_name=region).Table(upload_test_context["table_name"])
+
+    file_key = "public/books/book-orig/book.pdf"
+    digest = "ab" * 32
+    _seed_book(table, "book-orig", uploader_id="user-123", file_path=file_key)
+    _seed_book(table, "book-dup", uploader_id="user-456", file_path=file_key)
+    table.update_item(
+        Key={"PK": "BOOK#book-orig", "SK": "METADATA"},
+        UpdateExpression="SET contentHash = :h",
+        ExpressionAttributeValues={":h": digest},
+    )
+    table.update_item(
+        Key={"PK": "BOOK#book-dup", "SK": "METADATA"},
+        UpdateExpression="SET contentHash = :h, duplicateOf = :o",
+        ExpressionAttributeValues={":h": digest, ":o": "book-orig"},
+    )
+    table.put_item(Item={
+        "PK": f"HASH#{digest}",
+        "SK": "CONTENT",
+        "canonicalBookId": "book-orig",
+        "objectKey": file_key,
+        "refCount": 2,
+    })
+    s3 = s3_bucket["client"]
+    s3.put_object(Bucket=bucket_name, Key=file_key, Body=b"dummy")
+
+    def _delete(book_id, user_id):
+        event = {
+            "pathParameters": {"bookId": book_id},
+            "requestContext": {"authorizer": {"jwt": {"claims": {"sub": user_id}}}},
+        }
+        return handler(event, context={})
+
+    # Original goes first: the duplicate still needs the object
+    assert _delete("book-orig", "user-123")["statusCode"] == 200
+    s3.head_object(Bucket=bucket_name, Key=file_key)
+
+    # Last reference removes object and content item
+    assert _delete("book-dup", "user-456")["statusCode"] == 200
+    with pytest.raises(Exception):
+        s3.head_object(Bucket=bucket_name, Key=file_key)
+    assert "Item" not in table.get_item(Key={"PK": f"HASH#{digest}", "SK": "CONTENT"})
@@ -9,6 +9,8 @@ import boto3
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from get_my_uploads.handler import handler
+from shared.derived import uploader_stats_key
+from shared.dynamodb import uploader_sort_key
 
 
 def _put_book_item(table, book_id, user_id, status, uploaded_at, extra=None):
@@ -24,7 +26,7 @@ def _put_book_item(table, book_id, user_id, status, uploaded_at, extra=None):
         "uploaderId": user_id,
         "uploaderEmail": f"{user_id}@example.com",
         "GSI6PK": f"UPLOADER#{user_id}",
-        "GSI6SK": f"BOOK#{book_id}",
+        "GSI6SK": uploader_sort_key(book_id, uploaded_at),
     }
     if extra:
         item.update(extra)
@@ -89,3 +91,64 @@ def test_get_my_uploads_happy_path(upload_test_context, books_table, build_api_g
 
     # Pagination metadata
     assert body["pagination"]["total"] == 3
+
+
+def test_get_my_uploads_returns_304_for_matching_etag(upload_test_context, books_table, build_api_gateway_event):
+    region = upload_test_context["region"]
+    table = boto3.resource("dynamodb", region_name=region).Table(upload_test_context["table_name"])
+    _put_book_item(table, "book-1", "user-123", "PENDING", datetime.now(timezone.utc).isoformat())
+
+    event = build_api_gateway_event(method="GET", path="/books/my-uploads", user_id="user-123")
+
+    first = handler(event, context={})
+    assert first["statusCode"] == 200
+    etag = first["headers"]["ETag"]
+    assert etag.startswith('"') and etag.endswith('"')
+
+    event["headers"] = {"if-none-match": etag}
+    second = handler(event, context={})
+    assert second["statusCode"] == 304
+    assert second["body"] == ""
+    assert second["headers"]["ETag"] == etag
+
+    # A change in the list produces a new ETag and a full response
+    _put_book_item(table, "book-2", "user-123", "PENDING", datetime.now(timezone.utc).isoformat())
+    third = handler(event, context={})
+    assert third["statusCode"] == 200
+    assert third["headers"]["ETag"] != etag
+    assert len(json.loads(third["body"])["books"]) == 2
+
+
+def test_get_my_uploads_reads_one_page_when_counters_exist(
+    upload_test_context, books_table, build_api_gateway_event, monkeypatch
+):
+    import get_my_uploads.handler as uploads_handler
+
+    region = upload_test_context["region"]
+    table_name = upload_test_context["table_name"]
+    table = boto3.resource("dynamodb", region_name=region).Table(table_name)
+
+    now = datetime.now(timezone.utc)
+    for minutes in range(5):
+        uploaded_at = (now - timedelta(minutes=minutes)).isoformat()
+        _put_book_item(table, f"book-{minutes}", "user-123", "APPROVED", uploaded_at)
+    table.put_item(Item={**uploader_stats_key("user-123"), "APPROVED": 4, "PENDING": 1})
+
+    queries = []
+    real_query = uploads_handler.query_by_gsi
+
+    def recording_query(**kwargs):
+        queries.append(kwargs)
+        return real_query(**kwargs)
+
+    monkeypatch.setattr(uploads_handler, "query_by_gsi", recording_query)
+
+    event = build_api_gateway_event(method="GET", path="/books/my-uploads", user_id="user-123")
+    event["queryStringParameters"] = {"limit": "2", "offset": "1"}
+    body = json.loads(handler(event, context={})["body"])
+
+    assert [q.get("max_items") for q in queries] == [3]
+    assert [b["bookId"] for b in body["books"]] == ["book-1", "book-2"]
+    assert body["pagination"]["total"] == 5
+    assert body["pagination"]["hasMore"] is True
+    assert body["statusCounts"] == {"APPROVED": 4, "PENDING": 1}
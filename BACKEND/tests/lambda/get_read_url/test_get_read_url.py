@@ -11,6 +11,7 @@ import pytest
 # Add lambda directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+import get_read_url.handler as read_url_handler
 from get_read_url.handler import handler
 
 
@@ -205,3 +206,75 @@ def test_get_read_url_with_content_disposition(get_read_url_context, books_table
 
     assert qs.get("response-content-disposition") == [disposition_value]
     assert qs.get("response-content-type") == [mime_type]
+
+
+def test_get_read_url_range_mode(get_read_url_context, books_table, monkeypatch):
+    """Range mode returns the full-file URL with the PDF.js range options."""
+    book_id = "test-book-range"
+    table = boto3.resource("dynamodb", region_name=get_read_url_context["region"]).Table(
+        get_read_url_context["table_name"]
+    )
+    table.put_item(Item={
+        "PK": f"BOOK#{book_id}",
+        "SK": "METADATA",
+        "bookId": book_id,
+        "status": "APPROVED",
+        "file_path": f"public/books/{book_id}/test.pdf",
+        "mime_type": "application/pdf",
+        "contentLength": 5242880,
+        "linearized": True,
+        "pageCount": 12,
+    })
+
+    event = {
+        "pathParameters": {"bookId": book_id},
+        "queryStringParameters": {"mode": "range"},
+    }
+    reads = []
+    real_get = read_url_handler.get_book_metadata
+    monkeypatch.setattr(
+        read_url_handler,
+        "get_book_metadata",
+        lambda *args: reads.append(args) or real_get(*args),
+    )
+    response = handler(event, context={})
+
+    assert response["statusCode"] == 200
+    assert len(reads) == 1
+    body = json.loads(response["body"])
+    assert body["mode"] == "range"
+    assert body["url"].startswith(f"https://d123456.cloudfront.net/public/books/{book_id}/test.pdf")
+    assert body["length"] == 5242880
+    assert body["linearized"] is True
+    assert body["pageCount"] == 12
+    assert body["pdfjs"]["disableRange"] is False
+    assert body["pdfjs"]["disableAutoFetch"] is True
+    assert body["pdfjs"]["length"] == 5242880
+
+
+def test_get_read_url_range_mode_falls_back_to_full(get_read_url_context, books_table):
+    """Non-PDF books return the plain full-file response."""
+    book_id = "test-book-epub"
+    table = boto3.resource("dynamodb", region_name=get_read_url_context["region"]).Table(
+        get_read_url_context["table_name"]
+    )
+    table.put_item(Item={
+        "PK": f"BOOK#{book_id}",
+        "SK": "METADATA",
+        "bookId": book_id,
+        "status": "APPROVED",
+        "file_path": f"public/books/{book_id}/test.epub",
+        "mime_type": "application/epub+zip",
+    })
+
+    event = {
+        "pathParameters": {"bookId": book_id},
+        "queryStringParameters": {"mode": "range"},
+    }
+    response = handler(event, context={})
+
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert body["mode"] == "full"
+    assert "pdfjs" not in body
+    assert body["url"].startswith(f"https://d123456.cloudfront.net/public/books/{book_id}/test.epub")
@@ -8,10 +8,12 @@ import boto3
 # Add lambda directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from list_pending_books.handler import handler
+import list_pending_books.handler as pending
+from list_pending_books.handler import count_handler, handler
+from shared.derived import PENDING_MIGRATION_KEY, PENDING_SHARDS, pending_partition_keys, pending_shard_key
 
 
-def _put_item(table, book_id, status, uploaded_at, gsi5=False, uploader="user-1"):
+def _put_item(table, book_id, status, uploaded_at, gsi5=False, uploader="user-1", gsi5_pk="STATUS#PENDING"):
     item = {
         "PK": f"BOOK#{book_id}",
         "SK": "METADATA",
@@ -23,7 +25,7 @@ def _put_item(table, book_id, status, uploaded_at, gsi5=False, uploader="user-1"
         "uploaderId": uploader,
     }
     if gsi5:
-        item["GSI5PK"] = "STATUS#PENDING"
+        item["GSI5PK"] = gsi5_pk
         item["GSI5SK"] = uploaded_at
     table.put_item(Item=item)
 
@@ -95,3 +97,118 @@ def test_includes_legacy_items_without_gsi5(aws_region, books_table, monkeypatch
     assert ids == ["book-gsi", "book-legacy"]
     assert body["pagination"]["total"] == 2
     assert all(b.get("status") == "PENDING" for b in body["books"])
+
+
+def test_merges_pending_shards_newest_first(aws_region, books_table, monkeypatch):
+    monkeypatch.setenv("AWS_REGION", aws_region)
+    monkeypatch.setenv("BOOKS_TABLE_NAME", books_table.table_name)
+
+    table = boto3.resource("dynamodb", region_name=aws_region).Table(books_table.table_name)
+
+    now = datetime.now(timezone.utc)
+    keys = pending_partition_keys()
+    # Interleave upload times across shards and the legacy partition
+    for minutes, gsi5_pk in enumerate([keys[0], keys[-1], keys[1], keys[0], keys[2]]):
+        uploaded_at = (now - timedelta(minutes=minutes)).isoformat()
+        _put_item(table, f"book-{minutes}", "PENDING", uploaded_at, gsi5=True, gsi5_pk=gsi5_pk)
+
+    resp = handler({"queryStringParameters": {"limit": "3", "offset": "1"}}, context={})
+    assert resp["statusCode"] == 200
+    body = json.loads(resp["body"])
+    assert [b["bookId"] for b in body["books"]] == ["book-1", "book-2", "book-3"]
+
+
+def test_file_size_keeps_integer_type(aws_region, books_table, monkeypatch):
+    monkeypatch.setenv("AWS_REGION", aws_region)
+    monkeypatch.setenv("BOOKS_TABLE_NAME", books_table.table_name)
+
+    ddb = boto3.resource("dynamodb", region_name=aws_region)
+    table = ddb.Table(books_table.table_name)
+
+    now = datetime.now(timezone.utc).isoformat()
+    _put_item(table, "book-size", "PENDING", now, gsi5=True)
+    table.update_item(
+        Key={"PK": "BOOK#book-size", "SK": "METADATA"},
+        UpdateExpression="SET fileSize = :size",
+        ExpressionAttributeValues={":size": 1024},
+    )
+
+    resp = handler({"queryStringParameters": {}}, context={})
+    assert resp["statusCode"] == 200
+    assert "1024.0" not in resp["body"]
+    body = json.loads(resp["body"])
+    assert body["books"][0]["fileSize"] == 1024
+    assert isinstance(body["books"][0]["fileSize"], int)
+
+
+def test_total_comes_from_status_counters(aws_region, books_table, monkeypatch):
+    monkeypatch.setenv("AWS_REGION", aws_region)
+    monkeypatch.setenv("BOOKS_TABLE_NAME", books_table.table_name)
+
+    ddb = boto3.resource("dynamodb", region_name=aws_region)
+    table = ddb.Table(books_table.table_name)
+
+    now = datetime.now(timezone.utc)
+    for minutes in range(5):
+        _put_item(table, f"book-{minutes}", "PENDING", (now - timedelta(minutes=minutes)).isoformat(), gsi5=True)
+    table.put_item(Item={"PK": "STATS#STATUS", "SK": "COUNTS", "PENDING": 5, "APPROVED": 3})
+
+    resp = handler({"queryStringParameters": {"limit": "2", "offset": "1"}}, context={})
+    body = json.loads(resp["body"])
+
+    assert [b["bookId"] for b in body["books"]] == ["book-1", "book-2"]
+    assert body["pagination"]["total"] == 5
+    assert body["pagination"]["hasMore"] is True
+
+
+def test_migration_marker_skips_legacy_scan_and_partition(aws_region, books_table, monkeypatch):
+    monkeypatch.setenv("AWS_REGION", aws_region)
+    monkeypatch.setenv("BOOKS_TABLE_NAME", books_table.table_name)
+    monkeypatch.setattr(pending, "_migrations", {})
+
+    table = boto3.resource("dynamodb", region_name=aws_region).Table(books_table.table_name)
+    now = datetime.now(timezone.utc).isoformat()
+    _put_item(table, "book-sharded", "PENDING", now, gsi5=True, gsi5_pk=pending_shard_key("book-sharded"))
+    _put_item(table, "book-legacy-key", "PENDING", now, gsi5=True)
+    _put_item(table, "book-no-keys", "PENDING", now)
+    table.put_item(Item={"PK": "STATS#STATUS", "SK": "COUNTS", "PENDING": 3})
+
+    def ids():
+        body = json.loads(handler({"queryStringParameters": {}}, context={})["body"])
+        return sorted(b["bookId"] for b in body["books"])
+
+    assert ids() == ["book-legacy-key", "book-no-keys", "book-sharded"]
+
+    # Written by scripts/migrate_pending_gsi5.py after a complete pass
+    table.put_item(Item={**PENDING_MIGRATION_KEY, "shards": PENDING_SHARDS, "completedAt": now})
+    # First call still queries the legacy key (marker not cached yet), but no longer scans
+    assert ids() == ["book-legacy-key", "book-sharded"]
+    assert pending._migrations[books_table.table_name]["shards"] == PENDING_SHARDS
+    assert ids() == ["book-sharded"]
+
+
+def test_count_handler_reads_counters(aws_region, books_table, monkeypatch):
+    monkeypatch.setenv("AWS_REGION", aws_region)
+    monkeypatch.setenv("BOOKS_TABLE_NAME", books_table.table_name)
+
+    ddb = boto3.resource("dynamodb", region_name=aws_region)
+    table = ddb.Table(books_table.table_name)
+    table.put_item(Item={"PK": "STATS#STATUS", "SK": "COUNTS", "PENDING": 7, "APPROVED": 3})
+
+    resp = count_handler({}, context={})
+
+    assert resp["statusCode"] == 200
+    assert json.loads(resp["body"]) == {"pending": 7, "counts": {"PENDING": 7, "APPROVED": 3}}
+
+
+def test_count_handler_without_counters_falls_back_to_listing(aws_region, books_table, monkeypatch):
+    monkeypatch.setenv("AWS_REGION", aws_region)
+    monkeypatch.setenv("BOOKS_TABLE_NAME", books_table.table_name)
+
+    ddb = boto3.resource("dynamodb", region_name=aws_region)
+    table = ddb.Table(books_table.table_name)
+    _put_item(table, "book-a", "PENDING", datetime.now(timezone.utc).isoformat(), gsi5=True)
+
+    body = json.loads(count_handler({}, context={})["body"])
+
+    assert body["pending"] == 1
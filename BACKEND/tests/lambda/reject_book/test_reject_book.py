@@ -9,10 +9,12 @@ import pytest
 # Add lambda directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from approval_worker.handler import handler as worker_handler
+from stream_processor.handler import handler as stream_processor_handler
 from reject_book.handler import handler
 
 
-def test_reject_book_happy_path(upload_test_context, s3_bucket, books_table):
+def test_reject_book_happy_path(upload_test_context, s3_bucket, books_table, build_stream_event):
     region = upload_test_context["region"]
     bucket_name = upload_test_context["bucket_name"]
     table_name = upload_test_context["table_name"]
@@ -66,13 +68,19 @@ def test_reject_book_happy_path(upload_test_context, s3_bucket, books_table):
 
     response = handler(event, context={})
 
-    assert response["statusCode"] == 200
+    assert response["statusCode"] == 202
 
     body = json.loads(response["body"])
     assert body["bookId"] == book_id
-    assert body["status"] == "REJECTED"
+    assert body["status"] == "REJECTING"
     assert body["reason"] == "Copyright violation"
 
+    # File is untouched until the stream worker runs; replays are no-ops
+    s3.head_object(Bucket=bucket_name, Key=s3_key)
+    stream_event = build_stream_event(book_id)
+    assert worker_handler(stream_event, context={}) == {"batchItemFailures": []}
+    assert worker_handler(stream_event, context={}) == {"batchItemFailures": []}
+
     # Verify DynamoDB status
     item = table.get_item(
         Key={"PK": f"BOOK#{book_id}", "SK": "METADATA"}
@@ -83,7 +91,11 @@ def test_reject_book_happy_path(upload_test_context, s3_bucket, books_table):
     assert "rejectedAt" in item
     assert item.get("rejectedBy") == "admin-1"
     assert item.get("rejectedReason") == "Copyright violation"
-    # GSI5 removed
+    # stream_processor drops the book from the pending index
+    pending = {key: value for key, value in item.items() if key != "status"}
+    pending["status"] = "PENDING"
+    assert stream_processor_handler(build_stream_event(images=[(pending, item)]), context={}) == {"batchItemFailures": []}
+    item = table.get_item(Key={"PK": f"BOOK#{book_id}", "SK": "METADATA"}).get("Item")
     assert item.get("GSI5PK") is None
     assert item.get("GSI5SK") is None
 
@@ -10,6 +10,7 @@ import pytest
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from search_books.handler import handler
+from shared.derived import STATS_KEY, search_key_attributes
 
 
 @pytest.fixture
@@ -190,6 +191,43 @@ def test_search_books_pagination(search_books_context, books_table):
     assert body["pagination"]["hasMore"] is False
 
 
+def test_search_books_listing_total_comes_from_counters(search_books_context, books_table, monkeypatch):
+    """Without a query or snapshot, the scan stops at the page and the counter is the total."""
+    import search_books.handler as search_handler
+
+    table = boto3.resource("dynamodb", region_name=search_books_context["region"]).Table(
+        search_books_context["table_name"]
+    )
+    for i in range(5):
+        table.put_item(Item={
+            "PK": f"BOOK#book-{i}",
+            "SK": "METADATA",
+            "bookId": f"book-{i}",
+            "title": f"Book {i}",
+            "author": "Test Author",
+            "status": "APPROVED",
+        })
+    table.put_item(Item={**STATS_KEY, "APPROVED": 5, "PENDING": 2})
+
+    scans = []
+    real_scan = search_handler.scan_approved_books
+
+    def recording_scan(table_name, max_items=None):
+        scans.append(max_items)
+        return real_scan(table_name, max_items=max_items)
+
+    monkeypatch.setattr(search_handler, "scan_approved_books", recording_scan)
+
+    body = json.loads(
+        handler({"queryStringParameters": {"limit": "2", "offset": "2"}}, context={})["body"]
+    )
+
+    assert scans == [4]
+    assert len(body["books"]) == 2
+    assert body["pagination"]["total"] == 5
+    assert body["pagination"]["hasMore"] is True
+
+
 def test_search_books_only_approved(search_books_context, books_table):
     """Test that only approved books are returned."""
     table_name = search_books_context["table_name"]
@@ -236,3 +274,331 @@ def test_search_books_only_approved(search_books_context, books_table):
     body = json.loads(response["body"])
     assert len(body["books"]) == 1
     assert body["books"][0]["title"] == "Approved Book"
+
+
+def test_search_books_gzips_large_body_when_accepted(search_books_context, books_table, monkeypatch):
+    """Test large responses are gzipped when Accept-Encoding allows it."""
+    import base64
+    import gzip
+
+    ddb_resource = boto3.resource("dynamodb", region_name=search_books_context["region"])
+    table = ddb_resource.Table(search_books_context["table_name"])
+
+    for i in range(30):
+        table.put_item(Item={
+            "PK": f"BOOK#book-{i}",
+            "SK": "METADATA",
+            "bookId": f"book-{i}",
+            "title": f"Compressible Book {i}",
+            "author": "Test Author",
+            "description": "Lorem ipsum dolor sit amet " * 5,
+            "status": "APPROVED",
+            "fileSize": 2048,
+        })
+
+    event = {
+        "headers": {"accept-encoding": "gzip, deflate, br"},
+        "queryStringParameters": {"limit": "30"},
+    }
+
+    response = handler(event, context={})
+
+    assert response["statusCode"] == 200
+    assert response["isBase64Encoded"] is True
+    assert response["headers"]["Content-Encoding"] == "gzip"
+    body = json.loads(gzip.decompress(base64.b64decode(response["body"])))
+    assert len(body["books"]) == 30
+    assert body["books"][0]["fileSize"] == 2048
+
+    # Without Accept-Encoding the body stays plain JSON
+    del event["headers"]
+    response = handler(event, context={})
+    assert "isBase64Encoded" not in response
+    assert len(json.loads(response["body"])["books"]) == 30
+
+
+def test_search_books_uses_catalog_snapshot(search_books_context, books_table, s3_bucket, monkeypatch):
+    """Test search reads the published catalog snapshot instead of scanning."""
+    from shared import catalog
+
+    catalog.clear_catalog_cache()
+    bucket_name = s3_bucket["bucket_name"]
+    monkeypatch.setenv("CATALOG_BUCKET_NAME", bucket_name)
+
+    ddb_resource = boto3.resource("dynamodb", region_name=search_books_context["region"])
+    table = ddb_resource.Table(search_books_context["table_name"])
+    table.put_item(Item={
+        "PK": "BOOK#book-snap",
+        "SK": "METADATA",
+        "bookId": "book-snap",
+        "title": "Snapshot Book",
+        "author": "Cached Author",
+        "status": "APPROVED",
+        "fileSize": 4096,
+    })
+    table.put_item(Item={
+        "PK": "BOOK#book-pending",
+        "SK": "METADATA",
+        "bookId": "book-pending",
+        "title": "Snapshot Pending",
+        "status": "PENDING",
+    })
+
+    pointer = catalog.build_catalog_snapshot(search_books_context["table_name"], bucket_name)
+    assert pointer["count"] == 1
+
+    s3 = s3_bucket["client"]
+    snapshot = s3.get_object(Bucket=bucket_name, Key=pointer["key"])
+    assert snapshot["CacheControl"] == catalog.SNAPSHOT_CACHE_CONTROL
+
+    # The snapshot, not the table, answers the query
+    table.delete_item(Key={"PK": "BOOK#book-snap", "SK": "METADATA"})
+
+    response = handler({"queryStringParameters": {"q": "snapshot"}}, context={})
+
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert body["pagination"]["total"] == 1
+    assert body["books"][0]["bookId"] == "book-snap"
+    assert body["books"][0]["status"] == "APPROVED"
+    assert body["books"][0]["fileSize"] == 4096
+
+    catalog.clear_catalog_cache()
+
+
+def test_catalog_rebuild_keeps_two_snapshots_without_emails(search_books_context, s3_bucket):
+    """Test rebuilds prune old snapshot versions and publish no uploader emails."""
+    from shared import catalog
+
+    bucket_name = s3_bucket["bucket_name"]
+    ddb_resource = boto3.resource("dynamodb", region_name=search_books_context["region"])
+    table = ddb_resource.Table(search_books_context["table_name"])
+    table.put_item(Item={
+        "PK": "BOOK#book-private",
+        "SK": "METADATA",
+        "bookId": "book-private",
+        "title": "Private Uploader",
+        "status": "APPROVED",
+        "uploaderEmail": "uploader@example.com",
+    })
+
+    pointers = [catalog.build_catalog_snapshot(search_books_context["table_name"], bucket_name) for _ in range(3)]
+
+    s3 = s3_bucket["client"]
+    listed = s3.list_objects_v2(Bucket=bucket_name, Prefix=catalog.SNAPSHOT_PREFIX)
+    assert sorted(obj["Key"] for obj in listed["Contents"]) == [pointers[1]["key"], pointers[2]["key"]]
+
+    body = s3.get_object(Bucket=bucket_name, Key=pointers[2]["key"])["Body"].read().decode()
+    assert "uploaderEmail" not in body
+    assert "uploader@example.com" not in body
+
+
+def test_catalog_rebuild_never_replaces_a_newer_pointer(search_books_context, s3_bucket, monkeypatch):
+    """A rebuild overtaken by a later one leaves the later version published."""
+    from shared import catalog
+
+    table_name = search_books_context["table_name"]
+    bucket_name = s3_bucket["bucket_name"]
+    real_scan = catalog.scan_approved_books
+    newer = []
+
+    # While the first rebuild scans, a second one starts and finishes
+    def overtaken_scan(name, max_items=None):
+        monkeypatch.setattr(catalog, "scan_approved_books", real_scan)
+        newer.append(catalog.build_catalog_snapshot(table_name, bucket_name))
+        return real_scan(name, max_items=max_items)
+
+    monkeypatch.setattr(catalog, "scan_approved_books", overtaken_scan)
+
+    assert catalog.build_catalog_snapshot(table_name, bucket_name) is None
+
+    s3 = s3_bucket["client"]
+    latest = json.loads(s3.get_object(Bucket=bucket_name, Key=catalog.LATEST_KEY)["Body"].read())
+    listed = s3.list_objects_v2(Bucket=bucket_name, Prefix=catalog.SNAPSHOT_PREFIX)
+    assert latest["version"] == newer[0]["version"]
+    assert [obj["Key"] for obj in listed["Contents"]] == [newer[0]["key"]]
+
+
+def _put_indexed_book(table, book_id, title, author, status="APPROVED"):
+    item = {
+        "PK": f"BOOK#{book_id}",
+        "SK": "METADATA",
+        "bookId": book_id,
+        "title": title,
+        "author": author,
+        "status": status,
+    }
+    # Keys as stream_processor derives them (none unless approved)
+    item.update({k: v for k, v in search_key_attributes(item).items() if v is not None})
+    table.put_item(Item=item)
+
+
+def test_search_books_title_prefix_uses_gsi1(search_books_context, books_table):
+    table = boto3.resource("dynamodb", region_name=search_books_context["region"]).Table(
+        search_books_context["table_name"]
+    )
+    _put_indexed_book(table, "b1", "Dế Mèn Phiêu Lưu Ký", "Tô Hoài")
+    _put_indexed_book(table, "b2", "Dễ thương", "Ai đó")
+    _put_indexed_book(table, "b3", "Dế Mèn 2", "Tô Hoài", status="PENDING")
+    _put_indexed_book(table, "b4", "Số Đỏ", "Vũ Trọng Phụng")
+
+    response = handler({"queryStringParameters": {"title": "de men"}}, context={})
+
+    body = json.loads(response["body"])
+    assert [b["bookId"] for b in body["books"]] == ["b1"]
+    assert body["pagination"]["total"] == 1
+
+
+def test_search_books_author_prefix_and_combined(search_books_context, books_table):
+    table = boto3.resource("dynamodb", region_name=search_books_context["region"]).Table(
+        search_books_context["table_name"]
+    )
+    _put_indexed_book(table, "b1", "Dế Mèn Phiêu Lưu Ký", "Tô Hoài")
+    _put_indexed_book(table, "b2", "Vợ chồng A Phủ", "Tô Hoài")
+    _put_indexed_book(table, "b3", "Truyện Kiều", "Nguyễn Du")
+
+    by_author = json.loads(handler({"queryStringParameters": {"author": "TO HOAI"}}, context={})["body"])
+    combined = json.loads(
+        handler({"queryStringParameters": {"title": "vo", "author": "to"}}, context={})["body"]
+    )
+
+    assert [b["bookId"] for b in by_author["books"]] == ["b1", "b2"]
+    assert [b["bookId"] for b in combined["books"]] == ["b2"]
+
+
+def test_search_books_prefix_stops_paging_after_requested_page(search_books_context, books_table):
+    table = boto3.resource("dynamodb", region_name=search_books_context["region"]).Table(
+        search_books_context["table_name"]
+    )
+    for index in range(6):
+        _put_indexed_book(table, f"b{index}", f"Truyện ngắn {index}", "Nam Cao")
+
+    first = json.loads(
+        handler({"queryStringParameters": {"title": "truyen", "limit": "2"}}, context={})["body"]
+    )
+    last = json.loads(
+        handler({"queryStringParameters": {"title": "truyen", "limit": "2", "offset": "4"}}, context={})["body"]
+    )
+
+    assert [b["bookId"] for b in first["books"]] == ["b0", "b1"]
+    assert first["pagination"]["hasMore"] is True
+    assert first["pagination"]["total"] is None
+    assert [b["bookId"] for b in last["books"]] == ["b4", "b5"]
+    assert last["pagination"]["hasMore"] is False
+    assert last["pagination"]["total"] == 6
+
+
+def test_search_books_query_ignores_diacritics(search_books_context, books_table):
+    table = boto3.resource("dynamodb", region_name=search_books_context["region"]).Table(
+        search_books_context["table_name"]
+    )
+    _put_indexed_book(table, "b1", "Sách Hay Nhất", "Đặng Thùy Trâm")
+    _put_indexed_book(table, "b2", "Sạch sẽ", "Ai đó")
+
+    body = json.loads(handler({"queryStringParameters": {"q": "SACH hay"}}, context={})["body"])
+    by_author = json.loads(handler({"queryStringParameters": {"q": "dang thuy"}}, context={})["body"])
+
+    assert [b["bookId"] for b in body["books"]] == ["b1"]
+    assert [b["bookId"] for b in by_author["books"]] == ["b1"]
+
+
+def test_search_books_uses_warm_index_when_enabled(search_books_context, books_table, s3_bucket, monkeypatch):
+    from shared import catalog
+    from shared.search_index import clear_search_indexes
+
+    catalog.clear_catalog_cache()
+    clear_search_indexes()
+    bucket_name = s3_bucket["bucket_name"]
+    monkeypatch.setenv("CATALOG_BUCKET_NAME", bucket_name)
+    monkeypatch.setenv("SEARCH_INDEX_ENABLED", "true")
+
+    table = boto3.resource("dynamodb", region_name=search_books_context["region"]).Table(
+        search_books_context["table_name"]
+    )
+    _put_indexed_book(table, "b1", "Đắc Nhân Tâm", "Dale Carnegie")
+    _put_indexed_book(table, "b2", "Nhà Giả Kim", "Paulo Coelho")
+    catalog.build_catalog_snapshot(search_books_context["table_name"], bucket_name)
+
+    body = json.loads(handler({"queryStringParameters": {"q": "tam dac"}}, context={})["body"])
+
+    assert [b["bookId"] for b in body["books"]] == ["b1"]
+    assert body["pagination"]["total"] == 1
+
+    catalog.clear_catalog_cache()
+    clear_search_indexes()
+
+
+def test_search_books_browse_with_sort_and_facets(search_books_context, books_table, s3_bucket, monkeypatch):
+    from shared import catalog
+    from shared.catalog_facets import clear_catalog_facets
+
+    catalog.clear_catalog_cache()
+    clear_catalog_facets()
+    bucket_name = s3_bucket["bucket_name"]
+    monkeypatch.setenv("CATALOG_BUCKET_NAME", bucket_name)
+
+    table = boto3.resource("dynamodb", region_name=search_books_context["region"]).Table(
+        search_books_context["table_name"]
+    )
+    books = [
+        ("b1", "Truyện Kiều", "vi", "2024-01-01T00:00:00+00:00"),
+        ("b2", "Dune", "en", "2024-03-01T00:00:00+00:00"),
+        ("b3", "Số Đỏ", "vi", "2024-02-01T00:00:00+00:00"),
+    ]
+    for book_id, title, language, approved_at in books:
+        table.put_item(Item={
+            "PK": f"BOOK#{book_id}", "SK": "METADATA", "bookId": book_id, "title": title,
+            "author": "Someone", "status": "APPROVED", "language": language,
+            "fileSize": 1024, "approvedAt": approved_at,
+        })
+    catalog.build_catalog_snapshot(search_books_context["table_name"], bucket_name)
+
+    newest = json.loads(handler({"queryStringParameters": {"sort": "approvedAt"}}, context={})["body"])
+    by_title = json.loads(
+        handler({"queryStringParameters": {"sort": "title", "language": "vi"}}, context={})["body"]
+    )
+    invalid = handler({"queryStringParameters": {"sort": "random"}}, context={})
+
+    assert [b["bookId"] for b in newest["books"]] == ["b2", "b3", "b1"]
+    assert newest["facets"]["language"] == [
+        {"value": "vi", "label": "vi", "count": 2},
+        {"value": "en", "label": "en", "count": 1},
+    ]
+    assert [b["bookId"] for b in by_title["books"]] == ["b3", "b1"]
+    assert by_title["pagination"]["total"] == 2
+    assert invalid["statusCode"] == 400
+
+    catalog.clear_catalog_cache()
+    clear_catalog_facets()
+
+
+def test_suggest_books_from_catalog_with_short_public_cache(search_books_context, books_table, s3_bucket, monkeypatch):
+    from search_books.handler import suggest_handler
+    from shared import catalog
+    from shared.suggest import SUGGEST_CACHE_CONTROL, clear_suggest_indexes
+
+    catalog.clear_catalog_cache()
+    clear_suggest_indexes()
+    bucket_name = s3_bucket["bucket_name"]
+    monkeypatch.setenv("CATALOG_BUCKET_NAME", bucket_name)
+
+    table = boto3.resource("dynamodb", region_name=search_books_context["region"]).Table(
+        search_books_context["table_name"]
+    )
+    _put_indexed_book(table, "b1", "Đắc Nhân Tâm", "Dale Carnegie")
+    _put_indexed_book(table, "b2", "Dế Mèn Phiêu Lưu Ký", "Tô Hoài")
+    _put_indexed_book(table, "b3", "Đắc Nhân Tâm 2", "Someone", status="PENDING")
+    catalog.build_catalog_snapshot(search_books_context["table_name"], bucket_name)
+
+    response = suggest_handler({"queryStringParameters": {"prefix": "dac nh"}}, context={})
+    empty = suggest_handler({"queryStringParameters": {"prefix": " "}}, context={})
+
+    assert response["statusCode"] == 200
+    assert response["headers"]["Cache-Control"] == SUGGEST_CACHE_CONTROL
+    assert json.loads(response["body"])["suggestions"] == [
+        {"text": "Đắc Nhân Tâm", "type": "title", "bookId": "b1"},
+    ]
+    assert json.loads(empty["body"])["suggestions"] == []
+
+    catalog.clear_catalog_cache()
+    clear_suggest_indexes()
@@ -0,0 +1,59 @@
+import asyncio
+import sys
+import threading
+from decimal import Decimal
+from pathlib import Path
+
+# Add lambda directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from shared.async_runtime import async_handler, aws_call, deserialize_item, get_loop, run_in_thread
+
+
+def test_async_handler_reuses_one_loop_and_overlaps_blocking_calls():
+    barrier = threading.Barrier(3, timeout=5)
+
+    @async_handler
+    async def handler(event, context):
+        # Each call blocks until all three run at once
+        await asyncio.gather(*(run_in_thread(barrier.wait) for _ in range(3)))
+        return {"statusCode": 200, "loop": asyncio.get_running_loop()}
+
+    first = handler({}, None)
+    second = handler({}, None)
+    assert first["statusCode"] == 200
+    assert first["loop"] is second["loop"] is get_loop()
+
+
+def test_aws_call_returns_low_level_responses(s3_bucket, books_table, monkeypatch, aws_region):
+    monkeypatch.setenv("AWS_REGION", aws_region)
+    books_table.put_item(Item={"PK": "BOOK#b1", "SK": "METADATA", "fileSize": 1024, "tags": {"a"}})
+
+    @async_handler
+    async def handler(event, context):
+        return await asyncio.gather(
+            aws_call("dynamodb", "get_item", TableName=books_table.table_name, Key={"PK": {"S": "BOOK#b1"}, "SK": {"S": "METADATA"}}),
+            aws_call("s3", "list_objects_v2", Bucket=s3_bucket["bucket_name"], Prefix="uploads/"),
+        )
+
+    item, listing = handler({}, None)
+    assert deserialize_item(item["Item"]) == {"PK": "BOOK#b1", "SK": "METADATA", "fileSize": Decimal(1024), "tags": {"a"}}
+    assert [obj["Key"] for obj in listing["Contents"]] == ["uploads/"]
+
+
+def test_aws_call_runs_on_the_thread_pool(monkeypatch):
+    import shared.async_runtime as runtime
+
+    class FakeClient:
+        def head_object(self, **params):
+            return {"thread": threading.current_thread().name, "params": params}
+
+    monkeypatch.setattr(runtime, "get_client", lambda service_name, region: FakeClient())
+
+    @async_handler
+    async def handler(event, context):
+        return await aws_call("s3", "head_object", region="us-east-1", Bucket="b", Key="k")
+
+    response = handler({}, None)
+    assert response["thread"].startswith("aws")
+    assert response["params"] == {"Bucket": "b", "Key": "k"}
@@ -0,0 +1,44 @@
+import sys
+import threading
+from pathlib import Path
+
+# Add lambda directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from shared import aws_clients
+
+
+def test_client_config_reads_environment(monkeypatch):
+    monkeypatch.setenv("AWS_MAX_POOL_CONNECTIONS", "64")
+    monkeypatch.setenv("AWS_CONNECT_TIMEOUT", "1.5")
+    monkeypatch.setenv("AWS_RETRY_MODE", "bogus")
+    monkeypatch.setenv("AWS_MAX_ATTEMPTS", "3")
+    monkeypatch.setenv("AWS_TCP_KEEPALIVE", "false")
+    monkeypatch.setenv("S3_MAX_CONCURRENCY", "500")
+
+    config = aws_clients.client_config()
+    assert config.max_pool_connections == 64
+    assert config.connect_timeout == 1.5
+    assert config.read_timeout == 15
+    assert config.retries == {"mode": "standard", "max_attempts": 3}
+    assert config.tcp_keepalive is False
+    # Managed transfers never use more threads than the pool has connections
+    assert aws_clients.transfer_config().max_request_concurrency == 64
+
+
+def test_clients_are_shared_and_resources_are_per_thread(monkeypatch):
+    monkeypatch.setenv("AWS_REGION", "ap-southeast-1")
+    monkeypatch.setenv("AWS_RETRY_MODE", "adaptive")
+    aws_clients.clear_clients()
+
+    assert aws_clients.s3_client() is aws_clients.get_client("s3", "ap-southeast-1")
+    assert aws_clients.s3_client("us-east-1") is not aws_clients.s3_client()
+    assert aws_clients.s3_client().meta.config.retries["mode"] == "adaptive"
+
+    resource = aws_clients.dynamodb_resource()
+    assert aws_clients.dynamodb_resource() is resource
+    other = []
+    worker = threading.Thread(target=lambda: other.append(aws_clients.dynamodb_resource()))
+    worker.start()
+    worker.join()
+    assert other[0] is not resource
@@ -0,0 +1,77 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add lambda directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from shared.catalog_facets import CatalogFacets, language_key, size_bucket
+
+
+MB = 1024 * 1024
+
+# Snapshot order: newest approval first
+BOOKS = [
+    {"bookId": "b1", "title": "Số Đỏ", "author": "Vũ Trọng Phụng", "language": "vi",
+     "fileSize": 3 * MB, "approvedAt": "2024-03-10T08:00:00+00:00", "searchText": "so do | vu trong phung"},
+    {"bookId": "b2", "title": "Dune", "author": "Frank Herbert", "language": "en-US",
+     "fileSize": 60 * MB, "approvedAt": "2024-02-01T08:00:00+00:00", "searchText": "dune | frank herbert"},
+    {"bookId": "b3", "title": "Dế Mèn Phiêu Lưu Ký", "author": "Tô Hoài", "language": "vi-VN",
+     "fileSize": 512 * 1024, "approvedAt": "2024-01-15T08:00:00+00:00", "searchText": "de men phieu luu ky | to hoai"},
+    {"bookId": "b4", "title": "Vợ chồng A Phủ", "author": "Tô Hoài", "language": "vi",
+     "fileSize": 2 * MB, "approvedAt": "2023-12-24T08:00:00+00:00", "searchText": "vo chong a phu | to hoai"},
+]
+
+
+def _ids(result):
+    books, _ = result
+    return [book["bookId"] for book in books]
+
+
+def test_facet_keys():
+    assert language_key("vi-VN") == "vi"
+    assert language_key(None) is None
+    assert size_bucket(512 * 1024) == "small"
+    assert size_bucket(10 * MB) == "large"
+    assert size_bucket(None) is None
+
+
+def test_sort_orders_and_unfiltered_pages():
+    facets = CatalogFacets(BOOKS, "v1")
+
+    assert facets.browse(limit=2) == (BOOKS[:2], 4)
+    assert _ids(facets.browse(sort="title")) == ["b3", "b2", "b1", "b4"]
+    assert _ids(facets.browse(sort="author", limit=2, offset=1)) == ["b3", "b4"]
+    with pytest.raises(ValueError):
+        facets.browse(sort="fileSize")
+
+
+def test_filters_intersect_and_keep_the_requested_order():
+    facets = CatalogFacets(BOOKS, "v1")
+
+    assert facets.browse(language="VI") == ([BOOKS[0], BOOKS[2], BOOKS[3]], 3)
+    assert _ids(facets.browse(language="vi", size="medium", sort="title")) == ["b1", "b4"]
+    assert _ids(facets.browse(author="to hoai", sort="title")) == ["b3", "b4"]
+    assert _ids(facets.browse(title="de")) == ["b3"]
+    assert _ids(facets.browse(approved_from="2024-01-01", approved_to="2024-02-01")) == ["b2", "b3"]
+    assert _ids(facets.browse(approved_to="2023-12-31")) == ["b4"]
+    assert _ids(facets.browse(language="vi", query="PHU")) == ["b1", "b4"]
+    assert facets.browse(language="fr") == ([], 0)
+
+
+def test_query_matches_author_without_search_text():
+    # Entries from a table scan (no snapshot yet) carry no searchText
+    books = [{key: value for key, value in book.items() if key != "searchText"} for book in BOOKS]
+    facets = CatalogFacets(books, "v1")
+
+    assert _ids(facets.browse(query="to hoai", sort="title")) == ["b3", "b4"]
+    assert _ids(facets.browse(query="PHU")) == ["b1", "b4"]
+
+
+def test_facet_counts_are_precomputed_per_value():
+    counts = CatalogFacets(BOOKS, "v1").facet_counts()
+
+    assert counts["language"] == [{"value": "vi", "label": "vi", "count": 3}, {"value": "en", "label": "en", "count": 1}]
+    assert counts["size"][0] == {"value": "medium", "label": "medium", "count": 2}
+    assert counts["author"][0] == {"value": "to hoai", "label": "Tô Hoài", "count": 2}
@@ -0,0 +1,82 @@
+import json
+import logging
+import sys
+from pathlib import Path
+
+# Add lambda directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import shared.logger as shared_logger
+from shared.logger import InfoSamplingFilter, JsonFormatter, get_logger
+
+
+def _record(level=logging.INFO, **extra):
+    record = logging.LogRecord(
+        name="test.logger",
+        level=level,
+        pathname=__file__,
+        lineno=1,
+        msg="hello %s",
+        args=("world",),
+        exc_info=None,
+    )
+    record.created = 1700000000.123456
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+def test_formatter_includes_arbitrary_extras_and_record_timestamp():
+    formatter = JsonFormatter()
+    line = formatter.format(_record(count=3, total=10, userName="alice", requestId="req-1"))
+    data = json.loads(line)
+
+    assert data["message"] == "hello world"
+    assert data["level"] == "INFO"
+    assert data["timestamp"] == "2023-11-14T22:13:20.123456+00:00"
+    assert data["count"] == 3
+    assert data["total"] == 10
+    assert data["userName"] == "alice"
+    assert data["requestId"] == "req-1"
+    assert "lineno" not in data
+    assert "args" not in data
+
+
+def test_formatter_caches_static_lambda_fields(monkeypatch):
+    monkeypatch.setenv("AWS_LAMBDA_FUNCTION_NAME", "SearchBooksFn")
+    monkeypatch.setenv("AWS_LAMBDA_FUNCTION_VERSION", "$LATEST")
+    formatter = JsonFormatter()
+
+    data = json.loads(formatter.format(_record()))
+    assert data["function"] == "SearchBooksFn"
+    assert data["functionVersion"] == "$LATEST"
+    assert "coldStart" in data
+
+
+def test_cold_start_flag_cleared_after_first_record(monkeypatch):
+    monkeypatch.setattr(shared_logger, "_cold_start", True)
+    formatter = JsonFormatter()
+
+    first = json.loads(formatter.format(_record()))
+    second = json.loads(JsonFormatter().format(_record()))
+
+    assert first["coldStart"] is True
+    assert second["coldStart"] is False
+
+
+def test_get_logger_attaches_handler_once():
+    logger = get_logger("test.logger.idempotent")
+    handler = logger.handlers[0]
+
+    again = get_logger("test.logger.idempotent")
+
+    assert again is logger
+    assert again.handlers == [handler]
+
+
+def test_info_sampling_keeps_warnings_and_audit_records():
+    sampler = InfoSamplingFilter(sample_rate=0.0)
+
+    assert sampler.filter(_record(level=logging.INFO)) is False
+    assert sampler.filter(_record(level=logging.WARNING)) is True
+    assert sampler.filter(_record(level=logging.INFO, action="BOOK_APPROVED")) is True
@@ -0,0 +1,64 @@
+import json
+import sys
+from pathlib import Path
+
+# Add lambda directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from shared.logger import emit_metrics, get_metrics
+
+
+def _emf_documents(output: str):
+    docs = []
+    for line in output.splitlines():
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if "_aws" in data:
+            docs.append(data)
+    return docs
+
+
+def test_emit_metrics_flushes_single_emf_document(capsys):
+    @emit_metrics("testHandler")
+    def handler(event, context):
+        metrics = get_metrics()
+        metrics.add_dimension("action", "approve")
+        with metrics.timer("SignTime"):
+            pass
+        metrics.increment("BooksMoved")
+        metrics.increment("BooksMoved")
+        return {"statusCode": 200}
+
+    handler({}, {})
+
+    docs = _emf_documents(capsys.readouterr().out)
+    assert len(docs) == 1
+    doc = docs[0]
+
+    directive = doc["_aws"]["CloudWatchMetrics"][0]
+    assert directive["Namespace"] == "OnlineLibrary"
+    assert ["handler", "status"] in directive["Dimensions"]
+    assert ["handler", "action", "status"] in directive["Dimensions"]
+
+    units = {m["Name"]: m["Unit"] for m in directive["Metrics"]}
+    assert units["SignTime"] == "Milliseconds"
+    assert units["BooksMoved"] == "Count"
+
+    assert doc["handler"] == "testHandler"
+    assert doc["action"] == "approve"
+    assert doc["status"] == "SUCCESS"
+    assert doc["BooksMoved"] == [1, 1]
+    assert doc["Invocations"] == 1
+
+
+def test_emit_metrics_marks_errors(capsys):
+    @emit_metrics("testHandler")
+    def handler(event, context):
+        return {"statusCode": 500}
+
+    handler({}, {})
+
+    docs = _emf_documents(capsys.readouterr().out)
+    assert docs[0]["status"] == "ERROR"
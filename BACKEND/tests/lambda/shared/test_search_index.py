@@ -0,0 +1,124 @@
+import sys
+from pathlib import Path
+
+import boto3
+
+# Add lambda directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from shared import catalog
+from shared.search_index import SearchIndex, clear_search_indexes, get_search_index
+
+
+BOOKS = [
+    {"bookId": "b1", "title": "Dế Mèn Phiêu Lưu Ký", "author": "Tô Hoài"},
+    {"bookId": "b2", "title": "Vợ chồng A Phủ", "author": "Tô Hoài"},
+    {"bookId": "b3", "title": "Truyện Kiều", "author": "Nguyễn Du"},
+]
+
+
+def _ids(result):
+    books, _ = result
+    return [book["bookId"] for book in books]
+
+
+def test_word_prefix_and_search_in_snapshot_order():
+    index = SearchIndex(BOOKS, "v1")
+
+    assert _ids(index.search("to hoa")) == ["b1", "b2"]
+    assert _ids(index.search("hoai de")) == ["b1"]
+    assert _ids(index.search("kieu")) == ["b3"]
+    assert index.search("kieu xyz") == ([], 0)
+    assert index.search("", limit=2) == (BOOKS[:2], 3)
+
+
+def test_refresh_applies_adds_edits_and_removals_incrementally():
+    fillers = [{"bookId": f"x{i}", "title": f"Filler {i}"} for i in range(20)]
+    index = SearchIndex(BOOKS + fillers, "v1")
+    edited = dict(BOOKS[2], title="Kim Vân Kiều")
+    new = {"bookId": "b4", "title": "Số Đỏ", "author": "Vũ Trọng Phụng"}
+    books = [new, BOOKS[0], edited] + fillers
+
+    changes = index.refresh(books, "v2")
+
+    assert changes == {"added": 2, "removed": 2, "compacted": 0}
+    assert index.version == "v2"
+    assert _ids(index.search("so do")) == ["b4"]
+    assert _ids(index.search("kim van")) == ["b3"]
+    assert _ids(index.search("truyen")) == []
+    assert _ids(index.search("a phu")) == []
+    assert _ids(index.search("", limit=3)) == ["b4", "b1", "b3"]
+
+
+def test_get_search_index_hits_until_catalog_version_changes(s3_bucket, books_table, aws_region, monkeypatch):
+    monkeypatch.setattr(catalog, "CATALOG_REFRESH_SECONDS", 0)
+    catalog.clear_catalog_cache()
+    clear_search_indexes()
+    bucket = s3_bucket["bucket_name"]
+    table = boto3.resource("dynamodb", region_name=aws_region).Table(books_table.table_name)
+    table.put_item(Item={"PK": "BOOK#b1", "SK": "METADATA", "bookId": "b1", "title": "Sách Hay", "status": "APPROVED"})
+    catalog.build_catalog_snapshot(books_table.table_name, bucket)
+
+    first = get_search_index(bucket)
+    assert get_search_index(bucket) is first
+
+    table.put_item(Item={"PK": "BOOK#b2", "SK": "METADATA", "bookId": "b2", "title": "Sách Mới", "status": "APPROVED"})
+    catalog.build_catalog_snapshot(books_table.table_name, bucket)
+    refreshed = get_search_index(bucket)
+
+    assert refreshed is first
+    assert sorted(_ids(refreshed.search("sach"))) == ["b1", "b2"]
+    assert len(refreshed) == 2
+
+    catalog.clear_catalog_cache()
+    clear_search_indexes()
+
+
+def test_title_matches_outrank_description_matches():
+    books = [
+        {"bookId": "d1", "title": "Tuyển tập", "author": "Nhiều tác giả", "description": "Những bài thơ về mùa thu Hà Nội"},
+        {"bookId": "d2", "title": "Mùa thu Hà Nội", "author": "Nguyễn Đình Thi"},
+        {"bookId": "d3", "title": "Lá rụng", "author": "Thu Bồn"},
+    ]
+    index = SearchIndex(books, "v1")
+
+    assert _ids(index.search("mua thu")) == ["d2", "d1"]
+    assert _ids(index.search("thu")) == ["d2", "d3", "d1"]
+    assert _ids(index.search("mua thu", limit=1, offset=1)) == ["d1"]
+
+
+def test_misspelled_words_match_within_edit_distance():
+    index = SearchIndex(BOOKS + [{"bookId": "b4", "title": "Nhà Giả Kim", "author": "Paulo Coelho"}], "v1")
+
+    assert _ids(index.search("phieu luuu")) == ["b1"]
+    assert _ids(index.search("kieu nguyen")) == ["b3"]
+    assert _ids(index.search("coleho")) == ["b4"]
+    assert _ids(index.search("nugyen du")) == ["b3"]
+    assert index.search("zzzz") == ([], 0)
+
+
+def test_removed_books_do_not_count_towards_document_frequency():
+    books = [{"bookId": f"c{i}", "title": "Chí Phèo" if i < 3 else f"Lão Hạc {i}"} for i in range(20)]
+    index = SearchIndex(books, "v1")
+    fresh = SearchIndex(books[2:], "v2")
+
+    index.refresh(books[2:], "v2")
+
+    assert index._document_frequency("pheo") == fresh._document_frequency("pheo") == 1
+    assert index._idf("pheo") == fresh._idf("pheo")
+
+
+def test_typo_dictionary_keeps_only_the_most_frequent_words(monkeypatch):
+    from shared import search_index
+
+    monkeypatch.setattr(search_index, "FUZZY_MAX_WORDS", 2)
+    books = [
+        {"bookId": "f1", "title": "Những ngày thơ ấu"},
+        {"bookId": "f2", "title": "Những ngày cuối"},
+        {"bookId": "f3", "title": "Những người khốn khổ"},
+    ]
+    index = SearchIndex(books, "v1")
+
+    assert sorted(_ids(index.search("nhuung"))) == ["f1", "f2", "f3"]
+    assert _ids(index.search("nguoii")) == []
+    assert index._fuzzy_words == {"nhung", "ngay"}
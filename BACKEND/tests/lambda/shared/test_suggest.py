@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+
+# Add lambda directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from shared.suggest import SuggestIndex
+
+
+BOOKS = [
+    {"bookId": "b1", "title": "Dế Mèn Phiêu Lưu Ký", "author": "Tô Hoài"},
+    {"bookId": "b2", "title": "Vợ chồng A Phủ", "author": "Tô Hoài"},
+    {"bookId": "b3", "title": "Truyện Kiều", "author": "Nguyễn Du"},
+    {"bookId": "b4", "title": "Tôi thấy hoa vàng trên cỏ xanh", "author": "Nguyễn Nhật Ánh"},
+]
+
+
+def _texts(suggestions):
+    return [suggestion["text"] for suggestion in suggestions]
+
+
+def test_prefix_matches_titles_and_authors_ignoring_accents():
+    index = SuggestIndex(BOOKS, "v1")
+
+    assert index.suggest("TO") == [
+        {"text": "Tô Hoài", "type": "author", "count": 2},
+        {"text": "Tôi thấy hoa vàng trên cỏ xanh", "type": "title", "bookId": "b4"},
+    ]
+    assert _texts(index.suggest("nguyen")) == ["Nguyễn Du", "Nguyễn Nhật Ánh"]
+    assert index.suggest("") == []
+    assert index.suggest("zz") == []
+
+
+def test_inner_words_match_after_full_text_matches():
+    index = SuggestIndex(BOOKS, "v1")
+
+    assert _texts(index.suggest("hoa")) == ["Tôi thấy hoa vàng trên cỏ xanh", "Tô Hoài"]
+    assert _texts(index.suggest("kie")) == ["Truyện Kiều"]
+    assert _texts(index.suggest("n", limit=2)) == ["Nguyễn Du", "Nguyễn Nhật Ánh"]
+    assert len(index) == 7
@@ -0,0 +1,29 @@
+import sys
+from pathlib import Path
+
+# Add lambda directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from shared.text import edge_ngrams, fold, normalize, tokenize
+
+
+def test_fold_strips_vietnamese_diacritics_and_d_stroke():
+    assert fold("Đắc Nhân Tâm") == "dac nhan tam"
+    assert fold("ĐƯỜNG XƯA MÂY TRẮNG") == "duong xua may trang"
+    assert fold(None) == ""
+
+
+def test_fold_handles_uppercase_special_letters():
+    # U+0110 (Vietnamese Đ) and U+00D0 (Icelandic Ð) look alike
+    assert fold("\u0110\u00d0\u00f0") == "ddd"
+    assert fold("ØRSTED Łódź Straße") == "orsted lodz strasse"
+
+
+def test_normalize_collapses_punctuation_and_whitespace():
+    assert normalize("  Sách,   hay!\tNHẤT-2024 ") == "sach hay nhat 2024"
+    assert tokenize("Dế Mèn (phiêu lưu ký)") == ["de", "men", "phieu", "luu", "ky"]
+
+
+def test_edge_ngrams_prefixes_with_bounds():
+    assert edge_ngrams(["sach", "a"]) == {"sa", "sac", "sach", "a"}
+    assert max(len(gram) for gram in edge_ngrams(["x" * 40])) == 15
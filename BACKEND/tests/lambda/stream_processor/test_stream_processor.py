@@ -0,0 +1,157 @@
+import sys
+from pathlib import Path
+
+import boto3
+
+# Add lambda directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import stream_processor.handler as processor
+from shared.derived import get_status_counts, pending_shard_key
+from stream_processor.handler import handler
+
+
+def _book(book_id, status, **extra):
+    return {
+        "PK": f"BOOK#{book_id}",
+        "SK": "METADATA",
+        "bookId": book_id,
+        "title": "Truyện Kiều",
+        "author": "Nguyễn Du",
+        "status": status,
+        "uploadedAt": "2025-01-01T00:00:00+00:00",
+        **extra,
+    }
+
+
+def _table(context):
+    return boto3.resource("dynamodb", region_name=context["region"]).Table(context["table_name"])
+
+
+def test_pending_book_gets_index_keys_and_loses_stale_tokens(upload_test_context, books_table, build_stream_event):
+    table = _table(upload_test_context)
+    draft = _book("b1", "UPLOADING")
+    pending = _book("b1", "PENDING")
+    # Written by earlier versions of the processor
+    table.put_item(Item=dict(pending, searchTokens={"truyen", "tru"}))
+
+    assert handler(build_stream_event(images=[(draft, pending)]), context={}) == {"batchItemFailures": []}
+
+    item = table.get_item(Key={"PK": "BOOK#b1", "SK": "METADATA"})["Item"]
+    assert item["GSI5PK"] == pending_shard_key("b1")
+    assert item["GSI5SK"] == "2025-01-01T00:00:00+00:00"
+    assert "searchTokens" not in item
+    assert get_status_counts(upload_test_context["table_name"]) == {"UPLOADING": -1, "PENDING": 1}
+
+
+def test_decision_removes_index_keys(upload_test_context, books_table, build_stream_event):
+    table = _table(upload_test_context)
+    pending = _book("b2", "PENDING", GSI5PK="STATUS#PENDING", GSI5SK="2025-01-01T00:00:00+00:00")
+    approving = dict(pending, status="APPROVING")
+    table.put_item(Item=approving)
+
+    handler(build_stream_event(images=[(pending, approving)]), context={})
+
+    item = table.get_item(Key={"PK": "BOOK#b2", "SK": "METADATA"})["Item"]
+    assert "GSI5PK" not in item
+    assert "GSI5SK" not in item
+
+
+def test_replayed_batch_counts_once_and_consistent_book_is_not_rewritten(
+    upload_test_context, books_table, build_stream_event, monkeypatch
+):
+    table = _table(upload_test_context)
+    pending = _book("b3", "PENDING")
+    table.put_item(Item=pending)
+    event = build_stream_event(images=[(None, pending)])
+    handler(event, context={})
+
+    writes = []
+    real_write = processor._write_derived
+    monkeypatch.setattr(
+        processor,
+        "_write_derived",
+        lambda *args: writes.append(args) or real_write(*args),
+    )
+
+    # Replay, plus the record produced by the processor's own write
+    item = table.get_item(Key={"PK": "BOOK#b3", "SK": "METADATA"})["Item"]
+    handler(event, context={})
+    handler(build_stream_event(images=[(pending, item)]), context={})
+
+    assert writes == []
+    assert get_status_counts(upload_test_context["table_name"]) == {"PENDING": 1}
+
+
+def test_deleting_approved_book_refreshes_catalog(upload_test_context, books_table, build_stream_event, monkeypatch):
+    refreshed = []
+    monkeypatch.setattr(processor, "build_catalog_snapshot", lambda *args: refreshed.append(args))
+    approved = _book("b4", "APPROVED")
+
+    result = handler(build_stream_event(images=[(approved, None)]), context={})
+
+    assert result == {"batchItemFailures": []}
+    assert len(refreshed) == 1
+    assert get_status_counts(upload_test_context["table_name"]) == {"APPROVED": -1}
+
+
+def test_failed_catalog_rebuild_fails_batch(upload_test_context, books_table, build_stream_event, monkeypatch):
+    def failing_rebuild(*args):
+        raise RuntimeError("S3 unavailable")
+
+    monkeypatch.setattr(processor, "build_catalog_snapshot", failing_rebuild)
+    approved = _book("b7", "APPROVED")
+    event = build_stream_event(images=[(approved, None)])
+
+    assert handler(event, context={})["batchItemFailures"]
+
+    # The retry rebuilds the catalog without counting the records again
+    monkeypatch.setattr(processor, "build_catalog_snapshot", lambda *args: None)
+    assert handler(event, context={}) == {"batchItemFailures": []}
+    assert get_status_counts(upload_test_context["table_name"]) == {"APPROVED": -1}
+
+
+def test_uploader_counters_follow_status_changes(upload_test_context, books_table, build_stream_event):
+    table_name = upload_test_context["table_name"]
+    _table(upload_test_context).put_item(Item=_book("b5", "APPROVED", uploaderId="user-1"))
+    draft = _book("b5", "UPLOADING", uploaderId="user-1")
+    pending = dict(draft, status="PENDING")
+    approved = dict(draft, status="APPROVED")
+
+    handler(build_stream_event(images=[(None, draft), (draft, pending), (pending, approved)]), context={})
+
+    assert get_status_counts(table_name, uploader_id="user-1") == {"APPROVED": 1}
+    assert get_status_counts(table_name, uploader_id="user-2") is None
+
+
+def test_cancelled_counter_update_fails_batch_instead_of_skipping(
+    upload_test_context, books_table, build_stream_event, monkeypatch
+):
+    table_name = upload_test_context["table_name"]
+    pending = _book("b6", "PENDING")
+    _table(upload_test_context).put_item(Item=pending)
+    event = build_stream_event(images=[(None, pending)])
+    client = processor.get_dynamodb_table(table_name).meta.client
+
+    real_transact = client.transact_write_items
+    throttle = [True]
+
+    # Throttled counter update: the marker condition is fine, so the record
+    # must be retried, not counted as a replay
+    def flaky_transact(**kwargs):
+        if throttle[0]:
+            raise processor.ClientError(
+                {
+                    "Error": {"Code": "TransactionCanceledException", "Message": "cancelled"},
+                    "CancellationReasons": [{"Code": "None"}, {"Code": "ThrottlingError"}],
+                },
+                "TransactWriteItems",
+            )
+        return real_transact(**kwargs)
+
+    monkeypatch.setattr(client, "transact_write_items", flaky_transact)
+
+    assert handler(event, context={})["batchItemFailures"]
+    throttle[0] = False
+    assert handler(event, context={}) == {"batchItemFailures": []}
+    assert get_status_counts(table_name) == {"PENDING": 1}
@@ -0,0 +1,83 @@
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add lambda directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from validate_mime_type.metadata import extract_metadata, render_cover_thumbnail
+from validate_mime_type.structure import validate_structure
+
+
+EPUB_OPF = (
+    '<?xml version="1.0"?>'
+    '<package xmlns="http://www.idpf.org/2007/opf" version="3.0">'
+    '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">'
+    "<dc:title>Truy&#7879;n Ki&#7873;u</dc:title>"
+    "<dc:creator id=\"a1\">Nguyễn Du</dc:creator>"
+    "<dc:language>vi</dc:language>"
+    "</metadata>"
+    '<manifest><item id="cover" href="images/cover.png" media-type="image/png" '
+    'properties="cover-image"/></manifest><spine/></package>'
+)
+
+
+@pytest.fixture
+def put_object(s3_bucket):
+    def _put(key, body):
+        s3_bucket["client"].put_object(Bucket=s3_bucket["bucket_name"], Key=key, Body=body)
+        return s3_bucket["bucket_name"], key
+    return _put
+
+
+def test_pdf_metadata_from_info_dict(put_object, build_pdf_bytes):
+    pdf = build_pdf_bytes(info=b"/Title (My \\(First\\) Book) /Author <FEFF004A0061006E0065>")
+    bucket, key = put_object("uploads/m1/book.pdf", pdf)
+
+    metadata = extract_metadata(validate_structure(bucket, key, "application/pdf"))
+
+    assert metadata.page_count == 1
+    assert metadata.title == "My (First) Book"
+    assert metadata.author == "Jane"
+    assert metadata.cover_image is None
+
+
+def test_pdf_without_info_only_has_page_count(put_object, build_pdf_bytes):
+    bucket, key = put_object("uploads/m2/book.pdf", build_pdf_bytes())
+
+    metadata = extract_metadata(validate_structure(bucket, key, "application/pdf"))
+
+    assert metadata.page_count == 1
+    assert metadata.to_item_fields()["embeddedTitle"] is None
+
+
+def test_epub_metadata_and_cover_from_opf(put_object, build_epub_bytes):
+    epub = build_epub_bytes(opf=EPUB_OPF, files={"OEBPS/images/cover.png": b"fake-png"})
+    bucket, key = put_object("uploads/m3/book.epub", epub)
+
+    metadata = extract_metadata(validate_structure(bucket, key, "application/epub+zip"))
+
+    assert metadata.title == "Truyện Kiều"
+    assert metadata.author == "Nguyễn Du"
+    assert metadata.language == "vi"
+    assert metadata.cover_image == b"fake-png"
+
+
+def test_render_cover_thumbnail_scales_to_webp():
+    Image = pytest.importorskip("PIL.Image")
+    source = io.BytesIO()
+    Image.new("RGB", (1200, 1800), "navy").save(source, format="PNG")
+
+    thumbnail = render_cover_thumbnail(source.getvalue(), width=300)
+
+    with Image.open(io.BytesIO(thumbnail)) as image:
+        assert image.format == "WEBP"
+        assert image.size == (300, 450)
+
+
+def test_render_cover_thumbnail_ignores_garbage():
+    pytest.importorskip("PIL")
+
+    assert render_cover_thumbnail(b"not an image") is None
@@ -0,0 +1,89 @@
+import io
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+# Add lambda directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from validate_mime_type.structure import StructureError, validate_structure
+
+
+@pytest.fixture
+def put_object(s3_bucket):
+    def _put(key, body):
+        s3_bucket["client"].put_object(Bucket=s3_bucket["bucket_name"], Key=key, Body=body)
+        return s3_bucket["bucket_name"], key
+    return _put
+
+
+def test_valid_pdf_passes(put_object, build_pdf_bytes):
+    bucket, key = put_object("uploads/b1/book.pdf", build_pdf_bytes())
+
+    info = validate_structure(bucket, key, "application/pdf")
+
+    assert info.kind == "pdf"
+    assert info.details["xref"] == "table"
+
+
+def test_truncated_pdf_is_rejected(put_object, build_pdf_bytes):
+    pdf = build_pdf_bytes()
+    bucket, key = put_object("uploads/b2/book.pdf", pdf[: len(pdf) // 2])
+
+    with pytest.raises(StructureError, match="%%EOF"):
+        validate_structure(bucket, key, "application/pdf")
+
+
+def test_pdf_with_bad_startxref_is_rejected(put_object, build_pdf_bytes):
+    pdf = build_pdf_bytes().replace(b"startxref\n", b"startxref\n1")
+    bucket, key = put_object("uploads/b3/book.pdf", pdf)
+
+    with pytest.raises(StructureError):
+        validate_structure(bucket, key, "application/pdf")
+
+
+def test_valid_epub_passes(put_object, build_epub_bytes):
+    bucket, key = put_object("uploads/b4/book.epub", build_epub_bytes())
+
+    info = validate_structure(bucket, key, "application/epub+zip")
+
+    assert info.kind == "epub"
+    assert info.details["rootfile"] == "OEBPS/content.opf"
+
+
+def test_epub_without_leading_mimetype_is_rejected(put_object, build_epub_bytes):
+    bucket, key = put_object("uploads/b5/book.epub", build_epub_bytes(mimetype_first=False))
+
+    with pytest.raises(StructureError, match="mimetype"):
+        validate_structure(bucket, key, "application/epub+zip")
+
+
+def test_epub_zip_bomb_is_rejected_without_inflating(put_object, build_epub_bytes):
+    bomb = build_epub_bytes(files={"OEBPS/bomb.xhtml": b"\0" * (20 * 1024 * 1024)})
+    bucket, key = put_object("uploads/b6/book.epub", bomb)
+
+    with pytest.raises(StructureError, match="compression ratio"):
+        validate_structure(bucket, key, "application/epub+zip")
+
+
+def test_epub_missing_container_is_rejected(put_object):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr(zipfile.ZipInfo("mimetype"), b"application/epub+zip", zipfile.ZIP_STORED)
+        archive.writestr("OEBPS/content.opf", "<package/>")
+    bucket, key = put_object("uploads/b7/book.epub", buffer.getvalue())
+
+    with pytest.raises(StructureError, match="container.xml"):
+        validate_structure(bucket, key, "application/epub+zip")
+
+
+def test_read_budget_caps_work(put_object, build_epub_bytes, monkeypatch):
+    import validate_mime_type.structure as structure
+
+    monkeypatch.setattr(structure, "MAX_READ_BYTES", 100)
+    bucket, key = put_object("uploads/b8/book.epub", build_epub_bytes())
+
+    with pytest.raises(StructureError, match="budget"):
+        validate_structure(bucket, key, "application/epub+zip")
@@ -9,6 +9,8 @@ import pytest
 # Add lambda directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from shared.derived import pending_shard_key
+from stream_processor.handler import handler as stream_processor_handler
 from validate_mime_type.handler import handler
 
 
@@ -28,15 +30,15 @@ def validate_test_context(monkeypatch, aws_region, s3_bucket, books_table):
     }
 
 
-def test_validate_mime_type_pdf_approved(validate_test_context, build_api_gateway_event):
+def test_validate_mime_type_pdf_approved(validate_test_context, build_api_gateway_event, build_pdf_bytes, build_stream_event):
     """Test PDF file is marked pending and moved to staging/"""
     region = validate_test_context["region"]
     bucket_name = validate_test_context["bucket_name"]
     table_name = validate_test_context["table_name"]
     s3_client = validate_test_context["s3_client"]
 
-    # Create test PDF content (magic bytes for PDF)
-    pdf_content = b"%PDF-1.4\n%test pdf content"
+    # Create a minimal, structurally valid PDF
+    pdf_content = build_pdf_bytes(info=b"/Title (Embedded Title) /Author (Jane Doe)")
     book_id = "test-book-123"
     file_name = "test.pdf"
     source_key = f"uploads/{book_id}/{file_name}"
@@ -82,8 +84,16 @@ def test_validate_mime_type_pdf_approved(validate_test_context, build_api_gatewa
     assert item is not None
     assert item["status"] == "PENDING"
     assert item.get("mime_type") == "application/pdf"
-    assert item.get("GSI5PK") == "STATUS#PENDING"
-    assert item.get("GSI5SK") is not None
+    assert item.get("pageCount") == 1
+    assert item.get("embeddedTitle") == "Embedded Title"
+    assert item.get("embeddedAuthor") == "Jane Doe"
+    assert "coverPath" not in item
+
+    # The pending index keys are derived by stream_processor
+    assert stream_processor_handler(build_stream_event(images=[(None, item)]), context={}) == {"batchItemFailures": []}
+    item = table.get_item(Key={"PK": f"BOOK#{book_id}", "SK": "METADATA"}).get("Item")
+    assert item.get("GSI5PK") == pending_shard_key(book_id)
+    assert item.get("GSI5SK") == item["uploadedAt"]
 
 
 def test_validate_mime_type_invalid_rejected(validate_test_context):
@@ -136,3 +146,73 @@ def test_validate_mime_type_invalid_rejected(validate_test_context):
     assert item["status"] == "REJECTED"
     assert item.get("GSI5PK") is None
     assert item.get("GSI5SK") is None
+
+
+def test_validate_mime_type_deduplicates_identical_upload(validate_test_context, build_pdf_bytes):
+    """Test a second upload with identical bytes reuses the first object."""
+    import hashlib
+
+    bucket_name = validate_test_context["bucket_name"]
+    s3_client = validate_test_context["s3_client"]
+    table = boto3.resource("dynamodb", region_name=validate_test_context["region"]).Table(
+        validate_test_context["table_name"]
+    )
+    pdf_content = build_pdf_bytes(b"same bytes uploaded twice")
+
+    def _upload(book_id):
+        key = f"uploads/{book_id}/book.pdf"
+        s3_client.put_object(Bucket=bucket_name, Key=key, Body=pdf_content)
+        event = {"Records": [{"s3": {"bucket": {"name": bucket_name}, "object": {"key": key}}}]}
+        return json.loads(handler(event, context={})["body"])
+
+    first = _upload("book-original")
+    second = _upload("book-copy")
+
+    assert first["duplicateOf"] is None
+    assert second["status"] == "PENDING"
+    assert second["duplicateOf"] == "book-original"
+
+    copy_item = table.get_item(Key={"PK": "BOOK#book-copy", "SK": "METADATA"})["Item"]
+    assert copy_item["file_path"] == "staging/book-original/book.pdf"
+    assert copy_item["contentHash"] == hashlib.sha256(pdf_content).hexdigest()
+
+    content = table.get_item(Key={"PK": f"HASH#{copy_item['contentHash']}", "SK": "CONTENT"})["Item"]
+    assert content["canonicalBookId"] == "book-original"
+    assert content["refCount"] == 2
+    assert content["claimedBy"] == {"book-original", "book-copy"}
+
+    # A retried event for either book does not take a second reference
+    from shared.dedup import claim_content_hash
+
+    table_name = validate_test_context["table_name"]
+    assert claim_content_hash(table_name, copy_item["contentHash"], "book-copy", "staging/book-copy/book.pdf")[
+        "canonicalBookId"
+    ] == "book-original"
+    assert claim_content_hash(table_name, copy_item["contentHash"], "book-original", "staging/book-original/book.pdf") is None
+    content = table.get_item(Key={"PK": f"HASH#{copy_item['contentHash']}", "SK": "CONTENT"})["Item"]
+    assert content["refCount"] == 2
+
+    # Only one stored copy
+    staged = s3_client.list_objects_v2(Bucket=bucket_name, Prefix="staging/book-")
+    assert [obj["Key"] for obj in staged["Contents"]] == ["staging/book-original/book.pdf"]
+    uploads = s3_client.list_objects_v2(Bucket=bucket_name, Prefix="uploads/book-copy/")
+    assert "Contents" not in uploads
+
+
+def test_validate_mime_type_rejects_truncated_pdf(validate_test_context, build_pdf_bytes):
+    """Test a PDF with valid magic bytes but a cut-off body is quarantined."""
+    bucket_name = validate_test_context["bucket_name"]
+    s3_client = validate_test_context["s3_client"]
+    key = "uploads/book-truncated/book.pdf"
+    s3_client.put_object(Bucket=bucket_name, Key=key, Body=build_pdf_bytes()[:200])
+
+    event = {"Records": [{"s3": {"bucket": {"name": bucket_name}, "object": {"key": key}}}]}
+    body = json.loads(handler(event, context={})["body"])
+
+    assert body["status"] == "REJECTED"
+    table = boto3.resource("dynamodb", region_name=validate_test_context["region"]).Table(
+        validate_test_context["table_name"]
+    )
+    item = table.get_item(Key={"PK": "BOOK#book-truncated", "SK": "METADATA"})["Item"]
+    assert item["rejectedReason"].startswith("Corrupt or unsafe file")
+    assert item["file_path"] == "quarantine/book-truncated/book.pdf"
@@ -4,6 +4,7 @@ import Link from "next/link";
 import { useRouter } from "next/router";
 import { useAuth } from "../src/contexts/AuthContext";
 import { fetchAuthSession } from "aws-amplify/auth";
+import { api } from "../lib/api";
 
 export default function Header() {
   const [navbarOpen, setNavbarOpen] = useState(false);
@@ -76,7 +77,17 @@ export default function Header() {
     };
 
     checkAdmin();
-  }, [user]);  const handleSignOut = async () => {
+  }, [user]);
+
+  // Pending badge for admins (one counter read, no listing)
+  const [pendingCount, setPendingCount] = useState(0);
+
+  useEffect(() => {
+    if (!isAdmin) return;
+    api.getPendingCount()
+      .then((data) => setPendingCount(data?.pending || 0))
+      .catch(() => setPendingCount(0));
+  }, [isAdmin]);  const handleSignOut = async () => {
     try {
       await signOutUser();
       router.push("/");
@@ -137,6 +148,11 @@ export default function Header() {
             {isAdmin && (
               <Link href="/admin/pending" className="text-base md:text-sm text-black transition duration-300 dark:text-gray-300 hover:text-blue-600 dark:hover:text-blue-400 font-semibold py-2 md:py-0">
                 Dashboard
+                {pendingCount > 0 && (
+                  <span className="ml-2 inline-flex items-center justify-center px-2 py-0.5 text-xs font-bold text-white bg-red-600 rounded-full">
+                    {pendingCount}
+                  </span>
+                )}
               </Link>
             )}
           </div>
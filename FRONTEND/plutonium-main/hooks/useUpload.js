@@ -23,8 +23,10 @@ export function useUpload() {
 
   // Step 2: Upload to S3
   const uploadToS3Mutation = useMutation({
-    mutationFn: ({ uploadUrl, file }) =>
-      api.uploadToS3(uploadUrl, file, setUploadProgress),
+    mutationFn: ({ uploadUrl, uploadFields, file }) =>
+      uploadFields
+        ? api.uploadToS3Post(uploadUrl, uploadFields, file, setUploadProgress)
+        : api.uploadToS3(uploadUrl, file, setUploadProgress),
     onSuccess: () => {
       // Invalidate my-uploads query
       queryClient.invalidateQueries([QUERY_KEYS.BOOKS, QUERY_KEYS.MY_UPLOADS]);
@@ -49,14 +51,16 @@ export function useUpload() {
       }
 
       // Step 1: Get presigned URL
-      const { uploadUrl, bookId } = await createUploadUrlMutation.mutateAsync({
+      // "post" mode lets S3 enforce the declared size and content type
+      const { uploadUrl, uploadFields, bookId } = await createUploadUrlMutation.mutateAsync({
         fileName: file.name,
         fileSize: file.size,
+        uploadMode: 'post',
         ...metadata,
       });
 
       // Step 2: Upload to S3
-      await uploadToS3Mutation.mutateAsync({ uploadUrl, file });
+      await uploadToS3Mutation.mutateAsync({ uploadUrl, uploadFields, file });
 
       return { success: true, bookId };
     } catch (error) {
@@ -23,6 +23,38 @@ let getAccessToken = null;
 
 export const setTokenGetter = (getter) => {
   getAccessToken = getter;
+  // Cached list bodies belong to the previous user
+  etagCache.clear();
+};
+
+// ETag cache for list endpoints that are polled (search, my uploads, pending).
+// The backend answers 304 when If-None-Match matches, so unchanged lists cost
+// no body transfer or JSON parsing.
+const etagCache = new Map();
+
+const cachedGet = async (url, config = {}) => {
+  const key = apiClient.getUri({ url, params: config.params });
+  const cached = etagCache.get(key);
+  const headers = { ...(config.headers || {}) };
+  if (cached) {
+    headers['If-None-Match'] = cached.etag;
+  }
+
+  const response = await apiClient.get(url, {
+    ...config,
+    headers,
+    validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
+  });
+
+  if (response.status === 304 && cached) {
+    return cached.data;
+  }
+
+  const etag = response.headers?.etag;
+  if (etag) {
+    etagCache.set(key, { etag, data: response.data });
+  }
+  return response.data;
 };
 
 // Request interceptor - Add JWT token
@@ -101,7 +133,17 @@ export const api = {
    * @param {Object} params - { q?: string, limit?: number }
    */
   searchBooks: async (params) => {
-    const response = await apiClient.get(API_ENDPOINTS.SEARCH_BOOKS, { params });
+    return cachedGet(API_ENDPOINTS.SEARCH_BOOKS, { params });
+  },
+
+  /**
+   * Title/author suggestions for the search box
+   * @param {string} prefix - What the user has typed so far
+   * @param {number} [limit]
+   * @returns {Promise<{prefix: string, suggestions: Array<{text: string, type: 'title'|'author', bookId?: string, count?: number}>}>}
+   */
+  suggestBooks: async (prefix, limit) => {
+    const response = await apiClient.get(API_ENDPOINTS.SUGGEST_BOOKS, { params: { prefix, limit } });
     return response.data;
   },
 
@@ -119,13 +161,23 @@ export const api = {
     return response.data;
   },
 
+  /**
+   * Get a read URL plus PDF.js options for reading a PDF with HTTP Range requests.
+   * Falls back to a normal read URL (mode: 'full') for non-PDF books.
+   * @param {string} bookId
+   * @returns {Promise<{mode:'range'|'full', url:string, length?:number, linearized?:boolean, pageCount?:number, pdfjs?:Object}>}
+   */
+  getReadRange: async (bookId) => {
+    const response = await apiClient.get(API_ENDPOINTS.GET_READ_URL(bookId), { params: { mode: 'range' } });
+    return response.data;
+  },
+
   /**
    * Get user's uploads
    * @param {Object} params - { page?: number, pageSize?: number }
    */
   getMyUploads: async (params) => {
-    const response = await apiClient.get(API_ENDPOINTS.MY_UPLOADS, { params });
-    return response.data;
+    return cachedGet(API_ENDPOINTS.MY_UPLOADS, { params });
   },
 
   /**
@@ -148,6 +200,39 @@ export const api = {
     return response.data;
   },
 
+  /**
+   * Create upload URLs for several files in one call (max 25)
+   * @param {Array<Object>} files - [{ fileName, fileSize, title, author, description? }]
+   * @returns {Promise<{uploads: Array<{bookId, fileName, uploadUrl}>, expiresIn: number}>}
+   */
+  createUploadUrls: async (files) => {
+    const response = await apiClient.post(API_ENDPOINTS.CREATE_UPLOAD_URLS, { files });
+    return response.data;
+  },
+
+  /**
+   * Upload file to S3 with a presigned POST form (Step 2 of upload, uploadMode "post").
+   * S3 enforces the exact size and Content-Type signed into the policy.
+   * @param {string} uploadUrl - Presigned POST URL
+   * @param {Object} fields - Form fields returned as uploadFields
+   * @param {File} file - File object
+   * @param {Function} onProgress - Progress callback
+   */
+  uploadToS3Post: async (uploadUrl, fields, file, onProgress) => {
+    const form = new FormData();
+    Object.entries(fields).forEach(([key, value]) => form.append(key, value));
+    // The file must be the last field of the form
+    form.append('file', file);
+    await axios.post(uploadUrl, form, {
+      onUploadProgress: (progressEvent) => {
+        if (onProgress && progressEvent.total) {
+          const progress = Math.round((progressEvent.loaded * 100) / progressEvent.total);
+          onProgress(progress);
+        }
+      },
+    });
+  },
+
   /**
    * Upload file to S3 (Step 2 of upload)
    * @param {string} uploadUrl - Presigned PUT URL
@@ -175,8 +260,15 @@ export const api = {
    * @param {Object} params - { page?: number, pageSize?: number }
    */
   getPendingBooks: async (params) => {
-    const response = await apiClient.get(API_ENDPOINTS.PENDING_BOOKS, { params });
-    return response.data;
+    return cachedGet(API_ENDPOINTS.PENDING_BOOKS, { params });
+  },
+
+  /**
+   * Get the number of pending books (Admin only)
+   * @returns {Promise<{pending: number, counts: Object}>}
+   */
+  getPendingCount: async () => {
+    return cachedGet(API_ENDPOINTS.PENDING_BOOKS_COUNT);
   },
 
   /**
@@ -4,15 +4,18 @@ export const API_ENDPOINTS = {
   
   // Books
   SEARCH_BOOKS: '/books/search',
+  SUGGEST_BOOKS: '/books/suggest',
   GET_READ_URL: (bookId) => `/books/${bookId}/read-url`,
   MY_UPLOADS: '/books/my-uploads',
   DELETE_BOOK: (bookId) => `/books/${bookId}`,
   
   // Upload
   CREATE_UPLOAD_URL: '/books/upload-url',
+  CREATE_UPLOAD_URLS: '/books/upload-urls',
   
   // Admin
   PENDING_BOOKS: '/admin/books/pending',
+  PENDING_BOOKS_COUNT: '/admin/books/pending/count',
   ADMIN_PREVIEW_URL: (bookId) => `/admin/books/${bookId}/preview-url`,
   APPROVE_BOOK: (bookId) => `/admin/books/${bookId}/approve`,
   REJECT_BOOK: (bookId) => `/admin/books/${bookId}/reject`,
@@ -22,6 +25,8 @@ export const API_ENDPOINTS = {
 export const BOOK_STATUS = {
   UPLOADING: 'UPLOADING',
   PENDING: 'PENDING',
+  APPROVING: 'APPROVING',
+  REJECTING: 'REJECTING',
   APPROVED: 'APPROVED',
   REJECTED: 'REJECTED',
   REJECTED_INVALID_TYPE: 'REJECTED_INVALID_TYPE',
@@ -37,6 +42,14 @@ export const STATUS_BADGE_CONFIG = {
     text: 'Chờ duyệt',
     className: 'bg-yellow-100 text-yellow-800 dark:bg-yellow-900 dark:text-yellow-300',
   },
+  [BOOK_STATUS.APPROVING]: {
+    text: 'Đang duyệt',
+    className: 'bg-blue-100 text-blue-800 dark:bg-blue-900 dark:text-blue-300',
+  },
+  [BOOK_STATUS.REJECTING]: {
+    text: 'Đang từ chối',
+    className: 'bg-gray-100 text-gray-800 dark:bg-gray-700 dark:text-gray-300',
+  },
   [BOOK_STATUS.APPROVED]: {
     text: 'Đã duyệt',
     className: 'bg-green-100 text-green-800 dark:bg-green-900 dark:text-green-300',
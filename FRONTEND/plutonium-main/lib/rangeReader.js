@@ -0,0 +1,30 @@
+// Lazy reader for approved PDFs.
+// GET /books/{bookId}/read-url?mode=range returns the signed URL of the
+// original file plus PDF.js options (disableRange=false, disableAutoFetch=true,
+// known length), so PDF.js fetches only the byte ranges of the pages it shows
+// with HTTP Range requests instead of downloading the whole book.
+
+import { api } from './api';
+
+/**
+ * Open a book for lazy reading.
+ *
+ * @param {string} bookId
+ * @returns {Promise<{mode:'range', params:Object, linearized:boolean, pageCount:?number}|{mode:'full', url:string}>}
+ *   For mode 'range', pass params to pdfjsLib.getDocument(params).
+ */
+export async function openRangeBook(bookId) {
+	const info = await api.getReadRange(bookId);
+	if (info.mode !== 'range') {
+		return { mode: 'full', url: info.url };
+	}
+
+	return {
+		mode: 'range',
+		params: { url: info.url, ...info.pdfjs },
+		linearized: Boolean(info.linearized),
+		pageCount: info.pageCount ?? null,
+	};
+}
+
+export default { openRangeBook };
@@ -24,8 +24,9 @@ async function resolveToken(tokenOrGetter) {
  * @param {string} [params.title]
  * @param {string} [params.author]
  * @param {string} [params.description]
+ * @param {'put'|'post'} [params.uploadMode] - 'post' returns a presigned POST form (uploadFields)
  * @param {string} [apiUrl] - override API endpoint
- * @returns {Promise<{uploadUrl:string, bookId:string, expiresIn:number}>}
+ * @returns {Promise<{uploadUrl:string, uploadMethod:string, uploadFields?:Object, bookId:string, expiresIn:number}>}
  */
 export async function getUploadUrl(idTokenOrGetter, params = {}, apiUrl) {
 	const token = await resolveToken(idTokenOrGetter);
@@ -39,6 +40,7 @@ export async function getUploadUrl(idTokenOrGetter, params = {}, apiUrl) {
 		author: params.author || '',
 		description: params.description || '',
 	};
+	if (params.uploadMode) body.uploadMode = params.uploadMode;
 	const headers = {
 		'Content-Type': 'application/json',
 	};
@@ -131,6 +133,136 @@ export async function uploadToS3(uploadUrl, file, options = {}) {
 	return;
 }
 
+/**
+ * Upload a file with a presigned POST form (uploadMode 'post').
+ * S3 rejects the request if the size or Content-Type differ from the signed policy.
+ *
+ * @param {string} uploadUrl
+ * @param {Object} fields - uploadFields returned by getUploadUrl
+ * @param {Blob|File} file
+ * @returns {Promise<void>}
+ */
+export async function uploadWithPresignedPost(uploadUrl, fields, file) {
+	const form = new FormData();
+	Object.entries(fields || {}).forEach(([key, value]) => form.append(key, value));
+	// S3 ignores any field after the file, so it goes last
+	form.append('file', file);
+
+	const res = await fetch(uploadUrl, { method: 'POST', body: form });
+	if (!res.ok) {
+		const text = await res.text().catch(() => '');
+		const err = new Error(`S3 upload failed: ${res.status} ${text}`);
+		err.status = res.status;
+		throw err;
+	}
+}
+
+/**
+ * Upload a large file with the multipart endpoints (POST /books/multipart-upload).
+ * Parts are sent concurrently; a failed part is retried on its own instead of
+ * restarting the whole file. Part ETags are read from the S3 response, so the
+ * bucket CORS rule must expose the ETag header.
+ *
+ * @param {string|function():Promise<string>} idTokenOrGetter
+ * @param {File|Blob} file
+ * @param {Object} params - same metadata as getUploadUrl (fileName, title, author, description)
+ * @param {Object} [options]
+ * @param {string} [options.apiBase] - base url like https://.../books
+ * @param {number} [options.concurrency=4]
+ * @param {number} [options.retries=3]
+ * @param {function(number,number):void} [options.onProgress]
+ * @returns {Promise<{bookId:string, status:string}>}
+ */
+export async function uploadMultipart(idTokenOrGetter, file, params = {}, options = {}) {
+	const apiBase = (options.apiBase || DEFAULT_API.replace(/\/upload-url$/, '')).replace(/\/$/, '');
+	if (!apiBase) throw new Error('Upload API URL not configured (NEXT_PUBLIC_UPLOAD_API)');
+	const concurrency = options.concurrency || 4;
+	const retries = options.retries ?? 3;
+
+	const call = async (path, method, body) => {
+		const token = await resolveToken(idTokenOrGetter);
+		const headers = { 'Content-Type': 'application/json' };
+		if (token) headers.Authorization = `Bearer ${token}`;
+		const res = await fetch(`${apiBase}${path}`, {
+			method,
+			headers,
+			body: body ? JSON.stringify(body) : undefined,
+		});
+		if (!res.ok) {
+			const text = await res.text().catch(() => '');
+			const err = new Error(`${method} ${path} failed: ${res.status} ${text}`);
+			err.status = res.status;
+			throw err;
+		}
+		return res.json();
+	};
+
+	const init = await call('/multipart-upload', 'POST', {
+		fileName: params.fileName || file.name,
+		fileSize: file.size,
+		title: params.title || params.fileName || file.name,
+		author: params.author || '',
+		description: params.description || '',
+	});
+	const { bookId, partSize, partCount } = init;
+	const bookPath = `/${encodeURIComponent(bookId)}/multipart-upload`;
+
+	const urls = new Map(init.parts.map((p) => [p.partNumber, p.url]));
+	const signPart = async (partNumber) => {
+		if (!urls.has(partNumber)) {
+			// Sign the next batch (backend caps a batch at 100 parts)
+			const batch = [];
+			for (let n = partNumber; n <= partCount && batch.length < 100; n += 1) batch.push(n);
+			const { parts } = await call(`${bookPath}/parts`, 'POST', { partNumbers: batch });
+			parts.forEach((p) => urls.set(p.partNumber, p.url));
+		}
+		return urls.get(partNumber);
+	};
+
+	const etags = [];
+	const loaded = new Array(partCount + 1).fill(0);
+	const report = () => options.onProgress && options.onProgress(loaded.reduce((a, b) => a + b, 0), file.size);
+
+	const uploadPart = async (partNumber) => {
+		const blob = file.slice((partNumber - 1) * partSize, Math.min(partNumber * partSize, file.size));
+		for (let attempt = 0; ; attempt += 1) {
+			try {
+				const res = await fetch(await signPart(partNumber), { method: 'PUT', body: blob });
+				if (!res.ok) {
+					const err = new Error(`Part ${partNumber} failed: ${res.status}`);
+					err.status = res.status;
+					throw err;
+				}
+				etags.push({ partNumber, etag: res.headers.get('ETag') });
+				loaded[partNumber] = blob.size;
+				report();
+				return;
+			} catch (err) {
+				if (attempt >= retries) throw err;
+				if (err.status === 403) urls.delete(partNumber); // expired signature, re-sign
+			}
+		}
+	};
+
+	let next = 1;
+	const worker = async () => {
+		while (next <= partCount) {
+			const partNumber = next;
+			next += 1;
+			await uploadPart(partNumber);
+		}
+	};
+
+	try {
+		await Promise.all(Array.from({ length: Math.min(concurrency, partCount) }, worker));
+	} catch (err) {
+		await call(bookPath, 'DELETE').catch(() => null);
+		throw err;
+	}
+
+	return call(`${bookPath}/complete`, 'POST', { parts: etags });
+}
+
 /**
  * Optional: notify backend that upload completed (if you have such endpoint).
  * Example: POST /books/{bookId}/complete
@@ -186,6 +318,8 @@ export function getAmplifyIdTokenGetter() {
 export default {
 	getUploadUrl,
 	uploadToS3,
+	uploadWithPresignedPost,
+	uploadMultipart,
 	notifyUploadComplete,
 	getAmplifyIdTokenGetter,
 };
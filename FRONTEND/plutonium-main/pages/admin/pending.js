@@ -68,8 +68,9 @@ export default function AdminPendingPage() {
     if (!confirm(`Duyệt sách "${title}"?`)) return;
 
     try {
+      // 202: the file is moved in the background, status becomes APPROVED shortly
       await api.approveBook(bookId);
-      showToast(`Đã duyệt sách "${title}"`, "success");
+      showToast(`Đã duyệt sách "${title}", đang xử lý file...`, "success");
       // Reload entire list to ensure sync with backend
       await loadPendingBooks();
       await loadTotalBooks();
@@ -360,6 +361,11 @@ function PendingBookCard({ book, onApprove, onReject }) {
               <span className="font-medium">Tải lên:</span> {formatDate(book.uploadedAt || book.createdAt)}
             </p>
           </div>
+          {book.duplicateOf && (
+            <p className="mt-3 text-sm text-amber-700 dark:text-amber-400">
+              <span className="font-medium">Trùng nội dung với sách:</span> {book.duplicateOf}
+            </p>
+          )}
           {book.description && (
             <p className="mt-3 text-sm text-gray-600 dark:text-gray-400 line-clamp-2">
               <span className="font-medium">Mô tả:</span> {book.description}
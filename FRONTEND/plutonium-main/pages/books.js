@@ -7,6 +7,10 @@ import Footer from "../components/Footer";
 import { api } from "../lib/api";
 import Toast from "../components/Toast";
 
+// Cover thumbnails live under public/covers/ on the CloudFront distribution
+const CDN_BASE = (process.env.NEXT_PUBLIC_CDN_BASE || "").replace(/\/$/, "");
+const coverUrl = (book) => (CDN_BASE && book.coverPath ? `${CDN_BASE}/${book.coverPath}` : null);
+
 export default function BooksPage() {
   const [searchQuery, setSearchQuery] = useState("");
   const [books, setBooks] = useState([]);
@@ -309,7 +313,7 @@ function BookListItem({ book, index, onError }) {
         title: book.title,
         author: book.author,
         description: book.description,
-        pages: book.pages
+        pages: book.pages || book.pageCount
       }
     });
   };
@@ -344,6 +348,15 @@ function BookListItem({ book, index, onError }) {
             </span>
           </div>
           
+          {coverUrl(book) && (
+            <img
+              src={coverUrl(book)}
+              alt={book.title || ""}
+              loading="lazy"
+              className="absolute inset-0 w-full h-full object-cover"
+            />
+          )}
+
           {/* File type badge */}
           <div className="absolute bottom-1 right-1 text-sm">
             {getFileIcon()}
@@ -440,7 +453,7 @@ function BookGridCard({ book, index, onError }) {
         title: book.title,
         author: book.author,
         description: book.description,
-        pages: book.pages
+        pages: book.pages || book.pageCount
       }
     });
   };
@@ -468,6 +481,14 @@ function BookGridCard({ book, index, onError }) {
             {book.title}
           </span>
         </div>
+        {coverUrl(book) && (
+          <img
+            src={coverUrl(book)}
+            alt={book.title || ""}
+            loading="lazy"
+            className="absolute inset-0 w-full h-full object-cover"
+          />
+        )}
         <div className="absolute inset-0 bg-gradient-to-t from-black/30 to-transparent"></div>
         
         {/* File type badge */}
@@ -170,6 +170,16 @@ function UploadCard({ book, onToast, onDelete }) {
         className: "bg-yellow-100 text-yellow-800 dark:bg-yellow-900 dark:text-yellow-300",
         icon: "⏳"
       },
+      APPROVING: {
+        text: "Đang duyệt",
+        className: "bg-blue-100 text-blue-800 dark:bg-blue-900 dark:text-blue-300",
+        icon: "⏳"
+      },
+      REJECTING: {
+        text: "Đang từ chối",
+        className: "bg-gray-100 text-gray-800 dark:bg-gray-700 dark:text-gray-300",
+        icon: "⏳"
+      },
       APPROVED: {
         text: "Đã duyệt",
         className: "bg-green-100 text-green-800 dark:bg-green-900 dark:text-green-300",